@@ -0,0 +1,5 @@
+"""
+Benchmarks for the reverse engineering pipeline
+
+Run from the repository root, e.g. ``python -m benchmarks.bench_concurrent_journeys``.
+"""
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch endpoint extraction against the per-request path
+
+Runs analyze_api_patterns and analyze_api_patterns_batch over the same
+synthetic capture, held both as a list of dicts and in the columnar
+NetworkRequestStore, and checks that they infer identical endpoints.
+
+Usage:
+    python -m benchmarks.bench_batch_pattern_analysis --requests 1000000
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.bench_online_pattern_analysis import generate_requests
+from src.agents.pattern_analyzer import PatternAnalysisAgent
+from src.workflows.capture_store import NetworkRequestStore
+from src.workflows.state_management import create_initial_state
+
+
+def timed(analyze, requests) -> tuple:
+    """Run one analysis on a fresh agent and return (seconds, endpoints)."""
+    state = create_initial_state("Synthetic traffic", "benchmark")
+    state["network_requests"] = requests
+
+    start = time.perf_counter()
+    result = analyze(PatternAnalysisAgent(), state)
+    return time.perf_counter() - start, result["inferred_api_endpoints"]
+
+
+def run_benchmark(request_count: int) -> dict:
+    """Time the per-request and batch paths and compare their output."""
+    requests = generate_requests(request_count)
+    store = NetworkRequestStore(requests)
+
+    per_request_s, expected = timed(PatternAnalysisAgent.analyze_api_patterns, requests)
+    batch_list_s, from_list = timed(
+        PatternAnalysisAgent.analyze_api_patterns_batch, requests
+    )
+    batch_store_s, from_store = timed(
+        PatternAnalysisAgent.analyze_api_patterns_batch, store
+    )
+
+    return {
+        "requests": request_count,
+        "endpoints": len(expected),
+        "identical_output": from_list == expected and from_store == expected,
+        "per_request_s": round(per_request_s, 4),
+        "batch_list_s": round(batch_list_s, 4),
+        "batch_store_s": round(batch_store_s, 4),
+        "speedup_list": round(per_request_s / batch_list_s, 1),
+        "speedup_store": round(per_request_s / batch_store_s, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000000)
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.requests), indent=2))
+
+
+if __name__ == "__main__":
+    main()
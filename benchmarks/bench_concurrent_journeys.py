@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent journeys with blocking browser actions
+
+Each journey's browser step sleeps for a fixed latency on a synchronous call,
+the way a slow real browser action would. Because execute_journey offloads the
+call to the blocking pool, N concurrent journeys should take about
+max(latency) rather than sum(latency).
+
+Usage:
+    python -m benchmarks.bench_concurrent_journeys --journeys 8 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from src.integrations.playwright_mcp import PlaywrightMCPClient, configure_blocking_pool
+from src.workflows.reverse_engineering import ReverseEngineeringWorkflow
+from src.workflows.state_management import create_initial_state
+
+
+class BlockingLatencyClient(PlaywrightMCPClient):
+    """Client whose execute_action blocks for a fixed latency."""
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+
+    def execute_action(self, instruction: str):
+        time.sleep(self.latency)
+        return super().execute_action(instruction)
+
+
+async def run_benchmark(journeys: int, latency: float) -> dict:
+    """Run the journeys concurrently and compare against the serial cost."""
+    configure_blocking_pool(max_workers=journeys)
+    workflow = ReverseEngineeringWorkflow(
+        client_factory=lambda: BlockingLatencyClient(latency)
+    )
+    states = [
+        create_initial_state(f"Navigate to returns page {i}", "returns")
+        for i in range(journeys)
+    ]
+
+    start = time.perf_counter()
+    async for _ in workflow.execute_many(states, max_concurrency=journeys):
+        pass
+    elapsed = time.perf_counter() - start
+
+    return {
+        "journeys": journeys,
+        "latency_s": latency,
+        "max_latency_s": latency,
+        "sum_latency_s": latency * journeys,
+        "elapsed_s": round(elapsed, 4),
+        "speedup_vs_serial": round(latency * journeys / elapsed, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--journeys", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run_benchmark(args.journeys, args.latency)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
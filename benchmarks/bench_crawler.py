@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark novelty-prioritized crawling against a brute-force walk
+
+Builds a synthetic legacy application of modules, each with a listing page
+(a menu linking every module, action buttons and links to its records) and
+record pages with buttons of their own, every button calling an API
+endpoint. A brute-force walk visits every distinct URL and clicks every
+button on it; the UICrawler explores the same app. Reports the browser
+actions each needed and the endpoints each found.
+
+Usage:
+    python -m benchmarks.bench_crawler --modules 12 --records 50 --buttons 6
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from src.integrations.capture_events import NetworkEvent, now_ns
+from src.integrations.playwright_mcp import PlaywrightMCPClient
+from src.workflows.crawler import UICrawler, endpoint_key, page_actions
+
+ORIGIN = "https://legacy.example.com"
+
+RESOURCES = (
+    "invoices",
+    "vendors",
+    "payments",
+    "consignments",
+    "returns",
+    "parts",
+    "suppliers",
+    "warehouses",
+    "credits",
+    "orders",
+    "shipments",
+    "ledgers",
+    "budgets",
+    "contracts",
+    "receipts",
+    "customers",
+)
+
+VERBS = ("Search", "Export", "Approve", "Print", "Refresh", "Archive", "Assign")
+
+
+class SyntheticAppClient(PlaywrightMCPClient):
+    """Client simulating a module-per-resource legacy application."""
+
+    def __init__(self, modules: int, records: int, buttons: int):
+        super().__init__(origin=ORIGIN)
+        self.modules = list(RESOURCES[:modules])
+        self.records = records
+        self.buttons = buttons
+
+    async def navigate_to_url(self, url):
+        result = await super().navigate_to_url(url)
+        self._api("GET", f"/api{url[len(ORIGIN):]}")
+        return result
+
+    async def click_element(self, element_description, selector):
+        result = await super().click_element(element_description, selector)
+        path = self.current_url[len(ORIGIN) :]
+        verb = element_description.split()[0].lower()
+        self._api("POST", f"/api{path}/{verb}")
+        return result
+
+    async def snapshot_page(self):
+        parts = self.current_url[len(ORIGIN) :].strip("/").split("/")
+        menu = [
+            {"tag": "a", "attrs": {"href": f"/{m}"}, "text": m, "children": []}
+            for m in self.modules
+        ]
+        body = [{"tag": "nav", "attrs": {}, "children": menu}]
+        if parts[0] in self.modules:
+            detail = len(parts) > 1
+            body.extend(
+                {
+                    "tag": "button",
+                    "attrs": {"id": f"{verb.lower()}-{detail}"},
+                    "text": f"{verb} {'record' if detail else parts[0]}",
+                    "children": [],
+                }
+                for verb in VERBS[: self.buttons]
+            )
+            if not detail:
+                rows = [
+                    {
+                        "tag": "tr",
+                        "attrs": {},
+                        "children": [
+                            {
+                                "tag": "a",
+                                "attrs": {"href": f"/{parts[0]}/{r}"},
+                                "text": f"#{r}",
+                                "children": [],
+                            }
+                        ],
+                    }
+                    for r in range(1, self.records + 1)
+                ]
+                body.append({"tag": "table", "attrs": {}, "children": rows})
+        return {
+            "url": self.current_url,
+            "dom": {"tag": "html", "attrs": {}, "children": body},
+        }
+
+    def _api(self, method, path):
+        self._network_requests.append(
+            NetworkEvent(f"{ORIGIN}{path}", method, 200, 40, now_ns())
+        )
+
+
+def endpoint_count(client: PlaywrightMCPClient) -> int:
+    """Distinct endpoints the client captured."""
+    requests, _ = client.drain_network_requests()
+    return len({endpoint_key(request) for request in requests})
+
+
+async def brute_force(client: SyntheticAppClient, start_url: str) -> int:
+    """Visit every distinct URL and click every button, counting actions."""
+    queue, seen, actions = [start_url], {start_url}, 0
+    while queue:
+        url = queue.pop(0)
+        await client.navigate_to_url(url)
+        actions += 1
+        snapshot = await client.snapshot_page()
+        for step in page_actions(snapshot["dom"], url):
+            if step["action"] == "navigate":
+                if step["url"] not in seen:
+                    seen.add(step["url"])
+                    queue.append(step["url"])
+            else:
+                await client.navigate_to_url(url)
+                await client.click_element(step["element"], step["selector"])
+                actions += 2
+    return actions
+
+
+def run_benchmark(modules: int, records: int, buttons: int) -> dict:
+    """Explore the same synthetic app by brute force and with the crawler."""
+    start_url = f"{ORIGIN}/{RESOURCES[0]}"
+
+    client = SyntheticAppClient(modules, records, buttons)
+    start = time.perf_counter()
+    brute_actions = asyncio.run(brute_force(client, start_url))
+    brute_s = time.perf_counter() - start
+    brute_endpoints = endpoint_count(client)
+
+    client = SyntheticAppClient(modules, records, buttons)
+    start = time.perf_counter()
+    summary = asyncio.run(UICrawler(client, time_budget=3600).crawl(start_url))
+    crawl_s = time.perf_counter() - start
+
+    return {
+        "modules": modules,
+        "records_per_module": records,
+        "buttons_per_page": buttons,
+        "brute_force": {
+            "browser_actions": brute_actions,
+            "endpoints": brute_endpoints,
+            "seconds": round(brute_s, 4),
+        },
+        "crawler": {
+            "browser_actions": summary["browser_actions"],
+            "actions_tried": summary["actions_tried"],
+            "states": summary["states"],
+            "endpoints": len(summary["endpoints"]),
+            "seconds": round(crawl_s, 4),
+        },
+        "action_reduction": round(brute_actions / summary["browser_actions"], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--modules", type=int, default=12, choices=range(1, len(RESOURCES) + 1)
+    )
+    parser.add_argument("--records", type=int, default=50)
+    parser.add_argument("--buttons", type=int, default=6, choices=range(1, 8))
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.modules, args.records, args.buttons), indent=2))
+
+
+if __name__ == "__main__":
+    main()
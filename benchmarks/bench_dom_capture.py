@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark diff-compressed DOM capture on a heavy legacy page
+
+Simulates a session on a large listing page (a long table of records with
+a menu, filters and per-row actions): each action edits a row, opens or
+closes a dialog, or pages the table, sometimes navigating to another page
+of the same layout. Reports the JSON bytes per action of storing a full
+snapshot against those of the DomCapture events, the capture time per
+action and the node store size.
+
+Usage:
+    python -m benchmarks.bench_dom_capture --rows 5000 --actions 200
+"""
+
+import argparse
+import json
+import random
+import time
+
+from src.integrations.capture_events import event_dict
+from src.integrations.dom_capture import DomCapture
+
+ORIGIN = "https://legacy.example.com"
+
+
+def node(tag, *children, text=None, **attrs):
+    """DOM node in snapshot_page form."""
+    return {"tag": tag, "attrs": attrs, "text": text, "children": list(children)}
+
+
+def listing(resource: str, rows: int, first: int, statuses, dialog: bool) -> dict:
+    """A listing page showing rows records from record number first."""
+    table = node(
+        "table",
+        node("thead", node("tr", *(node("th", text=c) for c in ("No.", "Status", "")))),
+        node(
+            "tbody",
+            *(
+                node(
+                    "tr",
+                    node("td", text=f"{resource[:3].upper()}-{first + i:07d}"),
+                    node("td", text=statuses.get(first + i, "pending")),
+                    node(
+                        "td",
+                        node("button", text="Approve", onclick="approve()"),
+                        node("button", text="Hold", onclick="hold()"),
+                    ),
+                    **{"class": "row"},
+                )
+                for i in range(rows)
+            ),
+        ),
+    )
+    menu = node(
+        "nav",
+        *(node("a", text=name, href=f"/{name}") for name in ("invoices", "vendors")),
+    )
+    body = [
+        menu,
+        node("form", node("input", name="q"), node("button", text="Go")),
+        table,
+    ]
+    if dialog:
+        body.append(node("div", node("h2", text="Confirm"), role="dialog"))
+    return node("html", node("head", node("title", text=resource)), node("body", *body))
+
+
+def run_benchmark(rows: int, actions: int, seed: int = 7) -> dict:
+    """Capture a seeded session with full snapshots and with DomCapture."""
+    rng = random.Random(seed)
+    capture = DomCapture()
+    resource, first, statuses, dialog = "invoices", 0, {}, False
+
+    full_bytes = event_bytes = 0
+    capture_s = 0.0
+    baselines = diffs = 0
+    for _ in range(actions):
+        choice = rng.random()
+        if choice < 0.5:
+            statuses[first + rng.randrange(rows)] = rng.choice(("approved", "held"))
+        elif choice < 0.8:
+            dialog = not dialog
+        elif choice < 0.95:
+            first += rows
+        else:
+            resource = rng.choice(("invoices", "vendors"))
+            first = 0
+
+        dom = listing(resource, rows, first, statuses, dialog)
+        full_bytes += len(json.dumps(dom, separators=(",", ":")))
+
+        start = time.perf_counter()
+        event = capture.capture(f"{ORIGIN}/{resource}", dom, "click")
+        capture_s += time.perf_counter() - start
+        if event is not None:
+            entry = event_dict(event)
+            event_bytes += len(json.dumps(entry, separators=(",", ":")))
+            baselines += entry["type"] == "baseline"
+            diffs += entry["type"] == "diff"
+
+    return {
+        "rows": rows,
+        "actions": actions,
+        "baselines": baselines,
+        "diffs": diffs,
+        "full_snapshot_bytes_per_action": round(full_bytes / actions),
+        "event_bytes_per_action": round(event_bytes / actions),
+        "compression": round(full_bytes / max(event_bytes, 1), 1),
+        "capture_ms_per_action": round(capture_s * 1000 / actions, 2),
+        "stored_nodes": len(capture.store),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--actions", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.rows, args.actions, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory per captured event: dicts vs compact records
+
+Builds the same audit log and network events as the Playwright client
+records them, once as the previous dicts with ISO-8601 timestamp strings
+and once as __slots__ records with integer epoch nanoseconds, and reports
+bytes per event and creation time for each.
+
+Usage:
+    python -m benchmarks.bench_event_memory --actions 200000
+"""
+
+from datetime import datetime
+import argparse
+import json
+import time
+import tracemalloc
+
+from src.integrations.capture_events import AuditEvent, NetworkEvent, now_ns
+
+
+def dict_events(count: int) -> list:
+    """Events as dicts, stamped the way the client used to stamp them."""
+    events = []
+    for i in range(count):
+        url = f"https://example.com/page/{i}"
+        events.append(
+            {
+                "url": url,
+                "method": "GET",
+                "status": 200,
+                "response_time": 150,
+                "timestamp": datetime.now().isoformat(),
+                "request_type": "navigation",
+            }
+        )
+        events.append(
+            {
+                "action": "navigate",
+                "url": url,
+                "timestamp": datetime.now().isoformat(),
+                "success": True,
+            }
+        )
+    return events
+
+
+def record_events(count: int) -> list:
+    """Events as records sharing one integer timestamp per action."""
+    events = []
+    for i in range(count):
+        url = f"https://example.com/page/{i}"
+        timestamp_ns = now_ns()
+        events.append(NetworkEvent(url, "GET", 200, 150, timestamp_ns, "navigation"))
+        events.append(AuditEvent("navigate", timestamp_ns, True, url=url))
+    return events
+
+
+def measure(build, count: int) -> dict:
+    """Build count actions' events and report bytes per event and time."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    events = build(count)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "bytes_per_event": round(current / len(events), 1),
+        "build_s": round(elapsed, 4),
+    }
+
+
+def run_benchmark(action_count: int) -> dict:
+    """Compare dict and record events for action_count actions."""
+    before = measure(dict_events, action_count)
+    after = measure(record_events, action_count)
+    return {
+        "actions": action_count,
+        "events": 2 * action_count,
+        "dicts": before,
+        "records": after,
+        "memory_ratio": round(before["bytes_per_event"] / after["bytes_per_event"], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--actions", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.actions), indent=2))
+
+
+if __name__ == "__main__":
+    main()
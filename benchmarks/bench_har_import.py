@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark streaming HAR import against loading the whole file
+
+Writes a synthetic HAR recording to a temporary file, then analyzes its
+endpoints by streaming entries into an EndpointAggregator, and by
+json.load followed by analyze_api_patterns. Reports time and peak Python
+memory for each, and checks that both infer identical endpoints.
+
+Usage:
+    python -m benchmarks.bench_har_import --requests 200000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_online_pattern_analysis import generate_requests
+from src.agents.pattern_analyzer import PatternAnalysisAgent
+from src.integrations.har_import import har_entry_to_request, iter_har_requests
+from src.workflows.state_management import create_initial_state
+
+
+def write_har(path: str, request_count: int) -> None:
+    """Write a HAR file holding request_count synthetic entries."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"log": {"version": "1.2", "entries": [\n')
+        for i, request in enumerate(generate_requests(request_count)):
+            entry = {
+                "startedDateTime": request["timestamp"],
+                "time": request["response_time"],
+                "request": {"method": request["method"], "url": request["url"]},
+                "response": {
+                    "status": request["status"],
+                    "content": {"mimeType": "application/json", "text": "{}"},
+                },
+            }
+            f.write(("" if i == 0 else ",\n") + json.dumps(entry))
+        f.write("\n]}}\n")
+
+
+def measure(analyze) -> tuple:
+    """Run analyze() and return (seconds, peak bytes, endpoints)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    endpoints = analyze()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, endpoints
+
+
+def run_benchmark(request_count: int) -> dict:
+    """Time streaming and whole-file analysis of the same HAR file."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "capture.har")
+        write_har(path, request_count)
+
+        def streamed():
+            aggregator = PatternAnalysisAgent().create_aggregator()
+            aggregator.observe_many(iter_har_requests(path, include_bodies=False))
+            return aggregator.snapshot()
+
+        def loaded():
+            with open(path, "r", encoding="utf-8") as f:
+                document = json.load(f)
+            state = create_initial_state("HAR import", "benchmark")
+            state["network_requests"] = [
+                har_entry_to_request(entry, include_bodies=False)
+                for entry in document["log"]["entries"]
+            ]
+            result = PatternAnalysisAgent().analyze_api_patterns(state)
+            return result["inferred_api_endpoints"]
+
+        streamed_s, streamed_peak, from_stream = measure(streamed)
+        loaded_s, loaded_peak, from_load = measure(loaded)
+
+        return {
+            "requests": request_count,
+            "file_bytes": os.path.getsize(path),
+            "streamed_s": round(streamed_s, 4),
+            "streamed_peak_bytes": streamed_peak,
+            "loaded_s": round(loaded_s, 4),
+            "loaded_peak_bytes": loaded_peak,
+            "memory_ratio": round(loaded_peak / streamed_peak, 1),
+            "endpoints": len(from_stream),
+            "identical": from_stream == from_load,
+        }
+
+
+def main() -> None:
+    """Parse arguments and print the benchmark results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.requests), indent=2))
+
+
+if __name__ == "__main__":
+    main()
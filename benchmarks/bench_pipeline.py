@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Benchmark the analysis pipeline stages on synthetic traffic
+
+Generates seeded AP/consignment/returns/parts traffic at each requested
+size and measures, per stage, throughput, peak traced memory and latency
+percentiles:
+
+- analyze_api_patterns: requests observed in chunks by an endpoint
+  aggregator (the path analyze_api_patterns runs); latency per chunk
+- analyze_api_patterns_batch: one bulk analysis; latency per run
+- capture_data: incremental passes as the capture grows chunk by chunk;
+  latency per pass
+- execute: full workflow runs over a state preloaded with the traffic;
+  latency per run
+
+Results are printed, and optionally written, as JSON for comparison
+between runs.
+
+Usage:
+    python -m benchmarks.bench_pipeline --sizes 1000 100000 1000000
+    python -m benchmarks.bench_pipeline --sizes 1000 --output baseline.json
+"""
+
+from typing import Callable, Dict, List
+import argparse
+import asyncio
+import bisect
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic_traffic import generate_traffic
+from src.agents.pattern_analyzer import PatternAnalysisAgent
+from src.workflows.capture_store import NetworkRequestStore
+from src.workflows.reverse_engineering import ReverseEngineeringWorkflow
+from src.workflows.state_management import create_initial_state
+
+STAGES = (
+    "analyze_api_patterns",
+    "analyze_api_patterns_batch",
+    "capture_data",
+    "execute",
+)
+
+# Stages that process the capture once, timing each chunk
+CHUNKED_STAGES = ("analyze_api_patterns", "capture_data")
+
+
+def traffic_state(requests: List[Dict], logs: List[Dict]):
+    """Workflow state holding a synthetic capture."""
+    state = create_initial_state("Synthetic traffic", "accounts_payable")
+    state["network_requests"] = NetworkRequestStore(requests)
+    state["playwright_logs"] = list(logs)
+    return state
+
+
+def chunks(items: List, size: int) -> List[List]:
+    """Split items into consecutive chunks of at most size."""
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def stage_analyze(requests, logs, chunk_size, runs) -> Callable[[], List[float]]:
+    """Online aggregation in chunks; returns per-chunk latencies."""
+
+    def run() -> List[float]:
+        aggregator = PatternAnalysisAgent().create_aggregator()
+        latencies = []
+        for chunk in chunks(requests, chunk_size):
+            start = time.perf_counter()
+            aggregator.observe_many(chunk)
+            latencies.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        aggregator.snapshot()
+        latencies[-1] += time.perf_counter() - start
+        return latencies
+
+    return run
+
+
+def stage_analyze_batch(requests, logs, chunk_size, runs) -> Callable[[], List[float]]:
+    """Bulk analysis of the whole capture; returns per-run latencies."""
+    store = NetworkRequestStore(requests)
+
+    def run() -> List[float]:
+        latencies = []
+        for _ in range(runs):
+            state = create_initial_state("Synthetic traffic", "benchmark")
+            state["network_requests"] = store
+            start = time.perf_counter()
+            PatternAnalysisAgent().analyze_api_patterns_batch(state)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    return run
+
+
+def stage_capture(requests, logs, chunk_size, runs) -> Callable[[], List[float]]:
+    """Incremental capture passes as traffic arrives; per-pass latencies."""
+    # Each pass also receives the logs up to its last request's timestamp
+    log_times = [log["timestamp"] for log in logs]
+    batches, logged = [], 0
+    for request_chunk in chunks(requests, chunk_size):
+        until = bisect.bisect_right(log_times, request_chunk[-1]["timestamp"])
+        batches.append((request_chunk, logs[logged:until]))
+        logged = until
+    if batches:
+        batches[-1][1].extend(logs[logged:])
+
+    def run() -> List[float]:
+        workflow = ReverseEngineeringWorkflow()
+        config = workflow._run_config()
+        state = create_initial_state("Synthetic traffic", "benchmark")
+
+        async def passes() -> List[float]:
+            nonlocal state
+            latencies = []
+            for request_chunk, log_chunk_entries in batches:
+                state["network_requests"].extend(request_chunk)
+                state["playwright_logs"].extend(log_chunk_entries)
+                start = time.perf_counter()
+                state = await workflow.capture_data(state, config)
+                latencies.append(time.perf_counter() - start)
+            return latencies
+
+        return asyncio.run(passes())
+
+    return run
+
+
+def stage_execute(requests, logs, chunk_size, runs) -> Callable[[], List[float]]:
+    """Full workflow runs over a preloaded state; per-run latencies."""
+
+    def run() -> List[float]:
+        workflow = ReverseEngineeringWorkflow()
+        latencies = []
+        for _ in range(runs):
+            state = traffic_state(requests, logs)
+            start = time.perf_counter()
+            result = asyncio.run(workflow.execute(state))
+            latencies.append(time.perf_counter() - start)
+            if "workflow_error" in result:
+                raise RuntimeError(result["workflow_error"])
+        return latencies
+
+    return run
+
+
+STAGE_BUILDERS = {
+    "analyze_api_patterns": stage_analyze,
+    "analyze_api_patterns_batch": stage_analyze_batch,
+    "capture_data": stage_capture,
+    "execute": stage_execute,
+}
+
+
+def measure(stage: str, requests, logs, args) -> Dict:
+    """Time one stage, then rerun it under tracemalloc for peak memory."""
+    run = STAGE_BUILDERS[stage](requests, logs, args.chunk_size, args.runs)
+
+    latencies = np.asarray(run())
+    # Chunked stages process the capture once; per-run stages once per run
+    processed = len(requests) * (1 if stage in CHUNKED_STAGES else len(latencies))
+
+    result = {
+        "stage": stage,
+        "requests": len(requests),
+        "seconds": round(float(latencies.sum()), 4),
+        "throughput_rps": round(processed / float(latencies.sum())),
+        "latency_unit": (
+            f"chunk of {args.chunk_size} requests" if stage in CHUNKED_STAGES else "run"
+        ),
+        "latency_ms": {
+            f"p{q}": round(float(np.percentile(latencies, q)) * 1000, 3)
+            for q in (50, 90, 95, 99)
+        },
+    }
+    result["latency_ms"]["max"] = round(float(latencies.max()) * 1000, 3)
+
+    if args.memory:
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_memory_bytes"] = peak
+
+    return result
+
+
+def run_suite(args) -> Dict:
+    """Run every selected stage at every size."""
+    results = []
+    for size in args.sizes:
+        requests, logs = generate_traffic(size, seed=args.seed)
+        for stage in args.stages:
+            if stage == "execute" and size > args.max_execute_size:
+                continue
+            results.append(measure(stage, requests, logs, args))
+
+    return {
+        "seed": args.seed,
+        "sizes": args.sizes,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument(
+        "--max-execute-size",
+        type=int,
+        default=1000000,
+        help="Skip full workflow runs above this many requests",
+    )
+    parser.add_argument(
+        "--no-memory",
+        dest="memory",
+        action="store_false",
+        help="Skip the tracemalloc pass that measures peak memory",
+    )
+    parser.add_argument("--output", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    report = run_suite(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
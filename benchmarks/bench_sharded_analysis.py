@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark sharded multi-core endpoint analysis
+
+Aggregates a synthetic multi-host capture (with statistics and body
+schemas) in one process, then with sharded_endpoint_patterns at each
+worker count, reporting throughput, speedup and whether the endpoint
+catalog matches the single-process one. Speedup can only scale with the
+cores actually available; cpu_count is included in the report.
+
+Usage:
+    python -m benchmarks.bench_sharded_analysis --requests 2000000 --workers 1 2 4 8
+"""
+
+import argparse
+import json
+import os
+import time
+
+from benchmarks.synthetic_traffic import generate_traffic
+from src.agents.pattern_analyzer import PatternAnalysisAgent
+from src.agents.sharded_analysis import SHARD_BY, sharded_endpoint_patterns
+
+
+def comparable(endpoints):
+    """Endpoints with response time averages rounded past summation order."""
+    for endpoint in endpoints:
+        stats = endpoint["stats"]
+        if stats["response_time_avg"] is not None:
+            stats["response_time_avg"] = round(stats["response_time_avg"], 6)
+    return endpoints
+
+
+def run_benchmark(request_count: int, workers_list, shard_by: str) -> dict:
+    """Time single-process and sharded aggregation of the same capture."""
+    requests, _ = generate_traffic(request_count)
+
+    start = time.perf_counter()
+    aggregator = PatternAnalysisAgent().create_aggregator()
+    aggregator.observe_many(requests)
+    expected = comparable(aggregator.snapshot(include_stats=True))
+    single_s = time.perf_counter() - start
+
+    results = []
+    for workers in workers_list:
+        start = time.perf_counter()
+        endpoints = sharded_endpoint_patterns(
+            PatternAnalysisAgent(),
+            requests,
+            workers=workers,
+            shard_by=shard_by,
+            include_stats=True,
+        )
+        seconds = time.perf_counter() - start
+        results.append(
+            {
+                "workers": workers,
+                "seconds": round(seconds, 4),
+                "throughput_rps": round(request_count / seconds),
+                "speedup": round(single_s / seconds, 2),
+                "identical_output": comparable(endpoints) == expected,
+            }
+        )
+
+    return {
+        "requests": request_count,
+        "endpoints": len(expected),
+        "shard_by": shard_by,
+        "cpu_count": os.cpu_count(),
+        "single_process_s": round(single_s, 4),
+        "single_process_rps": round(request_count / single_s),
+        "sharded": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--shard-by", choices=SHARD_BY, default="endpoint")
+    args = parser.parse_args()
+
+    print(
+        json.dumps(run_benchmark(args.requests, args.workers, args.shard_by), indent=2)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark journey wall time with and without cached login state
+
+Every journey starts with a login whose round-trips take a fixed latency.
+With a StorageStateCache, only the first journey logs in; later sessions are
+seeded from the cached cookies and local storage.
+
+Usage:
+    python -m benchmarks.bench_storage_state_reuse --journeys 20 --login-latency 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+
+from src.integrations.auth_state import StorageStateCache
+from src.integrations.playwright_mcp import PlaywrightMCPClient
+from src.workflows.reverse_engineering import ReverseEngineeringWorkflow
+from src.workflows.state_management import create_initial_state
+
+
+class SlowLoginClient(PlaywrightMCPClient):
+    """Client whose login round-trips block for a fixed latency."""
+
+    login_latency = 0.2
+
+    def _perform_login(self):
+        time.sleep(self.login_latency)
+        super()._perform_login()
+
+
+async def run_journeys(journeys: int, cache) -> float:
+    """Run journeys one after another and return the total wall time."""
+    workflow = ReverseEngineeringWorkflow(
+        client_factory=lambda: SlowLoginClient(
+            storage_state_cache=cache, credential_id="ap-clerk"
+        )
+    )
+    states = [
+        create_initial_state("Login and open invoice list", "accounts_payable")
+        for _ in range(journeys)
+    ]
+
+    start = time.perf_counter()
+    async for _ in workflow.execute_many(states, max_concurrency=1):
+        pass
+    return time.perf_counter() - start
+
+
+async def run_benchmark(journeys: int, login_latency: float) -> dict:
+    """Compare journey wall time with and without the storage-state cache."""
+    SlowLoginClient.login_latency = login_latency
+
+    without_cache = await run_journeys(journeys, cache=None)
+    with tempfile.TemporaryDirectory() as directory:
+        with_cache = await run_journeys(journeys, cache=StorageStateCache(directory))
+
+    return {
+        "journeys": journeys,
+        "login_latency_s": login_latency,
+        "without_cache_s": round(without_cache, 4),
+        "with_cache_s": round(with_cache, 4),
+        "per_journey_without_cache_s": round(without_cache / journeys, 4),
+        "per_journey_with_cache_s": round(with_cache / journeys, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--journeys", type=int, default=20)
+    parser.add_argument("--login-latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(args.journeys, args.login_latency))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Seeded synthetic traffic for benchmarking the reverse engineering pipeline
+
+Mimics captures of the legacy accounts payable, consignment, returns and
+parts applications: REST routes with numeric, UUID, date and code segments,
+paged and filtered query strings, JSON request and response bodies on API
+calls, static asset loads, and audit log entries for the user actions that
+triggered them. The same seed always produces the same traffic.
+"""
+
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import json
+import random
+import uuid
+
+DOMAINS = ("accounts_payable", "consignment", "returns", "parts")
+
+START = datetime(2024, 1, 15, 8, 0)
+
+Route = Tuple[str, str, Callable[[random.Random], Tuple[str, Optional[Dict]]]]
+
+
+def _money(rng: random.Random) -> float:
+    """A currency amount."""
+    return round(rng.uniform(5, 25_000), 2)
+
+
+def _date(rng: random.Random) -> str:
+    """A date in early 2024."""
+    return (START + timedelta(days=rng.randint(0, 120))).date().isoformat()
+
+
+def _uuid(rng: random.Random) -> str:
+    """A UUID drawn from the seeded generator."""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _page(rng: random.Random) -> str:
+    """Paging query parameters."""
+    return f"page={rng.randint(1, 40)}&page_size={rng.choice((25, 50, 100))}"
+
+
+def _part_number(rng: random.Random) -> str:
+    """A manufacturer part number such as "CK-48213"."""
+    prefix = rng.choice("ABCDEFGH") + rng.choice("KLMNP")
+    return f"{prefix}-{rng.randint(10_000, 99_999)}"
+
+
+def _invoice(rng: random.Random) -> Dict:
+    """An invoice document."""
+    return {
+        "id": rng.randint(1, 2_000_000),
+        "vendor_id": rng.randint(1, 5_000),
+        "status": rng.choice(("draft", "pending", "approved", "paid")),
+        "amount": _money(rng),
+        "currency": rng.choice(("USD", "USD", "CAD")),
+        "due_date": _date(rng),
+        "lines": [
+            {"gl_account": f"{rng.randint(1000, 9999)}", "amount": _money(rng)}
+            for _ in range(rng.randint(1, 4))
+        ],
+    }
+
+
+def _consignment(rng: random.Random) -> Dict:
+    """A consignment document."""
+    return {
+        "id": _uuid(rng),
+        "consignor": {
+            "id": rng.randint(1, 800),
+            "name": f"Consignor {rng.randint(1, 800)}",
+        },
+        "status": rng.choice(("received", "listed", "sold", "returned")),
+        "items": rng.randint(1, 30),
+        "received_at": f"{_date(rng)}T{rng.randint(8, 17):02d}:00:00Z",
+    }
+
+
+def _return(rng: random.Random) -> Dict:
+    """A return merchandise authorization."""
+    return {
+        "rma": f"RMA-{rng.randint(100_000, 999_999)}",
+        "order_id": rng.randint(1, 3_000_000),
+        "reason": rng.choice(("damaged", "wrong_item", "not_needed", "warranty")),
+        "refund_amount": _money(rng),
+        "inspected": rng.random() < 0.5,
+    }
+
+
+def _part(rng: random.Random) -> Dict:
+    """A catalog part."""
+    return {
+        "part_number": _part_number(rng),
+        "description": rng.choice(("Brake pad", "Oil filter", "Alternator", "Gasket")),
+        "price": _money(rng),
+        "stock": rng.randint(0, 500),
+        "fitment": [
+            {
+                "make": rng.choice(("Ford", "Toyota", "Honda")),
+                "year": rng.randint(1995, 2024),
+            }
+            for _ in range(rng.randint(0, 3))
+        ],
+    }
+
+
+def _routes() -> Dict[str, List[Route]]:
+    """Weighted routes of each domain as (method, template, generator)."""
+    return {
+        "accounts_payable": [
+            (
+                "GET",
+                "/api/v1/invoices",
+                lambda r: (f"?status=pending&{_page(r)}", None),
+            ),
+            ("GET", "/api/v1/invoices/{id}", lambda r: ("", _invoice(r))),
+            ("GET", "/api/v1/invoices/{id}", lambda r: ("", _invoice(r))),
+            ("POST", "/api/v1/invoices", lambda r: ("", _invoice(r))),
+            (
+                "PUT",
+                "/api/v1/invoices/{id}/approve",
+                lambda r: ("", {"approved": True}),
+            ),
+            ("GET", "/api/v1/vendors/{id}", lambda r: ("", {"id": r.randint(1, 5000)})),
+            (
+                "GET",
+                "/api/v1/payments",
+                lambda r: (f"?from={_date(r)}&{_page(r)}", None),
+            ),
+            ("GET", "/api/v1/gl-accounts/{code}", lambda r: ("", None)),
+        ],
+        "consignment": [
+            ("GET", "/api/consignments/{uuid}", lambda r: ("", _consignment(r))),
+            ("GET", "/api/consignments/{uuid}/items", lambda r: (f"?{_page(r)}", None)),
+            ("POST", "/api/consignments", lambda r: ("", _consignment(r))),
+            (
+                "GET",
+                "/api/locations/{code}/stock",
+                lambda r: (f"?sku=SKU{r.randint(1, 99999)}", None),
+            ),
+            ("GET", "/api/settlements/{date}", lambda r: ("", None)),
+        ],
+        "returns": [
+            (
+                "GET",
+                "/api/returns",
+                lambda r: (f"?customer={r.randint(1, 90000)}&{_page(r)}", None),
+            ),
+            ("GET", "/api/returns/{rma}", lambda r: ("", _return(r))),
+            ("PUT", "/api/returns/{rma}/inspection", lambda r: ("", _return(r))),
+            (
+                "POST",
+                "/api/refunds",
+                lambda r: ("", {"rma": _return(r)["rma"], "amount": _money(r)}),
+            ),
+            ("GET", "/api/refunds/{id}", lambda r: ("", None)),
+        ],
+        "parts": [
+            ("GET", "/api/parts/{part}", lambda r: ("", _part(r))),
+            ("GET", "/api/parts/{part}", lambda r: ("", _part(r))),
+            (
+                "GET",
+                "/api/parts/search",
+                lambda r: (f"?q=brake&make=Ford&year={r.randint(1995, 2024)}", None),
+            ),
+            ("GET", "/api/catalog/{make}/{model}/{year}", lambda r: ("", None)),
+            ("GET", "/api/inventory/{warehouse}/bins/{bin}", lambda r: ("", None)),
+        ],
+    }
+
+
+_SEGMENTS: Dict[str, Callable[[random.Random], str]] = {
+    "{id}": lambda r: str(r.randint(1, 2_000_000)),
+    "{uuid}": _uuid,
+    "{code}": lambda r: f"{r.choice('ABCDEFGHJK')}{r.randint(100, 999)}",
+    "{date}": _date,
+    "{rma}": lambda r: f"RMA-{r.randint(100_000, 999_999)}",
+    "{part}": _part_number,
+    "{make}": lambda r: r.choice(("ford", "toyota", "honda", "gm")),
+    "{model}": lambda r: r.choice(("f150", "camry", "civic", "silverado", "accord")),
+    "{year}": lambda r: str(r.randint(1995, 2024)),
+    "{warehouse}": lambda r: r.choice(("east", "west", "central")),
+    "{bin}": lambda r: f"{r.randint(1, 40):02d}-{r.randint(1, 12):02d}",
+}
+
+_ASSETS = (
+    "/static/js/app.{hash}.js",
+    "/static/css/main.{hash}.css",
+    "/images/logo.png",
+    "/favicon.ico",
+)
+
+
+def _fill(template: str, rng: random.Random) -> str:
+    """Replace a route template's placeholders with concrete segments."""
+    return "/".join(
+        _SEGMENTS[segment](rng) if segment in _SEGMENTS else segment
+        for segment in template.split("/")
+    )
+
+
+def generate_traffic(
+    count: int,
+    seed: int = 42,
+    domains: Sequence[str] = DOMAINS,
+    body_rate: float = 0.3,
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Generate a synthetic capture of network requests and audit logs.
+
+    Args:
+        count: Number of network requests
+        seed: Random seed; the same seed gives the same traffic
+        domains: Business domains whose applications are exercised
+        body_rate: Fraction of API calls carrying JSON bodies
+
+    Returns:
+        Tuple of (network requests, audit log entries) in time order
+    """
+    rng = random.Random(seed)
+    routes = _routes()
+    hosts = {
+        domain: f"https://{domain.replace('_', '-')}.legacy.example.com"
+        for domain in domains
+    }
+
+    requests: List[Dict] = []
+    logs: List[Dict] = []
+    clock = START
+    domain = domains[0]
+
+    while len(requests) < count:
+        # Each user action triggers a burst of requests shortly after it
+        clock += timedelta(seconds=rng.uniform(1, 20))
+        if rng.random() < 0.1:
+            domain = rng.choice(domains)
+        host = hosts[domain]
+        action = rng.choice(("navigate", "click", "click", "type"))
+        logs.append(
+            {
+                "action": action,
+                "url": f"{host}/app/{domain}",
+                "timestamp": clock.isoformat(),
+                "success": True,
+            }
+        )
+
+        burst = clock
+        for _ in range(min(rng.randint(2, 15), count - len(requests))):
+            burst += timedelta(milliseconds=rng.randint(5, 400))
+            if rng.random() < 0.15:
+                path = rng.choice(_ASSETS).replace(
+                    "{hash}", f"{rng.getrandbits(40):010x}"
+                )
+                request = {"url": f"{host}{path}", "method": "GET"}
+            else:
+                method, template, extra = rng.choice(routes[domain])
+                query, body = extra(rng)
+                request = {
+                    "url": f"{host}{_fill(template, rng)}{query}",
+                    "method": method,
+                }
+                if body is not None and rng.random() < body_rate:
+                    encoded = json.dumps(body)
+                    if method in ("POST", "PUT"):
+                        request["request_body"] = encoded
+                    request["response_body"] = encoded
+            request["status"] = rng.choices(
+                (200, 201, 304, 404, 500), (80, 6, 8, 4, 2)
+            )[0]
+            request["response_time"] = round(rng.lognormvariate(4.5, 0.6), 1)
+            request["timestamp"] = burst.isoformat()
+            requests.append(request)
+
+    return requests, logs
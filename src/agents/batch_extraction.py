@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Batch endpoint extraction for large network captures.
+
+Requests are grouped by URL shape, the URL with every ASCII digit replaced
+by "0", computed in bulk with a single bytes translation. URLs of the same
+shape split into the same components at the same offsets, and differ only
+in digits. Those digits usually sit in identifier segments or query values,
+which don't affect the endpoint. Only positions where a digit does matter
+(a port, a literal such as "v2", a query key) are compared per request, and
+each resulting group is parsed once.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+from src.agents.route_inference import classify_segment
+from src.agents.schema_inference import EndpointBodies
+
+_DIGITS_TO_ZERO = bytes.maketrans(b"0123456789", b"0000000000")
+_SEPARATOR = "\x00"
+
+Span = Tuple[int, int]
+
+
+def url_shapes(urls: Sequence[str]) -> List[str]:
+    """
+    Replace every ASCII digit in each URL with "0".
+
+    Args:
+        urls: URL strings
+
+    Returns:
+        Shape of each URL, same length as the URL
+    """
+    joined = _SEPARATOR.join(urls)
+    shapes = _shape(joined).split(_SEPARATOR)
+    if len(shapes) != len(urls):
+        # A URL contains the separator itself
+        shapes = [_shape(url) for url in urls]
+    return shapes
+
+
+def _shape(text: str) -> str:
+    """Replace every ASCII digit in text with "0"."""
+    encoded = text.encode("utf-8", "surrogatepass")
+    return encoded.translate(_DIGITS_TO_ZERO).decode("utf-8", "surrogatepass")
+
+
+def digit_sensitive_spans(shape: str) -> Optional[List[Span]]:
+    """
+    Find the parts of a URL shape where the actual digits change the endpoint.
+
+    Args:
+        shape: URL shape from url_shapes()
+
+    Returns:
+        Spans to compare between URLs of this shape. Returns None if the shape
+        can't be mapped to offsets (e.g. stripped whitespace), in which case
+        every distinct URL is parsed on its own.
+    """
+    if "0" not in shape:
+        return []
+
+    parsed = urlparse(shape)
+    offset = 0
+    spans: List[Span] = []
+
+    if parsed.scheme:
+        offset = len(parsed.scheme) + 1
+        if shape[: offset - 1].lower() != parsed.scheme:
+            return None
+        if "0" in parsed.scheme:
+            spans.append((0, offset - 1))
+
+    if shape[offset : offset + 2] == "//":
+        offset += 2
+        end = offset + len(parsed.netloc)
+        if shape[offset:end] != parsed.netloc:
+            return None
+        if "0" in parsed.netloc:
+            spans.append((offset, end))
+        offset = end
+
+    end = offset + len(parsed.path)
+    if shape[offset:end] != parsed.path:
+        return None
+    for segment in parsed.path.split("/"):
+        if "0" in segment:
+            placeholder = classify_segment(segment)
+            # Typed segments classify the same whatever their digits are
+            if placeholder is None or placeholder == segment:
+                spans.append((offset, offset + len(segment)))
+        offset += len(segment) + 1
+
+    if parsed.query:
+        start = shape.find("?", end) + 1
+        if shape[start : start + len(parsed.query)] != parsed.query:
+            return None
+        for pair in parsed.query.split("&"):
+            name, has_value, _ = pair.partition("=")
+            if has_value and "0" in name:
+                spans.append((start, start + len(name)))
+            start += len(pair) + 1
+
+    return spans
+
+
+def group_urls(urls: Sequence[str]) -> Tuple[np.ndarray, List[int]]:
+    """
+    Group URLs that map to the same endpoint components.
+
+    Args:
+        urls: URL strings
+
+    Returns:
+        Tuple of (group code per URL, index of each group's first URL);
+        groups are numbered in first-seen order
+    """
+    shape_codes, shapes = pd.factorize(np.asarray(url_shapes(urls), dtype=object))
+
+    spans = [digit_sensitive_spans(shape) for shape in shapes]
+    group_codes = shape_codes.copy()
+
+    sensitive = [code for code, shape_spans in enumerate(spans) if shape_spans != []]
+    if sensitive:
+        # Split shapes whose digits matter by the digits that matter
+        keys = np.empty(len(urls), dtype=object)
+        keys[:] = None
+        rows_by_shape = pd.Series(np.arange(len(urls))).groupby(shape_codes).indices
+        for code in sensitive:
+            shape_spans = spans[code]
+            for row in rows_by_shape[code]:
+                url = urls[row]
+                keys[row] = (
+                    url
+                    if shape_spans is None
+                    else tuple(url[a:b] for a, b in shape_spans)
+                )
+        combined = pd.Series(list(zip(shape_codes.tolist(), keys.tolist())))
+        group_codes, _ = pd.factorize(combined)
+
+    return group_codes, first_occurrences(group_codes).tolist()
+
+
+def first_occurrences(codes: np.ndarray) -> np.ndarray:
+    """
+    Find the first position of each code.
+
+    Args:
+        codes: Codes 0..k-1 numbered in first-seen order, as from pd.factorize
+
+    Returns:
+        Array whose i-th entry is the first position of code i
+    """
+    first = np.empty(int(codes.max()) + 1 if len(codes) else 0, dtype=np.int64)
+    # Writing in reverse leaves the earliest position for each code
+    first[codes[::-1]] = np.arange(len(codes) - 1, -1, -1)
+    return first
+
+
+def _repeat_visits(
+    group_codes: np.ndarray, first_rows: List[int]
+) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Count the requests repeating a group between one new group and the next.
+
+    Args:
+        group_codes: Group code of each request, from group_urls
+        first_rows: Index of each group's first request
+
+    Returns:
+        Tuple of (group, request count) lists per run of repeats, and for
+        each new group the end of the runs that follow it before the next
+    """
+    groups = len(first_rows)
+    is_first = np.zeros(len(group_codes), dtype=bool)
+    is_first[first_rows] = True
+    since = np.cumsum(is_first) - 1
+    repeats = np.flatnonzero(~is_first)
+    run_codes, runs = pd.factorize(
+        since[repeats].astype(np.int64) * groups + group_codes[repeats]
+    )
+    # Runs are numbered in request order, so by the new group they follow
+    ends = np.searchsorted(runs // groups, np.arange(1, groups + 1))
+    return (
+        (runs % groups).tolist(),
+        np.bincount(run_codes, minlength=len(runs)).tolist(),
+        ends.tolist(),
+    )
+
+
+def _analyzed_columns(
+    requests: Sequence[Dict],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """URL and method of every request, and which requests are analyzed."""
+    if hasattr(requests, "column"):
+        urls_all = requests.column("url")
+        methods_all = requests.column("method")
+    else:
+        urls_all = np.empty(len(requests), dtype=object)
+        methods_all = np.empty(len(requests), dtype=object)
+        urls_all[:] = [request.get("url", "") for request in requests]
+        methods_all[:] = [request.get("method", "") for request in requests]
+
+    # Same filter as the per-request path: a non-empty string url and a method
+    count = len(urls_all)
+    valid = np.fromiter(map(type, urls_all), dtype=object, count=count) == str
+    valid &= np.fromiter(map(bool, urls_all), dtype=bool, count=count)
+    valid &= np.fromiter(map(bool, methods_all), dtype=bool, count=count)
+    return urls_all, methods_all, valid
+
+
+def observe_routes(
+    agent: Any, urls: List[str]
+) -> Tuple[np.ndarray, List[Tuple[str, str, str]]]:
+    """
+    Teach an agent's route inference a sequence of request URLs.
+
+    Parses one URL per group and observes groups in first-seen order. Only
+    a group's first request can add to the trie; the requests repeating
+    groups before the next new one are credited to the trie as visits
+    first, which leaves route inference as observing every request would.
+
+    Args:
+        agent: PatternAnalysisAgent whose route inference learns the URLs
+        urls: URLs of the analyzed requests, in arrival order
+
+    Returns:
+        Tuple of (group code per URL, (base URL, path, query) per group)
+    """
+    group_codes, first_rows = group_urls(urls)
+    repeat_groups, repeat_counts, repeat_ends = _repeat_visits(group_codes, first_rows)
+
+    components = []
+    start = 0
+    for group, row in enumerate(first_rows):
+        base_url, path, query = agent._split_url(urls[row])
+        agent.route_engine.observe(base_url, path)
+        components.append((base_url, path, query))
+        for repeated, count in zip(
+            repeat_groups[start : repeat_ends[group]],
+            repeat_counts[start : repeat_ends[group]],
+        ):
+            agent.route_engine.observe(*components[repeated][:2], count=count)
+        start = repeat_ends[group]
+    return group_codes, components
+
+
+def learn_routes(agent: Any, requests: Sequence[Dict]) -> None:
+    """
+    Teach an agent's route inference the routes of a whole capture.
+
+    Route inference ends up as if every analyzed request had been fed
+    through agent.create_aggregator() in order.
+
+    Args:
+        agent: PatternAnalysisAgent whose route inference learns the routes
+        requests: Network requests, a list of dicts or a NetworkRequestStore
+    """
+    urls_all, _, valid = _analyzed_columns(requests)
+    rows = np.flatnonzero(valid)
+    if len(rows):
+        observe_routes(agent, urls_all[rows].tolist())
+
+
+def batch_endpoint_patterns(agent: Any, requests: Sequence[Dict]) -> List[Dict]:
+    """
+    Infer API endpoints from a full capture in bulk.
+
+    Produces the same endpoints, in the same order, as feeding every request
+    through agent.create_aggregator() and taking a snapshot, and teaches the
+    agent's route inference the same routes. Only requests with bodies are
+    visited one by one, to infer body schemas.
+
+    Args:
+        agent: PatternAnalysisAgent whose parsing rules are applied
+        requests: Network requests, a list of dicts or a NetworkRequestStore
+
+    Returns:
+        Endpoint pattern dictionaries with call counts
+    """
+    urls_all, methods_all, valid = _analyzed_columns(requests)
+    rows = np.flatnonzero(valid)
+    if len(rows) == 0:
+        return []
+
+    urls = urls_all[rows].tolist()
+    group_codes, components = observe_routes(agent, urls)
+
+    query_patterns: Dict[str, str] = {}
+    group_patterns = []
+    for base_url, path, query in components:
+        path_pattern = agent.route_engine.resolve(base_url, path)
+        if query:
+            if query not in query_patterns:
+                query_patterns[query] = agent._extract_query_pattern(query)
+            path_pattern = f"{path_pattern}?{query_patterns[query]}"
+        group_patterns.append((base_url, path_pattern))
+
+    # Endpoint key per request from its group and method
+    method_codes, methods = pd.factorize(methods_all[rows])
+    pair_codes, pairs = pd.factorize(
+        group_codes.astype(np.int64) * len(methods) + method_codes
+    )
+    pair_keys = []
+    for pair in pairs.tolist():
+        base_url, path_pattern = group_patterns[pair // len(methods)]
+        endpoint = {
+            "method": methods[pair % len(methods)],
+            "base_url": base_url,
+            "path_pattern": path_pattern,
+        }
+        pair_keys.append(agent._create_endpoint_key(endpoint))
+
+    key_codes_by_pair, keys = pd.factorize(np.asarray(pair_keys, dtype=object))
+    key_codes = key_codes_by_pair[pair_codes]
+    counts = np.bincount(key_codes, minlength=len(keys))
+    first_by_key = first_occurrences(key_codes)
+
+    # Only requests carrying bodies are materialized, in arrival order
+    bodies: Dict[int, EndpointBodies] = {}
+    if hasattr(requests, "rows_with"):
+        body_rows = requests.rows_with("request_body", "response_body")
+    else:
+        body_rows = np.fromiter(
+            (
+                i
+                for i, request in enumerate(requests)
+                if "request_body" in request or "response_body" in request
+            ),
+            dtype=np.int64,
+        )
+    body_rows = body_rows[valid[body_rows]]
+    for row, position in zip(
+        body_rows.tolist(), np.searchsorted(rows, body_rows).tolist()
+    ):
+        code = int(key_codes[position])
+        if code not in bodies:
+            bodies[code] = EndpointBodies()
+        bodies[code].add(requests[row])
+
+    endpoints = []
+    for code in np.argsort(first_by_key, kind="stable").tolist():
+        first = int(first_by_key[code])
+        base_url, path_pattern = group_patterns[int(group_codes[first])]
+        endpoint = {
+            "method": methods_all[rows[first]],
+            "base_url": base_url,
+            "path_pattern": path_pattern,
+            "original_url": urls[first],
+            "call_count": int(counts[code]),
+        }
+        if code in bodies:
+            endpoint.update(bodies[code].patterns())
+        endpoints.append(endpoint)
+    return endpoints
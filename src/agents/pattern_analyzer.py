@@ -6,15 +6,342 @@ Analyzes captured data to identify patterns in API endpoints, business logic,
 UI components, and data flow.
 """
 
-import re
-from typing import Dict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urlparse
+from src.agents.batch_extraction import batch_endpoint_patterns
+from src.agents.route_inference import RouteInferenceEngine
+from src.agents.schema_inference import EndpointBodies, has_body
 from src.workflows.state_management import ReverseEngineeringState
 
 
+class EndpointStats:
+    """Running call statistics for one endpoint pattern."""
+
+    __slots__ = (
+        "status_counts",
+        "response_time_count",
+        "response_time_total",
+        "response_time_min",
+        "response_time_max",
+        "first_seen",
+        "last_seen",
+        "first_seen_seq",
+        "last_seen_seq",
+    )
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.status_counts: Dict[Any, int] = {}
+        self.response_time_count = 0
+        self.response_time_total = 0.0
+        self.response_time_min: Optional[float] = None
+        self.response_time_max: Optional[float] = None
+        self.first_seen: Optional[str] = None
+        self.last_seen: Optional[str] = None
+        self.first_seen_seq = -1
+        self.last_seen_seq = -1
+
+    def add(self, request: Dict, seq: int = 0) -> None:
+        """
+        Fold one request into the statistics.
+
+        Args:
+            request: Network request data
+            seq: Arrival position of the request
+        """
+        status = request.get("status")
+        if status is not None:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+        response_time = request.get("response_time")
+        if isinstance(response_time, (int, float)) and not isinstance(
+            response_time, bool
+        ):
+            self.response_time_count += 1
+            self.response_time_total += response_time
+            if self.response_time_min is None or response_time < self.response_time_min:
+                self.response_time_min = response_time
+            if self.response_time_max is None or response_time > self.response_time_max:
+                self.response_time_max = response_time
+
+        timestamp = request.get("timestamp")
+        if timestamp is not None:
+            if self.first_seen is None:
+                self.first_seen = timestamp
+                self.first_seen_seq = seq
+            self.last_seen = timestamp
+            self.last_seen_seq = seq
+
+    def merge(self, other: "EndpointStats") -> None:
+        """
+        Fold another endpoint's statistics into these.
+
+        Args:
+            other: Statistics of an endpoint merged into this one
+        """
+        for status, count in other.status_counts.items():
+            self.status_counts[status] = self.status_counts.get(status, 0) + count
+
+        if other.response_time_count:
+            self.response_time_count += other.response_time_count
+            self.response_time_total += other.response_time_total
+            if self.response_time_min is None or (
+                other.response_time_min < self.response_time_min
+            ):
+                self.response_time_min = other.response_time_min
+            if self.response_time_max is None or (
+                other.response_time_max > self.response_time_max
+            ):
+                self.response_time_max = other.response_time_max
+
+        if other.first_seen is not None:
+            if self.first_seen is None or other.first_seen_seq < self.first_seen_seq:
+                self.first_seen = other.first_seen
+                self.first_seen_seq = other.first_seen_seq
+            if other.last_seen_seq > self.last_seen_seq:
+                self.last_seen = other.last_seen
+                self.last_seen_seq = other.last_seen_seq
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the statistics.
+
+        Returns:
+            Status counts, response time min/max/average and first/last seen
+        """
+        return {
+            "status_counts": dict(self.status_counts),
+            "response_time_min": self.response_time_min,
+            "response_time_max": self.response_time_max,
+            "response_time_avg": (
+                self.response_time_total / self.response_time_count
+                if self.response_time_count
+                else None
+            ),
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+        }
+
+
+class EndpointAggregator:
+    """
+    Online aggregation of network requests into API endpoint patterns.
+
+    Each observed request updates its endpoint's call count and statistics
+    in place, so the endpoint catalog is maintained as traffic arrives
+    instead of being rebuilt from the full request list. JSON request and
+    response bodies are merged into per-endpoint schemas. When route
+    inference later turns a literal path segment into a parameter, the
+    endpoints it covers are merged on the next snapshot.
+    """
+
+    def __init__(self, analyzer: Optional["PatternAnalysisAgent"] = None):
+        """
+        Initialize the aggregator.
+
+        Args:
+            analyzer: Agent whose pattern extraction rules are applied
+        """
+        self.analyzer = analyzer or PatternAnalysisAgent()
+        self.observed = 0
+        self._endpoints: Dict[str, Dict] = {}
+        self._stats: Dict[str, EndpointStats] = {}
+        self._bodies: Dict[str, EndpointBodies] = {}
+        # Arrival position of each endpoint's first request
+        self._first_seq: Dict[str, int] = {}
+        self._generation = self.analyzer.route_engine.generation
+
+    def observe(self, request: Dict, seq: Optional[int] = None) -> Optional[str]:
+        """
+        Fold one network request into the endpoint catalog.
+
+        Args:
+            request: Network request data
+            seq: Arrival position of the request in the whole capture;
+                defaults to the number of requests observed so far
+
+        Returns:
+            Key of the request's endpoint, or None if no pattern was found
+        """
+        self.observed += 1
+        if seq is None:
+            seq = self.observed
+
+        endpoint = self.analyzer._extract_endpoint_pattern(request)
+        if not endpoint:
+            return None
+
+        key = self.analyzer._create_endpoint_key(endpoint)
+        existing = self._endpoints.get(key)
+        if existing is not None:
+            # Increment call count for existing pattern
+            existing["call_count"] += 1
+        else:
+            # Add new pattern with call count
+            endpoint["call_count"] = 1
+            self._endpoints[key] = endpoint
+            self._stats[key] = EndpointStats()
+            self._first_seq[key] = seq
+
+        self._stats[key].add(request, seq)
+        if has_body(request):
+            bodies = self._bodies.get(key)
+            if bodies is None:
+                bodies = self._bodies[key] = EndpointBodies()
+            bodies.add(request)
+        return key
+
+    def observe_many(self, requests: Iterable[Dict]) -> None:
+        """
+        Fold several network requests into the endpoint catalog.
+
+        Args:
+            requests: Network requests in arrival order
+        """
+        for request in requests:
+            self.observe(request)
+
+    def snapshot(self, include_stats: bool = False) -> List[Dict]:
+        """
+        Get the current endpoint catalog.
+
+        Args:
+            include_stats: Add each endpoint's call statistics under "stats"
+
+        Returns:
+            Endpoint patterns in first-seen order, copied so later
+            observations don't change them
+        """
+        if self._generation != self.analyzer.route_engine.generation:
+            self._consolidate()
+
+        endpoints = []
+        for key, endpoint in self._endpoints.items():
+            endpoint = dict(endpoint)
+            bodies = self._bodies.get(key)
+            if bodies is not None:
+                endpoint.update(bodies.patterns())
+            if include_stats:
+                endpoint["stats"] = self._stats[key].to_dict()
+            endpoints.append(endpoint)
+        return endpoints
+
+    def __len__(self) -> int:
+        """Number of distinct endpoint patterns."""
+        if self._generation != self.analyzer.route_engine.generation:
+            self._consolidate()
+        return len(self._endpoints)
+
+    def field_count(self) -> int:
+        """
+        Count the request and response body fields discovered so far.
+
+        Returns:
+            Body schema fields summed over every endpoint
+        """
+        if self._generation != self.analyzer.route_engine.generation:
+            self._consolidate()
+        return sum(bodies.field_count() for bodies in self._bodies.values())
+
+    def merge(self, other: "EndpointAggregator") -> None:
+        """
+        Fold another aggregator's endpoints into this catalog.
+
+        Merging is associative, so aggregators of disjoint parts of a
+        capture, observed with their capture-wide seq, can be combined in
+        any grouping. Endpoints stay in first-seen order. Route inference
+        must already hold other's routes (see RouteInferenceEngine.merge).
+        other's statistics and schemas are taken over, so other must not be
+        used afterwards.
+
+        Args:
+            other: Aggregator of another part of the capture
+        """
+        for key, endpoint in other._endpoints.items():
+            endpoint = self.analyzer._refresh_endpoint_pattern(endpoint)
+            new_key = self.analyzer._create_endpoint_key(endpoint)
+            first_seq = other._first_seq[key]
+
+            existing = self._endpoints.get(new_key)
+            if existing is None:
+                self._endpoints[new_key] = endpoint
+                self._stats[new_key] = other._stats[key]
+                self._first_seq[new_key] = first_seq
+            else:
+                call_count = existing["call_count"] + endpoint["call_count"]
+                if first_seq < self._first_seq[new_key]:
+                    # The earlier member supplies original_url
+                    existing = self._endpoints[new_key] = endpoint
+                    self._first_seq[new_key] = first_seq
+                existing["call_count"] = call_count
+                self._stats[new_key].merge(other._stats[key])
+
+            if key in other._bodies:
+                if new_key in self._bodies:
+                    self._bodies[new_key].merge(other._bodies[key])
+                else:
+                    self._bodies[new_key] = other._bodies[key]
+
+        self.observed += other.observed
+        self._endpoints = dict(
+            sorted(self._endpoints.items(), key=lambda item: self._first_seq[item[0]])
+        )
+
+    def reset(self) -> None:
+        """Forget every observed request."""
+        self.observed = 0
+        self._endpoints = {}
+        self._stats = {}
+        self._bodies = {}
+        self._first_seq = {}
+        self._generation = self.analyzer.route_engine.generation
+
+    def _consolidate(self) -> None:
+        """Re-resolve endpoint patterns and merge those that now coincide."""
+        endpoints: Dict[str, Dict] = {}
+        stats: Dict[str, EndpointStats] = {}
+        bodies: Dict[str, EndpointBodies] = {}
+        first_seq: Dict[str, int] = {}
+
+        # First-seen order is kept: a merged endpoint takes its earliest
+        # member's position and original_url
+        for key, endpoint in self._endpoints.items():
+            endpoint = self.analyzer._refresh_endpoint_pattern(endpoint)
+            new_key = self.analyzer._create_endpoint_key(endpoint)
+            if new_key in endpoints:
+                endpoints[new_key]["call_count"] += endpoint["call_count"]
+                stats[new_key].merge(self._stats[key])
+            else:
+                endpoints[new_key] = endpoint
+                stats[new_key] = self._stats[key]
+                first_seq[new_key] = self._first_seq[key]
+
+            if key in self._bodies:
+                if new_key in bodies:
+                    bodies[new_key].merge(self._bodies[key])
+                else:
+                    bodies[new_key] = self._bodies[key]
+
+        self._endpoints = endpoints
+        self._stats = stats
+        self._bodies = bodies
+        self._first_seq = first_seq
+        self._generation = self.analyzer.route_engine.generation
+
+
 class PatternAnalysisAgent:
     """Agent responsible for analyzing patterns in captured data."""
 
+    def __init__(self, route_engine: Optional[RouteInferenceEngine] = None):
+        """
+        Initialize the pattern analysis agent.
+
+        Args:
+            route_engine: Route inference shared by every analysis; it keeps
+                learning which path segments are parameters across calls
+        """
+        self.route_engine = route_engine or RouteInferenceEngine()
+
     def analyze_api_patterns(
         self, state: ReverseEngineeringState
     ) -> ReverseEngineeringState:
@@ -27,24 +354,11 @@ class PatternAnalysisAgent:
         Returns:
             Updated state with inferred API endpoints
         """
-        network_requests = state.get("network_requests", [])
-        endpoint_patterns = {}
-
-        for request in network_requests:
-            endpoint = self._extract_endpoint_pattern(request)
-            if endpoint:
-                key = self._create_endpoint_key(endpoint)
-
-                if key in endpoint_patterns:
-                    # Increment call count for existing pattern
-                    endpoint_patterns[key]["call_count"] += 1
-                else:
-                    # Add new pattern with call count
-                    endpoint["call_count"] = 1
-                    endpoint_patterns[key] = endpoint
+        aggregator = self.create_aggregator()
+        aggregator.observe_many(state.get("network_requests", []))
 
         # Convert to list of unique endpoints
-        endpoints = list(endpoint_patterns.values())
+        endpoints = aggregator.snapshot()
 
         # Update state with inferred endpoints
         updated_state = state.copy()
@@ -52,6 +366,40 @@ class PatternAnalysisAgent:
 
         return updated_state
 
+    def analyze_api_patterns_batch(
+        self, state: ReverseEngineeringState
+    ) -> ReverseEngineeringState:
+        """
+        Analyze a large capture of network requests in bulk.
+
+        Infers the same endpoints as analyze_api_patterns, but parses each
+        group of same-shaped URLs once instead of every request.
+
+        Args:
+            state: Current workflow state with network requests
+
+        Returns:
+            Updated state with inferred API endpoints
+        """
+        endpoints = batch_endpoint_patterns(self, state.get("network_requests", []))
+
+        updated_state = state.copy()
+        updated_state["inferred_api_endpoints"] = endpoints
+
+        return updated_state
+
+    def create_aggregator(self) -> EndpointAggregator:
+        """
+        Create an online endpoint aggregator using this agent's rules.
+
+        Feed it requests as they are captured and call snapshot() for the
+        same endpoints analyze_api_patterns would infer from the full list.
+
+        Returns:
+            Empty endpoint aggregator
+        """
+        return EndpointAggregator(self)
+
     def _extract_endpoint_pattern(self, request: Dict) -> Dict:
         """
         Extract API endpoint pattern from a single network request.
@@ -69,16 +417,15 @@ class PatternAnalysisAgent:
             return None
 
         # Parse URL to extract components
-        parsed = urlparse(url)
-        base_url = f"{parsed.scheme}://{parsed.netloc}"
-        path = parsed.path
+        base_url, path, query = self._split_url(url)
 
-        # Simple pattern detection - replace numeric IDs with {id}
-        path_pattern = re.sub(r"/\d+", "/{id}", path)
+        # Identifiers, hashes, dates and high-cardinality segments become
+        # parameters
+        path_pattern = self.route_engine.infer(base_url, path)
 
         # Handle query parameters
-        if parsed.query:
-            query_pattern = self._extract_query_pattern(parsed.query)
+        if query:
+            query_pattern = self._extract_query_pattern(query)
             path_pattern = f"{path_pattern}?{query_pattern}"
 
         return {
@@ -88,6 +435,35 @@ class PatternAnalysisAgent:
             "original_url": url,
         }
 
+    def _split_url(self, url: str) -> Tuple[str, str, str]:
+        """
+        Split a URL into the parts endpoint patterns are built from.
+
+        Args:
+            url: Request URL
+
+        Returns:
+            Tuple of (base URL, path, query string)
+        """
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}", parsed.path, parsed.query
+
+    def _refresh_endpoint_pattern(self, endpoint: Dict) -> Dict:
+        """
+        Re-resolve an endpoint's path pattern against current route inference.
+
+        Args:
+            endpoint: Endpoint pattern dictionary
+
+        Returns:
+            The endpoint, or a copy with its updated path pattern
+        """
+        path, separator, query = endpoint["path_pattern"].partition("?")
+        resolved = self.route_engine.resolve(endpoint["base_url"], path)
+        if resolved == path:
+            return endpoint
+        return {**endpoint, "path_pattern": f"{resolved}{separator}{query}"}
+
     def _extract_query_pattern(self, query_string: str) -> str:
         """
         Extract query parameter pattern from query string.
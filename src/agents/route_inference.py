@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Route inference for API endpoint patterns.
+
+Learns which URL path positions are parameters using a per-host trie of
+path segments. Segments that look like identifiers, hashes or dates become
+parameters on sight; positions that keep producing new literal values,
+relative to how often they are requested, are collapsed into a generic
+parameter.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+ID_PLACEHOLDER = "{id}"
+HASH_PLACEHOLDER = "{hash}"
+DATE_PLACEHOLDER = "{date}"
+PARAM_PLACEHOLDER = "{param}"
+
+_NUMERIC = re.compile(r"\d+")
+_UUID = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+_HEX_HASH = re.compile(r"(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{16,}")
+# base64/base64url alphabet with a digit, optionally padded
+_TOKEN = re.compile(r"(?=[\w-]*\d)[A-Za-z0-9_-]{20,}={0,2}")
+# Adjacent characters switching between lower and upper case, or letters and digits
+_CLASS_CHANGE = re.compile(r"[a-z](?=[A-Z])|[A-Za-z](?=\d)|\d(?=[A-Za-z])")
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_PLACEHOLDER = re.compile(r"\{\w+\}")
+
+
+def classify_segment(segment: str) -> Optional[str]:
+    """
+    Classify a path segment whose type alone makes it a parameter.
+
+    Args:
+        segment: One path segment (e.g., "123" or "2024-01-15")
+
+    Returns:
+        Placeholder for the segment's type, or None for plain literals
+    """
+    if _NUMERIC.fullmatch(segment) or _UUID.fullmatch(segment):
+        return ID_PLACEHOLDER
+    if _DATE.fullmatch(segment):
+        return DATE_PLACEHOLDER
+    if _HEX_HASH.fullmatch(segment) or _is_token(segment):
+        return HASH_PLACEHOLDER
+    if _PLACEHOLDER.fullmatch(segment):
+        return segment
+    return None
+
+
+def _is_token(segment: str) -> bool:
+    """
+    Whether a long segment reads as an encoded token rather than a slug.
+
+    Random base64 or base36 text changes between letters and digits, or
+    from lower to upper case, every few characters; kebab-case, snake_case
+    and CamelCase slugs do so only at their word boundaries.
+    """
+    return bool(_TOKEN.fullmatch(segment)) and (
+        5 * len(_CLASS_CHANGE.findall(segment)) >= len(segment)
+    )
+
+
+class RouteNode:
+    """One path position in the route trie."""
+
+    __slots__ = ("children", "params", "collapsed", "visits")
+
+    def __init__(self):
+        """Initialize an empty path position."""
+        self.children: Dict[str, "RouteNode"] = {}
+        self.params: Dict[str, "RouteNode"] = {}
+        self.collapsed = False
+        # Paths observed through this position to a segment after it
+        self.visits = 0
+
+
+class RouteInferenceEngine:
+    """
+    Infers parameterized path patterns from observed URLs.
+
+    Each host has a trie of path segments. Once a position has been
+    visited min_observations times, a new literal value collapses it into a
+    {param} placeholder if the position's distinct literals would exceed
+    literal_ratio of its visits, merging the literal subtrees under it. A
+    busy position with a fixed set of resources keeps them as literals,
+    while one that keeps producing new values does not; max_literals caps
+    distinct literals either way. Collapses are permanent, so a pattern
+    never splits back into literals, and the trie is capped at max_nodes
+    nodes in total, beyond which unseen literals are treated as parameters.
+
+    generation increases with every collapse; patterns returned earlier
+    only need resolve() again when it has changed.
+    """
+
+    def __init__(
+        self,
+        max_literals: int = 1000,
+        max_nodes: int = 100_000,
+        min_observations: int = 100,
+        literal_ratio: float = 0.5,
+    ):
+        """
+        Initialize the route inference engine.
+
+        Args:
+            max_literals: Distinct literal values a path position keeps, at
+                most, before it is treated as a parameter
+            max_nodes: Upper bound on trie nodes across all hosts
+            min_observations: Visits to a path position before its literal
+                cardinality is judged
+            literal_ratio: Distinct literals per visit above which a path
+                position is treated as a parameter
+        """
+        self.max_literals = max_literals
+        self.max_nodes = max_nodes
+        self.min_observations = min_observations
+        self.literal_ratio = literal_ratio
+        self.node_count = 0
+        self.generation = 0
+        self._roots: Dict[str, RouteNode] = {}
+
+    def infer(self, base_url: str, path: str) -> str:
+        """
+        Observe a URL path and return its current pattern.
+
+        Args:
+            base_url: Scheme and host of the URL
+            path: URL path (e.g., "/users/123/orders")
+
+        Returns:
+            Path pattern (e.g., "/users/{id}/orders")
+        """
+        self.observe(base_url, path)
+        return self.resolve(base_url, path)
+
+    def observe(self, base_url: str, path: str, count: int = 1) -> None:
+        """
+        Record a URL path in the host's trie.
+
+        Args:
+            base_url: Scheme and host of the URL
+            path: URL path
+            count: Times the path was requested
+        """
+        node = self._roots.get(base_url)
+        if node is None:
+            node = self._roots[base_url] = self._new_node()
+
+        for segment in path.split("/"):
+            node.visits += count
+            placeholder = classify_segment(segment)
+            if placeholder is None:
+                if not node.collapsed and segment not in node.children:
+                    if (
+                        self._overfull(node, len(node.children) + 1)
+                        or self.node_count >= self.max_nodes
+                    ):
+                        self._collapse(node)
+                    else:
+                        node.children[segment] = self._new_node()
+                if not node.collapsed:
+                    node = node.children[segment]
+                    continue
+                placeholder = PARAM_PLACEHOLDER
+
+            child = node.params.get(placeholder)
+            if child is None:
+                child = node.params[placeholder] = self._new_node()
+            node = child
+
+    def resolve(self, base_url: str, path: str) -> str:
+        """
+        Map a URL path, or a previously returned pattern, to its pattern.
+
+        Args:
+            base_url: Scheme and host of the URL
+            path: URL path or path pattern
+
+        Returns:
+            Path pattern under what the trie has learned so far
+        """
+        node = self._roots.get(base_url)
+        parts: List[str] = []
+
+        for segment in path.split("/"):
+            placeholder = classify_segment(segment)
+            if placeholder is None and node is not None:
+                if node.collapsed:
+                    placeholder = PARAM_PLACEHOLDER
+                else:
+                    node = node.children.get(segment)
+                    parts.append(segment)
+                    continue
+
+            if placeholder is None:
+                parts.append(segment)
+            else:
+                parts.append(placeholder)
+                node = node.params.get(placeholder) if node is not None else None
+
+        return "/".join(parts)
+
+    def merge(self, other: "RouteInferenceEngine") -> None:
+        """
+        Fold routes learned by another engine into this one.
+
+        Positions whose combined literals and visits pass the collapse
+        limits collapse just as if every path had been observed here, so
+        merging the engines of disjoint captures learns what one engine
+        observing all of them would, short of the max_nodes cap and of
+        positions whose literal ratio only passed literal_ratio part way
+        through the capture. other's trie is taken over and must not be used
+        afterwards.
+
+        Args:
+            other: Engine that observed another part of the capture
+        """
+        if not other._roots:
+            return
+        self.node_count += other.node_count
+        for base_url, root in other._roots.items():
+            if base_url in self._roots:
+                self._merge(self._roots[base_url], root)
+            else:
+                self._roots[base_url] = root
+        other._roots = {}
+        other.node_count = 0
+        # Patterns resolved before the merge may have changed
+        self.generation += 1
+
+    def _overfull(self, node: RouteNode, literals: int) -> bool:
+        """Whether a position with this many distinct literals is a parameter."""
+        return literals > self.max_literals or (
+            node.visits >= self.min_observations
+            and literals > self.literal_ratio * node.visits
+        )
+
+    def _new_node(self) -> RouteNode:
+        """Create a trie node, counting it against max_nodes."""
+        self.node_count += 1
+        return RouteNode()
+
+    def _collapse(self, node: RouteNode) -> None:
+        """Turn a path position into a {param}, merging its literal subtrees."""
+        self.generation += 1
+        node.collapsed = True
+        target = node.params.get(PARAM_PLACEHOLDER)
+        if target is None:
+            target = node.params[PARAM_PLACEHOLDER] = self._new_node()
+
+        children, node.children = node.children, {}
+        for child in children.values():
+            self._merge(target, child)
+
+    def _merge(self, target: RouteNode, source: RouteNode) -> None:
+        """Merge source's subtree into target."""
+        self.node_count -= 1
+        target.collapsed = target.collapsed or source.collapsed
+        target.visits += source.visits
+
+        for name, child in source.params.items():
+            if name in target.params:
+                self._merge(target.params[name], child)
+            else:
+                target.params[name] = child
+
+        for segment, child in source.children.items():
+            if target.collapsed:
+                self._merge(self._param_child(target), child)
+            elif segment in target.children:
+                self._merge(target.children[segment], child)
+            elif self._overfull(target, len(target.children) + 1):
+                self._collapse(target)
+                self._merge(self._param_child(target), child)
+            else:
+                target.children[segment] = child
+
+        if target.collapsed and target.children:
+            self._collapse(target)
+
+    def _param_child(self, node: RouteNode) -> RouteNode:
+        """The {param} child of a collapsed node."""
+        child = node.params.get(PARAM_PLACEHOLDER)
+        if child is None:
+            child = node.params[PARAM_PLACEHOLDER] = self._new_node()
+        return child
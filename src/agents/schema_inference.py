@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON body schema inference for API endpoints.
+
+Each observed request or response body is merged into a running schema of
+its endpoint: field types, which fields are optional, nested objects and
+array items, string formats, and enum candidates. Distinct values, object
+properties, nesting depth, the schema's total node count and the documents
+merged are capped, so a schema's memory stays flat however many calls are
+merged into it.
+"""
+
+import json
+import re
+from typing import Any, Dict, Optional
+
+_DATE_TIME = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?"
+)
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_UUID = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+_EMAIL = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+_URI = re.compile(r"https?://\S+")
+
+_FORMATS = (
+    ("date-time", _DATE_TIME),
+    ("date", _DATE),
+    ("uuid", _UUID),
+    ("email", _EMAIL),
+    ("uri", _URI),
+)
+
+# Format of a node whose strings don't share one
+_MIXED = ""
+
+
+def json_type(value: Any) -> str:
+    """
+    Name the JSON type of a decoded value.
+
+    Args:
+        value: Value decoded from JSON
+
+    Returns:
+        One of null, boolean, integer, number, string, array or object
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, (list, tuple)):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    return type(value).__name__
+
+
+def string_format(value: str) -> Optional[str]:
+    """
+    Recognize a well-known string format.
+
+    Args:
+        value: String field value
+
+    Returns:
+        date-time, date, uuid, email or uri, or None for free text
+    """
+    for name, pattern in _FORMATS:
+        if pattern.fullmatch(value):
+            return name
+    return None
+
+
+def parse_json_body(body: Any) -> Optional[Any]:
+    """
+    Decode a captured body if it holds a JSON object or array.
+
+    Args:
+        body: Body text, or an already decoded object or array
+
+    Returns:
+        Decoded object or array, or None if the body isn't one
+    """
+    if isinstance(body, (dict, list)):
+        return body
+    if isinstance(body, bytes):
+        try:
+            body = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+    if not isinstance(body, str):
+        return None
+
+    # Skip HTML, form data and other text without attempting a parse
+    stripped = body.lstrip()
+    if not stripped or stripped[0] not in "{[":
+        return None
+    try:
+        return json.loads(stripped)
+    except ValueError:
+        return None
+
+
+class SchemaNode:
+    """Running schema of one position in a JSON document."""
+
+    __slots__ = (
+        "count",
+        "types",
+        "object_count",
+        "properties",
+        "truncated",
+        "items",
+        "values",
+        "format",
+    )
+
+    def __init__(self):
+        """Initialize a position that hasn't been observed yet."""
+        self.count = 0
+        self.types: Dict[str, int] = {}
+        self.object_count = 0
+        self.properties: Optional[Dict[str, "SchemaNode"]] = None
+        self.truncated = False
+        self.items: Optional["SchemaNode"] = None
+        # Distinct short strings seen, or None once there are too many
+        self.values: Optional[Dict[str, None]] = {}
+        self.format: Optional[str] = None
+
+
+class SchemaInferrer:
+    """
+    Merges JSON documents into one schema.
+
+    Merging is incremental and order-independent: adding documents one at
+    a time, or merging the inferrers of disjoint subsets, gives the same
+    schema as long as the caps aren't reached. Beyond max_enum_values
+    distinct strings a field stops being an enum candidate, properties
+    past max_properties are dropped (the object is marked truncated), and
+    values nested deeper than max_depth only record their types. Once the
+    schema holds max_nodes nodes, no position gains properties or items
+    any more: objects and arrays that would need new ones are marked
+    truncated, leaving what they hold open. Documents after the first
+    max_samples added are skipped.
+    """
+
+    def __init__(
+        self,
+        max_enum_values: int = 20,
+        max_enum_length: int = 64,
+        max_properties: int = 200,
+        max_depth: int = 8,
+        max_nodes: int = 2000,
+        max_samples: int = 1000,
+    ):
+        """
+        Initialize an empty schema.
+
+        Args:
+            max_enum_values: Distinct strings a field keeps as enum candidates
+            max_enum_length: Longest string kept as an enum candidate
+            max_properties: Properties tracked per object position
+            max_depth: Nesting depth below which only types are recorded
+            max_nodes: Schema nodes kept across every position, bounding
+                id-keyed maps whose keys are new on every call
+            max_samples: Documents added before further ones are skipped
+        """
+        self.max_enum_values = max_enum_values
+        self.max_enum_length = max_enum_length
+        self.max_properties = max_properties
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.max_samples = max_samples
+        self.samples = 0
+        self.node_count = 1
+        self.root = SchemaNode()
+
+    def add(self, document: Any) -> None:
+        """
+        Merge one decoded JSON document into the schema.
+
+        Args:
+            document: Decoded JSON value
+        """
+        if self.samples >= self.max_samples:
+            return
+        self.samples += 1
+        self._add(self.root, document, 0)
+
+    def merge(self, other: "SchemaInferrer") -> None:
+        """
+        Merge another inferrer's schema into this one.
+
+        Args:
+            other: Schema of further documents of the same kind
+        """
+        self.samples += other.samples
+        self._merge(self.root, other.root, 0)
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        Describe the schema of the root document.
+
+        Returns:
+            Schema with "type" plus, where they apply, "format", "enum",
+            "properties" (each with "required"), "truncated" and "items"
+        """
+        return self._describe(self.root)
+
+    def body_pattern(self) -> Dict[str, Any]:
+        """
+        Describe the schema in the endpoint body pattern form.
+
+        Returns:
+            Field name to field schema for object documents; the full
+            schema from describe() for anything else
+        """
+        schema = self._describe(self.root)
+        if schema.get("type") == "object" and "properties" in schema:
+            return schema["properties"]
+        return schema
+
+    def _add(self, node: SchemaNode, value: Any, depth: int) -> None:
+        """Fold a value into the node for its position."""
+        kind = json_type(value)
+        node.count += 1
+        node.types[kind] = node.types.get(kind, 0) + 1
+
+        if kind == "string":
+            self._add_string(node, value)
+        elif depth >= self.max_depth:
+            return
+        elif kind == "object":
+            node.object_count += 1
+            if node.properties is None:
+                node.properties = {}
+            for name, child_value in value.items():
+                child = self._property(node, name)
+                if child is not None:
+                    self._add(child, child_value, depth + 1)
+        elif kind == "array":
+            if value and node.items is None:
+                node.items = self._new_node(node)
+                if node.items is None:
+                    return
+            for item in value:
+                self._add(node.items, item, depth + 1)
+
+    def _add_string(self, node: SchemaNode, value: str) -> None:
+        """Track the format and enum candidates of a string value."""
+        if node.format != _MIXED:
+            found = string_format(value) or _MIXED
+            if node.format is None:
+                node.format = found
+            elif node.format != found:
+                node.format = _MIXED
+
+        if node.values is not None and value not in node.values:
+            if (
+                len(value) > self.max_enum_length
+                or len(node.values) >= self.max_enum_values
+            ):
+                node.values = None
+            else:
+                node.values[value] = None
+
+    def _merge(self, target: SchemaNode, source: SchemaNode, depth: int) -> None:
+        """Fold source's schema into target's."""
+        target.count += source.count
+        for kind, count in source.types.items():
+            target.types[kind] = target.types.get(kind, 0) + count
+
+        if source.format is not None:
+            if target.format is None:
+                target.format = source.format
+            elif target.format != source.format:
+                target.format = _MIXED
+
+        if target.values is not None:
+            if source.values is None:
+                target.values = None
+            else:
+                for value in source.values:
+                    if value not in target.values:
+                        if len(target.values) >= self.max_enum_values:
+                            target.values = None
+                            break
+                        target.values[value] = None
+
+        if depth >= self.max_depth:
+            return
+
+        target.object_count += source.object_count
+        target.truncated = target.truncated or source.truncated
+        if source.properties is not None:
+            if target.properties is None:
+                target.properties = {}
+            for name, child in source.properties.items():
+                existing = self._property(target, name)
+                if existing is not None:
+                    self._merge(existing, child, depth + 1)
+
+        if source.items is not None:
+            if target.items is None:
+                target.items = self._new_node(target)
+            if target.items is not None:
+                self._merge(target.items, source.items, depth + 1)
+
+    def _property(self, node: SchemaNode, name: str) -> Optional[SchemaNode]:
+        """Node of an object property, or None once the object is full."""
+        child = node.properties.get(name)
+        if child is None:
+            if len(node.properties) >= self.max_properties:
+                node.truncated = True
+                return None
+            child = self._new_node(node)
+            if child is not None:
+                node.properties[name] = child
+        return child
+
+    def _new_node(self, parent: SchemaNode) -> Optional[SchemaNode]:
+        """Create a child schema node, or truncate parent once out of nodes."""
+        if self.node_count >= self.max_nodes:
+            parent.truncated = True
+            return None
+        self.node_count += 1
+        return SchemaNode()
+
+    def _describe(self, node: SchemaNode) -> Dict[str, Any]:
+        """Describe one position's schema."""
+        types = set(node.types)
+        if {"integer", "number"} <= types:
+            # Integers are numbers; report the wider type
+            types.discard("integer")
+        schema: Dict[str, Any] = {
+            "type": types.pop() if len(types) == 1 else sorted(types)
+        }
+
+        if node.format:
+            schema["format"] = node.format
+
+        # A field is an enum candidate when its values repeat
+        string_count = node.types.get("string", 0)
+        if node.values and 2 * len(node.values) <= string_count:
+            schema["enum"] = sorted(node.values)
+
+        if node.properties:
+            schema["properties"] = {
+                name: {
+                    **self._describe(child),
+                    "required": child.count == node.object_count,
+                }
+                for name, child in node.properties.items()
+            }
+        if node.truncated:
+            schema["truncated"] = True
+
+        if node.items is not None:
+            schema["items"] = self._describe(node.items)
+
+        return schema
+
+
+class EndpointBodies:
+    """Request and response body schemas of one endpoint."""
+
+    __slots__ = ("request", "response")
+
+    def __init__(self):
+        """Initialize empty body schemas."""
+        self.request = SchemaInferrer()
+        self.response = SchemaInferrer()
+
+    def add(self, request: Dict) -> None:
+        """
+        Merge a network request's JSON bodies into the schemas.
+
+        Response bodies are only merged for successful (2xx) responses, or
+        when the status is unknown, so error payloads don't pollute the
+        endpoint's response schema.
+
+        Args:
+            request: Network request data
+        """
+        body = parse_json_body(request.get("request_body"))
+        if body is not None:
+            self.request.add(body)
+
+        status = request.get("status")
+        if status is None or isinstance(status, int) and 200 <= status < 300:
+            body = parse_json_body(request.get("response_body"))
+            if body is not None:
+                self.response.add(body)
+
+    def merge(self, other: "EndpointBodies") -> None:
+        """
+        Merge another endpoint's body schemas into these.
+
+        Args:
+            other: Body schemas of an endpoint merged into this one
+        """
+        self.request.merge(other.request)
+        self.response.merge(other.response)
+
+    def field_count(self) -> int:
+        """
+        Count the body fields discovered so far.
+
+        Returns:
+            Schema positions below the request and response roots
+        """
+        return self.request.node_count + self.response.node_count - 2
+
+    def patterns(self) -> Dict[str, Any]:
+        """
+        Get the body patterns for an endpoint description.
+
+        Returns:
+            request_body_pattern and response_body_pattern, each present
+            only if a JSON body of that kind was seen
+        """
+        patterns = {}
+        if self.request.samples:
+            patterns["request_body_pattern"] = self.request.body_pattern()
+        if self.response.samples:
+            patterns["response_body_pattern"] = self.response.body_pattern()
+        return patterns
+
+
+def has_body(request: Dict) -> bool:
+    """
+    Check whether a network request carries a body to infer schemas from.
+
+    Args:
+        request: Network request data
+
+    Returns:
+        True if the request has a request or response body
+    """
+    return bool(request.get("request_body") or request.get("response_body"))
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Sharded multi-core endpoint analysis for very large captures.
+
+Route inference is learned once, in the parent, over the whole capture in
+arrival order: whether a path position collapses into a parameter depends
+on when its literals arrived among all of its visits, which no shard sees.
+Requests are then split into shards, by host or by a hash of the URL's path
+shape, and each shard is aggregated in its own process against the learned
+routes, so every request already gets its final pattern. Call counts,
+statistics and body schemas all merge associatively, so the merged catalog
+matches aggregating the whole capture in one process, whichever way the
+requests were sharded.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+import multiprocessing
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from src.agents.batch_extraction import learn_routes, url_shapes
+from src.agents.pattern_analyzer import EndpointAggregator, PatternAnalysisAgent
+from src.agents.route_inference import RouteInferenceEngine
+from src.workflows.capture_store import NetworkRequestStore
+
+logger = logging.getLogger(__name__)
+
+SHARD_BY = ("endpoint", "base_url")
+
+# Captures smaller than this are aggregated in-process
+MIN_PARALLEL_REQUESTS = 10_000
+
+# Shards per worker process; more, smaller shards even out skewed endpoints
+SHARDS_PER_WORKER = 4
+
+# The capture a worker process aggregates shards of, and the routes learned
+# from it, set by _set_capture
+_capture: Sequence[Dict] = ()
+_routes: Optional[RouteInferenceEngine] = None
+
+
+def _base_url(url: str) -> str:
+    """Scheme and host of a URL, without parsing it."""
+    return "/".join(url.split("/", 3)[:3])
+
+
+def _factorize(values: Sequence) -> Tuple[np.ndarray, List[str]]:
+    """Codes and distinct values of a column, "" standing in for non-strings."""
+    codes, distinct = pd.factorize(
+        np.asarray(values, dtype=object), use_na_sentinel=False
+    )
+    return codes, [value if isinstance(value, str) else "" for value in distinct]
+
+
+def _url_and_method_codes(
+    requests: Sequence[Dict],
+) -> Tuple[np.ndarray, List[str], np.ndarray, List[str]]:
+    """
+    Dictionary-encode the URL and method of every request.
+
+    A NetworkRequestStore's own URL codes are used as they are, so no
+    request is materialized.
+    """
+    if isinstance(requests, NetworkRequestStore):
+        url_codes = requests.url_codes()
+        url_values = requests.url_categories() + [""]
+        # Missing URLs (-1) index the trailing ""
+        url_codes = np.where(url_codes < 0, len(url_values) - 1, url_codes)
+        method_codes, method_values = _factorize(requests.column("method"))
+    else:
+        url_codes, url_values = _factorize([r.get("url") for r in requests])
+        method_codes, method_values = _factorize([r.get("method") for r in requests])
+    return url_codes, url_values, method_codes, method_values
+
+
+def shard_assignments(
+    requests: Sequence[Dict], shards: int, shard_by: str = "endpoint"
+) -> np.ndarray:
+    """
+    Assign every request to a shard.
+
+    Path shapes are built once per distinct URL and keys hashed once per
+    distinct host or endpoint, not per request.
+
+    Args:
+        requests: Network requests, a list of dicts or a NetworkRequestStore
+        shards: Number of shards
+        shard_by: "base_url" keeps each host in one shard; "endpoint" keys
+            by method, host and path with digits normalized, spreading a
+            single busy host over every shard
+
+    Returns:
+        Shard number of each request
+    """
+    if shard_by not in SHARD_BY:
+        raise ValueError(f"shard_by must be one of {SHARD_BY}, not {shard_by!r}")
+
+    url_codes, url_values, method_codes, method_values = _url_and_method_codes(requests)
+    if shard_by == "base_url":
+        host_codes, keys = _factorize([_base_url(url) for url in url_values])
+        codes = host_codes[url_codes]
+    else:
+        path_codes, paths = _factorize(
+            [shape.partition("?")[0] for shape in url_shapes(url_values)]
+        )
+        codes, pairs = pd.factorize(
+            path_codes[url_codes].astype(np.int64) * len(method_values) + method_codes
+        )
+        keys = [
+            f"{method_values[pair % len(method_values)]} "
+            f"{paths[pair // len(method_values)]}"
+            for pair in pairs.tolist()
+        ]
+
+    shard_by_key = np.fromiter(
+        (zlib.crc32(key.encode("utf-8", "surrogatepass")) % shards for key in keys),
+        dtype=np.int64,
+        count=len(keys),
+    )
+    return shard_by_key[codes]
+
+
+def shard_requests(
+    requests: Sequence[Dict], shards: int, shard_by: str = "endpoint"
+) -> List[np.ndarray]:
+    """
+    Split requests into shards by position.
+
+    Args:
+        requests: Network requests, a list of dicts or a NetworkRequestStore
+        shards: Number of shards
+        shard_by: Shard key, see shard_assignments
+
+    Returns:
+        Per shard, the ascending positions of its requests (counted from 1,
+        like EndpointAggregator.observe)
+    """
+    assignments = shard_assignments(requests, shards, shard_by)
+    order = np.argsort(assignments, kind="stable")
+    bounds = np.searchsorted(assignments[order], np.arange(1, shards))
+    return [rows + 1 for rows in np.split(order, bounds)]
+
+
+def aggregate_shard(
+    requests: Sequence[Dict], seqs: np.ndarray, routes: RouteInferenceEngine
+) -> EndpointAggregator:
+    """
+    Aggregate one shard against routes learned from the whole capture.
+
+    Every path the shard holds is already in the routes' trie, so
+    observing it only adds visits and never changes a pattern.
+
+    Args:
+        requests: The whole capture
+        seqs: Positions of the shard's requests from shard_requests
+        routes: Route inference that has learned the whole capture (see
+            batch_extraction.learn_routes)
+
+    Returns:
+        The shard's aggregator
+    """
+    aggregator = PatternAnalysisAgent(routes).create_aggregator()
+    for seq in seqs.tolist():
+        aggregator.observe(requests[seq - 1], seq)
+    return aggregator
+
+
+def _set_capture(requests: Sequence[Dict], routes: RouteInferenceEngine) -> None:
+    """Worker initializer: keep the capture and routes the worker's shards use."""
+    global _capture, _routes
+    _capture = requests
+    _routes = routes
+
+
+def _aggregate_worker_shard(seqs: np.ndarray) -> EndpointAggregator:
+    """Aggregate a shard of the capture set by _set_capture."""
+    aggregator = aggregate_shard(_capture, seqs, _routes)
+    # The parent holds the routes already; don't send the trie back
+    aggregator.analyzer = PatternAnalysisAgent()
+    return aggregator
+
+
+def merge_aggregators(
+    agent: PatternAnalysisAgent, aggregators: Iterable[EndpointAggregator]
+) -> EndpointAggregator:
+    """
+    Merge shard aggregators into one catalog under the agent's routes.
+
+    Routes the shards' own route inference learned are merged into the
+    agent's first, so every shard endpoint resolves to its capture-wide
+    pattern. Shards aggregated against routes learned from the whole
+    capture bring none.
+
+    Args:
+        agent: Agent whose route inference learns the shards' routes
+        aggregators: Shard aggregators; they are consumed
+
+    Returns:
+        Aggregator holding every shard's endpoints
+    """
+    aggregators = list(aggregators)
+    for aggregator in aggregators:
+        agent.route_engine.merge(aggregator.analyzer.route_engine)
+
+    merged = agent.create_aggregator()
+    for aggregator in aggregators:
+        merged.merge(aggregator)
+    return merged
+
+
+def sharded_endpoint_patterns(
+    agent: PatternAnalysisAgent,
+    requests: Sequence[Dict],
+    workers: Optional[int] = None,
+    shard_by: str = "endpoint",
+    include_stats: bool = False,
+) -> List[Dict]:
+    """
+    Infer API endpoints from a capture using several processes.
+
+    Produces the same endpoints, in the same order, as feeding every request
+    through agent.create_aggregator() and taking a snapshot (response time
+    averages may differ in the last bits, being summed in another order,
+    and body schemas of endpoints past the schema sample cap are built from
+    other samples), and teaches the agent's route inference the same routes.
+    The routes are learned in this process before the shards are
+    dispatched, one parse per distinct URL shape.
+
+    Args:
+        agent: PatternAnalysisAgent whose route inference is applied
+        requests: Network requests, a list of dicts or a NetworkRequestStore
+        workers: Worker processes (defaults to the CPU count)
+        shard_by: "endpoint" or "base_url", see shard_assignments
+        include_stats: Add each endpoint's call statistics under "stats"
+
+    Returns:
+        Endpoint pattern dictionaries with call counts
+    """
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(requests) < MIN_PARALLEL_REQUESTS:
+        aggregator = agent.create_aggregator()
+        aggregator.observe_many(requests)
+        return aggregator.snapshot(include_stats=include_stats)
+
+    shards = [
+        seqs
+        for seqs in shard_requests(requests, workers * SHARDS_PER_WORKER, shard_by)
+        if len(seqs)
+    ]
+    logger.info(
+        f"Analyzing {len(requests)} requests in {len(shards)} shards on "
+        f"{workers} processes (largest {max(len(seqs) for seqs in shards)})"
+    )
+    learn_routes(agent, requests)
+
+    # Workers get the capture and routes once, as they start; shards only
+    # carry row positions. Forked workers inherit them without pickling.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=_worker_context(),
+        initializer=_set_capture,
+        initargs=(requests, agent.route_engine),
+    ) as pool:
+        aggregators = list(pool.map(_aggregate_worker_shard, shards))
+
+    return merge_aggregators(agent, aggregators).snapshot(include_stats=include_stats)
+
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    """Fork where the platform can, so workers share the parent's capture."""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
@@ -0,0 +1,135 @@
+"""
+Authenticated storage-state cache for Playwright MCP
+
+Persists the cookies and local storage captured after a login, keyed by
+credential and origin, so new browser sessions can start already
+authenticated instead of repeating the login round-trips.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StorageStateCache:
+    """
+    On-disk cache of Playwright storage states with expiry.
+
+    Entries are JSON files named by a hash of (credential_id, origin). An
+    entry expires after ttl seconds or when its earliest cookie expires,
+    whichever comes first.
+    """
+
+    def __init__(self, directory: Union[str, Path], ttl: float = 3600.0):
+        """
+        Initialize the storage-state cache.
+
+        Args:
+            directory: Directory holding cached storage states
+            ttl: Maximum seconds a cached storage state is reused
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+    def load(self, credential_id: str, origin: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached storage state if it is still valid.
+
+        Args:
+            credential_id: Identifier of the login credential
+            origin: Origin the credential authenticates against
+
+        Returns:
+            Playwright storage state, or None if missing, expired or unreadable
+        """
+        path = self._path(credential_id, origin)
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.error(f"Discarding unreadable storage state {path}: {str(e)}")
+            self._remove(path)
+            return None
+
+        if entry.get("expires_at", 0) <= time.time():
+            logger.info(f"Cached storage state expired for {credential_id}@{origin}")
+            self._remove(path)
+            return None
+
+        return entry["storage_state"]
+
+    def save(
+        self, credential_id: str, origin: str, storage_state: Dict[str, Any]
+    ) -> None:
+        """
+        Cache a storage state captured after a successful login.
+
+        Args:
+            credential_id: Identifier of the login credential
+            origin: Origin the credential authenticates against
+            storage_state: Playwright storage state (cookies and origins)
+        """
+        now = time.time()
+        expires_at = now + self.ttl
+
+        # Don't outlive the session cookies themselves
+        cookie_expiries = [
+            cookie["expires"]
+            for cookie in storage_state.get("cookies", [])
+            if cookie.get("expires", -1) > 0
+        ]
+        if cookie_expiries:
+            expires_at = min(expires_at, min(cookie_expiries))
+
+        entry = {
+            "credential_id": credential_id,
+            "origin": origin,
+            "saved_at": now,
+            "expires_at": expires_at,
+            "storage_state": storage_state,
+        }
+
+        # Write atomically so concurrent journeys never read a partial file
+        path = self._path(credential_id, origin)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except Exception:
+            self._remove(Path(tmp_path))
+            raise
+
+    def invalidate(self, credential_id: str, origin: str) -> None:
+        """
+        Drop a cached storage state, e.g. after the server rejected it.
+
+        Args:
+            credential_id: Identifier of the login credential
+            origin: Origin the credential authenticates against
+        """
+        self._remove(self._path(credential_id, origin))
+
+    def _path(self, credential_id: str, origin: str) -> Path:
+        """File holding the storage state for a credential and origin."""
+        digest = hashlib.sha256(f"{credential_id}\0{origin}".encode("utf-8"))
+        return self.directory / f"{digest.hexdigest()}.json"
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        """Delete a file if it exists."""
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,258 @@
+"""
+Compact capture event records for Playwright MCP
+
+Audit log entries, network requests and DOM changes are held by the client as
+``__slots__`` records stamped with integer epoch nanoseconds, instead of
+one dict per event with a freshly formatted ISO-8601 string. They are
+converted to the usual capture dicts only when they leave the client; the
+dicts keep the nanoseconds under ``timestamp_ns`` next to the ISO string, so
+correlation never has to parse the string back.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import time
+
+_NS_PER_SECOND = 1_000_000_000
+
+
+def now_ns() -> int:
+    """Current time as integer nanoseconds since the epoch."""
+    return time.time_ns()
+
+
+def format_timestamp_ns(timestamp_ns: int) -> str:
+    """
+    Format epoch nanoseconds like datetime.now().isoformat().
+
+    Args:
+        timestamp_ns: Nanoseconds since the epoch
+
+    Returns:
+        Naive local ISO-8601 timestamp with microsecond precision
+    """
+    seconds, nanoseconds = divmod(timestamp_ns, _NS_PER_SECOND)
+    return (
+        datetime.fromtimestamp(seconds)
+        .replace(microsecond=nanoseconds // 1000)
+        .isoformat()
+    )
+
+
+class AuditEvent:
+    """One browser action in the audit log."""
+
+    __slots__ = (
+        "action",
+        "timestamp_ns",
+        "success",
+        "url",
+        "element",
+        "selector",
+        "instruction",
+        "total_steps",
+        "completed_steps",
+        "error",
+    )
+
+    # Optional fields, included in to_dict() only when set
+    OPTIONAL_FIELDS = __slots__[3:]
+
+    def __init__(
+        self,
+        action: str,
+        timestamp_ns: int,
+        success: bool,
+        url: Optional[str] = None,
+        element: Optional[str] = None,
+        selector: Optional[str] = None,
+        instruction: Optional[str] = None,
+        total_steps: Optional[int] = None,
+        completed_steps: Optional[int] = None,
+        error: Optional[str] = None,
+    ):
+        """
+        Initialize an audit event.
+
+        Args:
+            action: Action name (e.g., "navigate", "click")
+            timestamp_ns: When the action happened, in epoch nanoseconds
+            success: Whether the action succeeded
+            url: Navigated URL
+            element: Human-readable description of the clicked element
+            selector: Selector of the clicked element
+            instruction: Natural language instruction that was executed
+            total_steps: Steps in a user journey
+            completed_steps: Journey steps that were executed
+            error: Error message of a failed action
+        """
+        self.action = action
+        self.timestamp_ns = timestamp_ns
+        self.success = success
+        self.url = url
+        self.element = element
+        self.selector = selector
+        self.instruction = instruction
+        self.total_steps = total_steps
+        self.completed_steps = completed_steps
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the audit log dict shape.
+
+        Returns:
+            Audit log entry with ISO-8601 and epoch nanosecond timestamps
+        """
+        entry: Dict[str, Any] = {"action": self.action}
+        for name in self.OPTIONAL_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                entry[name] = value
+        entry["timestamp"] = format_timestamp_ns(self.timestamp_ns)
+        entry["timestamp_ns"] = self.timestamp_ns
+        entry["success"] = self.success
+        return entry
+
+
+class NetworkEvent:
+    """One captured network request."""
+
+    __slots__ = (
+        "url",
+        "method",
+        "status",
+        "response_time",
+        "timestamp_ns",
+        "request_type",
+    )
+
+    def __init__(
+        self,
+        url: str,
+        method: str,
+        status: int,
+        response_time: float,
+        timestamp_ns: int,
+        request_type: Optional[str] = None,
+    ):
+        """
+        Initialize a network event.
+
+        Args:
+            url: Request URL
+            method: HTTP method
+            status: Response status code
+            response_time: Response time in milliseconds
+            timestamp_ns: When the request was sent, in epoch nanoseconds
+            request_type: Kind of request (e.g., "navigation")
+        """
+        self.url = url
+        self.method = method
+        self.status = status
+        self.response_time = response_time
+        self.timestamp_ns = timestamp_ns
+        self.request_type = request_type
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the network request dict shape.
+
+        Returns:
+            Network request with ISO-8601 and epoch nanosecond timestamps
+        """
+        entry = {
+            "url": self.url,
+            "method": self.method,
+            "status": self.status,
+            "response_time": self.response_time,
+            "timestamp": format_timestamp_ns(self.timestamp_ns),
+            "timestamp_ns": self.timestamp_ns,
+        }
+        if self.request_type is not None:
+            entry["request_type"] = self.request_type
+        return entry
+
+
+class DomChangeEvent:
+    """One page's DOM change, as recorded by DomCapture."""
+
+    __slots__ = (
+        "kind",
+        "page",
+        "action",
+        "timestamp_ns",
+        "root",
+        "base",
+        "ops",
+        "nodes",
+    )
+
+    def __init__(
+        self,
+        kind: str,
+        page: str,
+        action: str,
+        timestamp_ns: int,
+        root: str,
+        nodes: Dict[str, List[Any]],
+        base: Optional[str] = None,
+        ops: Optional[List[Dict[str, Any]]] = None,
+    ):
+        """
+        Initialize a DOM change event.
+
+        Args:
+            kind: "baseline" for a page's first snapshot, otherwise "diff"
+            page: Page the snapshot was taken on
+            action: Browser action that preceded the snapshot
+            timestamp_ns: When the snapshot was taken, in epoch nanoseconds
+            root: Content hash of the page's new DOM tree
+            nodes: DOM nodes first seen in this snapshot, by content hash
+            base: Content hash of the page's previous DOM tree (diffs only)
+            ops: Structural edits turning the base tree into the new one
+                (diffs only)
+        """
+        self.kind = kind
+        self.page = page
+        self.action = action
+        self.timestamp_ns = timestamp_ns
+        self.root = root
+        self.nodes = nodes
+        self.base = base
+        self.ops = ops
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the DOM change dict shape.
+
+        Returns:
+            DOM change with ISO-8601 and epoch nanosecond timestamps
+        """
+        entry = {
+            "type": self.kind,
+            "page": self.page,
+            "action": self.action,
+            "root": self.root,
+        }
+        if self.base is not None:
+            entry["base"] = self.base
+            entry["ops"] = self.ops
+        entry["nodes"] = self.nodes
+        entry["timestamp"] = format_timestamp_ns(self.timestamp_ns)
+        entry["timestamp_ns"] = self.timestamp_ns
+        return entry
+
+
+def event_dict(entry: Any) -> Dict[str, Any]:
+    """
+    Convert a captured entry to its dict shape.
+
+    Args:
+        entry: Event record, or an entry that is already a dict
+
+    Returns:
+        Capture dict
+    """
+    to_dict = getattr(entry, "to_dict", None)
+    return to_dict() if to_dict is not None else entry
@@ -0,0 +1,220 @@
+"""
+Spill-to-disk capture journal for Playwright capture buffers
+
+Keeps the most recent capture entries in memory and moves older ones to an
+append-only JSON-lines file, read back through a memory map. Readers see a
+single sequence and never need to know where an entry lives.
+"""
+
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+import json
+import logging
+import mmap
+import os
+import tempfile
+import weakref
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HIGH_WATER = 10_000
+
+
+class CaptureJournal(Sequence):
+    """
+    Append-only sequence of capture entries with a bounded memory footprint.
+
+    Once more than high_water entries are held in memory, the older half is
+    spilled to a journal file as JSON lines; only an 8-byte offset per
+    spilled entry stays in memory. Spilled entries are decoded on access, so
+    they come back in their JSON form: event records as their to_dict(),
+    tuples as lists and other non-JSON values as strings.
+
+    The journal file is private to the instance and deleted when the
+    journal is cleared, closed or garbage collected.
+    """
+
+    def __init__(
+        self,
+        high_water: Optional[int] = DEFAULT_HIGH_WATER,
+        directory: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Initialize the journal.
+
+        Args:
+            high_water: Entries kept in memory before older ones spill to
+                disk; None keeps everything in memory
+            directory: Directory for the journal file (system temp if None)
+        """
+        self.high_water = high_water
+        self.directory = directory
+        self._recent: List[Dict[str, Any]] = []
+        self._offsets = array("q", [0])
+        self._fd: Optional[int] = None
+        self._path: Optional[str] = None
+        self._map: Optional[mmap.mmap] = None
+        # Open maps of the file, closed with it by the finalizer
+        self._maps: List[mmap.mmap] = []
+        self._finalizer: Optional[weakref.finalize] = None
+
+    @property
+    def spilled(self) -> int:
+        """Number of entries held on disk."""
+        return len(self._offsets) - 1
+
+    def __len__(self) -> int:
+        """Total number of entries."""
+        return self.spilled + len(self._recent)
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Get one entry, or a list of entries for a slice.
+
+        Args:
+            index: Entry position or slice
+
+        Returns:
+            Entry, or list of entries
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                # Only the spilled part of the range is read from disk
+                spilled = self.spilled
+                entries = [self._read(i) for i in range(start, min(stop, spilled))]
+                entries.extend(
+                    self._recent[max(start - spilled, 0) : max(stop - spilled, 0)]
+                )
+                return entries
+            return [self[i] for i in range(start, stop, step)]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("capture journal index out of range")
+        if index < self.spilled:
+            return self._read(index)
+        return self._recent[index - self.spilled]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over every entry, oldest first."""
+        for i in range(self.spilled):
+            yield self._read(i)
+        yield from list(self._recent)
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare with another sequence of entries."""
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """Short representation showing where entries are held."""
+        return f"CaptureJournal({len(self)} entries, {self.spilled} spilled to disk)"
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """
+        Add an entry, spilling older entries if over the high-water mark.
+
+        Args:
+            entry: Capture entry
+        """
+        self._recent.append(entry)
+        if self.high_water is not None and len(self._recent) > self.high_water:
+            self._spill(len(self._recent) - self.high_water // 2)
+
+    def extend(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """
+        Add several entries.
+
+        Args:
+            entries: Capture entries in order
+        """
+        for entry in entries:
+            self.append(entry)
+
+    def copy(self) -> List[Dict[str, Any]]:
+        """
+        Materialize every entry.
+
+        Returns:
+            List of all entries, oldest first
+        """
+        return self[:]
+
+    def clear(self) -> None:
+        """Remove every entry and delete the journal file."""
+        self.close()
+        self._recent = []
+
+    def close(self) -> None:
+        """Delete the journal file, discarding the spilled entries."""
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        self._fd = self._path = self._map = None
+        self._maps = []
+        self._offsets = array("q", [0])
+
+    def _spill(self, count: int) -> None:
+        """Move the oldest count in-memory entries to the journal file."""
+        if self._fd is None:
+            self._open()
+
+        lines = []
+        position = self._offsets[-1]
+        for entry in self._recent[:count]:
+            line = json.dumps(entry, default=_encode, separators=(",", ":")).encode()
+            lines.append(line + b"\n")
+            position += len(lines[-1])
+            self._offsets.append(position)
+
+        os.write(self._fd, b"".join(lines))
+        del self._recent[:count]
+        logger.debug(f"Spilled {count} capture entries to {self._path}")
+
+    def _open(self) -> None:
+        """Create the journal file."""
+        self._fd, self._path = tempfile.mkstemp(
+            prefix="capture-", suffix=".jsonl", dir=self.directory
+        )
+        self._finalizer = weakref.finalize(
+            self, _release, self._fd, self._path, self._maps
+        )
+
+    def _read(self, index: int) -> Dict[str, Any]:
+        """Decode spilled entry index."""
+        end = self._offsets[index + 1]
+        if self._map is None or len(self._map) < end:
+            # The file grew past the current map: map it again
+            if self._map is not None:
+                self._map.close()
+                self._maps.remove(self._map)
+            self._map = mmap.mmap(self._fd, 0, access=mmap.ACCESS_READ)
+            self._maps.append(self._map)
+        return json.loads(self._map[self._offsets[index] : end])
+
+
+def _encode(value: Any) -> Any:
+    """JSON form of a value json can't encode directly."""
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if to_dict is not None else str(value)
+
+
+def _release(fd: int, path: str, maps: List[mmap.mmap]) -> None:
+    """Close and delete a journal file."""
+    for memory_map in maps:
+        memory_map.close()
+    maps.clear()
+    os.close(fd)
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
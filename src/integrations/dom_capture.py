@@ -0,0 +1,484 @@
+"""
+Diff-compressed DOM change capture
+
+A full DOM snapshot after every browser action would dwarf every other
+capture on heavy legacy pages. Instead, every snapshot is interned into a
+content-addressed store of DOM nodes: a node's hash covers its tag,
+attributes, text and its children's hashes, so identical subtrees (within a
+page, across pages and across actions) are stored once. The first snapshot
+of a page is recorded as a baseline carrying the nodes the session had not
+seen before; later ones as a structural diff against the page's previous
+tree, carrying only the new subtrees the diff inserts. A diff's changed
+ancestors are not shipped: applying its ops to the base tree derives them.
+Event size therefore follows what changed, not the size of the page, and
+the event stream alone rebuilds every tree.
+
+Nodes are carried in events as [tag, attrs, text, child hashes].
+"""
+
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+import hashlib
+import sys
+
+from src.integrations.capture_events import DomChangeEvent, now_ns
+
+# (tag, sorted attribute items, text, child hashes)
+NodeRecord = Tuple[str, Tuple[Tuple[str, Any], ...], Optional[str], Tuple[str, ...]]
+
+
+def page_key(url: Optional[str]) -> str:
+    """
+    Identify the page a URL shows, ignoring its query and fragment.
+
+    Args:
+        url: Page URL
+
+    Returns:
+        Scheme, host and path of the URL
+    """
+    parts = urlsplit(url or "")
+    return (
+        f"{parts.scheme}://{parts.netloc}{parts.path}" if parts.netloc else parts.path
+    )
+
+
+class SubtreeStore:
+    """
+    Content-addressed store of DOM nodes.
+
+    Hashes are also kept by node record, so interning a snapshot only hashes
+    the nodes the store has not seen.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._nodes: Dict[str, NodeRecord] = {}
+        self._digests: Dict[NodeRecord, str] = {}
+
+    def intern(self, dom: Dict[str, Any]) -> Tuple[str, Set[str]]:
+        """
+        Add a DOM tree to the store.
+
+        Args:
+            dom: DOM tree from PlaywrightMCPClient.snapshot_page
+
+        Returns:
+            Tuple of (the tree's content hash, hashes of the nodes that were
+            new to the store)
+        """
+        added: Set[str] = set()
+        digests: Dict[int, str] = {}
+        for node in post_order(dom):
+            digest, new = self._put(
+                (
+                    sys.intern(str(node.get("tag", ""))),
+                    tuple(sorted((node.get("attrs") or {}).items())),
+                    node.get("text"),
+                    tuple(digests[id(child)] for child in node.get("children") or ()),
+                )
+            )
+            if new:
+                added.add(digest)
+            digests[id(node)] = digest
+        return digests[id(dom)], added
+
+    def nodes(self, digests: Iterable[str]) -> Dict[str, List[Any]]:
+        """
+        Get stored nodes in event form.
+
+        Args:
+            digests: Hashes of the nodes
+
+        Returns:
+            Nodes by content hash
+        """
+        nodes = {}
+        for digest in digests:
+            tag, attrs, text, children = self._nodes[digest]
+            nodes[digest] = [tag, dict(attrs), text, list(children)]
+        return nodes
+
+    def subtree(self, digests: Iterable[str]) -> Set[str]:
+        """
+        Collect stored subtrees.
+
+        Args:
+            digests: Hashes of the subtrees' roots
+
+        Returns:
+            Hashes of the roots and of every node below them
+        """
+        found: Set[str] = set()
+        stack = list(digests)
+        while stack:
+            digest = stack.pop()
+            if digest not in found:
+                found.add(digest)
+                stack.extend(self._nodes[digest][3])
+        return found
+
+    def add(self, nodes: Dict[str, List[Any]]) -> None:
+        """
+        Add nodes in event form, e.g. those of a recorded DOM change.
+
+        Args:
+            nodes: Nodes by content hash
+        """
+        for digest, (tag, attrs, text, children) in nodes.items():
+            if digest in self._nodes:
+                continue
+            record = (
+                sys.intern(tag),
+                tuple(sorted(attrs.items())),
+                text,
+                tuple(children),
+            )
+            self._nodes[digest] = record
+            try:
+                self._digests.setdefault(record, digest)
+            except TypeError:
+                pass
+
+    def load(self, events: Iterable[Dict[str, Any]]) -> None:
+        """
+        Add the trees of captured DOM change events.
+
+        Args:
+            events: DOM change dicts in capture order, e.g. a state's
+                dom_changes
+        """
+        for event in events:
+            self.add(event.get("nodes") or {})
+            if event.get("type") != "diff":
+                continue
+            root = self.apply(event["base"], event["ops"])
+            if root != event["root"]:
+                raise ValueError(
+                    f"DOM diff on {event.get('page')} does not rebuild its tree"
+                )
+
+    def tree(self, digest: str) -> Dict[str, Any]:
+        """
+        Rebuild a DOM tree from the store.
+
+        Args:
+            digest: Content hash of the tree's root
+
+        Returns:
+            DOM tree in snapshot_page form
+        """
+        root = self._node_dict(digest)
+        stack = [(root, self._nodes[digest][3])]
+        while stack:
+            parent, children = stack.pop()
+            for child in children:
+                node = self._node_dict(child)
+                parent["children"].append(node)
+                stack.append((node, self._nodes[child][3]))
+        return root
+
+    def diff(self, old: str, new: str) -> List[Dict[str, Any]]:
+        """
+        Compute the structural edits turning one stored tree into another.
+
+        Subtrees with equal hashes are skipped without being visited. Ops
+        address nodes by child index paths in the new tree and apply in
+        order (see apply):
+
+        * {"op": "set", "path", "node"} replaces a node by a stored subtree
+        * {"op": "update", "path", "attrs", "removed_attrs", "text"}
+          changes a node's own attributes or text (only changed keys given)
+        * {"op": "splice", "path", "index", "remove", "insert"} replaces
+          remove children at index by the stored subtrees in insert
+
+        Args:
+            old: Content hash of the base tree
+            new: Content hash of the new tree
+
+        Returns:
+            Ops, empty if the trees are equal
+        """
+        ops: List[Dict[str, Any]] = []
+        stack: List[Tuple[str, str, List[int]]] = [(old, new, [])]
+        while stack:
+            old, new, path = stack.pop()
+            if old == new:
+                continue
+            old_tag, old_attrs, old_text, old_children = self._nodes[old]
+            new_tag, new_attrs, new_text, new_children = self._nodes[new]
+            if old_tag != new_tag:
+                ops.append({"op": "set", "path": path, "node": new})
+                continue
+
+            update: Dict[str, Any] = {}
+            if old_attrs != new_attrs:
+                before, after = dict(old_attrs), dict(new_attrs)
+                changed = {
+                    k: v for k, v in after.items() if k not in before or before[k] != v
+                }
+                removed = [k for k in before if k not in after]
+                if changed:
+                    update["attrs"] = changed
+                if removed:
+                    update["removed_attrs"] = removed
+            if old_text != new_text:
+                update["text"] = new_text
+            if update:
+                ops.append({"op": "update", "path": path, **update})
+
+            if old_children == new_children:
+                continue
+            pairs = []
+            matcher = SequenceMatcher(None, old_children, new_children, autojunk=False)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                if tag == "equal":
+                    continue
+                if tag == "replace" and i2 - i1 == j2 - j1:
+                    # As many children as before: edit each in place
+                    pairs.extend(
+                        (old_children[i1 + k], new_children[j1 + k], path + [j1 + k])
+                        for k in range(i2 - i1)
+                    )
+                    continue
+                ops.append(
+                    {
+                        "op": "splice",
+                        "path": path,
+                        "index": j1,
+                        "remove": i2 - i1,
+                        "insert": list(new_children[j1:j2]),
+                    }
+                )
+            # Children's ops follow all of this node's splices
+            stack.extend(reversed(pairs))
+        return ops
+
+    def apply(self, root: str, ops: List[Dict[str, Any]]) -> str:
+        """
+        Apply the ops of a DOM diff to a stored tree.
+
+        Nodes on the ops' paths are edited as copies and stored once every
+        op is applied, so each changed node is hashed once.
+
+        Args:
+            root: Content hash of the diff's base tree
+            ops: Ops from diff; the subtrees they insert must be stored
+
+        Returns:
+            Content hash of the new tree, which is then stored too
+        """
+        edited: Dict[Tuple[int, ...], List[Any]] = {}
+        for op in ops:
+            path = tuple(op["path"])
+            if op["op"] == "set":
+                if not path:
+                    root = op["node"]
+                    edited.clear()
+                    continue
+                self._edit(root, edited, path[:-1])[3][path[-1]] = op["node"]
+                _forget(edited, path[:-1], path[-1], path[-1] + 1)
+            elif op["op"] == "update":
+                node = self._edit(root, edited, path)
+                node[1].update(op.get("attrs", {}))
+                for name in op.get("removed_attrs", ()):
+                    node[1].pop(name, None)
+                if "text" in op:
+                    node[2] = op["text"]
+            elif op["op"] == "splice":
+                index = op["index"]
+                children = self._edit(root, edited, path)[3]
+                children[index : index + op["remove"]] = op["insert"]
+                # Copies after the splice point no longer match their index
+                _forget(edited, path, index, None)
+            else:
+                raise ValueError(f"Unknown DOM diff op: {op['op']!r}")
+
+        # Store edited nodes deepest first, linking each into its parent
+        for path in sorted(edited, key=len, reverse=True):
+            tag, attrs, text, children = edited[path]
+            digest, _ = self._put(
+                (tag, tuple(sorted(attrs.items())), text, tuple(children))
+            )
+            if path:
+                edited[path[:-1]][3][path[-1]] = digest
+            else:
+                root = digest
+        return root
+
+    def __contains__(self, digest: str) -> bool:
+        """Whether a node is stored."""
+        return digest in self._nodes
+
+    def __len__(self) -> int:
+        """Number of distinct nodes stored."""
+        return len(self._nodes)
+
+    def _put(self, record: NodeRecord) -> Tuple[str, bool]:
+        """Store a node record, returning its hash and whether it was new."""
+        try:
+            digest = self._digests.get(record)
+        except TypeError:
+            # Unhashable attribute values: only the content hash identifies it
+            digest = _hash(record)
+            if digest in self._nodes:
+                return digest, False
+            self._nodes[digest] = record
+            return digest, True
+        if digest is not None:
+            return digest, False
+        digest = _hash(record)
+        self._digests[record] = digest
+        if digest in self._nodes:
+            return digest, False
+        self._nodes[digest] = record
+        return digest, True
+
+    def _edit(
+        self, root: str, edited: Dict[Tuple[int, ...], List[Any]], path: Tuple[int, ...]
+    ) -> List[Any]:
+        """Get the editable copy of the node at a path, copying its ancestors."""
+        start = len(path)
+        while start and path[:start] not in edited:
+            start -= 1
+        if not edited:
+            tag, attrs, text, children = self._nodes[root]
+            edited[()] = [tag, dict(attrs), text, list(children)]
+        for depth in range(start + 1, len(path) + 1):
+            digest = edited[path[: depth - 1]][3][path[depth - 1]]
+            tag, attrs, text, children = self._nodes[digest]
+            edited[path[:depth]] = [tag, dict(attrs), text, list(children)]
+        return edited[path]
+
+    def _node_dict(self, digest: str) -> Dict[str, Any]:
+        """A stored node as a DOM dict without its children."""
+        tag, attrs, text, _ = self._nodes[digest]
+        return {"tag": tag, "attrs": dict(attrs), "text": text, "children": []}
+
+
+class DomCapture:
+    """
+    Turns successive page snapshots into baseline and diff events.
+
+    One baseline is kept per page; a snapshot equal to the page's previous
+    tree produces no event at all.
+    """
+
+    def __init__(self, store: Optional[SubtreeStore] = None):
+        """
+        Initialize the DOM capture.
+
+        Args:
+            store: Node store to intern snapshots into (defaults to a new one)
+        """
+        self.store = store or SubtreeStore()
+        self._pages: Dict[str, str] = {}
+
+    def capture(
+        self,
+        url: Optional[str],
+        dom: Dict[str, Any],
+        action: str,
+        timestamp_ns: Optional[int] = None,
+    ) -> Optional[DomChangeEvent]:
+        """
+        Record a page snapshot.
+
+        Args:
+            url: URL of the page
+            dom: DOM tree of the page
+            action: Browser action that preceded the snapshot
+            timestamp_ns: When the snapshot was taken (defaults to now)
+
+        Returns:
+            Baseline event for a page's first snapshot, diff event for a
+            changed page, or None if the page did not change
+        """
+        page = page_key(url)
+        root, added = self.store.intern(dom)
+        base = self._pages.get(page)
+        if base == root:
+            return None
+        self._pages[page] = root
+
+        timestamp_ns = timestamp_ns if timestamp_ns is not None else now_ns()
+        if base is None:
+            nodes = self.store.nodes(added)
+            return DomChangeEvent("baseline", page, action, timestamp_ns, root, nodes)
+
+        ops = self.store.diff(base, root)
+        inserted = self.store.subtree(
+            digest
+            for op in ops
+            for digest in ([op["node"]] if op["op"] == "set" else op.get("insert", ()))
+        )
+        return DomChangeEvent(
+            "diff",
+            page,
+            action,
+            timestamp_ns,
+            root,
+            self.store.nodes(inserted & added),
+            base=base,
+            ops=ops,
+        )
+
+    def current(self, url: Optional[str]) -> Optional[str]:
+        """
+        Get the content hash of a page's latest tree.
+
+        Args:
+            url: URL of the page
+
+        Returns:
+            Root hash, or None if the page was never captured
+        """
+        return self._pages.get(page_key(url))
+
+    def reset(self) -> None:
+        """Forget every page and stored node; the next snapshots are baselines."""
+        self.store = SubtreeStore()
+        self._pages.clear()
+
+
+def _hash(record: NodeRecord) -> str:
+    """Content hash of a node record."""
+    tag, attrs, text, children = record
+    payload = "\x1f".join((tag, repr(attrs), repr(text), *children))
+    return hashlib.blake2b(
+        payload.encode("utf-8", "surrogatepass"), digest_size=16
+    ).hexdigest()
+
+
+def _forget(
+    edited: Dict[Tuple[int, ...], List[Any]],
+    parent: Tuple[int, ...],
+    start: int,
+    stop: Optional[int],
+) -> None:
+    """Drop the edited copies under the children of parent in [start, stop)."""
+    depth = len(parent)
+    for path in [p for p in edited if len(p) > depth and p[:depth] == parent]:
+        if path[depth] >= start and (stop is None or path[depth] < stop):
+            del edited[path]
+
+
+def post_order(dom: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Walk a DOM tree children first without recursion.
+
+    Args:
+        dom: DOM tree of {"tag", "attrs", "text", "children"} nodes
+
+    Returns:
+        Iterator over the nodes, each after all of its descendants
+    """
+    stack = [(dom, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            yield node
+            continue
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(node.get("children") or ()))
@@ -0,0 +1,412 @@
+"""
+Streaming HAR import for the capture pipeline
+
+Reads HTTP Archive (HAR) exports incrementally, one entry at a time, and
+converts them to the capture shapes the workflow uses: entries become
+``network_requests`` records and pages become navigation entries in
+``playwright_logs``. Only the entry being decoded is held in memory, so
+multi-gigabyte recordings can be analyzed without a browser and without
+loading the whole file.
+"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Optional, Tuple, Union
+import base64
+import binascii
+import codecs
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+HarSource = Union[str, Path, IO]
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Largest single value, such as one entry with its bodies, the reader buffers;
+# past this without a successful decode the document is taken as malformed
+DEFAULT_MAX_ENTRY_SIZE = 1 << 28
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SECTION_KINDS = {"pages": "page", "entries": "entry"}
+
+
+class _StreamingJSONReader:
+    """
+    Decodes a JSON document value by value from a text stream.
+
+    The buffer holds the unread remainder of the current chunk plus
+    whatever the value being decoded needs, so memory is bounded by the
+    largest single value read rather than by the document size, and by
+    max_value_size for a value that never decodes.
+    """
+
+    def __init__(self, stream: IO[str], chunk_size: int, max_value_size: int):
+        """
+        Initialize the reader.
+
+        Args:
+            stream: Text stream positioned at the start of the document
+            chunk_size: Characters read from the stream at a time
+            max_value_size: Characters buffered for one value before giving up
+        """
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._max_value_size = max_value_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or "" at the end."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or self._eof:
+                return self._buffer[self._pos : self._pos + 1]
+            self._read(self._chunk_size)
+
+    def expect(self, characters: str) -> str:
+        """
+        Consume the next character, which must be one of characters.
+
+        Args:
+            characters: Allowed structural characters
+
+        Returns:
+            The consumed character
+        """
+        char = self.peek()
+        if not char or char not in characters:
+            found = repr(char) if char else "end of file"
+            raise ValueError(
+                f"Malformed HAR: expected one of {characters!r}, found {found}"
+            )
+        self._pos += 1
+        return char
+
+    def decode(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                pending = len(self._buffer) - self._pos
+                if pending > self._max_value_size:
+                    raise ValueError(
+                        f"Malformed HAR: no value decoded within "
+                        f"{self._max_value_size} characters"
+                    )
+                # Grow geometrically so a value larger than a chunk is
+                # re-scanned a logarithmic number of times, stopping just
+                # past max_value_size
+                size = max(self._chunk_size, pending)
+                self._read(min(size, self._max_value_size + 1 - pending))
+                continue
+
+            # A number ending at the buffer edge may continue in the next chunk
+            if end == len(self._buffer) and not self._eof:
+                self._read(self._chunk_size)
+                continue
+
+            self._pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """
+        Iterate over the keys of the object starting at the next character.
+
+        The caller must consume each key's value before advancing.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.decode()
+            if not isinstance(key, str):
+                raise ValueError("Malformed HAR: object key is not a string")
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+    def elements(self) -> Iterator[None]:
+        """
+        Iterate over the array starting at the next character.
+
+        The caller must consume each element before advancing.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield None
+            if self.expect(",]") == "]":
+                return
+
+    def _read(self, size: int) -> None:
+        """Append the next characters of the stream, dropping consumed ones."""
+        chunk = self._stream.read(size)
+        if not chunk:
+            self._eof = True
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+
+
+def iter_har(
+    source: HarSource,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_entry_size: int = DEFAULT_MAX_ENTRY_SIZE,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Stream the pages and entries of a HAR document in file order.
+
+    Args:
+        source: Path to a HAR file, or an open text or binary file object
+        chunk_size: Characters read from the file at a time
+        max_entry_size: Characters buffered for one page or entry before
+            the document is rejected as malformed
+
+    Yields:
+        ("page", page) and ("entry", entry) tuples of raw HAR objects
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "r", encoding="utf-8-sig") as stream:
+            yield from iter_har(stream, chunk_size, max_entry_size)
+        return
+
+    if isinstance(source.read(0), bytes):
+        source = codecs.getreader("utf-8-sig")(source)
+
+    reader = _StreamingJSONReader(source, chunk_size, max_entry_size)
+    for key in reader.members():
+        if key != "log":
+            reader.decode()
+            continue
+        for section in reader.members():
+            kind = _SECTION_KINDS.get(section)
+            if kind is not None:
+                for _ in reader.elements():
+                    yield kind, reader.decode()
+            else:
+                reader.decode()
+
+
+def har_entry_to_request(
+    entry: Dict[str, Any], include_bodies: bool = True
+) -> Dict[str, Any]:
+    """
+    Convert a HAR entry to the network request capture shape.
+
+    Args:
+        entry: HAR entry object
+        include_bodies: Keep response headers and request/response bodies
+
+    Returns:
+        Network request with url, method, status, response_time (ms) and
+        timestamp, plus timestamp_ns, headers, request_body and
+        response_body if present
+    """
+    request = entry.get("request") or {}
+    response = entry.get("response") or {}
+
+    timestamp, timestamp_ns = _har_time(entry.get("startedDateTime"))
+    record = {
+        "url": request.get("url", ""),
+        "method": request.get("method", ""),
+        "status": response.get("status"),
+        "response_time": entry.get("time"),
+        "timestamp": timestamp,
+    }
+    if timestamp_ns is not None:
+        record["timestamp_ns"] = timestamp_ns
+
+    if include_bodies:
+        headers = _header_dict(response.get("headers"))
+        if headers:
+            record["headers"] = headers
+
+        request_body = (request.get("postData") or {}).get("text")
+        if request_body:
+            record["request_body"] = request_body
+
+        response_body = _content_text(response.get("content") or {})
+        if response_body:
+            record["response_body"] = response_body
+
+    return record
+
+
+def har_page_to_log(page: Dict[str, Any], url: str = "") -> Dict[str, Any]:
+    """
+    Convert a HAR page to a navigation entry in the audit log shape.
+
+    HAR pages don't record their URL (the title is free text), so it is
+    taken from the page's first entry where that is known.
+
+    Args:
+        page: HAR page object
+        url: URL of the page's first entry, if known
+
+    Returns:
+        Audit log entry for the page load
+    """
+    timestamp, timestamp_ns = _har_time(page.get("startedDateTime"))
+    log = {
+        "action": "navigate",
+        "url": url,
+        "page_id": page.get("id"),
+        "timestamp": timestamp,
+    }
+    if timestamp_ns is not None:
+        log["timestamp_ns"] = timestamp_ns
+    log["success"] = True
+    return log
+
+
+def iter_har_requests(
+    source: HarSource,
+    include_bodies: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_entry_size: int = DEFAULT_MAX_ENTRY_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the entries of a HAR document as network requests.
+
+    Feeding the result to an EndpointAggregator analyzes a recording of any
+    size in bounded memory.
+
+    Args:
+        source: Path to a HAR file, or an open text or binary file object
+        include_bodies: Keep response headers and request/response bodies
+        chunk_size: Characters read from the file at a time
+        max_entry_size: Characters buffered for one page or entry before
+            the document is rejected as malformed
+
+    Yields:
+        Network requests in file order
+    """
+    for kind, item in iter_har(source, chunk_size, max_entry_size):
+        if kind == "entry":
+            yield har_entry_to_request(item, include_bodies)
+
+
+def load_har(
+    state: Dict[str, Any],
+    source: HarSource,
+    include_bodies: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_entry_size: int = DEFAULT_MAX_ENTRY_SIZE,
+) -> Dict[str, int]:
+    """
+    Append a HAR recording to a workflow state's capture streams.
+
+    Entries are added to ``network_requests`` and pages to
+    ``playwright_logs``, ready for capture_data and pattern analysis.
+    Bodies are left out by default, since the state keeps every request.
+
+    Args:
+        state: Workflow state to extend in place
+        source: Path to a HAR file, or an open text or binary file object
+        include_bodies: Keep response headers and request/response bodies
+        chunk_size: Characters read from the file at a time
+        max_entry_size: Characters buffered for one page or entry before
+            the document is rejected as malformed
+
+    Returns:
+        Number of requests and pages imported
+    """
+    counts = {"requests": 0, "pages": 0}
+    # Pages usually precede their entries, so a page's log is filled in by
+    # its first entry; pages listed after their entries take it directly
+    pending_logs: Dict[Any, Dict[str, Any]] = {}
+    first_urls: Dict[Any, str] = {}
+    for kind, item in iter_har(source, chunk_size, max_entry_size):
+        if kind == "entry":
+            request = har_entry_to_request(item, include_bodies)
+            state["network_requests"].append(request)
+            counts["requests"] += 1
+            pageref = item.get("pageref")
+            if pageref is not None and pageref not in first_urls:
+                first_urls[pageref] = request["url"]
+                if pageref in pending_logs:
+                    pending_logs.pop(pageref)["url"] = request["url"]
+        else:
+            page_id = item.get("id")
+            log = har_page_to_log(item, first_urls.get(page_id, ""))
+            if not log["url"] and page_id is not None:
+                pending_logs[page_id] = log
+            state["playwright_logs"].append(log)
+            counts["pages"] += 1
+
+    logger.info(
+        f"Imported {counts['requests']} requests and {counts['pages']} pages from HAR"
+    )
+    return counts
+
+
+def normalize_timestamp(value: Optional[str]) -> Optional[str]:
+    """
+    Convert a HAR timestamp to a naive local ISO-8601 string.
+
+    Live captures are stamped in naive local time (see
+    capture_events.format_timestamp_ns), so imported traffic is converted
+    to the same form to correlate with them on one timeline. Naive
+    timestamps are also what the columnar request store keeps in its typed
+    column.
+
+    Args:
+        value: HAR startedDateTime (e.g. "2024-01-15T10:30:00.123+01:00")
+
+    Returns:
+        Naive local timestamp, or the value unchanged if it can't be parsed
+    """
+    return _har_time(value)[0]
+
+
+def _har_time(value: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+    """A HAR timestamp as a naive local ISO string and epoch nanoseconds."""
+    if not isinstance(value, str):
+        return value, None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return value, None
+    # Naive timestamps are taken as local time, as live captures are
+    instant = parsed.astimezone()
+    timestamp_ns = (instant - _EPOCH) // _MICROSECOND * 1000
+    if parsed.tzinfo is not None:
+        parsed = instant.replace(tzinfo=None)
+    return parsed.isoformat(), timestamp_ns
+
+
+def _header_dict(headers: Any) -> Dict[str, str]:
+    """Convert a HAR header list to a dict; later duplicates win."""
+    if not isinstance(headers, list):
+        return {}
+    return {
+        header["name"]: header.get("value", "")
+        for header in headers
+        if isinstance(header, dict) and "name" in header
+    }
+
+
+def _content_text(content: Dict[str, Any]) -> Optional[str]:
+    """Response body text, decoding base64 content that is valid UTF-8."""
+    text = content.get("text")
+    if not text or content.get("encoding") != "base64":
+        return text
+    try:
+        return base64.b64decode(text, validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError):
+        return None
@@ -5,12 +5,82 @@ Provides a client interface to interact with the global Playwright MCP
 for browser automation and data capture.
 """
 
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import asyncio
+import functools
 import logging
+import re
+import time
+import uuid
+
+from src.integrations.auth_state import StorageStateCache
+from src.integrations.capture_events import (
+    AuditEvent,
+    NetworkEvent,
+    event_dict,
+    format_timestamp_ns,
+    now_ns,
+)
+from src.integrations.capture_journal import DEFAULT_HIGH_WATER, CaptureJournal
+from src.integrations.dom_capture import DomCapture
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Capture buffers that can be drained with a cursor
+CAPTURE_BUFFERS = ("audit_logs", "network_requests", "dom_changes")
+
+# Pieces of natural language navigate instructions
+_URL = re.compile(r"https?://\S+")
+_NAVIGATE_TARGET = re.compile(r"navigate\s+(?:to\s+)?(?:the\s+)?(.*)", re.IGNORECASE)
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Shared pool for blocking browser calls made from async code
+DEFAULT_BLOCKING_WORKERS = 8
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+
+
+def configure_blocking_pool(max_workers: int = DEFAULT_BLOCKING_WORKERS) -> None:
+    """
+    Resize the thread pool used to offload blocking browser calls.
+
+    Calls already running on the previous pool are allowed to finish.
+
+    Args:
+        max_workers: Maximum number of blocking calls running at once
+    """
+    global _blocking_executor
+    previous = _blocking_executor
+    _blocking_executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="playwright-blocking"
+    )
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a synchronous callable on the bounded pool without blocking the event loop.
+
+    Args:
+        func: Blocking callable to run
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The callable's return value
+    """
+    if _blocking_executor is None:
+        configure_blocking_pool()
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _blocking_executor, functools.partial(func, *args, **kwargs)
+    )
+
 
 class PlaywrightMCPClient:
     """
@@ -20,18 +90,131 @@ class PlaywrightMCPClient:
     workflow to execute browser actions and capture interaction data.
     """
 
-    def __init__(self, endpoint: Optional[str] = None):
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        storage_state_cache: Optional[StorageStateCache] = None,
+        credential_id: Optional[str] = None,
+        origin: str = "https://example.com",
+        capture_high_water: Optional[int] = DEFAULT_HIGH_WATER,
+        capture_directory: Optional[str] = None,
+    ):
         """
         Initialize Playwright MCP client.
 
         Args:
             endpoint: MCP endpoint URL (uses global MCP if None)
+            storage_state_cache: Cache of authenticated storage states used to
+                seed new sessions instead of logging in again
+            credential_id: Identifier of the credential this client logs in with
+            origin: Origin of the legacy application being driven
+            capture_high_water: Entries each capture buffer keeps in memory
+                before older ones spill to disk; None never spills
+            capture_directory: Directory for spilled capture journals
+                (system temp if None)
         """
         self.endpoint = endpoint or "http://localhost:3000"  # Default global MCP
         self.session_id = None
-        self._audit_logs: List[Dict[str, Any]] = []
-        self._network_requests: List[Dict[str, Any]] = []
-        self._dom_changes: List[Dict[str, Any]] = []
+        self.current_url: Optional[str] = None
+        self.storage_state_cache = storage_state_cache
+        self.credential_id = credential_id
+        self.origin = origin
+        self.authenticated = False
+        self._storage_state: Optional[Dict[str, Any]] = None
+        self._audit_logs = CaptureJournal(capture_high_water, capture_directory)
+        self._network_requests = CaptureJournal(capture_high_water, capture_directory)
+        self._dom_changes = CaptureJournal(capture_high_water, capture_directory)
+        # Page baselines and interned DOM nodes behind the DOM change events
+        self._dom_capture = DomCapture()
+        # Cursors are only honored by the client that issued them
+        self._capture_id = uuid.uuid4().hex
+        # Entries dropped from each buffer by clear_session_data
+        self._capture_offsets = dict.fromkeys(CAPTURE_BUFFERS, 0)
+
+    async def create_session(self) -> str:
+        """
+        Create a new isolated browser context.
+
+        Returns:
+            Identifier of the new browser context
+        """
+        # This would be the actual MCP call creating a browser context
+        # TODO: Replace with actual MCP call when running in MCP environment
+        session_id = uuid.uuid4().hex
+        logger.info(f"Simulating browser context creation: {session_id}")
+        return session_id
+
+    async def reset_session(self, session_id: str) -> None:
+        """
+        Return a browser context to a clean state for its next user.
+
+        Args:
+            session_id: Browser context to reset
+        """
+        # This would clear cookies, storage and open pages via MCP
+        logger.info(f"Simulating browser context reset: {session_id}")
+
+    async def close_session(self, session_id: str) -> None:
+        """
+        Close a browser context and release its resources.
+
+        Args:
+            session_id: Browser context to close
+        """
+        logger.info(f"Simulating browser context close: {session_id}")
+        if self.session_id == session_id:
+            self.session_id = None
+
+    def attach_session(self, session_id: Optional[str]) -> None:
+        """
+        Drive subsequent browser actions through an existing browser context.
+
+        Args:
+            session_id: Browser context leased from a session pool
+        """
+        self.session_id = session_id
+        # A different context has its own (reset) cookies and storage
+        self.authenticated = False
+        self._storage_state = None
+
+    async def restore_authentication(self) -> bool:
+        """
+        Seed the current session with the cached authenticated storage state.
+
+        Returns:
+            True if the session is now authenticated without a login
+        """
+        if self.storage_state_cache is None or self.credential_id is None:
+            return False
+
+        storage_state = self.storage_state_cache.load(self.credential_id, self.origin)
+        if storage_state is None:
+            return False
+
+        await self.apply_storage_state(storage_state)
+        logger.info(f"Seeded session with cached login for {self.credential_id}")
+        return True
+
+    async def apply_storage_state(self, storage_state: Dict[str, Any]) -> None:
+        """
+        Load cookies and local storage into the current browser context.
+
+        Args:
+            storage_state: Playwright storage state (cookies and origins)
+        """
+        # This would add the cookies and local storage to the context via MCP
+        # TODO: Replace with actual MCP call when running in MCP environment
+        self._storage_state = storage_state
+        self.authenticated = True
+
+    def get_storage_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the current browser context's cookies and local storage.
+
+        Returns:
+            Playwright storage state, or None if nothing has been captured
+        """
+        return self._storage_state
 
     async def navigate_to_url(self, url: str) -> Dict[str, Any]:
         """
@@ -57,60 +240,88 @@ class PlaywrightMCPClient:
 
             # Simulate network request capture for the navigation
             # In real implementation, this would be captured automatically by Playwright MCP
-            navigation_request = {
-                "url": url,
-                "method": "GET",
-                "status": 200,
-                "response_time": 150,
-                "timestamp": datetime.now().isoformat(),
-                "request_type": "navigation",
-            }
-            self._network_requests.append(navigation_request)
+            timestamp_ns = now_ns()
+            self._network_requests.append(
+                NetworkEvent(url, "GET", 200, 150, timestamp_ns, "navigation")
+            )
+
+            self.current_url = url
 
             # Create result record
             result = {
                 "success": True,
                 "action": "navigate",
                 "url": url,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": format_timestamp_ns(timestamp_ns),
             }
 
             # Add to audit logs
-            self._audit_logs.append(
-                {
-                    "action": "navigate",
-                    "url": url,
-                    "timestamp": datetime.now().isoformat(),
-                    "success": True,
-                }
-            )
+            self._audit_logs.append(AuditEvent("navigate", timestamp_ns, True, url=url))
+            await self._capture_dom("navigate")
 
             logger.info(f"Successfully navigated to: {url}")
             return result
 
         except Exception as e:
             logger.error(f"Navigation failed: {str(e)}")
+            timestamp_ns = now_ns()
             result = {
                 "success": False,
                 "action": "navigate",
                 "url": url,
                 "error": str(e),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": format_timestamp_ns(timestamp_ns),
             }
 
             # Add error to audit logs
             self._audit_logs.append(
-                {
-                    "action": "navigate",
-                    "url": url,
-                    "timestamp": datetime.now().isoformat(),
-                    "success": False,
-                    "error": str(e),
-                }
+                AuditEvent("navigate", timestamp_ns, False, url=url, error=str(e))
             )
 
             return result
 
+    async def snapshot_page(self) -> Dict[str, Any]:
+        """
+        Capture the structure of the current page.
+
+        DOM nodes are dicts with a "tag", optional "attrs" and "text", and
+        "children"; an element's "attrs" may carry a "ref" that click_element
+        accepts as its selector.
+
+        Returns:
+            Dict with the page "url" and its "dom" tree
+        """
+        # This would be the actual MCP call:
+        # await mcp_playwright_browser_snapshot()
+        # TODO: Replace with actual MCP call when running in MCP environment
+        return {
+            "url": self.current_url,
+            "dom": {"tag": "html", "attrs": {}, "children": []},
+        }
+
+    async def _capture_dom(self, action: str) -> None:
+        """
+        Snapshot the current page and record how its DOM changed.
+
+        The first snapshot of a page is recorded as a baseline, later ones
+        as diffs against the page's previous tree; unchanged pages record
+        nothing.
+
+        Args:
+            action: Browser action that preceded the snapshot
+        """
+        try:
+            snapshot = await self.snapshot_page()
+        except Exception as e:
+            # The action itself succeeded; only its DOM change is lost
+            logger.warning(f"DOM snapshot after {action} failed: {str(e)}")
+            return
+        event = self._dom_capture.capture(
+            snapshot.get("url") or self.current_url, snapshot["dom"], action
+        )
+        if event is not None:
+            self._dom_changes.append(event)
+
     async def click_element(
         self, element_description: str, selector: str
     ) -> Dict[str, Any]:
@@ -134,49 +345,52 @@ class PlaywrightMCPClient:
             logger.info(f"Simulating click on: {element_description} ({selector})")
 
             # Create result record
+            timestamp_ns = now_ns()
             result = {
                 "success": True,
                 "action": "click",
                 "element": element_description,
                 "selector": selector,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": format_timestamp_ns(timestamp_ns),
             }
 
             # Add to audit logs
             self._audit_logs.append(
-                {
-                    "action": "click",
-                    "element": element_description,
-                    "selector": selector,
-                    "timestamp": datetime.now().isoformat(),
-                    "success": True,
-                }
+                AuditEvent(
+                    "click",
+                    timestamp_ns,
+                    True,
+                    element=element_description,
+                    selector=selector,
+                )
             )
+            await self._capture_dom("click")
 
             logger.info(f"Successfully clicked: {element_description}")
             return result
 
         except Exception as e:
             logger.error(f"Click failed: {str(e)}")
+            timestamp_ns = now_ns()
             result = {
                 "success": False,
                 "action": "click",
                 "element": element_description,
                 "selector": selector,
                 "error": str(e),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": format_timestamp_ns(timestamp_ns),
             }
 
             # Add error to audit logs
             self._audit_logs.append(
-                {
-                    "action": "click",
-                    "element": element_description,
-                    "selector": selector,
-                    "timestamp": datetime.now().isoformat(),
-                    "success": False,
-                    "error": str(e),
-                }
+                AuditEvent(
+                    "click",
+                    timestamp_ns,
+                    False,
+                    element=element_description,
+                    selector=selector,
+                    error=str(e),
+                )
             )
 
             return result
@@ -213,7 +427,7 @@ class PlaywrightMCPClient:
                     step_result = {
                         "success": False,
                         "error": f"Unsupported action: {action}",
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": format_timestamp_ns(now_ns()),
                     }
 
                 # Add step number to result
@@ -227,24 +441,25 @@ class PlaywrightMCPClient:
 
             # Create overall result
             all_successful = all(step.get("success", False) for step in executed_steps)
+            timestamp_ns = now_ns()
             result = {
                 "success": all_successful,
                 "action": "user_journey",
                 "steps": executed_steps,
                 "total_steps": len(journey_steps),
                 "completed_steps": len(executed_steps),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": format_timestamp_ns(timestamp_ns),
             }
 
             # Add to audit logs
             self._audit_logs.append(
-                {
-                    "action": "user_journey",
-                    "total_steps": len(journey_steps),
-                    "completed_steps": len(executed_steps),
-                    "success": all_successful,
-                    "timestamp": datetime.now().isoformat(),
-                }
+                AuditEvent(
+                    "user_journey",
+                    timestamp_ns,
+                    all_successful,
+                    total_steps=len(journey_steps),
+                    completed_steps=len(executed_steps),
+                )
             )
 
             logger.info(
@@ -254,21 +469,17 @@ class PlaywrightMCPClient:
 
         except Exception as e:
             logger.error(f"User journey execution failed: {str(e)}")
+            timestamp_ns = now_ns()
             result = {
                 "success": False,
                 "action": "user_journey",
                 "error": str(e),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": format_timestamp_ns(timestamp_ns),
             }
 
             # Add error to audit logs
             self._audit_logs.append(
-                {
-                    "action": "user_journey",
-                    "error": str(e),
-                    "success": False,
-                    "timestamp": datetime.now().isoformat(),
-                }
+                AuditEvent("user_journey", timestamp_ns, False, error=str(e))
             )
 
             return result
@@ -288,47 +499,98 @@ class PlaywrightMCPClient:
         logger.info(f"Executing browser action: {instruction}")
 
         # Simulate action execution
+        timestamp_ns = now_ns()
         result = {
             "success": True,
             "action": "mock_action",
             "instruction": instruction,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": format_timestamp_ns(timestamp_ns),
         }
 
         # Add to audit logs
         self._audit_logs.append(
-            {
-                "action": "mock_action",
-                "instruction": instruction,
-                "timestamp": datetime.now().isoformat(),
-                "success": True,
-            }
+            AuditEvent("mock_action", timestamp_ns, True, instruction=instruction)
         )
 
         # Simulate network request capture for mock
         # In real implementation, this would be captured automatically
         if "login" in instruction.lower():
-            self._network_requests.append(
-                {
-                    "url": "https://example.com/api/login",
-                    "method": "POST",
-                    "status": 200,
-                    "response_time": 150,
-                    "timestamp": datetime.now().isoformat(),
-                }
-            )
+            if self.authenticated:
+                # Session was seeded from cached storage state: no round-trip
+                result["authentication"] = "storage_state"
+            else:
+                self._perform_login()
+                result["authentication"] = "login"
         elif "navigate" in instruction.lower():
-            self._network_requests.append(
+            url = self._navigation_target(instruction)
+            self._network_requests.append(NetworkEvent(url, "GET", 200, 100, now_ns()))
+            self.current_url = url
+            result["url"] = url
+
+        return result
+
+    def _navigation_target(self, instruction: str) -> str:
+        """
+        Find the URL a natural language navigate instruction points at.
+
+        A URL in the instruction is used as is; a named page ("Navigate to
+        vendor invoices") resolves under the client's origin.
+
+        Args:
+            instruction: Instruction mentioning navigation
+
+        Returns:
+            Absolute URL to navigate to
+        """
+        url = _URL.search(instruction)
+        if url:
+            return url.group(0).rstrip(".,;)")
+        target = _NAVIGATE_TARGET.search(instruction)
+        words = _WORD.findall(target.group(1).lower()) if target else []
+        return f"{self.origin}/{'-'.join(w for w in words if w != 'page')}"
+
+    def _perform_login(self) -> None:
+        """Log in through the application and cache the resulting storage state."""
+        self._network_requests.append(
+            NetworkEvent(f"{self.origin}/api/login", "POST", 200, 150, now_ns())
+        )
+
+        # Simulated session cookie; a real client reads the context's storage state
+        self._storage_state = {
+            "cookies": [
                 {
-                    "url": "https://example.com/page",
-                    "method": "GET",
-                    "status": 200,
-                    "response_time": 100,
-                    "timestamp": datetime.now().isoformat(),
+                    "name": "session",
+                    "value": uuid.uuid4().hex,
+                    "domain": urlparse(self.origin).hostname,
+                    "path": "/",
+                    "expires": time.time() + 3600,
+                    "httpOnly": True,
+                    "secure": self.origin.startswith("https"),
                 }
+            ],
+            "origins": [{"origin": self.origin, "localStorage": []}],
+        }
+        self.authenticated = True
+
+        if self.storage_state_cache is not None and self.credential_id is not None:
+            self.storage_state_cache.save(
+                self.credential_id, self.origin, self._storage_state
             )
 
-        return result
+    async def aexecute_action(self, instruction: str) -> Dict[str, Any]:
+        """
+        Execute a browser action without blocking the event loop.
+
+        The synchronous execute_action runs on the shared bounded thread pool,
+        so other journeys keep making progress while a slow step is waiting.
+
+        Args:
+            instruction: Natural language description of action to perform
+
+        Returns:
+            Result of the action execution
+        """
+        return await run_blocking(self.execute_action, instruction)
 
     def get_audit_logs(self) -> List[Dict[str, Any]]:
         """
@@ -337,7 +599,7 @@ class PlaywrightMCPClient:
         Returns:
             List of interaction logs with timestamps and details
         """
-        return self._audit_logs.copy()
+        return [event_dict(entry) for entry in self._audit_logs]
 
     def get_network_requests(self) -> List[Dict[str, Any]]:
         """
@@ -346,16 +608,86 @@ class PlaywrightMCPClient:
         Returns:
             List of network request details
         """
-        return self._network_requests.copy()
+        return [event_dict(entry) for entry in self._network_requests]
 
     def get_dom_changes(self) -> List[Dict[str, Any]]:
         """
         Get all DOM changes captured during browser interactions.
 
         Returns:
-            List of DOM change events
+            List of DOM change events: a "baseline" per page, then "diff"
+            events; SubtreeStore.load rebuilds the trees they describe
+        """
+        return [event_dict(entry) for entry in self._dom_changes]
+
+    def drain_audit_logs(
+        self, since: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], str]:
         """
-        return self._dom_changes.copy()
+        Get the audit logs recorded after a cursor.
+
+        Args:
+            since: Cursor from a previous drain; None starts from the beginning
+
+        Returns:
+            Tuple of (new audit logs, cursor to pass to the next drain)
+        """
+        return self._drain("audit_logs", since)
+
+    def drain_network_requests(
+        self, since: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Get the network requests captured after a cursor.
+
+        Args:
+            since: Cursor from a previous drain; None starts from the beginning
+
+        Returns:
+            Tuple of (new network requests, cursor to pass to the next drain)
+        """
+        return self._drain("network_requests", since)
+
+    def drain_dom_changes(
+        self, since: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Get the DOM changes captured after a cursor.
+
+        Args:
+            since: Cursor from a previous drain; None starts from the beginning
+
+        Returns:
+            Tuple of (new DOM changes, cursor to pass to the next drain)
+        """
+        return self._drain("dom_changes", since)
+
+    def _drain(self, buffer_name: str, since: Optional[str]) -> Tuple[List, str]:
+        """
+        Slice the entries of a capture buffer recorded after a cursor.
+
+        Cursors count entries ever recorded by this client, so they stay
+        valid across clear_session_data. A cursor issued by another client
+        is treated like None.
+
+        Args:
+            buffer_name: One of CAPTURE_BUFFERS
+            since: Cursor from a previous drain, or None
+
+        Returns:
+            Tuple of (new entries, cursor after them)
+        """
+        buffer = getattr(self, f"_{buffer_name}")
+        offset = self._capture_offsets[buffer_name]
+
+        position = offset
+        if since is not None:
+            capture_id, _, count = since.partition(":")
+            if capture_id == self._capture_id:
+                position = int(count)
+
+        entries = [event_dict(entry) for entry in buffer[max(position - offset, 0) :]]
+        return entries, f"{self._capture_id}:{offset + len(buffer)}"
 
     def get_screenshots(self) -> List[str]:
         """
@@ -379,6 +711,10 @@ class PlaywrightMCPClient:
 
     def clear_session_data(self):
         """Clear all captured session data."""
+        for buffer_name in CAPTURE_BUFFERS:
+            self._capture_offsets[buffer_name] += len(getattr(self, f"_{buffer_name}"))
         self._audit_logs.clear()
         self._network_requests.clear()
         self._dom_changes.clear()
+        # Later DOM changes must not refer to nodes of cleared events
+        self._dom_capture.reset()
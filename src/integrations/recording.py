@@ -0,0 +1,298 @@
+"""
+Record and replay of Playwright MCP browser sessions
+
+A recording client drives the browser as usual and appends every
+navigate_to_url, click_element, execute_user_journey and execute_action
+call to a session tape: the call's arguments, its result and the audit
+logs, network requests and DOM changes it captured. A replay client serves
+the same calls from the tape at memory speed, without a browser, so
+analysis code can be iterated on against a fixed capture.
+
+Tapes are gzip-compressed JSON lines, one call per line after a header.
+Concurrent journeys record to a directory holding one tape per client, and
+a replay client given the directory serves the calls of all its tapes.
+"""
+
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Union
+import copy
+import gzip
+import itertools
+import json
+import logging
+import threading
+
+from src.integrations.capture_events import event_dict
+from src.integrations.playwright_mcp import CAPTURE_BUFFERS, PlaywrightMCPClient
+
+logger = logging.getLogger(__name__)
+
+TAPE_FORMAT = "playwright-session-tape"
+TAPE_VERSION = 1
+TAPE_SUFFIX = ".tape.gz"
+
+
+def call_key(method: str, args: List[Any]) -> str:
+    """
+    Identify a browser call by its method and arguments.
+
+    Args:
+        method: Client method name
+        args: Positional arguments of the call
+
+    Returns:
+        Canonical JSON of the call
+    """
+    return json.dumps([method, args], sort_keys=True, default=str)
+
+
+def load_tape(path: Union[str, Path]) -> Dict[str, Deque[Dict[str, Any]]]:
+    """
+    Read a session tape, or every tape in a directory.
+
+    Args:
+        path: Tape written by RecordingPlaywrightClient, or a directory of
+            tapes written by recording_factory
+
+    Returns:
+        Mapping of call key to its recorded calls in recording order
+    """
+    path = Path(path)
+    tapes = sorted(path.glob(f"*{TAPE_SUFFIX}")) if path.is_dir() else [path]
+    calls: Dict[str, Deque[Dict[str, Any]]] = {}
+    for tape in tapes:
+        _read_tape(tape, calls)
+    return calls
+
+
+def _read_tape(path: Path, calls: Dict[str, Deque[Dict[str, Any]]]) -> None:
+    """Append the calls of one tape to calls, keyed by call_key."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != TAPE_FORMAT:
+            raise ValueError(f"Not a Playwright session tape: {path}")
+        try:
+            for line in f:
+                record = json.loads(line)
+                calls.setdefault(
+                    call_key(record["method"], record["args"]), deque()
+                ).append(record)
+        except (EOFError, ValueError) as e:
+            # A recording cut short by a crash: keep the complete calls
+            logger.warning(f"Session tape {path} is truncated: {str(e)}")
+
+
+def recording_factory(
+    tape_dir: Union[str, Path], **kwargs: Any
+) -> Callable[[], "RecordingPlaywrightClient"]:
+    """
+    Make a client_factory whose clients each record to a tape of their own.
+
+    A workflow calls its factory once per journey, and journeys run
+    concurrently, so the clients can't share one tape file. Tapes are
+    numbered in creation order after those already in tape_dir; replay
+    them all with ReplayPlaywrightClient(tape_dir).
+
+    Args:
+        tape_dir: Directory for the tapes (created if missing)
+        **kwargs: Arguments for each RecordingPlaywrightClient
+
+    Returns:
+        Function creating a recording client on a new tape
+    """
+    tape_dir = Path(tape_dir)
+    tape_dir.mkdir(parents=True, exist_ok=True)
+    numbers = itertools.count(len(list(tape_dir.glob(f"*{TAPE_SUFFIX}"))))
+    lock = threading.Lock()
+
+    def create() -> RecordingPlaywrightClient:
+        with lock:
+            number = next(numbers)
+        return RecordingPlaywrightClient(
+            tape_dir / f"session-{number:04d}{TAPE_SUFFIX}", **kwargs
+        )
+
+    return create
+
+
+class RecordingPlaywrightClient(PlaywrightMCPClient):
+    """
+    Playwright client that records every browser call to a session tape.
+
+    Only outermost calls are recorded: the steps a user journey performs
+    are part of the journey's record rather than records of their own.
+    Each client writes a tape of its own; use recording_factory to record
+    every journey a workflow runs.
+    """
+
+    def __init__(self, tape_path: Union[str, Path], **kwargs: Any):
+        """
+        Initialize the recording client.
+
+        Args:
+            tape_path: Session tape to write (overwritten if it exists)
+            **kwargs: Arguments for PlaywrightMCPClient
+        """
+        super().__init__(**kwargs)
+        self.tape_path = Path(tape_path)
+        self.recorded = 0
+        self._depth = 0
+        self._lock = threading.Lock()
+        self._tape = gzip.open(self.tape_path, "wt", encoding="utf-8")
+        self._write({"format": TAPE_FORMAT, "version": TAPE_VERSION})
+
+    async def navigate_to_url(self, url: str) -> Dict[str, Any]:
+        """Navigate to a URL, recording the call."""
+        marks = self._enter()
+        try:
+            result = await super().navigate_to_url(url)
+        finally:
+            self._depth -= 1
+        self._record("navigate_to_url", [url], result, marks)
+        return result
+
+    async def click_element(
+        self, element_description: str, selector: str
+    ) -> Dict[str, Any]:
+        """Click an element, recording the call."""
+        marks = self._enter()
+        try:
+            result = await super().click_element(element_description, selector)
+        finally:
+            self._depth -= 1
+        self._record("click_element", [element_description, selector], result, marks)
+        return result
+
+    async def execute_user_journey(self, journey_steps: list) -> Dict[str, Any]:
+        """Execute a user journey, recording it as one call."""
+        marks = self._enter()
+        try:
+            result = await super().execute_user_journey(journey_steps)
+        finally:
+            self._depth -= 1
+        self._record("execute_user_journey", [journey_steps], result, marks)
+        return result
+
+    def execute_action(self, instruction: str) -> Dict[str, Any]:
+        """Execute a natural language action, recording the call."""
+        marks = self._enter()
+        try:
+            result = super().execute_action(instruction)
+        finally:
+            self._depth -= 1
+        self._record("execute_action", [instruction], result, marks)
+        return result
+
+    def close(self) -> None:
+        """Flush and close the session tape."""
+        with self._lock:
+            if not self._tape.closed:
+                self._tape.close()
+                logger.info(
+                    f"Recorded {self.recorded} browser calls to {self.tape_path}"
+                )
+
+    def _enter(self) -> Dict[str, int]:
+        """
+        Start a call, noting where each capture buffer ends.
+
+        Returns:
+            Length of each capture buffer before the call
+        """
+        self._depth += 1
+        return {name: len(getattr(self, f"_{name}")) for name in CAPTURE_BUFFERS}
+
+    def _record(
+        self,
+        method: str,
+        args: List[Any],
+        result: Dict[str, Any],
+        marks: Dict[str, int],
+    ) -> None:
+        """Append an outermost call with what it captured to the tape."""
+        if self._depth:
+            return
+        captures = {
+            name: [event_dict(entry) for entry in getattr(self, f"_{name}")[mark:]]
+            for name, mark in marks.items()
+        }
+        self._write(
+            {"method": method, "args": args, "result": result, "captures": captures}
+        )
+        self.recorded += 1
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        """Write one line to the tape and flush it."""
+        line = json.dumps(record, default=str, separators=(",", ":"))
+        with self._lock:
+            self._tape.write(line + "\n")
+            self._tape.flush()
+
+
+class ReplayPlaywrightClient(PlaywrightMCPClient):
+    """
+    Playwright client that serves browser calls from a session tape.
+
+    The n-th call with given arguments returns the n-th recording of that
+    call, with its captures appended to the client's buffers exactly as the
+    browser produced them; once those run out the last recording is served
+    again. Calls the tape never saw raise KeyError.
+    """
+
+    def __init__(self, tape_path: Union[str, Path], **kwargs: Any):
+        """
+        Initialize the replay client.
+
+        Args:
+            tape_path: Session tape written by RecordingPlaywrightClient, or
+                a directory of tapes written by recording_factory
+            **kwargs: Arguments for PlaywrightMCPClient
+        """
+        super().__init__(**kwargs)
+        self.tape_path = Path(tape_path)
+        self._calls = load_tape(self.tape_path)
+        self.replayed = 0
+
+    async def navigate_to_url(self, url: str) -> Dict[str, Any]:
+        """Replay a navigation."""
+        return self._replay("navigate_to_url", [url])
+
+    async def click_element(
+        self, element_description: str, selector: str
+    ) -> Dict[str, Any]:
+        """Replay a click."""
+        return self._replay("click_element", [element_description, selector])
+
+    async def execute_user_journey(self, journey_steps: list) -> Dict[str, Any]:
+        """Replay a user journey."""
+        return self._replay("execute_user_journey", [journey_steps])
+
+    def execute_action(self, instruction: str) -> Dict[str, Any]:
+        """Replay a natural language action."""
+        return self._replay("execute_action", [instruction])
+
+    async def aexecute_action(self, instruction: str) -> Dict[str, Any]:
+        """Replay a natural language action without the blocking pool."""
+        return self._replay("execute_action", [instruction])
+
+    def _replay(self, method: str, args: List[Any]) -> Dict[str, Any]:
+        """
+        Serve the next recording of a call.
+
+        Args:
+            method: Client method name
+            args: Positional arguments of the call
+
+        Returns:
+            Copy of the recorded result
+        """
+        recordings = self._calls.get(call_key(method, args))
+        if not recordings:
+            raise KeyError(f"No recorded {method} call with arguments {args!r}")
+        record = recordings.popleft() if len(recordings) > 1 else recordings[0]
+
+        for name, entries in record["captures"].items():
+            getattr(self, f"_{name}").extend(copy.deepcopy(entries))
+        self.replayed += 1
+        return copy.deepcopy(record["result"])
@@ -0,0 +1,283 @@
+"""
+Browser session pool for Playwright MCP
+
+Pre-warms browser contexts and leases them to journeys, so each journey
+skips the seconds of browser setup a fresh session costs.
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import logging
+import time
+
+from src.integrations.playwright_mcp import PlaywrightMCPClient
+
+logger = logging.getLogger(__name__)
+
+
+class PooledSession:
+    """A browser context owned by the pool."""
+
+    __slots__ = ("session_id", "created_at", "use_count")
+
+    def __init__(self, session_id: str):
+        """
+        Initialize a pooled session.
+
+        Args:
+            session_id: Identifier of the browser context
+        """
+        self.session_id = session_id
+        self.created_at = time.monotonic()
+        self.use_count = 0
+
+    @property
+    def age(self) -> float:
+        """Seconds since the browser context was created."""
+        return time.monotonic() - self.created_at
+
+
+class BrowserSessionPool:
+    """
+    Pool of pre-warmed browser contexts leased to journeys.
+
+    Returned contexts are reset before reuse. Contexts that have served
+    max_uses leases or are older than max_age seconds are closed and
+    replaced with fresh ones.
+    """
+
+    def __init__(
+        self,
+        client: Optional[PlaywrightMCPClient] = None,
+        size: int = 4,
+        max_uses: int = 50,
+        max_age: float = 900.0,
+    ):
+        """
+        Initialize the session pool.
+
+        Args:
+            client: Client used to create, reset and close browser contexts
+            size: Maximum number of browser contexts, all pre-warmed by start()
+            max_uses: Leases a context serves before it is recycled
+            max_age: Seconds a context lives before it is recycled
+        """
+        self.client = client or PlaywrightMCPClient()
+        self.size = size
+        self.max_uses = max_uses
+        self.max_age = max_age
+
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._total = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._vacancies = 0
+        self._closed = False
+
+        self._hits = 0
+        self._misses = 0
+        self._recycled = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    async def start(self) -> None:
+        """Pre-warm browser contexts up to the pool size."""
+        missing = self.size - self._total
+        if missing <= 0:
+            return
+
+        self._total += missing
+        sessions = await asyncio.gather(
+            *(self._create_session() for _ in range(missing))
+        )
+        for session in sessions:
+            self._idle.put_nowait(session)
+
+        logger.info(f"Session pool warmed with {self.size} browser contexts")
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[PooledSession]:
+        """
+        Lease a browser context for the duration of a journey.
+
+        Yields:
+            The leased session; it is reset or recycled when the block exits
+        """
+        session = await self.acquire()
+        try:
+            yield session
+        finally:
+            await self.release(session)
+
+    async def acquire(self) -> PooledSession:
+        """
+        Take a browser context from the pool, waiting if all are leased.
+
+        Returns:
+            The leased session
+        """
+        if self._closed:
+            raise RuntimeError("Session pool is closed")
+
+        start = time.monotonic()
+
+        while True:
+            if not self._idle.empty():
+                session = self._idle.get_nowait()
+            elif self._total < self.size:
+                session = None
+                break
+            else:
+                session = await self._wait_for_session(start)
+            if session is not None:
+                break
+            self._vacancies -= 1
+            if self._total < self.size:
+                break
+
+        if session is None:
+            # Free slot, left by a failed context or not yet used: pay the
+            # setup cost for a new context
+            self._total += 1
+            try:
+                session = await self._create_session()
+            except Exception:
+                self._free_slot()
+                raise
+            self._misses += 1
+        else:
+            self._hits += 1
+            if self._expired(session):
+                session = await self._recycle(session)
+
+        session.use_count += 1
+        self._in_use += 1
+        return session
+
+    async def release(self, session: PooledSession) -> None:
+        """
+        Return a leased browser context to the pool.
+
+        Args:
+            session: Session previously returned by acquire()
+        """
+        self._in_use -= 1
+
+        if self._closed:
+            self._total -= 1
+            await self.client.close_session(session.session_id)
+            return
+
+        try:
+            if self._expired(session):
+                session = await self._recycle(session)
+            else:
+                try:
+                    await self.client.reset_session(session.session_id)
+                except Exception as e:
+                    # A context that can't be reset is replaced rather than reused
+                    logger.error(f"Resetting browser context failed: {str(e)}")
+                    session = await self._recycle(session)
+        except Exception as e:
+            # The slot was handed on by _recycle; the journey itself is done
+            logger.error(f"Replacing browser context failed: {str(e)}")
+            return
+
+        self._idle.put_nowait(session)
+
+    async def close(self) -> None:
+        """
+        Close every idle browser context; leased ones close on release.
+
+        Callers waiting for a context are woken and fail.
+        """
+        self._closed = True
+        idle: List[PooledSession] = []
+        while not self._idle.empty():
+            session = self._idle.get_nowait()
+            if session is not None:
+                idle.append(session)
+        self._vacancies = 0
+
+        for _ in range(self._waiting):
+            self._idle.put_nowait(None)
+
+        self._total -= len(idle)
+        await asyncio.gather(
+            *(self.client.close_session(session.session_id) for session in idle)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool usage statistics.
+
+        Returns:
+            Hit/miss counts, recycling count, wait times and occupancy
+        """
+        leases = self._hits + self._misses
+        return {
+            "size": self.size,
+            "total_sessions": self._total,
+            "idle": self._idle.qsize() - self._vacancies,
+            "in_use": self._in_use,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / leases if leases else 0.0,
+            "recycled": self._recycled,
+            "waits": self._waits,
+            "wait_time_total": self._wait_time_total,
+            "wait_time_max": self._wait_time_max,
+            "wait_time_avg": (
+                self._wait_time_total / self._waits if self._waits else 0.0
+            ),
+        }
+
+    async def _wait_for_session(self, start: float) -> Optional[PooledSession]:
+        """Wait for a returned context or a freed slot (None)."""
+        self._waiting += 1
+        try:
+            session = await self._idle.get()
+        finally:
+            self._waiting -= 1
+        waited = time.monotonic() - start
+        self._waits += 1
+        self._wait_time_total += waited
+        self._wait_time_max = max(self._wait_time_max, waited)
+
+        if self._closed:
+            if session is not None:
+                self._total -= 1
+                await self.client.close_session(session.session_id)
+            raise RuntimeError("Session pool is closed")
+        return session
+
+    def _expired(self, session: PooledSession) -> bool:
+        """Whether a session has reached its use-count or age limit."""
+        return session.use_count >= self.max_uses or session.age >= self.max_age
+
+    async def _create_session(self) -> PooledSession:
+        """Create a browser context owned by the pool."""
+        return PooledSession(await self.client.create_session())
+
+    async def _recycle(self, session: PooledSession) -> PooledSession:
+        """Replace a browser context with a fresh one, freeing its slot on failure."""
+        self._recycled += 1
+        try:
+            await self.client.close_session(session.session_id)
+        except Exception as e:
+            logger.error(f"Closing browser context failed: {str(e)}")
+        try:
+            return await self._create_session()
+        except Exception:
+            self._free_slot()
+            raise
+
+    def _free_slot(self) -> None:
+        """Give up a context's slot, letting a waiting caller create one."""
+        self._total -= 1
+        if not self._closed and self._waiting > self._vacancies:
+            # Waiters block on the idle queue, so the slot is queued as None
+            self._vacancies += 1
+            self._idle.put_nowait(None)
@@ -0,0 +1,399 @@
+"""
+Columnar in-memory store for captured network requests
+
+Keeps the common request fields in typed NumPy columns instead of one dict
+per request, while still behaving like the list of dicts the agents expect.
+"""
+
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Presence bits per row; a field whose value can't round-trip through its
+# typed column is kept in the row's extras instead
+_URL = 1
+_METHOD = 2
+_STATUS = 4
+_RESPONSE_TIME = 8
+_RESPONSE_TIME_INT = 16
+_TIMESTAMP = 32
+_TIMESTAMP_NS = 64
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_MAX_EXACT_FLOAT_INT = 2**53
+
+
+class NetworkRequestStore(Sequence):
+    """
+    Network requests stored as typed columns.
+
+    ``url`` and ``method`` are dictionary-encoded, ``status`` is int16,
+    ``response_time`` is float64, ``timestamp`` is naive datetime64[us] and
+    ``timestamp_ns`` (epoch nanoseconds) is int64.
+    Any other field, or a value that would not survive its column exactly
+    (e.g. a timezone-aware timestamp), is kept per row as-is.
+
+    Indexing and iteration return plain dicts equal to the ones appended, so
+    existing list-of-dicts consumers keep working; column() and to_frame()
+    expose the vectorized view.
+    """
+
+    COLUMNS = ("url", "method", "status", "response_time", "timestamp", "timestamp_ns")
+
+    def __init__(self, requests: Optional[Iterable[Dict[str, Any]]] = None):
+        """
+        Initialize the store.
+
+        Args:
+            requests: Optional network requests to load
+        """
+        self._size = 0
+        self._capacity = 0
+        self._url_codes = np.empty(0, dtype=np.int32)
+        self._method_codes = np.empty(0, dtype=np.int8)
+        self._status = np.empty(0, dtype=np.int16)
+        self._response_time = np.empty(0, dtype=np.float64)
+        self._timestamp = np.empty(0, dtype=np.int64)
+        self._timestamp_ns = np.empty(0, dtype=np.int64)
+        self._flags = np.empty(0, dtype=np.uint8)
+        self._extras: List[Optional[Dict[str, Any]]] = []
+
+        self._urls: List[str] = []
+        self._url_lookup: Dict[str, int] = {}
+        self._methods: List[str] = []
+        self._method_lookup: Dict[str, int] = {}
+
+        if requests is not None:
+            self.extend(requests)
+
+    def __len__(self) -> int:
+        """Number of stored requests."""
+        return self._size
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Materialize one request, or a list of requests for a slice.
+
+        Args:
+            index: Row position or slice
+
+        Returns:
+            Request dict, or list of request dicts
+        """
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._size))]
+
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("network request index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over requests as dicts."""
+        for i in range(self._size):
+            yield self._row(i)
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare with another sequence of request dicts."""
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """Short representation showing the row count."""
+        return f"NetworkRequestStore({self._size} requests)"
+
+    def append(self, request: Dict[str, Any]) -> None:
+        """
+        Add a network request.
+
+        Args:
+            request: Network request in the capture dict shape
+        """
+        if self._size == self._capacity:
+            self._grow(self._size + 1)
+
+        i = self._size
+        flags = 0
+        extras = None
+
+        for key, value in request.items():
+            if key == "url" and type(value) is str:
+                self._url_codes[i] = self._encode(value, self._urls, self._url_lookup)
+                flags |= _URL
+            elif key == "method" and type(value) is str and len(self._methods) < 127:
+                self._method_codes[i] = self._encode(
+                    value, self._methods, self._method_lookup
+                )
+                flags |= _METHOD
+            elif key == "status" and type(value) is int and -32768 <= value < 32768:
+                self._status[i] = value
+                flags |= _STATUS
+            elif key == "response_time" and type(value) is float:
+                self._response_time[i] = value
+                flags |= _RESPONSE_TIME
+            elif (
+                key == "response_time"
+                and type(value) is int
+                and abs(value) < _MAX_EXACT_FLOAT_INT
+            ):
+                self._response_time[i] = value
+                flags |= _RESPONSE_TIME | _RESPONSE_TIME_INT
+            elif (
+                key == "timestamp" and (micros := _encode_timestamp(value)) is not None
+            ):
+                self._timestamp[i] = micros
+                flags |= _TIMESTAMP
+            elif (
+                key == "timestamp_ns"
+                and type(value) is int
+                and -(2**63) <= value < 2**63
+            ):
+                self._timestamp_ns[i] = value
+                flags |= _TIMESTAMP_NS
+            else:
+                if extras is None:
+                    extras = {}
+                extras[key] = value
+
+        self._flags[i] = flags
+        self._extras.append(extras)
+        self._size += 1
+
+    def extend(self, requests: Iterable[Dict[str, Any]]) -> None:
+        """
+        Add several network requests.
+
+        Args:
+            requests: Network requests in the capture dict shape
+        """
+        if isinstance(requests, Sequence):
+            self._grow(self._size + len(requests))
+        for request in requests:
+            self.append(request)
+
+    def clear(self) -> None:
+        """Remove all requests."""
+        self.__init__()
+
+    def copy(self) -> "NetworkRequestStore":
+        """
+        Copy the store.
+
+        Returns:
+            Independent store holding the same requests
+        """
+        copied = NetworkRequestStore()
+        copied._size = copied._capacity = self._size
+        copied._url_codes = self._url_codes[: self._size].copy()
+        copied._method_codes = self._method_codes[: self._size].copy()
+        copied._status = self._status[: self._size].copy()
+        copied._response_time = self._response_time[: self._size].copy()
+        copied._timestamp = self._timestamp[: self._size].copy()
+        copied._timestamp_ns = self._timestamp_ns[: self._size].copy()
+        copied._flags = self._flags[: self._size].copy()
+        copied._extras = [
+            dict(extras) if extras is not None else None for extras in self._extras
+        ]
+        copied._urls = list(self._urls)
+        copied._url_lookup = dict(self._url_lookup)
+        copied._methods = list(self._methods)
+        copied._method_lookup = dict(self._method_lookup)
+        return copied
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Get a typed column for vectorized processing.
+
+        Missing values are None for url/method, -1 for status, NaN for
+        response_time, NaT for timestamp and -1 for timestamp_ns. Timestamps
+        kept outside the column (e.g. timezone-aware strings) also read as NaT.
+
+        Args:
+            name: One of COLUMNS
+
+        Returns:
+            Column values for every stored request
+        """
+        n = self._size
+        flags = self._flags[:n]
+
+        if name == "url":
+            values = np.asarray(self._urls + [None], dtype=object)
+            codes = np.where(flags & _URL, self._url_codes[:n], len(self._urls))
+            return values[codes]
+        if name == "method":
+            values = np.asarray(self._methods + [None], dtype=object)
+            codes = np.where(
+                flags & _METHOD, self._method_codes[:n], len(self._methods)
+            )
+            return values[codes]
+        if name == "status":
+            return np.where(flags & _STATUS, self._status[:n], -1).astype(np.int16)
+        if name == "response_time":
+            return np.where(flags & _RESPONSE_TIME, self._response_time[:n], np.nan)
+        if name == "timestamp":
+            timestamps = self._timestamp[:n].astype("datetime64[us]")
+            return np.where(flags & _TIMESTAMP, timestamps, np.datetime64("NaT"))
+        if name == "timestamp_ns":
+            return np.where(flags & _TIMESTAMP_NS, self._timestamp_ns[:n], -1)
+
+        raise KeyError(f"Unknown network request column: {name}")
+
+    def url_codes(self) -> np.ndarray:
+        """
+        Get dictionary codes for the url column.
+
+        Returns:
+            Code per request indexing url_categories(), -1 where url is missing
+        """
+        n = self._size
+        return np.where(self._flags[:n] & _URL, self._url_codes[:n], -1)
+
+    def url_categories(self) -> List[str]:
+        """
+        Get the distinct URLs referenced by url_codes().
+
+        Returns:
+            Distinct URLs in first-seen order
+        """
+        return list(self._urls)
+
+    def rows_with(self, *names: str) -> np.ndarray:
+        """
+        Find the requests with a non-empty value for any of the given fields.
+
+        Args:
+            names: Fields kept outside the typed columns (e.g. "response_body")
+
+        Returns:
+            Ascending row positions
+        """
+        return np.fromiter(
+            (
+                i
+                for i, extras in enumerate(self._extras)
+                if extras is not None and any(extras.get(name) for name in names)
+            ),
+            dtype=np.int64,
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Build a DataFrame over the typed columns.
+
+        Returns:
+            DataFrame with categorical url/method, nullable Int16 status,
+            float response_time, datetime timestamp and nullable Int64
+            timestamp_ns, one row per request
+        """
+        n = self._size
+        flags = self._flags[:n]
+
+        url_codes = np.where(flags & _URL, self._url_codes[:n], -1)
+        method_codes = np.where(flags & _METHOD, self._method_codes[:n], -1)
+
+        return pd.DataFrame(
+            {
+                "url": pd.Categorical.from_codes(url_codes, categories=self._urls),
+                "method": pd.Categorical.from_codes(
+                    method_codes, categories=self._methods
+                ),
+                "status": pd.arrays.IntegerArray(
+                    self._status[:n].copy(), (flags & _STATUS) == 0
+                ),
+                "response_time": self.column("response_time"),
+                "timestamp": self.column("timestamp"),
+                "timestamp_ns": pd.arrays.IntegerArray(
+                    self._timestamp_ns[:n].copy(), (flags & _TIMESTAMP_NS) == 0
+                ),
+            }
+        )
+
+    def _row(self, i: int) -> Dict[str, Any]:
+        """Materialize row i as a request dict."""
+        flags = int(self._flags[i])
+        row: Dict[str, Any] = {}
+
+        if flags & _URL:
+            row["url"] = self._urls[self._url_codes[i]]
+        if flags & _METHOD:
+            row["method"] = self._methods[self._method_codes[i]]
+        if flags & _STATUS:
+            row["status"] = int(self._status[i])
+        if flags & _RESPONSE_TIME_INT:
+            row["response_time"] = int(self._response_time[i])
+        elif flags & _RESPONSE_TIME:
+            row["response_time"] = float(self._response_time[i])
+        if flags & _TIMESTAMP:
+            row["timestamp"] = _decode_timestamp(int(self._timestamp[i]))
+        if flags & _TIMESTAMP_NS:
+            row["timestamp_ns"] = int(self._timestamp_ns[i])
+
+        extras = self._extras[i]
+        if extras is not None:
+            row.update(extras)
+        return row
+
+    def _grow(self, minimum: int) -> None:
+        """Grow every column to hold at least minimum rows."""
+        if minimum <= self._capacity:
+            return
+
+        capacity = max(minimum, self._capacity * 2, 64)
+        for name in (
+            "_url_codes",
+            "_method_codes",
+            "_status",
+            "_response_time",
+            "_timestamp",
+            "_timestamp_ns",
+            "_flags",
+        ):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            setattr(self, name, grown)
+        self._capacity = capacity
+
+    @staticmethod
+    def _encode(value: str, values: List[str], lookup: Dict[str, int]) -> int:
+        """Dictionary-encode a string value."""
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(values)
+            values.append(value)
+        return code
+
+
+def _encode_timestamp(value: Any) -> Optional[int]:
+    """
+    Encode a naive ISO timestamp as microseconds since 1970-01-01.
+
+    Returns None unless decoding gives back exactly the same string.
+    """
+    if type(value) is not str:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        return None
+
+    micros = (parsed - _EPOCH) // _MICROSECOND
+    return micros if _decode_timestamp(micros) == value else None
+
+
+def _decode_timestamp(micros: int) -> str:
+    """Decode microseconds since 1970-01-01 into a naive ISO timestamp."""
+    return (_EPOCH + timedelta(microseconds=micros)).isoformat()
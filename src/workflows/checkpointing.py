@@ -0,0 +1,756 @@
+"""
+Delta-based SQLite checkpointer for long reverse engineering runs
+
+Persists LangGraph checkpoints to a local SQLite file so an exploration can
+be resumed after the process dies. Capture streams only ever grow, so each
+checkpoint stores just the entries appended since the previous one, and
+channels whose value did not change are stored as a reference instead of a
+copy. Every few checkpoints a channel is written in full again, bounding
+how many deltas a resume has to replay.
+"""
+
+from contextlib import closing
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+import hashlib
+import logging
+import random
+import sqlite3
+import threading
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+logger = logging.getLogger(__name__)
+
+# State keys that are only ever appended to during a run
+APPEND_ONLY_CHANNELS = (
+    "user_interactions",
+    "playwright_logs",
+    "network_requests",
+    "dom_changes",
+    "discovery_history",
+)
+
+# State keys rebuilt from the capture streams on resume instead of stored
+DERIVED_CHANNELS = ("processed_interactions",)
+
+# Blob kinds: a full value, entries appended to the base version's value, the
+# base version's value unchanged, or no value at all
+_SNAPSHOT = "snapshot"
+_APPEND = "append"
+_UNCHANGED = "unchanged"
+_EMPTY = "empty"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS channel_blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    base_version TEXT,
+    length INTEGER,
+    depth INTEGER NOT NULL DEFAULT 0,
+    digest TEXT,
+    type TEXT,
+    data BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    base_version TEXT,
+    type TEXT,
+    data BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+
+class DeltaSQLiteSaver(BaseCheckpointSaver[str]):
+    """
+    SQLite checkpointer that stores per-checkpoint deltas.
+
+    Channels listed in append_only_channels are stored as the entries
+    appended since the parent checkpoint's version, guarded by a digest of
+    the last entry the base held; a list that was replaced or truncated is
+    stored in full instead. Other channels are stored in full only when
+    their serialized value changed. A channel is snapshotted again once its
+    delta chain reaches snapshot_interval, so a resume replays at most that
+    many deltas per channel. Channels listed in derived_channels are not
+    stored at all.
+
+    Values are serialized with the LangGraph JSON+msgpack serializer, with
+    pickle as the fallback for types it can't encode (e.g. the columnar
+    network request store); only open databases this process wrote.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        snapshot_interval: int = 20,
+        append_only_channels: Iterable[str] = APPEND_ONLY_CHANNELS,
+        derived_channels: Iterable[str] = DERIVED_CHANNELS,
+        serde: Optional[SerializerProtocol] = None,
+    ):
+        """
+        Initialize the checkpointer.
+
+        Args:
+            path: SQLite database file, or ":memory:" for a throwaway store
+            snapshot_interval: Deltas stored per channel before it is
+                written in full again
+            append_only_channels: Channels whose values only ever grow
+            derived_channels: Channels recomputed on resume rather than stored
+            serde: Serializer for channel values and checkpoint metadata
+        """
+        super().__init__(serde=serde or JsonPlusSerializer(pickle_fallback=True))
+        self.path = str(path)
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.append_only_channels = frozenset(append_only_channels)
+        self.derived_channels = frozenset(derived_channels)
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self.conn.close()
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """
+        Load a checkpoint with its channel values and pending writes.
+
+        Args:
+            config: Config with a thread_id and, optionally, a checkpoint_id;
+                without one the thread's latest checkpoint is loaded
+
+        Returns:
+            The checkpoint tuple, or None if there is no such checkpoint
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        query = (
+            "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+            "metadata_type, metadata FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        params: Tuple[Any, ...] = (thread_id, checkpoint_ns)
+        if checkpoint_id:
+            query += " AND checkpoint_id = ?"
+            params += (checkpoint_id,)
+        else:
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+
+        with self._lock, closing(self.conn.cursor()) as cur:
+            row = cur.execute(query, params).fetchone()
+            if row is None:
+                return None
+            return self._load_tuple(cur, thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        List checkpoints, newest first.
+
+        Args:
+            config: Config selecting a thread (and optionally namespace and
+                checkpoint); None lists every thread
+            filter: Metadata key/value pairs a checkpoint must match
+            before: Only list checkpoints older than this config's checkpoint
+            limit: Maximum number of checkpoints to return
+
+        Yields:
+            Matching checkpoint tuples
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if config:
+            configurable = config["configurable"]
+            clauses.append("thread_id = ?")
+            params.append(configurable["thread_id"])
+            if configurable.get("checkpoint_ns") is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(configurable["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "type, checkpoint, metadata_type, metadata FROM checkpoints"
+        )
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock, closing(self.conn.cursor()) as cur:
+            rows = cur.execute(query, params).fetchall()
+
+        remaining = limit
+        for thread_id, checkpoint_ns, *row in rows:
+            if remaining is not None and remaining <= 0:
+                break
+            if filter:
+                metadata = self.serde.loads_typed((row[4], row[5]))
+                if not all(metadata.get(k) == v for k, v in filter.items()):
+                    continue
+
+            with self._lock, closing(self.conn.cursor()) as cur:
+                item = self._load_tuple(cur, thread_id, checkpoint_ns, row)
+            yield item
+
+            if remaining is not None:
+                remaining -= 1
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """
+        Store a checkpoint, writing only what changed for each new version.
+
+        Args:
+            config: Config of the parent checkpoint
+            checkpoint: Checkpoint to store
+            metadata: Metadata for the checkpoint
+            new_versions: Channel versions created since the parent checkpoint
+
+        Returns:
+            Config pointing at the stored checkpoint
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        parent_id = configurable.get("checkpoint_id")
+
+        stored = checkpoint.copy()
+        values: Dict[str, Any] = stored.pop("channel_values")
+        checkpoint_type, checkpoint_data = self.serde.dumps_typed(stored)
+        metadata_type, metadata_data = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+
+        with self._lock, self.conn, closing(self.conn.cursor()) as cur:
+            parent_versions = self._channel_versions(
+                cur, thread_id, checkpoint_ns, parent_id
+            )
+            for channel, version in new_versions.items():
+                base_version = parent_versions.get(channel)
+                base = (
+                    self._blob_header(
+                        cur, thread_id, checkpoint_ns, channel, base_version
+                    )
+                    if base_version is not None
+                    else None
+                )
+                blob = self._encode_blob(channel, values, base_version, base)
+                cur.execute(
+                    "INSERT OR REPLACE INTO channel_blobs (thread_id, checkpoint_ns, "
+                    "channel, version, kind, base_version, length, depth, digest, "
+                    "type, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, channel, str(version), *blob),
+                )
+
+            cur.execute(
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, "
+                "checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                "metadata_type, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    parent_id,
+                    checkpoint_type,
+                    checkpoint_data,
+                    metadata_type,
+                    metadata_data,
+                ),
+            )
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """
+        Store writes made by a task on top of a checkpoint.
+
+        Writes to append-only channels are stored as the entries added to the
+        checkpoint's value for that channel, and writes of any other channel
+        that leave the checkpoint's value unchanged as a reference to it.
+        Writes to derived channels are not stored.
+
+        Args:
+            config: Config of the checkpoint the writes apply to
+            writes: (channel, value) pairs written by the task
+            task_id: Identifier of the task
+            task_path: Path of the task, used to order replayed writes
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = configurable["checkpoint_id"]
+
+        with self._lock, self.conn, closing(self.conn.cursor()) as cur:
+            versions = self._channel_versions(
+                cur, thread_id, checkpoint_ns, checkpoint_id
+            )
+            for idx, (channel, value) in enumerate(writes):
+                if channel in self.derived_channels:
+                    continue
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                # Special writes (errors, interrupts) replace earlier ones
+                verb = "INSERT OR REPLACE" if write_idx < 0 else "INSERT OR IGNORE"
+
+                base_version = versions.get(channel)
+                base = (
+                    self._blob_header(
+                        cur, thread_id, checkpoint_ns, channel, base_version
+                    )
+                    if base_version is not None
+                    else None
+                )
+                tail = self._appended(channel, value, base)
+                if tail is not None:
+                    value_type, value_data = self.serde.dumps_typed(tail)
+                else:
+                    value_type, value_data = self.serde.dumps_typed(value)
+                    if (
+                        channel not in self.append_only_channels
+                        and base is not None
+                        and base[3] == hashlib.sha1(value_data).hexdigest()
+                    ):
+                        # Same value as the checkpoint's: keep a reference only
+                        value_type = value_data = None
+                    else:
+                        base_version = None
+
+                cur.execute(
+                    f"{verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, "
+                    "task_id, idx, channel, task_path, base_version, type, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint_id,
+                        task_id,
+                        write_idx,
+                        channel,
+                        task_path,
+                        None if base_version is None else str(base_version),
+                        value_type,
+                        value_data,
+                    ),
+                )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """
+        Delete every checkpoint, blob and write of a thread.
+
+        Args:
+            thread_id: Thread to delete
+        """
+        with self._lock, self.conn:
+            for table in ("checkpoints", "channel_blobs", "writes"):
+                self.conn.execute(
+                    f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,)
+                )
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Async version of get_tuple()."""
+        return self.get_tuple(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Async version of list()."""
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Async version of put()."""
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Async version of put_writes()."""
+        self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Async version of delete_thread()."""
+        self.delete_thread(thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        """
+        Generate the next version of a channel.
+
+        Versions are zero-padded counters with a random suffix, so they sort
+        as strings and never collide across forks of the same thread.
+
+        Args:
+            current: Current version of the channel, if any
+            channel: Unused, kept for interface compatibility
+
+        Returns:
+            The next version
+        """
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    def storage_stats(self, thread_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Summarize how channel values are stored.
+
+        Args:
+            thread_id: Restrict the summary to one thread
+
+        Returns:
+            Blob counts by kind and total serialized bytes of blobs and writes
+        """
+        where = " WHERE thread_id = ?" if thread_id is not None else ""
+        params = (thread_id,) if thread_id is not None else ()
+
+        with self._lock, closing(self.conn.cursor()) as cur:
+            kinds = dict(
+                cur.execute(
+                    f"SELECT kind, COUNT(*) FROM channel_blobs{where} GROUP BY kind",
+                    params,
+                ).fetchall()
+            )
+            blob_bytes = cur.execute(
+                f"SELECT COALESCE(SUM(LENGTH(data)), 0) FROM channel_blobs{where}",
+                params,
+            ).fetchone()[0]
+            write_bytes = cur.execute(
+                f"SELECT COALESCE(SUM(LENGTH(data)), 0) FROM writes{where}", params
+            ).fetchone()[0]
+            checkpoints = cur.execute(
+                f"SELECT COUNT(*) FROM checkpoints{where}", params
+            ).fetchone()[0]
+
+        return {
+            "checkpoints": checkpoints,
+            "blobs": {
+                kind: kinds.get(kind, 0)
+                for kind in (_SNAPSHOT, _APPEND, _UNCHANGED, _EMPTY)
+            },
+            "blob_bytes": blob_bytes,
+            "write_bytes": write_bytes,
+        }
+
+    def _encode_blob(
+        self,
+        channel: str,
+        values: Dict[str, Any],
+        base_version: Any,
+        base: Optional[Tuple[str, Optional[int], int, Optional[str]]],
+    ) -> Tuple[Any, ...]:
+        """
+        Encode one channel version relative to the parent's version.
+
+        Returns:
+            Row values (kind, base_version, length, depth, digest, type, data)
+        """
+        if channel not in values or channel in self.derived_channels:
+            return (_EMPTY, None, None, 0, None, None, None)
+
+        value = values[channel]
+        depth = base[2] + 1 if base is not None else 0
+        compact = depth > self.snapshot_interval
+
+        if channel in self.append_only_channels and _is_sequence(value):
+            length = len(value)
+            digest = self._digest(value[length - 1]) if length else None
+            tail = None if compact else self._appended(channel, value, base)
+            if tail is None:
+                value_type, value_data = self.serde.dumps_typed(value)
+                return (_SNAPSHOT, None, length, 0, digest, value_type, value_data)
+            if not tail:
+                return (
+                    _UNCHANGED,
+                    str(base_version),
+                    length,
+                    depth,
+                    digest,
+                    None,
+                    None,
+                )
+            value_type, value_data = self.serde.dumps_typed(tail)
+            return (
+                _APPEND,
+                str(base_version),
+                length,
+                depth,
+                digest,
+                value_type,
+                value_data,
+            )
+
+        value_type, value_data = self.serde.dumps_typed(value)
+        digest = hashlib.sha1(value_data).hexdigest()
+        if not compact and base is not None and base[3] == digest:
+            return (_UNCHANGED, str(base_version), None, depth, digest, None, None)
+        return (_SNAPSHOT, None, None, 0, digest, value_type, value_data)
+
+    def _appended(
+        self,
+        channel: str,
+        value: Any,
+        base: Optional[Tuple[str, Optional[int], int, Optional[str]]],
+    ) -> Optional[List[Any]]:
+        """
+        Entries appended to a channel's base value.
+
+        Returns:
+            The new entries, or None when value isn't an extension of the base
+            (not append-only, base missing, list replaced or truncated)
+        """
+        if (
+            channel not in self.append_only_channels
+            or not _is_sequence(value)
+            or base is None
+            or base[0] == _EMPTY
+            or base[1] is None
+        ):
+            return None
+
+        base_length, base_digest = base[1], base[3]
+        if len(value) < base_length:
+            return None
+        if base_length and self._digest(value[base_length - 1]) != base_digest:
+            return None
+        return list(value[base_length:])
+
+    def _digest(self, entry: Any) -> str:
+        """Digest of one serialized entry."""
+        return hashlib.sha1(self.serde.dumps_typed(entry)[1]).hexdigest()
+
+    def _channel_versions(
+        self,
+        cur: sqlite3.Cursor,
+        thread_id: str,
+        checkpoint_ns: str,
+        checkpoint_id: Optional[str],
+    ) -> Dict[str, Any]:
+        """Channel versions recorded by a stored checkpoint."""
+        if checkpoint_id is None:
+            return {}
+        row = cur.execute(
+            "SELECT type, checkpoint FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchone()
+        if row is None:
+            return {}
+        return self.serde.loads_typed(row)["channel_versions"]
+
+    @staticmethod
+    def _blob_header(
+        cur: sqlite3.Cursor,
+        thread_id: str,
+        checkpoint_ns: str,
+        channel: str,
+        version: Any,
+    ) -> Optional[Tuple[str, Optional[int], int, Optional[str]]]:
+        """Kind, length, chain depth and digest of a stored channel version."""
+        return cur.execute(
+            "SELECT kind, length, depth, digest FROM channel_blobs "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+            (thread_id, checkpoint_ns, channel, str(version)),
+        ).fetchone()
+
+    def _load_channel(
+        self,
+        cur: sqlite3.Cursor,
+        thread_id: str,
+        checkpoint_ns: str,
+        channel: str,
+        version: Any,
+    ) -> Tuple[bool, Any]:
+        """
+        Rebuild a channel value by replaying deltas onto its last snapshot.
+
+        Returns:
+            Tuple of (whether the channel has a value, the value)
+        """
+        chain = []
+        version = str(version)
+        while True:
+            row = cur.execute(
+                "SELECT kind, base_version, type, data FROM channel_blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? "
+                "AND version = ?",
+                (thread_id, checkpoint_ns, channel, version),
+            ).fetchone()
+            if row is None:
+                logger.error(f"Missing checkpoint blob for {channel}@{version}")
+                return False, None
+            chain.append(row)
+            if row[0] in (_SNAPSHOT, _EMPTY):
+                break
+            version = row[1]
+
+        if chain[-1][0] == _EMPTY:
+            return False, None
+
+        value = self.serde.loads_typed((chain[-1][2], chain[-1][3]))
+        for kind, _, value_type, value_data in reversed(chain[:-1]):
+            if kind == _APPEND:
+                value.extend(self.serde.loads_typed((value_type, value_data)))
+        return True, value
+
+    def _load_tuple(
+        self,
+        cur: sqlite3.Cursor,
+        thread_id: str,
+        checkpoint_ns: str,
+        row: Sequence[Any],
+    ) -> CheckpointTuple:
+        """Build a checkpoint tuple from a checkpoints row."""
+        checkpoint_id, parent_id, checkpoint_type, checkpoint_data = row[:4]
+        checkpoint = self.serde.loads_typed((checkpoint_type, checkpoint_data))
+
+        channel_values = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            found, value = self._load_channel(
+                cur, thread_id, checkpoint_ns, channel, version
+            )
+            if found:
+                channel_values[channel] = value
+
+        pending_writes = []
+        for task_id, channel, base_version, value_type, value_data in cur.execute(
+            "SELECT task_id, channel, base_version, type, data FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall():
+            if base_version is None:
+                value = self.serde.loads_typed((value_type, value_data))
+            else:
+                _, value = self._load_channel(
+                    cur, thread_id, checkpoint_ns, channel, base_version
+                )
+                # Writes without data reference the base value unchanged
+                if value_type is not None:
+                    value.extend(self.serde.loads_typed((value_type, value_data)))
+            pending_writes.append((task_id, channel, value))
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self.serde.loads_typed((row[4], row[5])),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+            pending_writes=pending_writes,
+        )
+
+
+def _is_sequence(value: Any) -> bool:
+    """Whether a value is a list-like capture stream."""
+    return hasattr(value, "extend") and hasattr(value, "__getitem__")
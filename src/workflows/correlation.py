@@ -0,0 +1,301 @@
+"""
+Time-indexed correlation of browser interactions with network traffic
+
+Sorts captured streams once by timestamp and answers window queries with
+bisect, so correlating L log entries with R network requests costs
+O((L + R) log R + matches) instead of O(L x R). Entries carrying epoch
+nanoseconds under ``timestamp_ns`` are indexed by them; only entries without
+them have their ISO-8601 ``timestamp`` parsed.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import math
+
+_NS_PER_SECOND = 1_000_000_000
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """
+    Convert a captured timestamp into epoch seconds.
+
+    Args:
+        value: ISO-8601 string, datetime, or epoch seconds
+
+    Returns:
+        Epoch seconds, or None if the value cannot be interpreted
+    """
+    if value is None or isinstance(value, bool):
+        return None
+
+    if isinstance(value, (int, float)):
+        return float(value) if math.isfinite(value) else None
+
+    if isinstance(value, datetime):
+        return value.timestamp()
+
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return None
+
+    return None
+
+
+def entry_timestamp(entry: Dict[str, Any]) -> Optional[float]:
+    """
+    Get a captured entry's time in epoch seconds.
+
+    Args:
+        entry: Captured entry with "timestamp_ns" and/or "timestamp"
+
+    Returns:
+        Epoch seconds, or None if the entry has no usable timestamp
+    """
+    timestamp_ns = entry.get("timestamp_ns")
+    if type(timestamp_ns) is int:
+        return timestamp_ns / _NS_PER_SECOND
+    return parse_timestamp(entry.get("timestamp"))
+
+
+class TimeIndex:
+    """
+    Entries ordered by (timestamp, arrival sequence).
+
+    Entries whose timestamp cannot be parsed are not indexed and therefore
+    never match a window query.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._keys: List[Tuple[float, int]] = []
+        self._entries: List[Any] = []
+        self._consumed = 0
+
+    def __len__(self) -> int:
+        """Number of indexed entries."""
+        return len(self._keys)
+
+    @property
+    def consumed(self) -> int:
+        """Number of entries offered to the index, including unparseable ones."""
+        return self._consumed
+
+    def extend(
+        self, entries: Iterable[Dict[str, Any]], values: Optional[Iterable[Any]] = None
+    ) -> None:
+        """
+        Add entries to the index.
+
+        Sequence numbers continue from previously added entries, so ties on
+        timestamp keep arrival order.
+
+        Args:
+            entries: Captured entries carrying a "timestamp_ns" or
+                "timestamp" field
+            values: Optional values to store instead of the entries themselves
+        """
+        new_keys = []
+        new_entries = []
+        values = iter(values) if values is not None else None
+
+        for entry in entries:
+            value = next(values) if values is not None else entry
+            seq = self._consumed
+            self._consumed += 1
+
+            timestamp = entry_timestamp(entry)
+            if timestamp is None:
+                continue
+
+            new_keys.append((timestamp, seq))
+            new_entries.append(value)
+
+        if not new_keys:
+            return
+
+        # Captures arrive in (roughly) time order; only re-sort when they don't
+        in_order = all(a <= b for a, b in zip(new_keys, new_keys[1:]))
+        if in_order and (not self._keys or self._keys[-1] <= new_keys[0]):
+            self._keys.extend(new_keys)
+            self._entries.extend(new_entries)
+            return
+
+        merged = sorted(
+            zip(self._keys + new_keys, self._entries + new_entries),
+            key=lambda pair: pair[0],
+        )
+        self._keys = [key for key, _ in merged]
+        self._entries = [entry for _, entry in merged]
+
+    def between(self, start: float, end: float) -> List[Any]:
+        """
+        Return entries with timestamps in [start, end].
+
+        Args:
+            start: Window start in epoch seconds
+            end: Window end in epoch seconds
+
+        Returns:
+            Matching entries ordered by timestamp, then arrival
+        """
+        lo = bisect_left(self._keys, (start, -1))
+        hi = bisect_right(self._keys, (end, math.inf))
+        return self._entries[lo:hi]
+
+    def window(self, timestamp: float, before: float, after: float) -> List[Any]:
+        """
+        Return entries with timestamps in [timestamp - before, timestamp + after].
+
+        Args:
+            timestamp: Centre of the window in epoch seconds
+            before: Seconds to include before the centre
+            after: Seconds to include after the centre
+
+        Returns:
+            Matching entries ordered by timestamp, then arrival
+        """
+        return self.between(timestamp - before, timestamp + after)
+
+
+class DataCorrelationEngine:
+    """
+    Correlates browser interaction logs with network requests and DOM changes by time.
+
+    A log entry is matched with every request whose timestamp falls inside
+    its window, and a request may match any number of log entries. Log
+    entries are indexed too, so the entries affected by late-arriving
+    requests can be found without rescanning every log.
+    """
+
+    def __init__(self, time_window: float = 2.0, window_after: Optional[float] = None):
+        """
+        Initialize the correlation engine.
+
+        Args:
+            time_window: Seconds before a log entry to search for requests
+            window_after: Seconds after a log entry to search (defaults to time_window)
+        """
+        self.window_before = time_window
+        self.window_after = time_window if window_after is None else window_after
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop everything indexed so far."""
+        self.requests = TimeIndex()
+        self.dom_changes = TimeIndex()
+        self.logs = TimeIndex()
+
+    def add_requests(self, network_requests: Iterable[Dict[str, Any]]) -> None:
+        """
+        Index additional network requests.
+
+        Args:
+            network_requests: Newly captured network requests
+        """
+        self.requests.extend(network_requests)
+
+    def add_dom_changes(self, dom_changes: Iterable[Dict[str, Any]]) -> None:
+        """
+        Index additional DOM change events.
+
+        Args:
+            dom_changes: Newly captured DOM change events
+        """
+        self.dom_changes.extend(dom_changes)
+
+    def add_logs(self, playwright_logs: List[Dict[str, Any]]) -> None:
+        """
+        Index additional log entries by their position in the log stream.
+
+        Args:
+            playwright_logs: Newly captured log entries, in stream order
+        """
+        start = self.logs.consumed
+        self.logs.extend(playwright_logs, range(start, start + len(playwright_logs)))
+
+    def correlate_entry(self, log_entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Find indexed network requests inside a log entry's window.
+
+        Args:
+            log_entry: Browser interaction log entry
+
+        Returns:
+            Correlated network requests ordered by timestamp
+        """
+        timestamp = entry_timestamp(log_entry)
+        if timestamp is None:
+            return []
+
+        return self.requests.window(timestamp, self.window_before, self.window_after)
+
+    def correlate_dom_changes(self, log_entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Find indexed DOM changes inside a log entry's window.
+
+        Args:
+            log_entry: Browser interaction log entry
+
+        Returns:
+            Correlated DOM change events ordered by timestamp
+        """
+        timestamp = entry_timestamp(log_entry)
+        if timestamp is None:
+            return []
+
+        return self.dom_changes.window(timestamp, self.window_before, self.window_after)
+
+    def affected_logs(self, entries: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Find indexed log positions whose window contains any of the entries.
+
+        Args:
+            entries: Requests or DOM changes that were just captured
+
+        Returns:
+            Sorted log stream positions that need re-correlation
+        """
+        timestamps = sorted(
+            t for t in (entry_timestamp(entry) for entry in entries) if t is not None
+        )
+
+        # A log at t_log sees an entry at t when t_log is in [t - after, t + before];
+        # merge overlapping ranges so each log position is looked up once
+        positions = set()
+        start = end = None
+        for timestamp in timestamps:
+            lo, hi = timestamp - self.window_after, timestamp + self.window_before
+            if end is not None and lo <= end:
+                end = max(end, hi)
+                continue
+            if start is not None:
+                positions.update(self.logs.between(start, end))
+            start, end = lo, hi
+        if start is not None:
+            positions.update(self.logs.between(start, end))
+
+        return sorted(positions)
+
+    def correlate(
+        self,
+        playwright_logs: Iterable[Dict[str, Any]],
+        network_requests: Iterable[Dict[str, Any]],
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Correlate every log entry with the network requests around it.
+
+        The requests are added to the engine's index, so later calls keep
+        matching against them.
+
+        Args:
+            playwright_logs: Browser interaction log entries
+            network_requests: Captured network requests
+
+        Returns:
+            One list of correlated requests per log entry, in log order
+        """
+        self.add_requests(network_requests)
+        return [self.correlate_entry(log_entry) for log_entry in playwright_logs]
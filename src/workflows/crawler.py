@@ -0,0 +1,504 @@
+"""
+Novelty-prioritized crawling of the legacy UI
+
+Scripted journeys only cover what someone wrote down. The crawler explores
+the application on its own: it keeps a frontier of the actions (links and
+clickable elements) offered by every UI state it has reached, and always
+tries the action most likely to reveal API endpoints it hasn't seen yet.
+
+Two things keep the number of browser actions far below a brute-force walk
+of every action in every state:
+
+* UI states are identified by the URL's path shape and a hash of the DOM
+  structure that ignores text, attribute values and repeated siblings, so
+  the same screen showing different records (or a different number of
+  table rows) is one state.
+* Actions are deduplicated by signature: a link by the shape of its target
+  URL, a click by its page's path shape and its label, so a navigation menu
+  repeated on every page is followed once.
+
+Priorities are learned as the crawl goes: each action's label words, kind
+and target path share a running average of the new endpoints their actions
+revealed, starting optimistic so untried kinds of actions get a chance.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Pattern, Tuple
+from urllib.parse import urldefrag, urljoin, urlsplit
+import hashlib
+import heapq
+import logging
+import re
+import time
+
+from src.integrations.dom_capture import post_order
+from src.integrations.playwright_mcp import PlaywrightMCPClient
+
+logger = logging.getLogger(__name__)
+
+# Labels of actions never taken: they destroy data or end the session
+DEFAULT_AVOID = r"\b(delete|remove|purge|log ?out|log ?off|sign ?out)\b"
+
+# Attributes whose values change what an element is, not just what it shows
+STRUCTURAL_ATTRIBUTES = ("type", "role")
+
+CLICKABLE_ROLES = ("button", "link", "tab", "menuitem", "option")
+
+_WORD = re.compile(r"[a-z]+")
+_DIGITS = re.compile(r"\d+")
+
+
+def dom_structure_hash(dom: Dict[str, Any]) -> str:
+    """
+    Hash the structure of a DOM tree.
+
+    Tags, attribute names and the values of STRUCTURAL_ATTRIBUTES count;
+    text and other attribute values don't, and runs of structurally equal
+    siblings (table rows, list items) count once.
+
+    Args:
+        dom: DOM tree from PlaywrightMCPClient.snapshot_page
+
+    Returns:
+        Hex digest of the tree's structure
+    """
+    digests: Dict[int, str] = {}
+    for node in post_order(dom):
+        attrs = node.get("attrs") or {}
+        parts = [str(node.get("tag", ""))]
+        parts.extend(
+            f"{name}={attrs[name]}" if name in STRUCTURAL_ATTRIBUTES else name
+            for name in sorted(attrs)
+            if name != "ref"
+        )
+        previous = None
+        for child in node.get("children") or ():
+            digest = digests.pop(id(child))
+            if digest != previous:
+                parts.append(digest)
+            previous = digest
+        digests[id(node)] = hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
+    return digests[id(dom)]
+
+
+def page_actions(dom: Dict[str, Any], page_url: str) -> List[Dict[str, Any]]:
+    """
+    Find the actions a page offers.
+
+    Links to the page's own origin become navigate steps and buttons,
+    submit inputs and elements with a clickable role or an onclick handler
+    become click steps, in the step format of execute_user_journey.
+
+    Args:
+        dom: DOM tree from PlaywrightMCPClient.snapshot_page
+        page_url: URL of the page, for resolving relative links
+
+    Returns:
+        Journey steps, in document order
+    """
+    origin = urlsplit(page_url).netloc
+    actions = []
+    for node in _pre_order(dom):
+        tag = str(node.get("tag", "")).lower()
+        attrs = node.get("attrs") or {}
+        href = attrs.get("href")
+        if tag == "a" and href and not href.startswith(("#", "javascript:", "mailto:")):
+            url = urldefrag(urljoin(page_url, href))[0]
+            if urlsplit(url).netloc == origin:
+                actions.append({"action": "navigate", "url": url})
+        elif (
+            tag == "button"
+            or (tag == "input" and attrs.get("type") in ("submit", "button"))
+            or attrs.get("role") in CLICKABLE_ROLES
+            or "onclick" in attrs
+        ):
+            label = _label(node)
+            actions.append(
+                {
+                    "action": "click",
+                    "element": label,
+                    "selector": _selector(tag, attrs, label),
+                }
+            )
+    return actions
+
+
+def action_signature(step: Dict[str, Any], page_url: str) -> str:
+    """
+    Identify the actions expected to have the same effect.
+
+    Args:
+        step: Journey step from page_actions
+        page_url: URL of the page offering the step
+
+    Returns:
+        "navigate" and the target's URL shape, or "click", the page's path
+        shape and the label, with digit runs replaced by "0"
+    """
+    if step["action"] == "navigate":
+        return f"navigate {_shape(step['url'])}"
+    path = _shape(urlsplit(page_url).path)
+    label = _shape(step["element"].lower())
+    return f"click {path} {label}"
+
+
+def action_features(step: Dict[str, Any]) -> List[str]:
+    """
+    Describe a step by what it shares with other steps.
+
+    Args:
+        step: Journey step from page_actions
+
+    Returns:
+        The step's kind, the words of a click's label and the first path
+        segment of a link's target
+    """
+    features = [step["action"]]
+    if step["action"] == "navigate":
+        segments = [s for s in urlsplit(step["url"]).path.split("/") if s]
+        if segments:
+            features.append(f"path:{segments[0].lower()}")
+    else:
+        features.extend(f"word:{w}" for w in _WORD.findall(step["element"].lower()))
+    return features
+
+
+def endpoint_key(request: Dict[str, Any]) -> str:
+    """
+    Identify the endpoint a captured request called.
+
+    Args:
+        request: Captured network request
+
+    Returns:
+        The method and the URL without its query, digit runs replaced by "0"
+    """
+    url = str(request.get("url", "")).split("?", 1)[0]
+    return f"{request.get('method', 'GET')} {_shape(url)}"
+
+
+class CrawlFrontier:
+    """
+    Priority queue of untried actions from the UI states reached so far.
+
+    An action's priority is the average discovery yield of its features
+    minus a cost per step of the path that leads back to its state.
+    Priorities change as yields are recorded; popped entries are rescored
+    and put back when they no longer lead.
+    """
+
+    def __init__(self, prior_yield: float = 1.0, depth_cost: float = 0.1):
+        """
+        Initialize the crawl frontier.
+
+        Args:
+            prior_yield: Yield assumed for features never tried; an
+                optimistic prior explores every kind of action early
+            depth_cost: Priority lost per step needed to reach a state
+        """
+        self.prior_yield = prior_yield
+        self.depth_cost = depth_cost
+        self.states: Dict[str, Dict[str, Any]] = {}
+        self.tried: set = set()
+        self._queued: set = set()
+        self._yields: Dict[str, List[float]] = {}
+        self._heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._seq = 0
+
+    def add_state(
+        self,
+        key: str,
+        url: str,
+        path: List[Dict[str, Any]],
+        actions: List[Dict[str, Any]],
+    ) -> bool:
+        """
+        Register a UI state and queue its untried actions.
+
+        Args:
+            key: State key (see UICrawler.state_key)
+            url: URL the state was reached at
+            path: Journey steps that lead to the state from a fresh page
+            actions: Steps the state offers, from page_actions
+
+        Returns:
+            False if the state was already known
+        """
+        if key in self.states:
+            return False
+        self.states[key] = {"url": url, "path": path}
+        for step in actions:
+            signature = action_signature(step, url)
+            if signature in self.tried or signature in self._queued:
+                continue
+            self._queued.add(signature)
+            self._push(
+                {"state": key, "step": step, "signature": signature, "depth": len(path)}
+            )
+        return True
+
+    def pop(self) -> Optional[Dict[str, Any]]:
+        """
+        Take the most promising untried action.
+
+        Returns:
+            Entry with the state key, journey step, signature and depth, or
+            None once the frontier is empty
+        """
+        while self._heap:
+            _, _, entry = heapq.heappop(self._heap)
+            score = self.score(entry)
+            if self._heap and score < -self._heap[0][0]:
+                # Outranked since it was queued: requeue at its current score
+                self._push(entry, score)
+                continue
+            self._queued.discard(entry["signature"])
+            self.tried.add(entry["signature"])
+            return entry
+        return None
+
+    def record(self, step: Dict[str, Any], new_endpoints: int) -> None:
+        """
+        Learn from the endpoints an action revealed.
+
+        Args:
+            step: Journey step that was executed
+            new_endpoints: Endpoints never seen before the step
+        """
+        for feature in action_features(step):
+            totals = self._yields.setdefault(feature, [0.0, 0])
+            totals[0] += new_endpoints
+            totals[1] += 1
+
+    def score(self, entry: Dict[str, Any]) -> float:
+        """
+        Priority of a frontier entry under the yields recorded so far.
+
+        Args:
+            entry: Frontier entry
+
+        Returns:
+            Expected new endpoints, less the cost of getting to its state
+        """
+        features = action_features(entry["step"])
+        expected = sum(
+            (total + self.prior_yield) / (count + 1)
+            for total, count in (self._yields.get(f, (0.0, 0)) for f in features)
+        ) / len(features)
+        return expected - self.depth_cost * entry["depth"]
+
+    def __len__(self) -> int:
+        """Number of queued actions."""
+        return len(self._heap)
+
+    def _push(self, entry: Dict[str, Any], score: Optional[float] = None) -> None:
+        """Queue an entry, highest score first and FIFO among equals."""
+        if score is None:
+            score = self.score(entry)
+        self._seq += 1
+        heapq.heappush(self._heap, (-score, self._seq, entry))
+
+
+class UICrawler:
+    """
+    Explores an application through a Playwright client under a time budget.
+
+    Every action's network requests land in the client's capture buffers
+    like those of any journey, ready to be drained into the workflow state.
+    """
+
+    def __init__(
+        self,
+        client: PlaywrightMCPClient,
+        time_budget: float = 300.0,
+        max_actions: Optional[int] = None,
+        avoid: Optional[str] = DEFAULT_AVOID,
+        frontier: Optional[CrawlFrontier] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the crawler.
+
+        Args:
+            client: Client driving the browser
+            time_budget: Seconds of exploration before the crawl stops
+            max_actions: Browser actions (including steps replayed to get
+                back to a state) before the crawl stops, or None
+            avoid: Regular expression (case-insensitive) of labels and URLs
+                never acted on, or None to allow everything
+            frontier: Frontier to explore from (defaults to a new one)
+            clock: Source of the current time in seconds
+        """
+        self.client = client
+        self.time_budget = time_budget
+        self.max_actions = max_actions
+        self.avoid: Optional[Pattern] = re.compile(avoid, re.I) if avoid else None
+        self.frontier = frontier or CrawlFrontier()
+        self.clock = clock
+        self.endpoints: set = set()
+        self.actions = 0
+        self._cursor: Optional[str] = None
+        self._current: Optional[str] = None
+
+    async def crawl(self, start_url: str) -> Dict[str, Any]:
+        """
+        Explore the application from a start page.
+
+        Args:
+            start_url: Page the crawl starts from and returns to
+
+        Returns:
+            Summary with the states reached, actions tried, browser actions
+            taken, endpoints discovered and whether the budget ran out
+        """
+        started = self.clock()
+        logger.info(f"Crawling {start_url} for up to {self.time_budget}s")
+        _, self._cursor = self.client.drain_network_requests(self._cursor)
+
+        root = {"action": "navigate", "url": start_url}
+        await self._perform(root)
+        self._collect_endpoints()
+        await self._register([root])
+
+        tried = 0
+        exhausted = False
+        while len(self.frontier):
+            if self.clock() - started >= self.time_budget or (
+                self.max_actions is not None and self.actions >= self.max_actions
+            ):
+                exhausted = True
+                break
+            entry = self.frontier.pop()
+            if entry is None:
+                break
+            state = self.frontier.states[entry["state"]]
+            if self._current != entry["state"]:
+                for step in state["path"]:
+                    await self._perform(step)
+                self._collect_endpoints()
+
+            result = await self._perform(entry["step"])
+            tried += 1
+            new_endpoints = self._collect_endpoints()
+            self.frontier.record(entry["step"], new_endpoints)
+            if not result.get("success", False):
+                self._current = None
+                continue
+
+            if entry["step"]["action"] == "navigate":
+                path = [entry["step"]]  # links are reachable directly
+            else:
+                path = state["path"] + [entry["step"]]
+            await self._register(path)
+
+        summary = {
+            "start_url": start_url,
+            "states": len(self.frontier.states),
+            "actions_tried": tried,
+            "browser_actions": self.actions,
+            "endpoints": sorted(self.endpoints),
+            "frontier": len(self.frontier),
+            "budget_exhausted": exhausted,
+            "elapsed": self.clock() - started,
+        }
+        logger.info(
+            f"Crawl reached {summary['states']} states and "
+            f"{len(self.endpoints)} endpoints in {self.actions} browser actions"
+        )
+        return summary
+
+    @staticmethod
+    def state_key(url: str, dom: Dict[str, Any]) -> str:
+        """
+        Identify a UI state.
+
+        Args:
+            url: URL of the page
+            dom: DOM tree of the page
+
+        Returns:
+            The URL's path shape and the DOM's structure hash
+        """
+        path = _shape(urlsplit(url or "").path)
+        return f"{path}#{dom_structure_hash(dom)}"
+
+    async def _perform(self, step: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute one journey step, counting it as a browser action."""
+        self.actions += 1
+        if step["action"] == "navigate":
+            return await self.client.navigate_to_url(step["url"])
+        return await self.client.click_element(step["element"], step["selector"])
+
+    async def _register(self, path: List[Dict[str, Any]]) -> None:
+        """Snapshot the current page and add it to the frontier."""
+        snapshot = await self.client.snapshot_page()
+        url = snapshot.get("url") or path[-1].get("url", "")
+        key = self.state_key(url, snapshot["dom"])
+        actions = [
+            step
+            for step in page_actions(snapshot["dom"], url)
+            if not self._avoided(step)
+        ]
+        if self.frontier.add_state(key, url, path, actions):
+            logger.debug(f"New UI state {key} offering {len(actions)} actions")
+        self._current = key
+
+    def _avoided(self, step: Dict[str, Any]) -> bool:
+        """Whether a step matches the avoid pattern."""
+        target = step["url"] if step["action"] == "navigate" else step["element"]
+        return self.avoid is not None and bool(self.avoid.search(target))
+
+    def _collect_endpoints(self) -> int:
+        """
+        Note the endpoints among requests captured since the last call.
+
+        Returns:
+            Number of endpoints not seen before
+        """
+        requests, self._cursor = self.client.drain_network_requests(self._cursor)
+        before = len(self.endpoints)
+        self.endpoints.update(endpoint_key(request) for request in requests)
+        return len(self.endpoints) - before
+
+
+def _shape(text: str) -> str:
+    """Replace every run of digits in text with "0"."""
+    return _DIGITS.sub("0", text)
+
+
+def _pre_order(dom: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Walk a DOM tree in document order without recursion."""
+    stack = [dom]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(node.get("children") or ()))
+
+
+def _label(node: Dict[str, Any]) -> str:
+    """Human-readable label of a clickable element."""
+    attrs = node.get("attrs") or {}
+    text = " ".join(
+        str(n.get("text", "")).strip() for n in _pre_order(node) if n.get("text")
+    )
+    for candidate in (
+        attrs.get("aria-label"),
+        text,
+        attrs.get("value"),
+        attrs.get("title"),
+        attrs.get("name"),
+        attrs.get("id"),
+    ):
+        if candidate and str(candidate).strip():
+            return " ".join(str(candidate).split())[:80]
+    return str(node.get("tag", ""))
+
+
+def _selector(tag: str, attrs: Dict[str, Any], label: str) -> str:
+    """Selector click_element can locate an element by."""
+    if attrs.get("ref"):
+        return str(attrs["ref"])
+    if attrs.get("id"):
+        return f"#{attrs['id']}"
+    if attrs.get("name"):
+        return f'{tag}[name="{attrs["name"]}"]'
+    return f'{tag}:has-text("{label}")'
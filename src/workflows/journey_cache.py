@@ -0,0 +1,244 @@
+"""
+On-disk cache of journey executor outputs
+
+Re-running the pipeline after a change to the analysis code would otherwise
+drive the legacy browser through every journey again. Each journey
+iteration's outputs (the interaction record plus the audit logs, network
+requests and DOM changes it captured) are stored in a local SQLite file,
+keyed by the workflow description, the business domain, the iteration and
+a fingerprint of the target application build, so a new build of the
+legacy app never serves stale captures. Entries expire after a TTL and the
+least recently used ones are evicted once the cache exceeds its size limit.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 7 * 24 * 3600  # seconds
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journeys (
+    key TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS journeys_accessed ON journeys (accessed_at);
+"""
+
+
+def fingerprint_target(*parts: Any) -> str:
+    """
+    Fingerprint a build of the target application.
+
+    Args:
+        parts: Anything identifying the build, such as a version string,
+            deployment id or the hashed asset URLs of the login page
+
+    Returns:
+        Hex digest that changes whenever any part changes
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class JourneyCache:
+    """
+    SQLite-backed cache of journey iteration outputs.
+
+    Payloads are stored as zlib-compressed JSON; entries that JSON can't
+    represent natively are stored as their string form.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        target_fingerprint: str = "",
+        ttl: Optional[float] = DEFAULT_TTL,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the journey cache.
+
+        Args:
+            path: SQLite database file, or ":memory:" for a throwaway cache
+            target_fingerprint: Fingerprint of the target application build
+                (see fingerprint_target); entries of other builds never hit
+            ttl: Seconds an entry stays valid, or None to never expire
+            max_bytes: Compressed payload bytes kept before the least
+                recently used entries are evicted, or None for no limit
+            clock: Source of the current time in seconds
+        """
+        self.path = str(path)
+        self.target_fingerprint = target_fingerprint
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(_SCHEMA)
+
+    def key(self, description: str, domain: str, iteration: int) -> str:
+        """
+        Build the cache key of one journey iteration.
+
+        Args:
+            description: Workflow description driving the journey
+            domain: Business domain of the journey
+            iteration: Iterations the run had completed before this one
+
+        Returns:
+            Hex digest identifying the iteration on this target build
+        """
+        return fingerprint_target(
+            description, domain, iteration, self.target_fingerprint
+        )
+
+    def get(
+        self, description: str, domain: str, iteration: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up the outputs of a journey iteration.
+
+        Args:
+            description: Workflow description driving the journey
+            domain: Business domain of the journey
+            iteration: Iterations the run had completed before this one
+
+        Returns:
+            The cached outputs, or None on a miss or an expired entry
+        """
+        key = self.key(description, domain, iteration)
+        now = self.clock()
+        with self._lock, self.conn:
+            row = self.conn.execute(
+                "SELECT created_at, payload FROM journeys WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self._expired(row[0], now):
+                self.conn.execute("DELETE FROM journeys WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.conn.execute(
+                "UPDATE journeys SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+
+        return json.loads(zlib.decompress(row[1]))
+
+    def put(
+        self,
+        description: str,
+        domain: str,
+        iteration: int,
+        outputs: Dict[str, Any],
+    ) -> None:
+        """
+        Store the outputs of a journey iteration.
+
+        Args:
+            description: Workflow description driving the journey
+            domain: Business domain of the journey
+            iteration: Iterations the run had completed before this one
+            outputs: JSON-compatible outputs of the iteration
+        """
+        key = self.key(description, domain, iteration)
+        payload = zlib.compress(
+            json.dumps(outputs, default=str, separators=(",", ":")).encode("utf-8")
+        )
+        now = self.clock()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO journeys "
+                "(key, created_at, accessed_at, size, payload) VALUES (?, ?, ?, ?, ?)",
+                (key, now, now, len(payload), payload),
+            )
+            self._evict(now)
+
+    def evict_expired(self) -> int:
+        """
+        Delete every entry older than the TTL.
+
+        Returns:
+            Number of entries deleted
+        """
+        if self.ttl is None:
+            return 0
+        with self._lock, self.conn:
+            return self.conn.execute(
+                "DELETE FROM journeys WHERE created_at <= ?",
+                (self.clock() - self.ttl,),
+            ).rowcount
+
+    def size(self) -> int:
+        """Compressed payload bytes currently stored."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM journeys"
+            ).fetchone()[0]
+
+    def __len__(self) -> int:
+        """Number of cached journey iterations."""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM journeys").fetchone()[0]
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM journeys")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self.conn.close()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        """Whether an entry created at created_at is past the TTL."""
+        return self.ttl is not None and now - created_at >= self.ttl
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones over max_bytes."""
+        if self.ttl is not None:
+            self.conn.execute(
+                "DELETE FROM journeys WHERE created_at <= ?", (now - self.ttl,)
+            )
+        if self.max_bytes is None:
+            return
+
+        total = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM journeys"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size in self.conn.execute(
+            "SELECT key, size FROM journeys ORDER BY accessed_at, rowid"
+        ):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self.conn.executemany("DELETE FROM journeys WHERE key = ?", evicted)
+        logger.info(f"Evicted {len(evicted)} cached journeys over the size limit")
@@ -0,0 +1,286 @@
+"""
+Per-node profiling for the reverse engineering workflow
+
+Opt-in instrumentation that wraps LangGraph nodes and records, for every
+invocation, wall time, CPU time, the tracemalloc peak reached while the
+node ran and the sizes of the state going in and out. Spans export as a
+Chrome trace (the JSON trace event format read by chrome://tracing and
+Perfetto), so a slow run shows at a glance whether the journey executor,
+the data capturer or the graph itself is responsible.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Union
+import functools
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+Node = Callable[..., Awaitable[Any]]
+
+# Trace thread id of the enclosing span; inherited by the tasks LangGraph
+# runs nodes in, so every span of one workflow run shares a lane
+_LANE: ContextVar[Optional[int]] = ContextVar("profiling_lane", default=None)
+
+
+def state_sizes(state: Any) -> Dict[str, int]:
+    """
+    Count the entries held by each collection in a workflow state.
+
+    Args:
+        state: Workflow state (or any mapping)
+
+    Returns:
+        Mapping of state key to its length, for keys holding sized values
+    """
+    if not isinstance(state, dict):
+        return {}
+    return {
+        key: len(value)
+        for key, value in state.items()
+        if hasattr(value, "__len__") and not isinstance(value, str)
+    }
+
+
+class NodeProfiler:
+    """
+    Records timing and memory spans for workflow nodes.
+
+    Spans nested in an enclosing span (such as the whole workflow run) share
+    its trace thread id, so concurrent journeys show as separate lanes. CPU
+    time is process-wide, and with several journeys in flight the memory peak
+    of one node includes allocations made by the others meanwhile.
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        """
+        Initialize the profiler.
+
+        Args:
+            trace_memory: Record tracemalloc peaks, starting tracemalloc on
+                the first span if it is not already tracing
+        """
+        self.trace_memory = trace_memory
+        self.events: List[Dict[str, Any]] = []
+        self._lane_ids = itertools.count(1)
+        self._lanes: List[int] = []
+        self._origin_ns = time.perf_counter_ns()
+        self._started_tracemalloc = False
+        # [traced bytes at start, highest peak seen] of every open span
+        self._open_frames: List[List[int]] = []
+        self._lock = threading.Lock()
+
+    def wrap(self, name: str, node: Node) -> Node:
+        """
+        Wrap a node so each invocation is recorded as a span.
+
+        Args:
+            name: Node name in the graph
+            node: Async node taking (state, config)
+
+        Returns:
+            Async node with the same signature that records a span
+        """
+
+        @functools.wraps(node)
+        async def profiled(state, config=None):
+            with self.span(name, "node", state) as span:
+                result = await node(state, config)
+                span["output_sizes"] = state_sizes(result)
+            return result
+
+        return profiled
+
+    @contextmanager
+    def span(
+        self, name: str, category: str = "node", state: Any = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Record the enclosed block as a span.
+
+        Args:
+            name: Span name shown in the trace viewer
+            category: Trace event category (e.g., "node", "graph")
+            state: Input state whose sizes are recorded
+
+        Yields:
+            The span's args, to which extra measurements may be added
+        """
+        self._start_tracing()
+        args: Dict[str, Any] = {}
+        if state is not None:
+            args["input_sizes"] = state_sizes(state)
+        lane = _LANE.get()
+        token = None
+        if lane is None:
+            lane = next(self._lane_ids)
+            self._lanes.append(lane)
+            token = _LANE.set(lane)
+        frame = self._open_frame()
+        start_ns = time.perf_counter_ns()
+        cpu_start_ns = time.process_time_ns()
+        try:
+            yield args
+        except BaseException as e:
+            args["error"] = repr(e)
+            raise
+        finally:
+            cpu_ns = time.process_time_ns() - cpu_start_ns
+            wall_ns = time.perf_counter_ns() - start_ns
+            if frame is not None:
+                args["memory_peak_bytes"] = self._close_frame(frame)
+            args["wall_ms"] = wall_ns / 1e6
+            args["cpu_ms"] = cpu_ns / 1e6
+            self._record(name, category, lane, start_ns, wall_ns, args)
+            if token is not None:
+                _LANE.reset(token)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Aggregate recorded spans by name.
+
+        Returns:
+            Mapping of span name to its call count, total and maximum wall
+            time, total CPU time and largest memory peak
+        """
+        summary: Dict[str, Dict[str, float]] = {}
+        for event in self.events:
+            args = event["args"]
+            entry = summary.setdefault(
+                event["name"],
+                {
+                    "calls": 0,
+                    "wall_ms": 0.0,
+                    "max_wall_ms": 0.0,
+                    "cpu_ms": 0.0,
+                    "memory_peak_bytes": 0,
+                },
+            )
+            entry["calls"] += 1
+            entry["wall_ms"] += args["wall_ms"]
+            entry["max_wall_ms"] = max(entry["max_wall_ms"], args["wall_ms"])
+            entry["cpu_ms"] += args["cpu_ms"]
+            entry["memory_peak_bytes"] = max(
+                entry["memory_peak_bytes"], args.get("memory_peak_bytes", 0)
+            )
+        return summary
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Build the recorded spans as a Chrome trace.
+
+        Returns:
+            Trace in the JSON object format of the trace event spec
+        """
+        with self._lock:
+            events = list(self.events)
+            lanes = list(self._lanes)
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "tid": lane,
+                "args": {"name": f"journey {lane}"},
+            }
+            for lane in lanes
+        ]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def export(self, path: Union[str, Path]) -> Path:
+        """
+        Write the recorded spans to a Chrome trace file.
+
+        Args:
+            path: Destination JSON file
+
+        Returns:
+            Path of the written file
+        """
+        path = Path(path)
+        path.write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+        logger.info(f"Wrote {len(self.events)} profiling spans to {path}")
+        return path
+
+    def close(self) -> None:
+        """Stop tracemalloc if this profiler started it."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _start_tracing(self) -> None:
+        """Start tracemalloc for memory peaks if it isn't running."""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def _open_frame(self) -> Optional[List[int]]:
+        """
+        Start measuring the memory peak of a span.
+
+        tracemalloc has a single peak, so the peak reached so far is folded
+        into every open span before it is reset for the new one.
+
+        Returns:
+            The span's memory frame, or None when not tracing
+        """
+        if not (self.trace_memory and tracemalloc.is_tracing()):
+            return None
+        with self._lock:
+            peak = tracemalloc.get_traced_memory()[1]
+            for frame in self._open_frames:
+                frame[1] = max(frame[1], peak)
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            frame = [current, current]
+            self._open_frames.append(frame)
+        return frame
+
+    def _close_frame(self, frame: List[int]) -> int:
+        """
+        Finish measuring the memory peak of a span.
+
+        Args:
+            frame: Memory frame returned by _open_frame
+
+        Returns:
+            Bytes allocated above the span's starting point at its peak
+        """
+        with self._lock:
+            self._open_frames = [f for f in self._open_frames if f is not frame]
+            if not tracemalloc.is_tracing():
+                return max(frame[1] - frame[0], 0)
+            peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+        return max(peak - frame[0], 0)
+
+    def _record(
+        self,
+        name: str,
+        category: str,
+        lane: int,
+        start_ns: int,
+        wall_ns: int,
+        args: Dict[str, Any],
+    ) -> None:
+        """Append a complete ("X") trace event."""
+        with self._lock:
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start_ns - self._origin_ns) / 1000,
+                    "dur": wall_ns / 1000,
+                    "pid": os.getpid(),
+                    "tid": lane,
+                    "args": args,
+                }
+            )
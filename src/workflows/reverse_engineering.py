@@ -5,13 +5,42 @@ Implements a multi-agent workflow using LangGraph to coordinate
 browser automation, data capture, and pattern analysis.
 """
 
-from typing import Dict, Any
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 from datetime import datetime
+from itertools import chain
+import asyncio
+import inspect
 import logging
+import os
+import socket
+import time
+import uuid
 
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph, END
-from src.workflows.state_management import ReverseEngineeringState
-from src.integrations.playwright_mcp import PlaywrightMCPClient
+from src.workflows.state_management import (
+    CAPTURE_STREAMS,
+    ReverseEngineeringState,
+    create_initial_state,
+)
+from src.agents.pattern_analyzer import EndpointAggregator, PatternAnalysisAgent
+from src.workflows.correlation import DataCorrelationEngine
+from src.workflows.crawler import UICrawler
+from src.workflows.journey_cache import JourneyCache
+from src.workflows.profiling import NodeProfiler, state_sizes
+from src.workflows.work_queue import JourneyQueue
+from src.integrations.playwright_mcp import PlaywrightMCPClient, run_blocking
+from src.integrations.session_pool import BrowserSessionPool
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +53,51 @@ class ReverseEngineeringWorkflow:
     capture interaction data, and analyze patterns.
     """
 
-    def __init__(self):
-        """Initialize the reverse engineering workflow."""
-        self.playwright_client = PlaywrightMCPClient()
+    def __init__(
+        self,
+        correlation_window: float = 2.0,
+        client_factory: Callable[[], PlaywrightMCPClient] = PlaywrightMCPClient,
+        session_pool: Optional[BrowserSessionPool] = None,
+        checkpointer: Optional[BaseCheckpointSaver] = None,
+        profiler: Optional[NodeProfiler] = None,
+        max_iterations: int = 1,
+        min_discovery_yield: int = 1,
+        saturation_patience: int = 1,
+        journey_cache: Optional[JourneyCache] = None,
+    ):
+        """
+        Initialize the reverse engineering workflow.
+
+        Args:
+            correlation_window: Seconds around a log entry in which network
+                requests are considered correlated with it
+            client_factory: Creates the isolated Playwright client used by
+                each concurrent journey in execute_many
+            session_pool: Pool of pre-warmed browser contexts leased to each
+                journey instead of creating a fresh browser session
+            checkpointer: Saver persisting a checkpoint after every node, so
+                an interrupted journey can be resumed by thread id
+            profiler: Records wall time, CPU time, memory peak and state
+                sizes of every node invocation and workflow run
+            max_iterations: Most journey iterations a run may take; with the
+                default of 1 the journey runs once
+            min_discovery_yield: New endpoints plus body fields an iteration
+                must discover for exploration to continue
+            saturation_patience: Consecutive iterations below
+                min_discovery_yield after which discovery counts as saturated
+            journey_cache: Cache of journey iteration outputs; hits are
+                served without driving the browser
+        """
+        self.client_factory = client_factory
+        self.session_pool = session_pool
+        self.checkpointer = checkpointer
+        self.profiler = profiler
+        self.max_iterations = max_iterations
+        self.min_discovery_yield = min_discovery_yield
+        self.saturation_patience = saturation_patience
+        self.journey_cache = journey_cache
+        self.playwright_client = client_factory()
+        self.correlation_window = correlation_window
         self.workflow = self._build_workflow()
 
     def _build_workflow(self) -> StateGraph:
@@ -39,36 +110,66 @@ class ReverseEngineeringWorkflow:
         workflow = StateGraph(ReverseEngineeringState)
 
         # Add agent nodes
-        workflow.add_node("journey_executor", self.execute_journey)
-        workflow.add_node("data_capturer", self.capture_data)
+        workflow.add_node("journey_executor", self._node("journey_executor"))
+        workflow.add_node("data_capturer", self._node("data_capturer"))
+        workflow.add_node("pattern_analyzer", self._node("pattern_analyzer"))
 
         # Define workflow transitions
         workflow.add_edge("journey_executor", "data_capturer")
-        workflow.add_edge("data_capturer", END)
+        workflow.add_edge("data_capturer", "pattern_analyzer")
+        workflow.add_conditional_edges(
+            "pattern_analyzer",
+            self.determine_next_action,
+            {"more_data_needed": "journey_executor", "complete": END},
+        )
 
         # Set entry point
         workflow.set_entry_point("journey_executor")
 
-        return workflow.compile()
+        return workflow.compile(checkpointer=self.checkpointer)
+
+    def _node(self, name: str) -> Callable:
+        """
+        Get the callable registered for a graph node.
+
+        Args:
+            name: Node name in the graph
+
+        Returns:
+            The node's agent method, wrapped by the profiler if profiling
+        """
+        node = {
+            "journey_executor": self.execute_journey,
+            "data_capturer": self.capture_data,
+            "pattern_analyzer": self.analyze_patterns,
+        }[name]
+        if self.profiler is None:
+            return node
+        return self.profiler.wrap(name, node)
 
     async def execute_journey(
-        self, state: ReverseEngineeringState
+        self, state: ReverseEngineeringState, config: Optional[RunnableConfig] = None
     ) -> ReverseEngineeringState:
         """
         Journey Executor Agent: Convert workflow description to browser actions.
 
         Args:
             state: Current workflow state
+            config: Run configuration carrying the run's Playwright client
 
         Returns:
             Updated state with interaction data
         """
         logger.info(f"Executing journey: {state['workflow_description']}")
+        if self._serve_cached_journey(state):
+            return state
+        playwright_client = self._get_playwright_client(config)
+        captured_from = {stream: len(state[stream]) for stream in CAPTURE_STREAMS}
 
         try:
             # Execute browser action based on workflow description
-            result = self.playwright_client.execute_action(
-                state["workflow_description"]
+            result = await self._execute_action(
+                playwright_client, state["workflow_description"]
             )
 
             # Create interaction record
@@ -83,13 +184,10 @@ class ReverseEngineeringWorkflow:
             state["user_interactions"].append(interaction)
             state["iteration_count"] += 1
 
-            # Capture audit logs from Playwright
-            audit_logs = self.playwright_client.get_audit_logs()
-            state["playwright_logs"].extend(audit_logs)
-
-            # Capture network requests
-            network_requests = self.playwright_client.get_network_requests()
-            state["network_requests"].extend(network_requests)
+            # Capture only what the client recorded since the last drain
+            self._drain_captures(state, playwright_client)
+            if self.journey_cache is not None and interaction["success"]:
+                self._cache_journey(state, interaction, captured_from)
 
             logger.info(
                 f"Journey execution completed. Interactions: {len(state['user_interactions'])}"
@@ -108,14 +206,101 @@ class ReverseEngineeringWorkflow:
 
         return state
 
+    def _serve_cached_journey(self, state: ReverseEngineeringState) -> bool:
+        """
+        Apply the cached outputs of the state's next journey iteration.
+
+        Args:
+            state: Current workflow state, updated in place on a hit
+
+        Returns:
+            True if the iteration was served from the journey cache
+        """
+        if self.journey_cache is None:
+            return False
+        cached = self.journey_cache.get(
+            state["workflow_description"],
+            state["current_domain"],
+            state["iteration_count"],
+        )
+        if cached is None:
+            return False
+
+        state["user_interactions"].append({**cached["interaction"], "cached": True})
+        state["iteration_count"] += 1
+        for stream in CAPTURE_STREAMS:
+            state[stream].extend(cached[stream])
+
+        logger.info(
+            f"Served journey iteration {state['iteration_count']} from the cache"
+        )
+        return True
+
+    def _cache_journey(
+        self,
+        state: ReverseEngineeringState,
+        interaction: Dict[str, Any],
+        captured_from: Dict[str, int],
+    ) -> None:
+        """
+        Store a journey iteration's interaction and captures in the cache.
+
+        Args:
+            state: Workflow state after the iteration
+            interaction: Interaction record the iteration appended
+            captured_from: Length of each capture stream before the iteration
+        """
+        outputs = {"interaction": interaction}
+        for stream in CAPTURE_STREAMS:
+            outputs[stream] = list(state[stream][captured_from[stream] :])
+        try:
+            self.journey_cache.put(
+                state["workflow_description"],
+                state["current_domain"],
+                state["iteration_count"] - 1,
+                outputs,
+            )
+        except Exception as e:
+            # The journey itself succeeded; only later runs miss the cache
+            logger.warning(f"Could not cache journey iteration: {str(e)}")
+
+    def _drain_captures(
+        self, state: ReverseEngineeringState, playwright_client: PlaywrightMCPClient
+    ) -> None:
+        """
+        Append the client's new audit logs, requests and DOM changes to state.
+
+        The client's drain cursors are kept in ``capture_cursors``, so every
+        captured entry lands in the state exactly once however many times
+        the journey executor runs.
+
+        Args:
+            state: Current workflow state, updated in place
+            playwright_client: Client driving the journey's browser
+        """
+        cursors = state.setdefault("capture_cursors", {})
+        for stream, drain in (
+            ("playwright_logs", playwright_client.drain_audit_logs),
+            ("network_requests", playwright_client.drain_network_requests),
+            ("dom_changes", playwright_client.drain_dom_changes),
+        ):
+            entries, cursors[stream] = drain(cursors.get(stream))
+            state[stream].extend(entries)
+
     async def capture_data(
-        self, state: ReverseEngineeringState
+        self, state: ReverseEngineeringState, config: Optional[RunnableConfig] = None
     ) -> ReverseEngineeringState:
         """
         Data Capture Agent: Process and structure Playwright interaction logs.
 
+        Only entries appended to the capture streams since the last pass (as
+        recorded in ``capture_watermarks``) are processed. Earlier interactions
+        are re-correlated only when new traffic falls inside their window, so
+        the result always matches a full rebuild.
+
         Args:
             state: Current workflow state with raw interaction data
+            config: Run configuration carrying the run's correlation engine
 
         Returns:
             Updated state with processed interaction data
@@ -123,81 +308,578 @@ class ReverseEngineeringWorkflow:
         logger.info("Processing captured interaction data")
 
         try:
-            processed_interactions = []
-
-            # Process each Playwright log entry
-            for log_entry in state["playwright_logs"]:
-                # Correlate with network requests based on timestamp
-                correlated_requests = self._correlate_network_requests(
-                    log_entry, state["network_requests"]
-                )
-
-                processed_interaction = {
-                    "original_log": log_entry,
-                    "correlated_requests": correlated_requests,
-                    "processed_timestamp": datetime.now().isoformat(),
+            correlator = self._get_correlator(config)
+            watermarks, processed_interactions = self._resume_capture(state, correlator)
+
+            new_logs = state["playwright_logs"][watermarks["playwright_logs"] :]
+            new_requests = state["network_requests"][watermarks["network_requests"] :]
+            new_dom_changes = state["dom_changes"][watermarks["dom_changes"] :]
+
+            correlator.add_requests(new_requests)
+            correlator.add_dom_changes(new_dom_changes)
+
+            # Re-correlate earlier interactions whose window now holds new traffic
+            for position in correlator.affected_logs(
+                chain(new_requests, new_dom_changes)
+            ):
+                previous = processed_interactions[position]
+                processed_interactions[position] = {
+                    **previous,
+                    "correlated_requests": correlator.correlate_entry(
+                        previous["original_log"]
+                    ),
+                    "correlated_dom_changes": correlator.correlate_dom_changes(
+                        previous["original_log"]
+                    ),
                 }
 
-                processed_interactions.append(processed_interaction)
+            correlator.add_logs(new_logs)
+            for log_entry in new_logs:
+                processed_interactions.append(
+                    {
+                        "original_log": log_entry,
+                        "correlated_requests": correlator.correlate_entry(log_entry),
+                        "correlated_dom_changes": correlator.correlate_dom_changes(
+                            log_entry
+                        ),
+                        "processed_timestamp": datetime.now().isoformat(),
+                    }
+                )
 
             # Add processed data to state
             state["processed_interactions"] = processed_interactions
+            state["capture_watermarks"] = {
+                stream: len(state[stream]) for stream in CAPTURE_STREAMS
+            }
 
             logger.info(
-                f"Data capture completed. Processed {len(processed_interactions)} interactions"
+                f"Data capture completed. Processed {len(new_logs)} new interactions "
+                f"({len(processed_interactions)} total)"
             )
 
         except Exception as e:
             logger.error(f"Data capture failed: {str(e)}")
-            # Ensure processed_interactions exists even on error
+            # Ensure processed_interactions exists even on error; the next
+            # pass rebuilds from the start of every stream
             state["processed_interactions"] = []
+            state["capture_watermarks"] = dict.fromkeys(CAPTURE_STREAMS, 0)
 
         return state
 
-    def _correlate_network_requests(
-        self, log_entry: Dict[str, Any], network_requests: list
-    ) -> list:
+    async def analyze_patterns(
+        self, state: ReverseEngineeringState, config: Optional[RunnableConfig] = None
+    ) -> ReverseEngineeringState:
         """
-        Correlate browser interaction with network requests based on timing.
+        Pattern Analysis Agent: Infer API endpoints and track discovery.
+
+        Network requests captured since the previous iteration are folded
+        into the run's endpoint aggregator, and the endpoints and body fields
+        the iteration added are recorded in ``discovery_history``.
 
         Args:
-            log_entry: Browser interaction log entry
-            network_requests: List of captured network requests
+            state: Current workflow state with captured network requests
+            config: Run configuration carrying the run's endpoint aggregator
 
         Returns:
-            List of correlated network requests
+            Updated state with inferred endpoints and discovery history
+        """
+        history = state.setdefault("discovery_history", [])
+        previous = history[-1] if history else {}
+        requests = state["network_requests"]
+
+        aggregator = self._get_aggregator(config)
+        analyzed = previous.get("requests", 0)
+        if analyzed > len(requests):
+            # Capture replaced since the last iteration: start over
+            history.clear()
+            previous, analyzed = {}, 0
+        if aggregator.observed != analyzed:
+            # Fresh (or foreign) aggregator: fold in what was analyzed before
+            aggregator.reset()
+            aggregator.observe_many(requests[:analyzed])
+        aggregator.observe_many(requests[analyzed:])
+
+        state["inferred_api_endpoints"] = aggregator.snapshot()
+        endpoints = len(state["inferred_api_endpoints"])
+        fields = aggregator.field_count()
+        history.append(
+            {
+                "iteration": state["iteration_count"],
+                "requests": len(requests),
+                "endpoints": endpoints,
+                "fields": fields,
+                "new_endpoints": max(endpoints - previous.get("endpoints", 0), 0),
+                "new_fields": max(fields - previous.get("fields", 0), 0),
+            }
+        )
+
+        logger.info(
+            f"Pattern analysis found {history[-1]['new_endpoints']} new endpoints "
+            f"and {history[-1]['new_fields']} new fields ({endpoints} endpoints, "
+            f"{fields} fields total)"
+        )
+        return state
+
+    def determine_next_action(self, state: ReverseEngineeringState) -> str:
         """
-        # Simple correlation based on timestamp proximity
-        # In real implementation, this would be more sophisticated
-        correlated = []
+        Decide whether another journey iteration is worth its browser time.
 
-        if not network_requests:
-            return correlated
+        Exploration continues until max_iterations is reached or the last
+        saturation_patience iterations each discovered fewer than
+        min_discovery_yield new endpoints and fields.
 
-        # For now, return first network request as correlation
-        # This is minimal implementation to pass tests
-        if network_requests:
-            correlated.append(network_requests[0])
+        Args:
+            state: Workflow state after pattern analysis
 
-        return correlated
+        Returns:
+            "more_data_needed" to run the journey again, otherwise "complete"
+        """
+        if state["iteration_count"] >= self.max_iterations:
+            return "complete"
+
+        recent = state.get("discovery_history", [])[-self.saturation_patience :]
+        saturated = len(recent) >= self.saturation_patience and all(
+            entry["new_endpoints"] + entry["new_fields"] < self.min_discovery_yield
+            for entry in recent
+        )
+        if saturated:
+            logger.info(
+                f"Discovery saturated after {state['iteration_count']} iterations"
+            )
+            return "complete"
+        return "more_data_needed"
+
+    async def _execute_action(
+        self, playwright_client: PlaywrightMCPClient, instruction: str
+    ) -> Dict[str, Any]:
+        """
+        Execute a browser action without blocking the event loop.
+
+        Clients without a native async path have their synchronous
+        execute_action offloaded to the bounded blocking pool.
+
+        Args:
+            playwright_client: Client driving the journey's browser
+            instruction: Natural language description of action to perform
+
+        Returns:
+            Result of the action execution
+        """
+        aexecute_action = getattr(playwright_client, "aexecute_action", None)
+        if inspect.iscoroutinefunction(aexecute_action):
+            return await aexecute_action(instruction)
+        return await run_blocking(playwright_client.execute_action, instruction)
+
+    def _get_playwright_client(
+        self, config: Optional[RunnableConfig]
+    ) -> PlaywrightMCPClient:
+        """
+        Get the Playwright client for the current run.
+
+        Args:
+            config: Run configuration, if invoked through the graph
+
+        Returns:
+            The run's client, or the workflow's default client
+        """
+        configurable = (config or {}).get("configurable", {})
+        return configurable.get("playwright_client") or self.playwright_client
+
+    def _get_correlator(
+        self, config: Optional[RunnableConfig]
+    ) -> DataCorrelationEngine:
+        """
+        Get the correlation engine for the current run.
+
+        Args:
+            config: Run configuration, if invoked through the graph
+
+        Returns:
+            The run's engine, or a fresh one for standalone calls
+        """
+        configurable = (config or {}).get("configurable", {})
+        correlator = configurable.get("correlation_engine")
+        if correlator is None:
+            correlator = DataCorrelationEngine(time_window=self.correlation_window)
+        return correlator
+
+    def _get_aggregator(self, config: Optional[RunnableConfig]) -> EndpointAggregator:
+        """
+        Get the endpoint aggregator for the current run.
+
+        Args:
+            config: Run configuration, if invoked through the graph
+
+        Returns:
+            The run's aggregator, or a fresh one for standalone calls
+        """
+        configurable = (config or {}).get("configurable", {})
+        aggregator = configurable.get("endpoint_aggregator")
+        if aggregator is None:
+            aggregator = PatternAnalysisAgent().create_aggregator()
+        return aggregator
+
+    def _resume_capture(
+        self, state: ReverseEngineeringState, correlator: DataCorrelationEngine
+    ) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+        """
+        Validate the capture watermarks and bring the correlator up to them.
+
+        Watermarks that don't match the state (streams replaced or truncated,
+        processed data missing) fall back to a full rebuild.
+
+        Args:
+            state: Current workflow state
+            correlator: Correlation engine for this run
+
+        Returns:
+            Tuple of (watermarks, processed interactions to extend)
+        """
+        watermarks = {
+            stream: (state.get("capture_watermarks") or {}).get(stream, 0)
+            for stream in CAPTURE_STREAMS
+        }
+        processed_interactions = state.get("processed_interactions") or []
+
+        consistent = len(processed_interactions) == watermarks[
+            "playwright_logs"
+        ] and all(
+            watermarks[stream] <= len(state[stream]) for stream in CAPTURE_STREAMS
+        )
+        if not consistent:
+            watermarks = dict.fromkeys(CAPTURE_STREAMS, 0)
+            processed_interactions = []
+
+        in_sync = (
+            correlator.logs.consumed == watermarks["playwright_logs"]
+            and correlator.requests.consumed == watermarks["network_requests"]
+            and correlator.dom_changes.consumed == watermarks["dom_changes"]
+        )
+        if not in_sync:
+            # Fresh (or foreign) engine: index what earlier passes already saw
+            correlator.reset()
+            correlator.add_logs(
+                state["playwright_logs"][: watermarks["playwright_logs"]]
+            )
+            correlator.add_requests(
+                state["network_requests"][: watermarks["network_requests"]]
+            )
+            correlator.add_dom_changes(
+                state["dom_changes"][: watermarks["dom_changes"]]
+            )
+
+        return watermarks, processed_interactions
 
     async def execute(
-        self, initial_state: ReverseEngineeringState
+        self,
+        initial_state: ReverseEngineeringState,
+        thread_id: Optional[str] = None,
     ) -> ReverseEngineeringState:
         """
         Execute the complete reverse engineering workflow.
 
         Args:
             initial_state: Initial workflow state
+            thread_id: Checkpoint thread for the run; generated if a
+                checkpointer is configured and none is given
+
+        Returns:
+            Final state after workflow completion
+        """
+        return await self._execute(initial_state, self.playwright_client, thread_id)
+
+    async def explore(
+        self,
+        initial_state: ReverseEngineeringState,
+        start_url: str,
+        time_budget: float = 300.0,
+        max_actions: Optional[int] = None,
+    ) -> ReverseEngineeringState:
+        """
+        Explore the application autonomously instead of running a journey.
+
+        A UICrawler drives the workflow's client from start_url, trying the
+        actions most likely to reveal unseen endpoints first. Its captures
+        are then processed and analyzed like a journey iteration's.
+
+        Args:
+            initial_state: Workflow state to add the exploration to
+            start_url: Page the crawl starts from
+            time_budget: Seconds of exploration
+            max_actions: Browser actions before the crawl stops, or None
+
+        Returns:
+            Updated state with the crawl's captures analyzed
+        """
+        client = self.playwright_client
+        await client.restore_authentication()
+        crawler = UICrawler(client, time_budget=time_budget, max_actions=max_actions)
+        summary = await crawler.crawl(start_url)
+
+        state = initial_state
+        state["user_interactions"].append(
+            {
+                "instruction": f"Explore {start_url}",
+                "result": summary,
+                "timestamp": datetime.now().isoformat(),
+                "success": True,
+            }
+        )
+        state["iteration_count"] += 1
+        self._drain_captures(state, client)
+
+        config = self._run_config(client)
+        state = await self.capture_data(state, config)
+        return await self.analyze_patterns(state, config)
+
+    async def resume(
+        self, thread_id: str, checkpoint_id: Optional[str] = None
+    ) -> ReverseEngineeringState:
+        """
+        Resume a checkpointed run from where it stopped.
+
+        Derived data such as processed_interactions is not checkpointed; the
+        data capturer rebuilds it from the restored capture streams.
+
+        Args:
+            thread_id: Checkpoint thread of the interrupted run
+            checkpoint_id: Checkpoint to resume from (defaults to the latest)
+
+        Returns:
+            Final state after workflow completion
+        """
+        if self.checkpointer is None:
+            raise ValueError("Resuming a run requires a checkpointer")
+
+        logger.info(f"Resuming reverse engineering workflow thread {thread_id}")
+        await self.playwright_client.restore_authentication()
+
+        config = self._run_config(self.playwright_client, thread_id)
+        if checkpoint_id is not None:
+            config["configurable"]["checkpoint_id"] = checkpoint_id
+        final_state = await self._ainvoke(None, config)
+
+        if "processed_interactions" not in final_state:
+            # The run had already finished: rebuild the derived data
+            final_state = await self.capture_data(final_state, config)
+        return final_state
+
+    async def execute_many(
+        self,
+        states: Iterable[ReverseEngineeringState],
+        max_concurrency: int = 4,
+    ) -> AsyncIterator[Tuple[int, ReverseEngineeringState]]:
+        """
+        Execute several journeys concurrently, yielding each as it finishes.
+
+        Every journey runs with its own Playwright client from client_factory,
+        and at most max_concurrency journeys are in flight at once.
+
+        Args:
+            states: Initial states, one per journey
+            max_concurrency: Maximum number of journeys running at once
+
+        Yields:
+            Tuples of (index into states, final state) in completion order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_journey(
+            index: int, state: ReverseEngineeringState
+        ) -> Tuple[int, ReverseEngineeringState]:
+            async with semaphore:
+                return index, await self._execute(state, self.client_factory())
+
+        tasks = [
+            asyncio.create_task(run_journey(index, state))
+            for index, state in enumerate(states)
+        ]
+        logger.info(
+            f"Executing {len(tasks)} journeys with concurrency {max_concurrency}"
+        )
+
+        try:
+            for next_finished in asyncio.as_completed(tasks):
+                yield await next_finished
+        finally:
+            # Consumer stopped early: don't leave journeys running
+            for task in tasks:
+                task.cancel()
+
+    async def run_worker(
+        self,
+        queue: JourneyQueue,
+        worker_id: Optional[str] = None,
+        max_jobs: Optional[int] = None,
+        poll_interval: float = 1.0,
+        idle_timeout: float = 0.0,
+    ) -> int:
+        """
+        Run as a journey worker, executing journeys leased from a queue.
+
+        Each leased spec ({"workflow_description": ..., "domain": ...}) runs
+        as a full journey with its own Playwright client from client_factory;
+        its captures are pushed back to the queue for central analysis with
+        merge_results. The lease is renewed while the journey runs, and a
+        journey ending in a workflow error or a failed interaction is
+        reported for retry.
+
+        Args:
+            queue: Shared journey queue
+            worker_id: Identifier recorded with leases and results (defaults
+                to host name and process id)
+            max_jobs: Stop after this many jobs, or None to run until idle
+            poll_interval: Seconds between lease attempts on an empty queue
+            idle_timeout: Seconds to keep polling an empty queue before
+                returning
+
+        Returns:
+            Number of jobs whose results were stored
+        """
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        logger.info(f"Journey worker {worker_id} started")
+        completed = attempted = 0
+        idle_since = time.monotonic()
+
+        while max_jobs is None or attempted < max_jobs:
+            lease = queue.lease(worker_id)
+            if lease is None:
+                if time.monotonic() - idle_since >= idle_timeout:
+                    break
+                await asyncio.sleep(poll_interval)
+                continue
+
+            attempted += 1
+            spec = lease["spec"]
+            final_state = await self._run_leased_journey(
+                queue,
+                lease,
+                create_initial_state(spec["workflow_description"], spec["domain"]),
+            )
+            error = journey_error(final_state)
+            if error is not None:
+                queue.fail(lease["job_id"], lease["lease_token"], error)
+            else:
+                completed += queue.complete(
+                    lease["job_id"], journey_result(final_state), worker_id
+                )
+            idle_since = time.monotonic()
+
+        logger.info(f"Journey worker {worker_id} stopped after {attempted} jobs")
+        return completed
+
+    async def _run_leased_journey(
+        self,
+        queue: JourneyQueue,
+        lease: Dict[str, Any],
+        initial_state: ReverseEngineeringState,
+    ) -> ReverseEngineeringState:
+        """
+        Execute a leased journey, renewing its lease until it finishes.
+
+        Args:
+            queue: Queue the job was leased from
+            lease: Lease returned by queue.lease
+            initial_state: Initial state built from the job's spec
+
+        Returns:
+            Final state after workflow completion
+        """
+
+        async def renew_lease() -> None:
+            while True:
+                await asyncio.sleep(queue.lease_seconds / 3)
+                if not queue.renew(lease["job_id"], lease["lease_token"]):
+                    # Another worker took over; whichever finishes first wins
+                    logger.warning(f"Lost the lease on job {lease['job_id']}")
+                    return
+
+        renewer = asyncio.create_task(renew_lease())
+        try:
+            return await self._execute(initial_state, self.client_factory())
+        finally:
+            renewer.cancel()
+
+    async def merge_results(
+        self,
+        queue: JourneyQueue,
+        state: ReverseEngineeringState,
+        config: Optional[RunnableConfig] = None,
+    ) -> ReverseEngineeringState:
+        """
+        Merge journey results pushed by workers into one analysis state.
+
+        Only results stored after ``merged_seq`` are read from the queue, so
+        merging again after more workers finish only adds the new journeys,
+        and the data capturer and pattern analyzer only process new entries.
+
+        Args:
+            queue: Journey queue the workers pushed results to
+            state: Central state collecting every journey
+            config: Run configuration carrying the analysis engines to reuse
+                between merges
+
+        Returns:
+            Updated state with the merged captures analyzed
+        """
+        merged = state.setdefault("merged_jobs", [])
+        added = 0
+        for seq, job_id, result in queue.results(after=state.get("merged_seq", 0)):
+            state["user_interactions"].extend(
+                {**interaction, "job_id": job_id}
+                for interaction in result["user_interactions"]
+            )
+            state["iteration_count"] += result["iteration_count"]
+            for stream in CAPTURE_STREAMS:
+                state[stream].extend(result[stream])
+            merged.append(job_id)
+            state["merged_seq"] = seq
+            added += 1
+
+        logger.info(f"Merged {added} journey results ({len(merged)} total)")
+        state = await self.capture_data(state, config)
+        return await self.analyze_patterns(state, config)
+
+    async def _execute(
+        self,
+        initial_state: ReverseEngineeringState,
+        playwright_client: PlaywrightMCPClient,
+        thread_id: Optional[str] = None,
+    ) -> ReverseEngineeringState:
+        """
+        Run the LangGraph workflow for one journey.
+
+        Args:
+            initial_state: Initial workflow state
+            playwright_client: Client driving this journey's browser
+            thread_id: Checkpoint thread for the run, if checkpointing
 
         Returns:
             Final state after workflow completion
         """
         logger.info("Starting reverse engineering workflow execution")
 
+        if self.checkpointer is not None and thread_id is None:
+            thread_id = uuid.uuid4().hex
+            logger.info(f"Checkpointing run as thread {thread_id}")
+
         try:
-            # Execute the LangGraph workflow
-            final_state = await self.workflow.ainvoke(initial_state)
+            if self.session_pool is None:
+                await playwright_client.restore_authentication()
+                final_state = await self._invoke(
+                    initial_state, playwright_client, thread_id
+                )
+            else:
+                # Run inside a pre-warmed browser context for this journey
+                async with self.session_pool.lease() as session:
+                    playwright_client.attach_session(session.session_id)
+                    try:
+                        await playwright_client.restore_authentication()
+                        final_state = await self._invoke(
+                            initial_state, playwright_client, thread_id
+                        )
+                    finally:
+                        playwright_client.attach_session(None)
 
             logger.info("Reverse engineering workflow completed successfully")
             return final_state
@@ -207,3 +889,120 @@ class ReverseEngineeringWorkflow:
             # Return state with error information
             initial_state["workflow_error"] = str(e)
             return initial_state
+
+    async def _invoke(
+        self,
+        initial_state: ReverseEngineeringState,
+        playwright_client: PlaywrightMCPClient,
+        thread_id: Optional[str] = None,
+    ) -> ReverseEngineeringState:
+        """
+        Invoke the compiled graph with run-scoped resources.
+
+        Args:
+            initial_state: Initial workflow state
+            playwright_client: Client driving this journey's browser
+            thread_id: Checkpoint thread for the run, if checkpointing
+
+        Returns:
+            Final state after workflow completion
+        """
+        return await self._ainvoke(
+            initial_state, self._run_config(playwright_client, thread_id)
+        )
+
+    async def _ainvoke(
+        self, graph_input: Optional[ReverseEngineeringState], config: RunnableConfig
+    ) -> ReverseEngineeringState:
+        """
+        Invoke the compiled graph, recording the run as a span if profiling.
+
+        Time in the run's span not covered by its node spans is graph
+        overhead (scheduling, state merging, checkpointing).
+
+        Args:
+            graph_input: Initial state, or None to resume from a checkpoint
+            config: Run configuration from _run_config
+
+        Returns:
+            Final state after workflow completion
+        """
+        if self.profiler is None:
+            return await self.workflow.ainvoke(graph_input, config=config)
+        with self.profiler.span("workflow", "graph", graph_input) as span:
+            final_state = await self.workflow.ainvoke(graph_input, config=config)
+            span["output_sizes"] = state_sizes(final_state)
+        return final_state
+
+    def _run_config(
+        self,
+        playwright_client: Optional[PlaywrightMCPClient] = None,
+        thread_id: Optional[str] = None,
+    ) -> RunnableConfig:
+        """
+        Build the LangGraph config for one workflow run.
+
+        Args:
+            playwright_client: Client for the run (defaults to the workflow's)
+            thread_id: Checkpoint thread for the run, if checkpointing
+
+        Returns:
+            Config whose configurable section holds the run's own resources
+        """
+        configurable = {
+            "playwright_client": playwright_client or self.playwright_client,
+            "correlation_engine": DataCorrelationEngine(
+                time_window=self.correlation_window
+            ),
+            "endpoint_aggregator": PatternAnalysisAgent().create_aggregator(),
+        }
+        if thread_id is not None:
+            configurable["thread_id"] = thread_id
+        return {"configurable": configurable}
+
+
+def journey_error(state: ReverseEngineeringState) -> Optional[str]:
+    """
+    Find why a finished journey failed, if it did.
+
+    Browser and action errors don't raise out of the workflow; they are
+    recorded as unsuccessful interactions.
+
+    Args:
+        state: Final state of the journey
+
+    Returns:
+        The workflow error or the first failed interaction's error, or None
+        if the journey succeeded
+    """
+    if "workflow_error" in state:
+        return state["workflow_error"]
+    for interaction in state["user_interactions"]:
+        if not interaction.get("success", False):
+            return (
+                interaction.get("error")
+                or (interaction.get("result") or {}).get("error")
+                or "Journey action failed"
+            )
+    return None
+
+
+def journey_result(state: ReverseEngineeringState) -> Dict[str, Any]:
+    """
+    Extract what a worker pushes back from a finished journey.
+
+    Args:
+        state: Final state of the journey
+
+    Returns:
+        JSON-compatible interactions, iteration count and capture streams
+    """
+    result = {
+        "workflow_description": state["workflow_description"],
+        "domain": state["current_domain"],
+        "iteration_count": state["iteration_count"],
+        "user_interactions": list(state["user_interactions"]),
+    }
+    for stream in CAPTURE_STREAMS:
+        result[stream] = list(state[stream])
+    return result
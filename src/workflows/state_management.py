@@ -7,6 +7,11 @@ multi-agent reverse engineering workflow.
 
 from typing import Dict, List, Any, TypedDict
 
+from src.workflows.capture_store import NetworkRequestStore
+
+# Append-only capture streams tracked by the data capturer's watermarks
+CAPTURE_STREAMS = ("playwright_logs", "network_requests", "dom_changes")
+
 
 class ReverseEngineeringState(TypedDict):
     """
@@ -23,15 +28,23 @@ class ReverseEngineeringState(TypedDict):
 
     # Captured data from browser automation
     playwright_logs: List[Dict[str, Any]]
-    network_requests: List[Dict[str, Any]]
+    network_requests: NetworkRequestStore  # list-of-dicts compatible; lists accepted
     dom_changes: List[Dict[str, Any]]
     user_interactions: List[Dict[str, Any]]
 
+    # Correlated interaction data built incrementally by the data capturer
+    processed_interactions: List[Dict[str, Any]]
+    capture_watermarks: Dict[str, int]  # stream name -> entries already processed
+    capture_cursors: Dict[str, str]  # stream name -> Playwright client drain cursor
+    merged_jobs: List[str]  # work queue jobs whose results were merged in
+    merged_seq: int  # work queue result sequence number merged up to
+
     # Analysis results from pattern recognition
     inferred_api_endpoints: List[Dict[str, Any]]
     database_schema: Dict[str, Any]
     business_logic_patterns: List[Dict[str, Any]]
     ui_component_patterns: List[Dict[str, Any]]
+    discovery_history: List[Dict[str, Any]]  # endpoints/fields found per iteration
 
     # Generated outputs
     backend_code: Dict[str, str]  # filename -> code content
@@ -62,16 +75,25 @@ def create_initial_state(
         workflow_description=workflow_description,
         current_domain=domain,
         iteration_count=0,
-        # Captured data - initialized as empty lists
+        # Captured data - initialized as empty lists (columnar for network traffic)
         playwright_logs=[],
-        network_requests=[],
+        network_requests=NetworkRequestStore(),
         dom_changes=[],
         user_interactions=[],
+        # Processed data - nothing consumed from the capture streams yet
+        processed_interactions=[],
+        capture_watermarks=dict.fromkeys(CAPTURE_STREAMS, 0),
+        # Nothing drained from the Playwright client yet
+        capture_cursors={},
+        # No worker results merged yet
+        merged_jobs=[],
+        merged_seq=0,
         # Analysis results - initialized as empty
         inferred_api_endpoints=[],
         database_schema={},
         business_logic_patterns=[],
         ui_component_patterns=[],
+        discovery_history=[],
         # Generated outputs - initialized as empty dicts
         backend_code={},
         frontend_code={},
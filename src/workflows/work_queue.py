@@ -0,0 +1,386 @@
+"""
+SQLite work queue for distributed journey execution
+
+Journey specs are enqueued once, centrally, and pulled by worker processes
+on any machine that can reach the database file. A worker leases a job for
+a limited time and renews the lease while its browser runs; a job whose
+worker dies becomes available again when the lease expires. Failed jobs
+are retried with a delay until max_attempts is reached. Results are stored
+per job and the first result wins, so a job finished twice (by a worker
+whose lease had expired and the worker that took over) is merged once.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    spec TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_token TEXT,
+    lease_owner TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available_at);
+CREATE TABLE IF NOT EXISTS results (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL UNIQUE,
+    worker_id TEXT,
+    completed_at REAL NOT NULL,
+    payload BLOB NOT NULL
+);
+"""
+
+
+def job_id_for(spec: Dict[str, Any]) -> str:
+    """
+    Derive a stable job id from a journey spec.
+
+    Args:
+        spec: JSON-compatible journey spec
+
+    Returns:
+        Hex digest of the spec's canonical JSON
+    """
+    canonical = json.dumps(spec, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+class JourneyQueue:
+    """
+    Leased work queue of journey specs and their results.
+
+    Every state change runs in an immediate transaction, so any number of
+    worker processes can share one database file.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        lease_seconds: float = 300.0,
+        max_attempts: int = 3,
+        retry_delay: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the journey queue.
+
+        Args:
+            path: SQLite database file shared by the coordinator and workers,
+                or ":memory:" for a single-process queue
+            lease_seconds: Seconds a leased job stays with its worker unless
+                the lease is renewed
+            max_attempts: Leases a job gets before it is marked failed
+            retry_delay: Seconds before a failed attempt is retried
+            clock: Source of the current time in seconds
+        """
+        self.path = str(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.clock = clock
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, timeout=30.0
+        )
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(_SCHEMA)
+
+    def enqueue(self, spec: Dict[str, Any], job_id: Optional[str] = None) -> str:
+        """
+        Add a journey spec to the queue.
+
+        Enqueuing a job id that is already queued does nothing, so specs can
+        be enqueued again safely after a coordinator restart.
+
+        Args:
+            spec: JSON-compatible journey spec, e.g. {"workflow_description":
+                ..., "domain": ...}
+            job_id: Job id (defaults to a digest of the spec)
+
+        Returns:
+            The job id
+        """
+        job_id = job_id or job_id_for(spec)
+        now = self.clock()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO jobs "
+                "(job_id, spec, status, available_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job_id, json.dumps(spec, default=str), PENDING, now, now),
+            )
+        return job_id
+
+    def lease(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Lease the oldest job that is ready to run.
+
+        Pending jobs past their retry delay and leased jobs whose lease has
+        expired are eligible; an expired job out of attempts is marked
+        failed instead.
+
+        Args:
+            worker_id: Identifier of the leasing worker
+
+        Returns:
+            Lease with job_id, spec, attempt and lease_token, or None if no
+            job is ready
+        """
+        now = self.clock()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, last_error = 'lease expired' "
+                "WHERE status = ? AND lease_expires <= ? AND attempts >= ?",
+                (FAILED, LEASED, now, self.max_attempts),
+            )
+            row = conn.execute(
+                "SELECT job_id, spec, attempts FROM jobs "
+                "WHERE (status = ? AND available_at <= ?) "
+                "OR (status = ? AND lease_expires <= ?) "
+                "ORDER BY created_at, job_id LIMIT 1",
+                (PENDING, now, LEASED, now),
+            ).fetchone()
+            if row is None:
+                return None
+
+            job_id, spec, attempts = row
+            token = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = ?, lease_token = ?, "
+                "lease_owner = ?, lease_expires = ? WHERE job_id = ?",
+                (
+                    LEASED,
+                    attempts + 1,
+                    token,
+                    worker_id,
+                    now + self.lease_seconds,
+                    job_id,
+                ),
+            )
+
+        if attempts:
+            logger.info(f"Worker {worker_id} retrying job {job_id} ({attempts + 1})")
+        return {
+            "job_id": job_id,
+            "spec": json.loads(spec),
+            "attempt": attempts + 1,
+            "lease_token": token,
+        }
+
+    def renew(self, job_id: str, lease_token: str) -> bool:
+        """
+        Extend a lease that is still held.
+
+        Args:
+            job_id: Leased job
+            lease_token: Token returned by lease()
+
+        Returns:
+            False if the lease was lost to another worker or the job ended
+        """
+        with self._transaction() as conn:
+            renewed = conn.execute(
+                "UPDATE jobs SET lease_expires = ? "
+                "WHERE job_id = ? AND lease_token = ? AND status = ?",
+                (self.clock() + self.lease_seconds, job_id, lease_token, LEASED),
+            ).rowcount
+        return bool(renewed)
+
+    def complete(
+        self,
+        job_id: str,
+        result: Dict[str, Any],
+        worker_id: Optional[str] = None,
+    ) -> bool:
+        """
+        Store a job's result and mark the job done.
+
+        A result is accepted even from a worker whose lease expired, as long
+        as no result was stored yet; later results of the same job are
+        ignored.
+
+        Args:
+            job_id: Finished job
+            result: JSON-compatible result of the journey
+            worker_id: Identifier of the worker that ran it
+
+        Returns:
+            True if this result was stored, False for a duplicate
+        """
+        payload = zlib.compress(
+            json.dumps(result, default=str, separators=(",", ":")).encode("utf-8")
+        )
+        with self._transaction() as conn:
+            stored = conn.execute(
+                "INSERT OR IGNORE INTO results "
+                "(job_id, worker_id, completed_at, payload) VALUES (?, ?, ?, ?)",
+                (job_id, worker_id, self.clock(), payload),
+            ).rowcount
+            conn.execute(
+                "UPDATE jobs SET status = ?, lease_token = NULL, last_error = NULL "
+                "WHERE job_id = ?",
+                (DONE, job_id),
+            )
+        if not stored:
+            logger.info(f"Ignored duplicate result for job {job_id}")
+        return bool(stored)
+
+    def fail(self, job_id: str, lease_token: str, error: str) -> str:
+        """
+        Report a failed attempt, scheduling a retry if attempts remain.
+
+        Args:
+            job_id: Leased job
+            lease_token: Token returned by lease()
+            error: Description of the failure
+
+        Returns:
+            The job's new status, or its unchanged status if the lease was
+            no longer held
+        """
+        now = self.clock()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT status, attempts, lease_token FROM jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"Unknown job: {job_id}")
+            status, attempts, token = row
+            if status != LEASED or token != lease_token:
+                return status
+
+            status = FAILED if attempts >= self.max_attempts else PENDING
+            conn.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, lease_token = NULL, "
+                "last_error = ? WHERE job_id = ?",
+                (status, now + self.retry_delay, error, job_id),
+            )
+        logger.warning(f"Job {job_id} attempt {attempts} failed ({status}): {error}")
+        return status
+
+    def results(self, after: int = 0) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        """
+        Iterate stored results in completion order.
+
+        Args:
+            after: Only results stored after this sequence number
+
+        Yields:
+            Tuples of (sequence number, job id, result)
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT seq, job_id, payload FROM results WHERE seq > ? ORDER BY seq",
+                (after,),
+            ).fetchall()
+        for seq, job_id, payload in rows:
+            yield seq, job_id, json.loads(zlib.decompress(payload))
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Count jobs by status.
+
+        Returns:
+            Mapping of every status to its number of jobs
+        """
+        counts = dict.fromkeys((PENDING, LEASED, DONE, FAILED), 0)
+        with self._lock:
+            for status, count in self.conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ):
+                counts[status] = count
+        return counts
+
+    def job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job's state.
+
+        Args:
+            job_id: Job to look up
+
+        Returns:
+            The job's spec, status, attempts, lease owner and last error, or
+            None if there is no such job
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT spec, status, attempts, lease_owner, last_error "
+                "FROM jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        spec, status, attempts, lease_owner, last_error = row
+        return {
+            "job_id": job_id,
+            "spec": json.loads(spec),
+            "status": status,
+            "attempts": attempts,
+            "lease_owner": lease_owner,
+            "last_error": last_error,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self.conn.close()
+
+    def _transaction(self):
+        """Immediate transaction holding the queue's write lock."""
+        return _ImmediateTransaction(self.conn, self._lock)
+
+
+class _ImmediateTransaction:
+    """Context manager running a BEGIN IMMEDIATE ... COMMIT block."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.RLock):
+        """
+        Initialize the transaction.
+
+        Args:
+            conn: Connection in autocommit mode
+            lock: Lock serializing this process's use of the connection
+        """
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        """Acquire the lock and the database write lock."""
+        self.lock.acquire()
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.lock.release()
+            raise
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Commit, or roll back on an exception, and release the lock."""
+        try:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
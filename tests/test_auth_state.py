@@ -0,0 +1,122 @@
+"""
+Test authenticated storage-state reuse for Playwright MCP
+"""
+
+import json
+import time
+
+import pytest
+
+from src.integrations.auth_state import StorageStateCache
+from src.integrations.playwright_mcp import PlaywrightMCPClient
+from src.workflows.reverse_engineering import ReverseEngineeringWorkflow
+from src.workflows.state_management import create_initial_state
+
+ORIGIN = "https://legacy.example.com"
+STORAGE_STATE = {
+    "cookies": [{"name": "session", "value": "abc", "expires": -1}],
+    "origins": [{"origin": ORIGIN, "localStorage": [{"name": "k", "value": "v"}]}],
+}
+
+
+class TestStorageStateCache:
+    """Test the on-disk storage-state cache"""
+
+    def test_round_trips_storage_state(self, tmp_path):
+        """Saved storage states load back unchanged"""
+        cache = StorageStateCache(tmp_path)
+
+        cache.save("ap-clerk", ORIGIN, STORAGE_STATE)
+
+        assert cache.load("ap-clerk", ORIGIN) == STORAGE_STATE
+        assert cache.load("ap-clerk", "https://other.example.com") is None
+        assert cache.load("parts-clerk", ORIGIN) is None
+
+    def test_expired_entries_are_discarded(self, tmp_path):
+        """Entries past their TTL are not reused"""
+        cache = StorageStateCache(tmp_path, ttl=0.0)
+
+        cache.save("ap-clerk", ORIGIN, STORAGE_STATE)
+
+        assert cache.load("ap-clerk", ORIGIN) is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_cookie_expiry_caps_cache_expiry(self, tmp_path):
+        """An entry expires no later than its earliest cookie"""
+        cache = StorageStateCache(tmp_path, ttl=3600)
+        short_lived = {
+            "cookies": [
+                {"name": "session", "value": "abc", "expires": time.time() - 1}
+            ],
+            "origins": [],
+        }
+
+        cache.save("ap-clerk", ORIGIN, short_lived)
+
+        assert cache.load("ap-clerk", ORIGIN) is None
+
+    def test_corrupt_entries_are_discarded(self, tmp_path):
+        """Unreadable cache files are treated as misses"""
+        cache = StorageStateCache(tmp_path)
+        cache.save("ap-clerk", ORIGIN, STORAGE_STATE)
+        (entry,) = tmp_path.iterdir()
+        entry.write_text("{not json")
+
+        assert cache.load("ap-clerk", ORIGIN) is None
+
+    def test_entries_are_json_files(self, tmp_path):
+        """Cached entries record credential, origin and expiry"""
+        cache = StorageStateCache(tmp_path)
+        cache.save("ap-clerk", ORIGIN, STORAGE_STATE)
+
+        (entry,) = tmp_path.iterdir()
+        data = json.loads(entry.read_text())
+
+        assert data["credential_id"] == "ap-clerk"
+        assert data["origin"] == ORIGIN
+        assert data["expires_at"] > data["saved_at"]
+
+
+class TestAuthenticatedSessionReuse:
+    """Test that journeys reuse cached logins"""
+
+    @pytest.mark.asyncio
+    async def test_second_journey_skips_login_request(self, tmp_path):
+        """Only the first journey performs the login round-trip"""
+        cache = StorageStateCache(tmp_path)
+        workflow = ReverseEngineeringWorkflow(
+            client_factory=lambda: PlaywrightMCPClient(
+                storage_state_cache=cache, credential_id="ap-clerk"
+            )
+        )
+
+        first = await workflow.execute(
+            create_initial_state("Login and open invoices", "accounts_payable")
+        )
+        results = [
+            final_state
+            async for _, final_state in workflow.execute_many(
+                [create_initial_state("Login and open invoices", "accounts_payable")]
+            )
+        ]
+
+        assert [r["url"] for r in first["network_requests"]] == [
+            "https://example.com/api/login"
+        ]
+        second = results[0]
+        assert second["network_requests"] == []
+        assert second["user_interactions"][0]["result"]["authentication"] == (
+            "storage_state"
+        )
+
+    @pytest.mark.asyncio
+    async def test_new_session_is_not_authenticated(self):
+        """Attaching a different browser context drops the login"""
+        client = PlaywrightMCPClient()
+        client.execute_action("Login as clerk")
+        assert client.authenticated is True
+
+        client.attach_session("fresh-context")
+
+        assert client.authenticated is False
+        assert await client.restore_authentication() is False
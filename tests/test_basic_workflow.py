@@ -7,10 +7,12 @@ of the core workflow before implementation.
 
 import pytest
 from unittest.mock import Mock, patch
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 
 from src.workflows.reverse_engineering import ReverseEngineeringWorkflow
 from src.workflows.state_management import create_initial_state
+from src.integrations.playwright_mcp import PlaywrightMCPClient
 
 
 class TestBasicReverseEngineeringWorkflow:
@@ -247,3 +249,288 @@ class TestBasicReverseEngineeringWorkflow:
                 after_capture["workflow_description"]
                 == test_state["workflow_description"]
             )
+
+    @pytest.mark.asyncio
+    async def test_repeated_journeys_capture_each_event_once(self):
+        """Running the journey executor again only appends new captures"""
+        workflow = ReverseEngineeringWorkflow()
+        state = create_initial_state("Navigate to login page", "accounts_payable")
+
+        for _ in range(3):
+            state = await workflow.execute_journey(state)
+
+        logs = workflow.playwright_client.get_audit_logs()
+        requests = workflow.playwright_client.get_network_requests()
+        assert state["playwright_logs"] == logs
+        assert state["network_requests"] == requests
+        assert len(state["playwright_logs"]) == 3
+
+
+class TestIncrementalDataCapture:
+    """Test watermark-based incremental processing in the data capturer"""
+
+    @staticmethod
+    def _strip_processing_time(processed_interactions):
+        return [
+            {k: v for k, v in entry.items() if k != "processed_timestamp"}
+            for entry in processed_interactions
+        ]
+
+    @staticmethod
+    def _log(seconds, action="click"):
+        return {
+            "action": action,
+            "timestamp": (
+                datetime(2024, 1, 15) + timedelta(seconds=seconds)
+            ).isoformat(),
+        }
+
+    @staticmethod
+    def _request(seconds, url):
+        return {
+            "url": url,
+            "method": "GET",
+            "timestamp": (
+                datetime(2024, 1, 15) + timedelta(seconds=seconds)
+            ).isoformat(),
+        }
+
+    @pytest.mark.asyncio
+    async def test_incremental_passes_match_full_rebuild(self):
+        """Processing in several passes gives the same result as one pass"""
+        workflow = ReverseEngineeringWorkflow(correlation_window=1.0)
+        config = workflow._run_config()
+
+        incremental = create_initial_state("Test workflow", "test_domain")
+        batches = [
+            ([self._log(0), self._log(5)], [self._request(0.5, "/a")]),
+            # Late request at 4.5s must be attached to the log from the first pass
+            ([self._log(10)], [self._request(4.5, "/b"), self._request(10.2, "/c")]),
+            ([], [self._request(9.5, "/d")]),
+        ]
+        for logs, requests in batches:
+            incremental["playwright_logs"].extend(logs)
+            incremental["network_requests"].extend(requests)
+            incremental = await workflow.capture_data(incremental, config)
+
+        full = create_initial_state("Test workflow", "test_domain")
+        full["playwright_logs"] = list(incremental["playwright_logs"])
+        full["network_requests"] = list(incremental["network_requests"])
+        full = await workflow.capture_data(full)
+
+        assert self._strip_processing_time(
+            incremental["processed_interactions"]
+        ) == self._strip_processing_time(full["processed_interactions"])
+        assert [
+            [r["url"] for r in entry["correlated_requests"]]
+            for entry in incremental["processed_interactions"]
+        ] == [["/a"], ["/b"], ["/d", "/c"]]
+
+    @pytest.mark.asyncio
+    async def test_watermarks_track_processed_entries(self):
+        """Watermarks record how much of each stream has been processed"""
+        workflow = ReverseEngineeringWorkflow()
+
+        state = create_initial_state("Test workflow", "test_domain")
+        state["playwright_logs"].extend([self._log(0), self._log(1)])
+        state["network_requests"].append(self._request(0, "/a"))
+
+        state = await workflow.capture_data(state)
+
+        assert state["capture_watermarks"] == {
+            "playwright_logs": 2,
+            "network_requests": 1,
+            "dom_changes": 0,
+        }
+
+        # Only the new log entry is appended on the next pass
+        first_entry = state["processed_interactions"][0]
+        state["playwright_logs"].append(self._log(30))
+        state = await workflow.capture_data(state)
+
+        assert len(state["processed_interactions"]) == 3
+        assert state["processed_interactions"][0] is first_entry
+        assert state["capture_watermarks"]["playwright_logs"] == 3
+
+    @pytest.mark.asyncio
+    async def test_inconsistent_watermarks_trigger_full_rebuild(self):
+        """Streams replaced behind the capturer's back are reprocessed"""
+        workflow = ReverseEngineeringWorkflow()
+
+        state = create_initial_state("Test workflow", "test_domain")
+        state["playwright_logs"].extend([self._log(0), self._log(1)])
+        state = await workflow.capture_data(state)
+
+        state["playwright_logs"] = [self._log(0)]
+        state = await workflow.capture_data(state)
+
+        assert len(state["processed_interactions"]) == 1
+        assert state["capture_watermarks"]["playwright_logs"] == 1
+
+
+class TestConcurrentJourneyExecution:
+    """Test running many journeys through execute_many"""
+
+    @pytest.mark.asyncio
+    async def test_execute_many_returns_every_journey(self):
+        """Every journey yields exactly one final state with its index"""
+        workflow = ReverseEngineeringWorkflow()
+        descriptions = [f"Navigate to invoice page {i}" for i in range(6)]
+        states = [create_initial_state(d, "accounts_payable") for d in descriptions]
+
+        results = [
+            result async for result in workflow.execute_many(states, max_concurrency=2)
+        ]
+
+        assert sorted(index for index, _ in results) == list(range(6))
+        for index, final_state in results:
+            assert final_state["workflow_description"] == descriptions[index]
+            assert final_state["iteration_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_execute_many_isolates_clients(self):
+        """Each journey captures data only from its own client"""
+        created_clients = []
+
+        def client_factory():
+            client = PlaywrightMCPClient()
+            created_clients.append(client)
+            return client
+
+        workflow = ReverseEngineeringWorkflow(client_factory=client_factory)
+        states = [
+            create_initial_state(f"Login as user {i}", "accounts_payable")
+            for i in range(3)
+        ]
+
+        results = dict(
+            [
+                result
+                async for result in workflow.execute_many(states, max_concurrency=3)
+            ]
+        )
+
+        # One default client plus one per journey
+        assert len(created_clients) == 4
+        for index, final_state in results.items():
+            instructions = {
+                log["instruction"] for log in final_state["playwright_logs"]
+            }
+            assert instructions == {f"Login as user {index}"}
+            assert len(final_state["network_requests"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_blocking_actions_do_not_serialize_journeys(self):
+        """Slow synchronous browser steps run concurrently across journeys"""
+
+        class SlowClient(PlaywrightMCPClient):
+            def execute_action(self, instruction):
+                time.sleep(0.3)
+                return super().execute_action(instruction)
+
+        workflow = ReverseEngineeringWorkflow(client_factory=SlowClient)
+        states = [
+            create_initial_state(f"Open parts catalog {i}", "parts") for i in range(4)
+        ]
+
+        start = time.perf_counter()
+        results = [
+            result async for result in workflow.execute_many(states, max_concurrency=4)
+        ]
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == 4
+        # Serial execution would take 1.2s
+        assert elapsed < 0.9
+
+
+class ExploringClient(PlaywrightMCPClient):
+    """Client whose every journey iteration opens the next page of a crawl"""
+
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+        self.actions = 0
+
+    async def aexecute_action(self, instruction):
+        page = self.pages[min(self.actions, len(self.pages) - 1)]
+        self.actions += 1
+        return await self.navigate_to_url(page)
+
+
+class TestConvergenceLoop:
+    """Test the discovery-saturation loop around the journey executor"""
+
+    PAGES = [
+        "https://ap.example.com/api/invoices",
+        "https://ap.example.com/api/vendors",
+        "https://ap.example.com/api/payments",
+    ]
+
+    def workflow(self, pages, **options):
+        """Workflow exploring pages with the given loop options"""
+        return ReverseEngineeringWorkflow(
+            client_factory=lambda: ExploringClient(pages), **options
+        )
+
+    @pytest.mark.asyncio
+    async def test_single_iteration_by_default(self):
+        """Without max_iterations the journey runs once"""
+        workflow = self.workflow(self.PAGES)
+
+        final_state = await workflow.execute(create_initial_state("Explore", "ap"))
+
+        assert final_state["iteration_count"] == 1
+        assert len(final_state["inferred_api_endpoints"]) == 1
+        assert workflow.playwright_client.actions == 1
+
+    @pytest.mark.asyncio
+    async def test_stops_when_discovery_saturates(self):
+        """Exploration ends at the first iteration that finds nothing new"""
+        workflow = self.workflow(self.PAGES, max_iterations=10)
+
+        final_state = await workflow.execute(create_initial_state("Explore", "ap"))
+
+        history = final_state["discovery_history"]
+        assert final_state["iteration_count"] == 4
+        assert [entry["new_endpoints"] for entry in history] == [1, 1, 1, 0]
+        assert history[-1]["endpoints"] == 3
+        assert len(final_state["inferred_api_endpoints"]) == 3
+        assert len(final_state["processed_interactions"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_patience_tolerates_dry_iterations(self):
+        """A dry spell shorter than the patience doesn't stop exploration"""
+        pages = self.PAGES[:1] * 2 + self.PAGES[1:]
+        workflow = self.workflow(pages, max_iterations=10, saturation_patience=2)
+
+        final_state = await workflow.execute(create_initial_state("Explore", "ap"))
+
+        yields = [e["new_endpoints"] for e in final_state["discovery_history"]]
+        assert yields == [1, 0, 1, 1, 0, 0]
+
+    @pytest.mark.asyncio
+    async def test_max_iterations_caps_exploration(self):
+        """A run never takes more than max_iterations journey iterations"""
+        pages = [f"https://ap.example.com/api/report{i}" for i in range(10)]
+        workflow = self.workflow(pages, max_iterations=3)
+
+        final_state = await workflow.execute(create_initial_state("Explore", "ap"))
+
+        assert final_state["iteration_count"] == 3
+        assert workflow.playwright_client.actions == 3
+
+    @pytest.mark.asyncio
+    async def test_standalone_analysis_resumes_from_history(self):
+        """A fresh aggregator only counts requests beyond the last iteration"""
+        workflow = ReverseEngineeringWorkflow()
+        state = create_initial_state("Explore", "ap")
+        state["network_requests"].extend(
+            {"url": url, "method": "GET"} for url in self.PAGES[:2]
+        )
+        state = await workflow.analyze_patterns(state)
+
+        state["network_requests"].append({"url": self.PAGES[2], "method": "GET"})
+        state = await workflow.analyze_patterns(state)
+
+        assert [e["new_endpoints"] for e in state["discovery_history"]] == [2, 1]
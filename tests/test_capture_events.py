@@ -0,0 +1,90 @@
+"""
+Test compact capture event records
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.integrations.capture_events import (
+    AuditEvent,
+    NetworkEvent,
+    event_dict,
+    format_timestamp_ns,
+)
+from src.integrations.capture_journal import CaptureJournal
+from src.integrations.playwright_mcp import PlaywrightMCPClient
+
+
+class TestCaptureEvents:
+    """Test event records and their dict conversion"""
+
+    def test_timestamp_matches_datetime_isoformat(self):
+        """Nanosecond timestamps format like datetime.now().isoformat()"""
+        moment = datetime(2024, 1, 15, 10, 30, 0, 123456)
+        timestamp_ns = int(moment.timestamp()) * 10**9 + 123456789
+
+        assert format_timestamp_ns(timestamp_ns) == moment.isoformat()
+        assert format_timestamp_ns(int(moment.timestamp()) * 10**9) == (
+            moment.replace(microsecond=0).isoformat()
+        )
+
+    def test_records_convert_to_capture_dicts(self):
+        """Only the fields that were set appear in the dicts"""
+        timestamp_ns = int(datetime(2024, 1, 15, 10, 30).timestamp()) * 10**9
+
+        audit = AuditEvent("click", timestamp_ns, True, selector="#save")
+        request = NetworkEvent("https://example.com/api", "POST", 201, 80, timestamp_ns)
+
+        assert audit.to_dict() == {
+            "action": "click",
+            "selector": "#save",
+            "timestamp": "2024-01-15T10:30:00",
+            "timestamp_ns": timestamp_ns,
+            "success": True,
+        }
+        assert request.to_dict() == {
+            "url": "https://example.com/api",
+            "method": "POST",
+            "status": 201,
+            "response_time": 80,
+            "timestamp": "2024-01-15T10:30:00",
+            "timestamp_ns": timestamp_ns,
+        }
+        assert event_dict({"action": "navigate"}) == {"action": "navigate"}
+        assert not hasattr(audit, "__dict__")
+
+    def test_spilled_records_read_back_as_dicts(self, tmp_path):
+        """Records spilled by a capture journal come back in dict form"""
+        journal = CaptureJournal(high_water=2, directory=tmp_path)
+        events = [AuditEvent("navigate", 10**18 + i, True, url="/a") for i in range(5)]
+        journal.extend(events)
+
+        assert [event_dict(entry) for entry in journal] == [
+            event.to_dict() for event in events
+        ]
+
+
+class TestClientEventRecords:
+    """Test that the client keeps records and hands out dicts"""
+
+    @pytest.mark.asyncio
+    async def test_one_timestamp_per_navigation(self):
+        """A navigation's request, audit log and result share a timestamp"""
+        client = PlaywrightMCPClient()
+
+        result = await client.navigate_to_url("https://example.com/login")
+
+        assert isinstance(client._audit_logs[0], AuditEvent)
+        (request,) = client.get_network_requests()
+        (log,) = client.get_audit_logs()
+        assert request["timestamp"] == log["timestamp"] == result["timestamp"]
+        assert request["timestamp_ns"] == log["timestamp_ns"]
+        assert request["request_type"] == "navigation"
+        assert log == {
+            "action": "navigate",
+            "url": "https://example.com/login",
+            "timestamp": result["timestamp"],
+            "timestamp_ns": request["timestamp_ns"],
+            "success": True,
+        }
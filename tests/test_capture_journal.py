@@ -0,0 +1,100 @@
+"""
+Test the spill-to-disk capture journal
+"""
+
+import gc
+import os
+
+import pytest
+
+from src.integrations.capture_journal import CaptureJournal
+from src.integrations.playwright_mcp import PlaywrightMCPClient
+
+
+def entries(count):
+    """Audit log entries numbered from 0."""
+    return [
+        {"action": "click", "selector": f"#button-{i}", "step": i} for i in range(count)
+    ]
+
+
+class TestCaptureJournal:
+    """Test spilling, reading back and releasing journal files"""
+
+    def test_reads_spilled_and_recent_entries_as_one_sequence(self, tmp_path):
+        """Entries read the same wherever they are held"""
+        journal = CaptureJournal(high_water=10, directory=tmp_path)
+        expected = entries(95)
+
+        journal.extend(expected)
+
+        assert journal.spilled > 0
+        assert len(journal._recent) <= 10
+        assert len(journal) == 95
+        assert list(journal) == expected
+        assert journal == expected
+        assert journal[0] == expected[0]
+        assert journal[-1] == expected[-1]
+        assert journal[journal.spilled - 3 : journal.spilled + 3] == (
+            expected[journal.spilled - 3 : journal.spilled + 3]
+        )
+        assert journal[::10] == expected[::10]
+
+    def test_appends_after_reading_remap_the_file(self, tmp_path):
+        """Entries spilled after a read are visible to later reads"""
+        journal = CaptureJournal(high_water=4, directory=tmp_path)
+        journal.extend(entries(10))
+        assert journal[0]["step"] == 0
+
+        journal.extend(entries(20)[10:])
+
+        assert [entry["step"] for entry in journal] == list(range(20))
+
+    def test_clear_and_collection_delete_the_file(self, tmp_path):
+        """Journal files don't outlive the journal's entries"""
+        journal = CaptureJournal(high_water=2, directory=tmp_path)
+        journal.extend(entries(10))
+        assert len(os.listdir(tmp_path)) == 1
+
+        journal.clear()
+        assert os.listdir(tmp_path) == []
+        assert len(journal) == 0
+
+        journal.extend(entries(10))
+        assert journal == entries(10)
+        del journal
+        gc.collect()
+        assert os.listdir(tmp_path) == []
+
+    def test_without_high_water_nothing_spills(self):
+        """A journal without a high-water mark stays in memory"""
+        journal = CaptureJournal(high_water=None)
+        journal.extend(entries(1000))
+
+        assert journal.spilled == 0
+        with pytest.raises(IndexError):
+            journal[1000]
+
+
+class TestClientCaptureJournal:
+    """Test Playwright client buffers backed by capture journals"""
+
+    @pytest.mark.asyncio
+    async def test_long_crawl_spills_and_drains_completely(self, tmp_path):
+        """Drains return every entry even after most have spilled"""
+        client = PlaywrightMCPClient(capture_high_water=8, capture_directory=tmp_path)
+        drained, cursor = [], None
+
+        for i in range(50):
+            await client.navigate_to_url(f"https://example.com/page/{i}")
+            if i % 7 == 0:
+                new, cursor = client.drain_network_requests(cursor)
+                drained.extend(new)
+        new, cursor = client.drain_network_requests(cursor)
+        drained.extend(new)
+
+        assert client._network_requests.spilled > 0
+        assert [r["url"] for r in drained] == [
+            f"https://example.com/page/{i}" for i in range(50)
+        ]
+        assert client.get_network_requests() == drained
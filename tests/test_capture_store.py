@@ -0,0 +1,127 @@
+"""
+Test the columnar network request store
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+from src.agents.pattern_analyzer import PatternAnalysisAgent
+from src.workflows.capture_store import NetworkRequestStore
+from src.workflows.state_management import create_initial_state
+
+
+def sample_requests():
+    """Requests covering typed, missing and irregular fields."""
+    return [
+        {
+            "url": "https://api.example.com/users/123",
+            "method": "GET",
+            "status": 200,
+            "response_time": 150,
+            "timestamp": datetime(2024, 1, 15, 10, 30, 0, 125000).isoformat(),
+            "timestamp_ns": 1705314600_125_000_000,
+        },
+        {
+            "url": "https://api.example.com/users",
+            "method": "POST",
+            "status": 201,
+            "response_time": 180.5,
+            "timestamp": datetime(2024, 1, 15, 10, 30, 1).isoformat(),
+            "headers": {"Content-Type": "application/json"},
+            "request_body": '{"name": "Jane"}',
+        },
+        # Missing fields, non-string url, timezone-aware timestamp
+        {
+            "url": None,
+            "method": "",
+            "timestamp": datetime(2024, 1, 15, tzinfo=timezone.utc).isoformat(),
+        },
+        {"url": "https://api.example.com/users/123", "method": "GET"},
+    ]
+
+
+class TestNetworkRequestStore:
+    """Test list compatibility and the vectorized API"""
+
+    def test_round_trips_requests_exactly(self):
+        """Materialized rows equal the appended dicts, including value types"""
+        requests = sample_requests()
+        store = NetworkRequestStore(requests)
+
+        assert len(store) == 4
+        assert store == requests
+        assert list(store) == requests
+        assert store[-1] == requests[-1]
+        assert store[1:3] == requests[1:3]
+        assert type(store[0]["response_time"]) is int
+        assert type(store[1]["response_time"]) is float
+
+    def test_behaves_like_a_list_of_dicts(self):
+        """Supports the list operations the workflow relies on"""
+        store = NetworkRequestStore()
+        assert store == []
+        assert not store
+
+        store.append(sample_requests()[0])
+        store.extend(sample_requests()[1:])
+
+        assert len(store) == 4
+        assert store[0]["url"] == "https://api.example.com/users/123"
+
+        copied = store.copy()
+        store.clear()
+        assert len(store) == 0
+        assert copied == sample_requests()
+
+    def test_exposes_typed_columns(self):
+        """Columns are typed arrays with explicit missing values"""
+        store = NetworkRequestStore(sample_requests())
+
+        assert store.column("status").dtype == np.int16
+        assert list(store.column("status")) == [200, 201, -1, -1]
+        assert np.isnan(store.column("response_time")[2])
+        assert store.column("url")[2] is None
+        assert np.isnat(store.column("timestamp")[2])
+        assert store.column("timestamp")[0] == np.datetime64("2024-01-15T10:30:00.125")
+        assert list(store.column("timestamp_ns")) == [
+            1705314600_125_000_000,
+            -1,
+            -1,
+            -1,
+        ]
+        assert store._extras[0] is None
+
+    def test_dictionary_encodes_urls(self):
+        """Repeated URLs share a single code"""
+        store = NetworkRequestStore(sample_requests())
+
+        codes = store.url_codes()
+        categories = store.url_categories()
+
+        assert codes[0] == codes[3]
+        assert codes[2] == -1
+        assert categories[codes[1]] == "https://api.example.com/users"
+
+    def test_builds_dataframe(self):
+        """to_frame exposes the typed columns to pandas"""
+        frame = NetworkRequestStore(sample_requests()).to_frame()
+
+        assert list(frame.columns) == list(NetworkRequestStore.COLUMNS)
+        assert frame["method"].value_counts()["GET"] == 2
+        assert frame["status"].isna().sum() == 2
+
+    def test_initial_state_uses_store_transparently(self):
+        """Pattern analysis works on state backed by the store"""
+        state = create_initial_state("User management workflow", "user_management")
+        state["network_requests"].extend(sample_requests())
+
+        result = PatternAnalysisAgent().analyze_api_patterns(state)
+
+        users = next(
+            ep
+            for ep in result["inferred_api_endpoints"]
+            if ep["path_pattern"] == "/users/{id}"
+        )
+        assert isinstance(state["network_requests"], NetworkRequestStore)
+        assert users["call_count"] == 2
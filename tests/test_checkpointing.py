@@ -0,0 +1,240 @@
+"""
+Test the delta-based SQLite checkpointer
+"""
+
+from datetime import datetime, timedelta
+
+from langgraph.checkpoint.base import empty_checkpoint
+import pytest
+
+from src.workflows.capture_store import NetworkRequestStore
+from src.workflows.checkpointing import DeltaSQLiteSaver
+from src.workflows.reverse_engineering import ReverseEngineeringWorkflow
+from src.workflows.state_management import create_initial_state
+
+
+def log_entry(i):
+    """Audit log entry i seconds after a fixed start."""
+    return {
+        "action": f"click #{i}",
+        "timestamp": (datetime(2024, 1, 15, 10, 30) + timedelta(seconds=i)).isoformat(),
+    }
+
+
+def put_states(saver, states, thread_id="thread"):
+    """Store each channel-value dict as the next checkpoint of a thread."""
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    versions = {}
+    configs = []
+
+    for step, values in enumerate(states):
+        new_versions = {}
+        for channel in values:
+            versions[channel] = saver.get_next_version(versions.get(channel), None)
+            new_versions[channel] = versions[channel]
+
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = values
+        checkpoint["channel_versions"] = dict(versions)
+        config = saver.put(config, checkpoint, {"step": step}, new_versions)
+        configs.append(config)
+
+    return configs
+
+
+class TestDeltaSQLiteSaver:
+    """Test delta storage, compaction and restore"""
+
+    def test_appended_entries_stored_as_deltas(self):
+        """Growing capture streams only store their new entries"""
+        saver = DeltaSQLiteSaver()
+        logs = [log_entry(i) for i in range(6)]
+        states = [
+            {"playwright_logs": logs[: 2 * step], "iteration_count": step // 2}
+            for step in range(4)
+        ]
+
+        configs = put_states(saver, states)
+
+        stats = saver.storage_stats()
+        assert stats["checkpoints"] == 4
+        assert stats["blobs"]["append"] == 3
+        # iteration_count only changed once after the first checkpoint
+        assert stats["blobs"]["unchanged"] == 2
+
+        for config, values in zip(configs, states):
+            restored = saver.get_tuple(config).checkpoint["channel_values"]
+            assert restored == values
+
+    def test_compacts_after_snapshot_interval(self):
+        """Delta chains are cut by a full snapshot every interval"""
+        saver = DeltaSQLiteSaver(snapshot_interval=2)
+        logs = [log_entry(i) for i in range(5)]
+        states = [{"playwright_logs": logs[: step + 1]} for step in range(5)]
+
+        configs = put_states(saver, states)
+
+        stats = saver.storage_stats()
+        assert stats["blobs"]["snapshot"] == 2
+        assert stats["blobs"]["append"] == 3
+        latest = saver.get_tuple({"configurable": {"thread_id": "thread"}})
+        assert latest.config == configs[-1]
+        assert latest.checkpoint["channel_values"]["playwright_logs"] == logs
+
+    def test_replaced_stream_stored_in_full(self):
+        """A stream that isn't an extension of its base is snapshotted"""
+        saver = DeltaSQLiteSaver()
+        states = [
+            {"dom_changes": [{"id": 1}, {"id": 2}]},
+            {"dom_changes": [{"id": 1}, {"id": 9}, {"id": 3}]},
+            {"dom_changes": [{"id": 1}]},
+        ]
+
+        configs = put_states(saver, states)
+
+        assert saver.storage_stats()["blobs"]["snapshot"] == 3
+        for config, values in zip(configs, states):
+            assert saver.get_tuple(config).checkpoint["channel_values"] == values
+
+    def test_restores_network_request_store(self):
+        """Columnar request stores survive snapshots and deltas"""
+        saver = DeltaSQLiteSaver()
+        requests = [
+            {"url": f"https://api.example.com/users/{i}", "method": "GET"}
+            for i in range(3)
+        ]
+        states = [
+            {"network_requests": NetworkRequestStore(requests[:1])},
+            {"network_requests": NetworkRequestStore(requests)},
+        ]
+
+        configs = put_states(saver, states)
+
+        restored = saver.get_tuple(configs[-1]).checkpoint["channel_values"]
+        assert isinstance(restored["network_requests"], NetworkRequestStore)
+        assert restored["network_requests"] == requests
+
+    def test_derived_channels_not_stored(self):
+        """Derived channels are left for the workflow to rebuild"""
+        saver = DeltaSQLiteSaver()
+        configs = put_states(
+            saver, [{"processed_interactions": [{"a": 1}], "iteration_count": 1}]
+        )
+
+        restored = saver.get_tuple(configs[0]).checkpoint["channel_values"]
+        assert restored == {"iteration_count": 1}
+
+    def test_pending_writes_store_deltas(self):
+        """Task writes keep only appended entries and changed values"""
+        saver = DeltaSQLiteSaver()
+        logs = [log_entry(i) for i in range(3)]
+        (config,) = put_states(
+            saver, [{"playwright_logs": logs[:2], "iteration_count": 1}]
+        )
+        writes = [
+            ("playwright_logs", logs),
+            ("iteration_count", 1),
+            ("processed_interactions", [{"a": 1}]),
+        ]
+
+        saver.put_writes(config, writes, "task")
+
+        rows = saver.conn.execute(
+            "SELECT channel, base_version IS NOT NULL, data IS NULL FROM writes "
+            "ORDER BY idx"
+        ).fetchall()
+        assert rows == [("playwright_logs", 1, 0), ("iteration_count", 1, 1)]
+        assert saver.get_tuple(config).pending_writes == [
+            ("task", "playwright_logs", logs),
+            ("task", "iteration_count", 1),
+        ]
+
+    def test_persists_across_connections(self, tmp_path):
+        """A new saver on the same file resumes the stored thread"""
+        path = tmp_path / "checkpoints.db"
+        saver = DeltaSQLiteSaver(path)
+        logs = [log_entry(i) for i in range(3)]
+        put_states(saver, [{"playwright_logs": logs[:1]}, {"playwright_logs": logs}])
+        saver.close()
+
+        reopened = DeltaSQLiteSaver(path)
+        listed = list(reopened.list({"configurable": {"thread_id": "thread"}}))
+
+        assert [t.metadata["step"] for t in listed] == [1, 0]
+        assert listed[0].checkpoint["channel_values"]["playwright_logs"] == logs
+        assert len(list(reopened.list(None, filter={"step": 0}))) == 1
+
+        reopened.delete_thread("thread")
+        assert reopened.get_tuple({"configurable": {"thread_id": "thread"}}) is None
+
+
+class TestCheckpointedWorkflow:
+    """Test running and resuming the workflow with checkpoints"""
+
+    @pytest.mark.asyncio
+    async def test_resume_from_earlier_checkpoint(self):
+        """Resuming after the journey step reruns capture from the checkpoint"""
+        saver = DeltaSQLiteSaver()
+        workflow = ReverseEngineeringWorkflow(checkpointer=saver)
+        state = create_initial_state("Navigate to login page", "user_management")
+
+        result = await workflow.execute(state, thread_id="journey")
+
+        assert "workflow_error" not in result
+        after_journey = next(
+            t
+            for t in saver.list({"configurable": {"thread_id": "journey"}})
+            if t.metadata["step"] == 1
+        )
+
+        resumed = await workflow.resume(
+            "journey", after_journey.config["configurable"]["checkpoint_id"]
+        )
+
+        assert resumed["playwright_logs"] == result["playwright_logs"]
+        assert resumed["network_requests"] == result["network_requests"]
+        assert len(resumed["processed_interactions"]) == len(
+            result["processed_interactions"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_resume_finished_run_rebuilds_derived_state(self):
+        """A finished run resumes to its final state with processed data"""
+        workflow = ReverseEngineeringWorkflow(checkpointer=DeltaSQLiteSaver())
+        state = create_initial_state("Navigate to login page", "user_management")
+
+        result = await workflow.execute(state, thread_id="done")
+        resumed = await workflow.resume("done")
+
+        assert resumed["iteration_count"] == result["iteration_count"]
+        assert len(resumed["processed_interactions"]) == len(
+            result["processed_interactions"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_writes_grow_linearly_over_iterations(self):
+        """Node writes store deltas, not every channel's value again"""
+
+        async def write_bytes(iterations):
+            saver = DeltaSQLiteSaver()
+            workflow = ReverseEngineeringWorkflow(
+                checkpointer=saver, max_iterations=iterations, min_discovery_yield=0
+            )
+            state = create_initial_state("Navigate to login page", "user_management")
+            await workflow.execute(state, thread_id="long")
+            derived = saver.conn.execute(
+                "SELECT COUNT(*) FROM writes WHERE channel = 'processed_interactions'"
+            ).fetchone()[0]
+            assert derived == 0
+            return saver.storage_stats()["write_bytes"]
+
+        short, long = await write_bytes(5), await write_bytes(20)
+
+        # Four times the iterations; storing full values grew about 11 times
+        assert long < 5 * short
+
+    @pytest.mark.asyncio
+    async def test_resume_requires_checkpointer(self):
+        """Resuming without a checkpointer is rejected"""
+        with pytest.raises(ValueError):
+            await ReverseEngineeringWorkflow().resume("missing")
@@ -0,0 +1,127 @@
+"""
+Test time-indexed correlation of interaction logs and network requests
+"""
+
+from datetime import datetime, timedelta
+
+from src.workflows.correlation import (
+    DataCorrelationEngine,
+    entry_timestamp,
+    parse_timestamp,
+)
+
+BASE_TIME = datetime(2024, 1, 15, 10, 30, 0)
+
+
+def at(seconds: float) -> str:
+    """ISO timestamp a number of seconds after BASE_TIME."""
+    return (BASE_TIME + timedelta(seconds=seconds)).isoformat()
+
+
+class TestDataCorrelationEngine:
+    """Test the windowed merge join between logs and requests"""
+
+    def test_parses_supported_timestamp_formats(self):
+        """Parses ISO strings, datetimes and epoch numbers"""
+        assert parse_timestamp(at(0)) == BASE_TIME.timestamp()
+        assert parse_timestamp(BASE_TIME) == BASE_TIME.timestamp()
+        assert parse_timestamp(1700000000) == 1700000000.0
+        assert parse_timestamp("not a timestamp") is None
+        assert parse_timestamp(None) is None
+
+    def test_prefers_epoch_nanoseconds(self):
+        """Entries carrying timestamp_ns are indexed without parsing the string"""
+        base_ns = int(BASE_TIME.timestamp()) * 10**9
+        engine = DataCorrelationEngine(time_window=1.0)
+
+        correlated = engine.correlate(
+            [{"action": "click", "timestamp": "display only", "timestamp_ns": base_ns}],
+            [
+                {"url": "/ns", "timestamp": "-", "timestamp_ns": base_ns + 5 * 10**8},
+                {"url": "/iso", "timestamp": at(0.75)},
+                {
+                    "url": "/late",
+                    "timestamp": at(0),
+                    "timestamp_ns": base_ns + 2 * 10**9,
+                },
+            ],
+        )
+
+        assert entry_timestamp({"timestamp_ns": base_ns}) == BASE_TIME.timestamp()
+        assert [r["url"] for r in correlated[0]] == ["/ns", "/iso"]
+
+    def test_matches_requests_inside_window_only(self):
+        """Only requests within the configured window are correlated"""
+        engine = DataCorrelationEngine(time_window=2.0)
+
+        logs = [{"action": "click", "timestamp": at(10)}]
+        requests = [
+            {"url": "/too-early", "timestamp": at(7)},
+            {"url": "/before", "timestamp": at(8.5)},
+            {"url": "/after", "timestamp": at(11)},
+            {"url": "/too-late", "timestamp": at(12.5)},
+        ]
+
+        correlated = engine.correlate(logs, requests)
+
+        assert [r["url"] for r in correlated[0]] == ["/before", "/after"]
+
+    def test_supports_many_to_many_matches(self):
+        """A request can match several logs and a log several requests"""
+        engine = DataCorrelationEngine(time_window=1.0)
+
+        logs = [
+            {"action": "navigate", "timestamp": at(0)},
+            {"action": "click", "timestamp": at(0.5)},
+        ]
+        requests = [
+            {"url": "/a", "timestamp": at(0.2)},
+            {"url": "/b", "timestamp": at(0.4)},
+        ]
+
+        correlated = engine.correlate(logs, requests)
+
+        assert [r["url"] for r in correlated[0]] == ["/a", "/b"]
+        assert [r["url"] for r in correlated[1]] == ["/a", "/b"]
+
+    def test_orders_out_of_order_requests_by_time(self):
+        """Requests arriving out of order are returned in time order"""
+        engine = DataCorrelationEngine(time_window=5.0)
+
+        engine.add_requests([{"url": "/second", "timestamp": at(2)}])
+        engine.add_requests(
+            [
+                {"url": "/first", "timestamp": at(1)},
+                {"url": "/third", "timestamp": at(3)},
+            ]
+        )
+
+        correlated = engine.correlate_entry({"timestamp": at(2)})
+
+        assert [r["url"] for r in correlated] == ["/first", "/second", "/third"]
+
+    def test_asymmetric_window(self):
+        """The window after a log entry can differ from the window before"""
+        engine = DataCorrelationEngine(time_window=0.0, window_after=3.0)
+
+        correlated = engine.correlate(
+            [{"timestamp": at(10)}],
+            [
+                {"url": "/before", "timestamp": at(9)},
+                {"url": "/after", "timestamp": at(12)},
+            ],
+        )
+
+        assert [r["url"] for r in correlated[0]] == ["/after"]
+
+    def test_skips_entries_without_timestamps(self):
+        """Entries without parseable timestamps never correlate"""
+        engine = DataCorrelationEngine()
+
+        correlated = engine.correlate(
+            [{"action": "click"}, {"action": "click", "timestamp": at(0)}],
+            [{"url": "/no-time"}, {"url": "/timed", "timestamp": at(0)}],
+        )
+
+        assert correlated[0] == []
+        assert [r["url"] for r in correlated[1]] == ["/timed"]
@@ -0,0 +1,300 @@
+"""
+Test novelty-prioritized UI crawling
+"""
+
+import pytest
+
+from src.integrations.capture_events import NetworkEvent, now_ns
+from src.integrations.playwright_mcp import PlaywrightMCPClient
+from src.workflows.crawler import (
+    CrawlFrontier,
+    UICrawler,
+    action_signature,
+    dom_structure_hash,
+    page_actions,
+)
+from src.workflows.reverse_engineering import ReverseEngineeringWorkflow
+from src.workflows.state_management import create_initial_state
+
+ORIGIN = "https://ap.example.com"
+RECORDS = 20
+
+
+def node(tag, *children, text=None, **attrs):
+    """DOM node in snapshot_page format."""
+    return {"tag": tag, "attrs": attrs, "text": text, "children": list(children)}
+
+
+def nav():
+    """Navigation menu repeated on every page."""
+    return node(
+        "nav",
+        node("a", text="Invoices", href="/invoices"),
+        node("a", text="Vendors", href="/vendors"),
+        node("a", text="Reports", href="/reports"),
+        node("button", text="Log out", id="logout"),
+    )
+
+
+def table(resource):
+    """Listing with a link per record."""
+    return node(
+        "table",
+        *(
+            node("tr", node("td", node("a", text=f"#{i}", href=f"/{resource}/{i}")))
+            for i in range(1, RECORDS + 1)
+        ),
+    )
+
+
+class FakeAppClient(PlaywrightMCPClient):
+    """
+    Client simulating an accounts payable app.
+
+    Pages load their data from an API; buttons call further endpoints, and
+    "New invoice" opens a form whose "Submit" posts it.
+    """
+
+    def __init__(self):
+        super().__init__(origin=ORIGIN)
+        self.form_open = False
+
+    async def navigate_to_url(self, url):
+        result = await super().navigate_to_url(url)
+        self.form_open = False
+        self._api("GET", f"/api{url[len(ORIGIN):]}")
+        return result
+
+    async def click_element(self, element_description, selector):
+        result = await super().click_element(element_description, selector)
+        path = self.current_url[len(ORIGIN) :]
+        calls = {
+            "Search": ("GET", "/api/invoices/search"),
+            "Export": ("GET", "/api/invoices/export"),
+            "Delete all": ("DELETE", "/api/invoices"),
+            "Approve": ("POST", f"/api{path}/approve"),
+            "Save": ("PUT", f"/api{path}"),
+            "Monthly": ("GET", "/api/reports/monthly"),
+            "Yearly": ("GET", "/api/reports/yearly"),
+            "Submit": ("POST", "/api/invoices"),
+            "Log out": ("POST", "/api/logout"),
+        }
+        if element_description == "New invoice":
+            self.form_open = True
+        elif element_description in calls:
+            self._api(*calls[element_description])
+        return result
+
+    async def snapshot_page(self):
+        path = self.current_url[len(ORIGIN) :]
+        parts = path.strip("/").split("/")
+        body = [nav()]
+        if parts == ["invoices"]:
+            body += [
+                node("button", text="Search"),
+                node("button", text="Export"),
+                node("button", text="New invoice"),
+                node("button", text="Delete all"),
+                table("invoices"),
+            ]
+            if self.form_open:
+                body.append(node("form", node("input", type="submit", value="Submit")))
+        elif parts == ["vendors"]:
+            body.append(table("vendors"))
+        elif parts[0] == "invoices":
+            body.append(node("button", text="Approve", id="approve"))
+        elif parts[0] == "vendors":
+            body.append(node("input", type="submit", value="Save", name="save"))
+        elif parts == ["reports"]:
+            body += [
+                node("div", text="Monthly", role="tab"),
+                node("div", text="Yearly", role="tab"),
+            ]
+        return {"url": self.current_url, "dom": node("html", node("body", *body))}
+
+    def _api(self, method, path):
+        self._network_requests.append(
+            NetworkEvent(f"{ORIGIN}{path}", method, 200, 40, now_ns())
+        )
+
+
+def brute_force_actions():
+    """Actions a walk of every action on every page would take."""
+    listing = 3 + 4 + RECORDS  # menu links, buttons, record links
+    return (
+        4  # home
+        + 4
+        + listing  # invoices
+        + 4
+        + 1
+        + listing  # invoices with the form open
+        + RECORDS * (4 + 1)  # invoice detail pages
+        + 4
+        + RECORDS  # vendors
+        + RECORDS * (4 + 1)  # vendor detail pages
+        + 4
+        + 2  # reports
+    )
+
+
+class TestStateIdentity:
+    """Test DOM structure hashing and action extraction"""
+
+    def test_structure_hash_ignores_text_values_and_repeats(self):
+        """The same screen with other data is the same state"""
+        a = node(
+            "ul", node("li", text="Acme", id="v1"), node("li", text="Bolt", id="v2")
+        )
+        b = node("ul", node("li", text="Corp", id="v9"))
+        c = node("ul", node("li", text="Acme"), node("span"))
+
+        assert dom_structure_hash(a) == dom_structure_hash(b)
+        assert dom_structure_hash(a) != dom_structure_hash(c)
+
+    def test_structural_attribute_values_count(self):
+        """An input's type changes the state"""
+        text = node("form", node("input", type="text"))
+        password = node("form", node("input", type="password"))
+
+        assert dom_structure_hash(text) != dom_structure_hash(password)
+
+    def test_structure_hash_handles_deep_pages(self):
+        """Deeply nested legacy markup doesn't hit the recursion limit"""
+        dom = node("div")
+        for _ in range(5000):
+            dom = node("div", dom)
+
+        assert len(dom_structure_hash(dom)) == 40
+
+    def test_page_actions(self):
+        """Same-origin links and clickable elements become journey steps"""
+        dom = node(
+            "body",
+            node("a", text="Invoices", href="/invoices#top"),
+            node("a", text="Help", href="https://help.example.com/"),
+            node("a", text="Top", href="#top"),
+            node("button", node("span", text="Approve"), ref="e12"),
+            node("input", type="submit", value="Save", name="save"),
+            node("div", text="Monthly", role="tab"),
+        )
+
+        assert page_actions(dom, f"{ORIGIN}/home") == [
+            {"action": "navigate", "url": f"{ORIGIN}/invoices"},
+            {"action": "click", "element": "Approve", "selector": "e12"},
+            {"action": "click", "element": "Save", "selector": 'input[name="save"]'},
+            {
+                "action": "click",
+                "element": "Monthly",
+                "selector": 'div:has-text("Monthly")',
+            },
+        ]
+
+    def test_action_signatures(self):
+        """Record links share a signature; clicks are scoped to the page"""
+        first = {"action": "navigate", "url": f"{ORIGIN}/invoices/1"}
+        second = {"action": "navigate", "url": f"{ORIGIN}/invoices/22"}
+        save = {"action": "click", "element": "Save", "selector": "#save"}
+
+        assert action_signature(first, ORIGIN) == action_signature(second, ORIGIN)
+        assert action_signature(save, f"{ORIGIN}/vendors/1") == action_signature(
+            save, f"{ORIGIN}/vendors/2"
+        )
+        assert action_signature(save, f"{ORIGIN}/vendors/1") != action_signature(
+            save, f"{ORIGIN}/parts/1"
+        )
+
+
+class TestCrawlFrontier:
+    """Test frontier ordering"""
+
+    def test_prefers_actions_like_those_that_paid_off(self):
+        """Learned yields reorder queued actions"""
+        frontier = CrawlFrontier()
+        frontier.add_state(
+            "home",
+            ORIGIN,
+            [],
+            [
+                {"action": "click", "element": "Print", "selector": "#print"},
+                {"action": "click", "element": "Search vendors", "selector": "#sv"},
+            ],
+        )
+        frontier.record({"action": "click", "element": "Print", "selector": "#p"}, 0)
+        frontier.record({"action": "click", "element": "Search", "selector": "#s"}, 3)
+
+        assert frontier.pop()["step"]["element"] == "Search vendors"
+        assert frontier.pop()["step"]["element"] == "Print"
+        assert frontier.pop() is None
+
+    def test_known_states_and_tried_signatures_are_skipped(self):
+        """Nothing is queued twice"""
+        frontier = CrawlFrontier()
+        link = {"action": "navigate", "url": f"{ORIGIN}/invoices/1"}
+        assert frontier.add_state("a", ORIGIN, [], [link])
+        assert not frontier.add_state("a", ORIGIN, [], [link])
+        frontier.pop()
+
+        frontier.add_state("b", ORIGIN, [], [dict(link, url=f"{ORIGIN}/invoices/2")])
+        assert len(frontier) == 0
+
+
+class TestUICrawler:
+    """Test exploring an application"""
+
+    @pytest.mark.asyncio
+    async def test_covers_the_app_with_far_fewer_actions_than_brute_force(self):
+        """Every reachable endpoint is found without walking every action"""
+        crawler = UICrawler(FakeAppClient())
+        summary = await crawler.crawl(f"{ORIGIN}/home")
+
+        assert set(summary["endpoints"]) >= {
+            f"GET {ORIGIN}/api/invoices/search",
+            f"GET {ORIGIN}/api/invoices/export",
+            f"POST {ORIGIN}/api/invoices",
+            f"POST {ORIGIN}/api/invoices/0/approve",
+            f"PUT {ORIGIN}/api/vendors/0",
+            f"GET {ORIGIN}/api/reports/monthly",
+            f"GET {ORIGIN}/api/reports/yearly",
+        }
+        assert not any(
+            "logout" in e or e.startswith("DELETE") for e in summary["endpoints"]
+        )
+        assert summary["frontier"] == 0 and not summary["budget_exhausted"]
+        assert summary["browser_actions"] * 4 < brute_force_actions()
+
+    @pytest.mark.asyncio
+    async def test_stops_at_the_action_budget(self):
+        """The crawl ends when its budget is spent"""
+        crawler = UICrawler(FakeAppClient(), max_actions=5)
+        summary = await crawler.crawl(f"{ORIGIN}/home")
+
+        assert summary["budget_exhausted"]
+        assert summary["browser_actions"] == 5
+        assert summary["frontier"] > 0
+
+    @pytest.mark.asyncio
+    async def test_stops_at_the_time_budget(self):
+        """The crawl ends when its time is up"""
+        ticks = iter(range(100))
+        crawler = UICrawler(FakeAppClient(), time_budget=3, clock=lambda: next(ticks))
+        summary = await crawler.crawl(f"{ORIGIN}/home")
+
+        assert summary["budget_exhausted"]
+        assert summary["actions_tried"] == 2
+
+    @pytest.mark.asyncio
+    async def test_workflow_explore_analyzes_the_crawl(self):
+        """Exploration feeds the capture streams and pattern analysis"""
+        workflow = ReverseEngineeringWorkflow(client_factory=FakeAppClient)
+        state = await workflow.explore(
+            create_initial_state("Explore accounts payable", "ap"), f"{ORIGIN}/home"
+        )
+
+        interaction = state["user_interactions"][0]
+        urls = {
+            endpoint["path_pattern"] for endpoint in state["inferred_api_endpoints"]
+        }
+        assert interaction["success"] and interaction["result"]["states"] > 1
+        assert state["iteration_count"] == 1
+        assert len(state["network_requests"]) > 0
+        assert any("reports/monthly" in url for url in urls)
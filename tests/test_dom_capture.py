@@ -0,0 +1,348 @@
+"""
+Test diff-compressed DOM change capture
+"""
+
+import copy
+import json
+import random
+
+import pytest
+
+from src.integrations.capture_events import event_dict
+from src.integrations.dom_capture import DomCapture, SubtreeStore
+from src.integrations.playwright_mcp import PlaywrightMCPClient
+from src.workflows.reverse_engineering import ReverseEngineeringWorkflow
+from src.workflows.state_management import create_initial_state
+
+ORIGIN = "https://ap.example.com"
+
+
+def node(tag, *children, text=None, **attrs):
+    """DOM node in snapshot_page form."""
+    return {"tag": tag, "attrs": attrs, "text": text, "children": list(children)}
+
+
+def invoice_page(rows=500, status="pending", modal=False):
+    """A heavy listing page: menu, filters and a long table."""
+    body = [
+        node("nav", *(node("a", text=f"Menu {i}", href=f"/m{i}") for i in range(20))),
+        node("form", node("input", name="q"), node("button", text="Search")),
+        node(
+            "table",
+            *(
+                node(
+                    "tr",
+                    node("td", text=f"INV-{i:05d}"),
+                    node("td", text=status if i == 7 else "pending"),
+                    node("td", node("button", text="Approve")),
+                )
+                for i in range(rows)
+            ),
+        ),
+    ]
+    if modal:
+        body.append(node("div", node("h2", text="Approve invoice"), role="dialog"))
+    return node("html", node("body", *body))
+
+
+def size(value):
+    """Bytes of a value's JSON form."""
+    return len(json.dumps(value, separators=(",", ":")))
+
+
+def mutate(rng, dom):
+    """Apply a random structural edit to a copy of a DOM tree."""
+    dom = copy.deepcopy(dom)
+    nodes = [dom]
+    for current in nodes:
+        nodes.extend(current["children"])
+    target = rng.choice(nodes)
+    choice = rng.randrange(5)
+    if choice == 0:
+        target["text"] = f"text {rng.random()}"
+    elif choice == 1:
+        target["attrs"][rng.choice("abc")] = rng.randrange(3)
+    elif choice == 2 and target["attrs"]:
+        target["attrs"].pop(rng.choice(sorted(target["attrs"])))
+    elif choice == 3 and target["children"]:
+        del target["children"][rng.randrange(len(target["children"]))]
+    else:
+        position = rng.randrange(len(target["children"]) + 1)
+        target["children"].insert(position, node(rng.choice("ps"), text="new"))
+    if rng.random() < 0.1 and target is not dom:
+        target["tag"] = "section"
+    return dom
+
+
+class TestSubtreeStore:
+    """Test interning, rebuilding and diffing trees"""
+
+    def test_identical_subtrees_are_stored_once(self):
+        """Repeated markup costs one node per distinct subtree"""
+        store = SubtreeStore()
+        row = node("tr", node("td", node("button", text="Approve")))
+        table = node("table", *(copy.deepcopy(row) for _ in range(1000)))
+
+        root, added = store.intern(table)
+
+        assert len(store) == len(added) == 4
+        assert store.tree(root) == table
+
+    def test_interning_again_adds_nothing(self):
+        """Known trees are recognized by hash"""
+        store = SubtreeStore()
+        first, _ = store.intern(invoice_page())
+        second, added = store.intern(invoice_page())
+
+        assert first == second
+        assert added == set()
+
+    def test_diff_of_a_text_change_is_one_update(self):
+        """Unchanged subtrees are skipped"""
+        store = SubtreeStore()
+        old, _ = store.intern(invoice_page())
+        new, _ = store.intern(invoice_page(status="approved"))
+
+        ops = store.diff(old, new)
+
+        assert ops == [{"op": "update", "path": [0, 2, 7, 1], "text": "approved"}]
+
+    def test_diff_of_an_added_subtree_is_one_splice(self):
+        """Inserted subtrees are referenced by hash"""
+        store = SubtreeStore()
+        old, _ = store.intern(invoice_page())
+        new, added = store.intern(invoice_page(modal=True))
+
+        (op,) = store.diff(old, new)
+
+        assert op["op"] == "splice" and op["path"] == [0]
+        assert (op["index"], op["remove"]) == (3, 0)
+        assert op["insert"][0] in added
+
+    @pytest.mark.parametrize("seed", range(25))
+    def test_applying_a_diff_rebuilds_the_new_tree(self, seed):
+        """Diff ops turn the base tree into the new tree"""
+        rng = random.Random(seed)
+        store = SubtreeStore()
+        before = invoice_page(rows=5)
+        for _ in range(20):
+            after = before
+            for _ in range(rng.randint(1, 4)):
+                after = mutate(rng, after)
+            old, _ = store.intern(before)
+            new, _ = store.intern(after)
+
+            assert store.apply(old, store.diff(old, new)) == new
+            assert store.tree(new) == after
+            before = after
+
+    def test_applying_a_diff_in_a_fresh_store(self):
+        """Changed ancestors are derived from the base tree and the ops"""
+        store = SubtreeStore()
+        old, _ = store.intern(invoice_page(rows=5))
+        new, _ = store.intern(invoice_page(rows=6, modal=True))
+        ops = store.diff(old, new)
+
+        replica = SubtreeStore()
+        replica.intern(invoice_page(rows=5))
+        inserted = [digest for op in ops for digest in op.get("insert", ())]
+        replica.add(store.nodes(store.subtree(inserted)))
+
+        assert replica.apply(old, ops) == new
+        assert replica.tree(new) == invoice_page(rows=6, modal=True)
+
+    def test_unknown_ops_are_rejected(self):
+        """A diff from another format fails loudly"""
+        store = SubtreeStore()
+        root, _ = store.intern(invoice_page(rows=1))
+
+        with pytest.raises(ValueError):
+            store.apply(root, [{"op": "move", "path": [0]}])
+
+    def test_unhashable_attribute_values(self):
+        """Attribute values that can't be dict keys are still stored"""
+        store = SubtreeStore()
+        dom = node("div", node("span", data=["a", "b"]))
+
+        root, added = store.intern(dom)
+
+        assert len(added) == 2 and store.intern(dom) == (root, set())
+        assert store.tree(root) == dom
+
+    def test_deep_trees(self):
+        """Deeply nested legacy markup doesn't hit the recursion limit"""
+        store = SubtreeStore()
+        dom = node("div", text="leaf")
+        for _ in range(5000):
+            dom = node("div", dom)
+
+        root, _ = store.intern(dom)
+
+        assert len(store) == 5001
+        assert SubtreeStore().intern(store.tree(root))[0] == root
+
+
+class TestDomCapture:
+    """Test baseline and diff events"""
+
+    def test_baseline_then_small_diffs(self):
+        """Per-action events stay small on a heavy page"""
+        capture = DomCapture()
+        url = f"{ORIGIN}/invoices?page=1"
+
+        baseline = event_dict(capture.capture(url, invoice_page(), "navigate"))
+        diff = event_dict(capture.capture(url, invoice_page(modal=True), "click"))
+
+        assert baseline["type"] == "baseline"
+        assert baseline["page"] == f"{ORIGIN}/invoices"
+        assert diff["type"] == "diff" and diff["base"] == baseline["root"]
+        # Only the dialog and its heading are new; html and body are derived
+        assert len(diff["nodes"]) == 2 and diff["root"] not in diff["nodes"]
+        assert size(diff) * 100 < size(invoice_page())
+        assert size(baseline) < size(invoice_page())
+        assert "timestamp" in diff
+
+    def test_unchanged_pages_record_nothing(self):
+        """An action that changed nothing costs nothing"""
+        capture = DomCapture()
+        capture.capture(f"{ORIGIN}/invoices", invoice_page(), "navigate")
+
+        assert capture.capture(f"{ORIGIN}/invoices", invoice_page(), "click") is None
+
+    def test_events_alone_rebuild_every_tree(self):
+        """A consumer rebuilds each snapshot from the JSON event stream"""
+        capture = DomCapture()
+        pages = [
+            (f"{ORIGIN}/invoices", invoice_page()),
+            (f"{ORIGIN}/invoices", invoice_page(modal=True)),
+            (f"{ORIGIN}/vendors", invoice_page(rows=3)),
+            (f"{ORIGIN}/invoices", invoice_page(status="approved")),
+        ]
+        events = [
+            json.loads(json.dumps(event_dict(capture.capture(url, dom, "click"))))
+            for url, dom in pages
+        ]
+
+        store = SubtreeStore()
+        store.load(events)
+
+        for event, (_, dom) in zip(events, pages):
+            assert store.tree(event["root"]) == dom
+            if event["type"] == "diff":
+                assert store.apply(event["base"], event["ops"]) == event["root"]
+
+    def test_diffs_that_do_not_rebuild_are_rejected(self):
+        """Loading a diff whose ops don't reach its root fails"""
+        capture = DomCapture()
+        url = f"{ORIGIN}/invoices"
+        events = [
+            event_dict(capture.capture(url, invoice_page(), "navigate")),
+            event_dict(capture.capture(url, invoice_page(status="held"), "click")),
+        ]
+        events[1]["ops"][0]["text"] = "approved"
+
+        with pytest.raises(ValueError):
+            SubtreeStore().load(events)
+
+
+class SnapshottingClient(PlaywrightMCPClient):
+    """Client whose pages render an invoice listing"""
+
+    def __init__(self, **kwargs):
+        super().__init__(origin=ORIGIN, **kwargs)
+        self.modal = False
+
+    async def click_element(self, element_description, selector):
+        self.modal = True
+        return await super().click_element(element_description, selector)
+
+    async def snapshot_page(self):
+        return {"url": self.current_url, "dom": invoice_page(modal=self.modal)}
+
+
+class TestClientDomChanges:
+    """Test DOM changes captured by the Playwright client"""
+
+    @pytest.mark.asyncio
+    async def test_actions_capture_dom_changes(self):
+        """Navigations and clicks record baselines and diffs"""
+        client = SnapshottingClient()
+        await client.navigate_to_url(f"{ORIGIN}/invoices")
+        await client.click_element("Approve", "tr:nth-child(8) button")
+        await client.navigate_to_url(f"{ORIGIN}/invoices")
+
+        changes = client.get_dom_changes()
+        assert [(c["type"], c["action"]) for c in changes] == [
+            ("baseline", "navigate"),
+            ("diff", "click"),
+        ]
+
+        store = SubtreeStore()
+        store.load(changes)
+        assert store.tree(changes[-1]["root"]) == invoice_page(modal=True)
+
+    @pytest.mark.asyncio
+    async def test_spilled_changes_still_rebuild(self, tmp_path):
+        """DOM changes spilled to the capture journal keep their nodes"""
+        client = SnapshottingClient(capture_high_water=2, capture_directory=tmp_path)
+        for page in range(6):
+            await client.navigate_to_url(f"{ORIGIN}/invoices/{page}")
+
+        changes, _ = client.drain_dom_changes()
+        store = SubtreeStore()
+        store.load(changes)
+
+        assert len(changes) == 6
+        assert store.tree(changes[0]["root"]) == invoice_page()
+
+    @pytest.mark.asyncio
+    async def test_cleared_sessions_start_from_baselines(self):
+        """Changes after a clear never depend on cleared events"""
+        client = SnapshottingClient()
+        await client.navigate_to_url(f"{ORIGIN}/invoices")
+        client.clear_session_data()
+        await client.click_element("Approve", "button")
+
+        (change,) = client.get_dom_changes()
+        assert change["type"] == "baseline"
+        assert len(change["nodes"]) > 1
+
+    @pytest.mark.asyncio
+    async def test_failed_snapshots_do_not_fail_actions(self):
+        """A page that can't be snapshotted only loses its DOM change"""
+
+        class BrokenSnapshots(PlaywrightMCPClient):
+            async def snapshot_page(self):
+                raise RuntimeError("page crashed")
+
+        client = BrokenSnapshots()
+        result = await client.navigate_to_url(f"{ORIGIN}/invoices")
+
+        assert result["success"]
+        assert client.get_dom_changes() == []
+
+
+class JourneyClient(SnapshottingClient):
+    """Client whose journeys open the invoice listing and approve one"""
+
+    async def aexecute_action(self, instruction):
+        await self.navigate_to_url(f"{ORIGIN}/invoices")
+        return await self.click_element("Approve", "tr:nth-child(8) button")
+
+
+class TestWorkflowDomChanges:
+    """Test DOM changes reaching the workflow state"""
+
+    @pytest.mark.asyncio
+    async def test_journeys_populate_dom_changes(self):
+        """The state's dom_changes are filled and correlated"""
+        workflow = ReverseEngineeringWorkflow(client_factory=JourneyClient)
+        state = await workflow.execute(create_initial_state("Approve invoice", "ap"))
+
+        assert [c["type"] for c in state["dom_changes"]] == ["baseline", "diff"]
+        click = next(
+            p
+            for p in state["processed_interactions"]
+            if p["original_log"]["action"] == "click"
+        )
+        assert len(click["correlated_dom_changes"]) == 2
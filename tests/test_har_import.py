@@ -0,0 +1,208 @@
+"""
+Test streaming HAR import
+"""
+
+import io
+import json
+import time
+
+import pytest
+
+from src.agents.pattern_analyzer import PatternAnalysisAgent
+from src.integrations.capture_events import format_timestamp_ns
+from src.integrations.har_import import (
+    iter_har,
+    iter_har_requests,
+    load_har,
+    normalize_timestamp,
+)
+from src.workflows.capture_store import NetworkRequestStore
+from src.workflows.reverse_engineering import ReverseEngineeringWorkflow
+from src.workflows.state_management import create_initial_state
+
+
+@pytest.fixture
+def local_time(monkeypatch):
+    """Set the local time zone for the test."""
+
+    def set_zone(zone):
+        monkeypatch.setenv("TZ", zone)
+        time.tzset()
+
+    yield set_zone
+    monkeypatch.undo()
+    time.tzset()
+
+
+def har_entry(i, body=None):
+    """HAR entry for GET /users/{i}, one second after the previous one."""
+    return {
+        "pageref": "page_1",
+        "startedDateTime": f"2024-01-15T10:30:{i:02d}.000+01:00",
+        "time": 100 + i,
+        "request": {
+            "method": "GET",
+            "url": f"https://api.example.com/users/{i}",
+            "headers": [{"name": "Accept", "value": "application/json"}],
+        },
+        "response": {
+            "status": 200,
+            "headers": [{"name": "Content-Type", "value": "application/json"}],
+            "content": {"mimeType": "application/json", "text": body or ""},
+        },
+        "timings": {"send": 1, "wait": 90, "receive": 9},
+    }
+
+
+def har_document(entries):
+    """HAR document whose creator and pages surround the entries."""
+    return {
+        "log": {
+            "version": "1.2",
+            "creator": {"name": "legacy-recorder", "version": "3.1"},
+            "pages": [
+                {
+                    "id": "page_1",
+                    "title": "https://app.example.com/users",
+                    "startedDateTime": "2024-01-15T10:29:59.500+01:00",
+                    "pageTimings": {"onLoad": 800},
+                }
+            ],
+            "entries": entries,
+            "comment": "exported [entries] { }",
+        }
+    }
+
+
+class TestStreamingHarParser:
+    """Test incremental parsing of HAR documents"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+    def test_matches_full_parse_for_any_chunk_size(self, chunk_size):
+        """Entries split across reads decode the same as a full json.load"""
+        document = har_document([har_entry(i, '{"id": %d}' % i) for i in range(20)])
+        text = json.dumps(document, indent=2)
+
+        items = list(iter_har(io.StringIO(text), chunk_size=chunk_size))
+
+        assert items[0] == ("page", document["log"]["pages"][0])
+        assert [item for kind, item in items[1:]] == document["log"]["entries"]
+
+    def test_reads_binary_files_and_paths(self, tmp_path):
+        """Paths and binary streams, with or without a BOM, are accepted"""
+        path = tmp_path / "session.har"
+        path.write_bytes(
+            b"\xef\xbb\xbf" + json.dumps(har_document([har_entry(1)])).encode()
+        )
+
+        from_path = list(iter_har_requests(path))
+        with open(path, "rb") as f:
+            from_binary = list(iter_har_requests(f, chunk_size=16))
+
+        assert from_path == from_binary
+        assert from_path[0]["url"] == "https://api.example.com/users/1"
+
+    def test_buffer_bounded_by_largest_entry(self):
+        """The reader never holds much more than one entry"""
+        entries = [har_entry(i % 60, "x" * 2000) for i in range(500)]
+        text = json.dumps(har_document(entries))
+        stream = io.StringIO(text)
+        largest = 0
+
+        original_read = stream.read
+
+        def tracking_read(size=-1):
+            nonlocal largest
+            largest = max(largest, size)
+            return original_read(size)
+
+        stream.read = tracking_read
+        assert sum(1 for _ in iter_har(stream, chunk_size=512)) == 501
+        assert largest < 2 * len(json.dumps(entries[0]))
+
+    def test_rejects_malformed_documents(self):
+        """Truncated or non-HAR input raises ValueError"""
+        text = json.dumps(har_document([har_entry(1), har_entry(2)]))
+
+        with pytest.raises(ValueError):
+            list(iter_har(io.StringIO(text[: len(text) // 2]), chunk_size=32))
+        with pytest.raises(ValueError):
+            list(iter_har(io.StringIO("[1, 2, 3]")))
+
+    def test_malformed_entries_are_not_buffered_to_the_end(self):
+        """A value that never decodes is rejected at the entry size limit"""
+        entries = [har_entry(i % 60, "x" * 2000) for i in range(500)]
+        text = json.dumps(har_document(entries))
+        broken = text.replace('"time": 101', '"time": 1O1', 1)
+        stream = io.StringIO(broken)
+
+        with pytest.raises(ValueError, match="within 10000 characters"):
+            list(iter_har(stream, chunk_size=512, max_entry_size=10_000))
+        assert stream.tell() < 3 * 10_000
+
+
+class TestHarCaptureShape:
+    """Test conversion of HAR entries to capture records"""
+
+    def test_entries_become_network_requests(self, local_time):
+        """Entries carry the network request fields and, optionally, bodies"""
+        local_time("UTC")
+        text = json.dumps(har_document([har_entry(3, '{"id": 3}')]))
+
+        (request,) = iter_har_requests(io.StringIO(text))
+        (lean,) = iter_har_requests(io.StringIO(text), include_bodies=False)
+
+        assert request == {
+            "url": "https://api.example.com/users/3",
+            "method": "GET",
+            "status": 200,
+            "response_time": 103,
+            "timestamp": "2024-01-15T09:30:03",
+            "timestamp_ns": 1705311003_000_000_000,
+            "headers": {"Content-Type": "application/json"},
+            "response_body": '{"id": 3}',
+        }
+        assert set(lean) == set(NetworkRequestStore.COLUMNS)
+
+    def test_normalizes_timestamps_to_naive_local_time(self, local_time):
+        """Offsets are folded into naive local time, like live captures"""
+        local_time("EST5")
+        instant = "2024-01-15T10:30:00.250Z"
+        epoch_ns = 1705314600_250_000_000
+
+        assert normalize_timestamp(instant) == "2024-01-15T05:30:00.250000"
+        assert normalize_timestamp(instant) == format_timestamp_ns(epoch_ns)
+        assert normalize_timestamp("2024-01-15T10:30:00") == "2024-01-15T10:30:00"
+        assert normalize_timestamp("yesterday") == "yesterday"
+
+    def test_pages_take_their_first_entry_url(self):
+        """Page logs carry a URL, never the page title"""
+        document = har_document([har_entry(4), har_entry(5)])
+        document["log"]["pages"].append({"id": "page_2", "title": "Vendors"})
+        document["log"]["pages"].append({"id": "page_3", "title": "Unused"})
+        document["log"]["entries"][1]["pageref"] = "page_2"
+        state = create_initial_state("Imported session", "user_management")
+
+        load_har(state, io.StringIO(json.dumps(document)))
+
+        assert [log["url"] for log in state["playwright_logs"]] == [
+            "https://api.example.com/users/4",
+            "https://api.example.com/users/5",
+            "",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_feeds_capture_and_pattern_analysis(self):
+        """Imported traffic is analyzed and correlated without a browser"""
+        text = json.dumps(har_document([har_entry(i) for i in range(5)]))
+        state = create_initial_state("Imported session", "user_management")
+
+        counts = load_har(state, io.StringIO(text))
+        state = await ReverseEngineeringWorkflow().capture_data(state)
+        analyzed = PatternAnalysisAgent().analyze_api_patterns(state)
+
+        assert counts == {"requests": 5, "pages": 1}
+        assert state["playwright_logs"][0]["url"] == "https://api.example.com/users/0"
+        assert len(state["processed_interactions"]) == 1
+        assert analyzed["inferred_api_endpoints"][0]["path_pattern"] == "/users/{id}"
+        assert analyzed["inferred_api_endpoints"][0]["call_count"] == 5
@@ -0,0 +1,158 @@
+"""
+Test the on-disk journey result cache
+"""
+
+import pytest
+
+from src.integrations.playwright_mcp import PlaywrightMCPClient
+from src.workflows.journey_cache import JourneyCache, fingerprint_target
+from src.workflows.reverse_engineering import ReverseEngineeringWorkflow
+from src.workflows.state_management import create_initial_state
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def outputs(i=0, padding=0):
+    """Journey outputs with one captured request."""
+    return {
+        "interaction": {"instruction": f"journey {i}", "success": True},
+        "playwright_logs": [{"action": "navigate", "pad": "x" * padding}],
+        "network_requests": [{"url": f"https://example.com/{i}", "method": "GET"}],
+        "dom_changes": [],
+    }
+
+
+class TestJourneyCache:
+    """Test lookups, expiry and eviction"""
+
+    def test_round_trips_outputs_by_description_domain_and_iteration(self):
+        """Entries are found only under their own key"""
+        cache = JourneyCache()
+        cache.put("Approve invoice", "accounts_payable", 0, outputs(0))
+
+        assert cache.get("Approve invoice", "accounts_payable", 0) == outputs(0)
+        assert cache.get("Approve invoice", "accounts_payable", 1) is None
+        assert cache.get("Approve invoice", "returns", 0) is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_other_target_builds_never_hit(self, tmp_path):
+        """Entries persist on disk but are scoped to the target fingerprint"""
+        path = tmp_path / "journeys.db"
+        old_build = fingerprint_target("4.2.0", "app.3f2a.js")
+        cache = JourneyCache(path, target_fingerprint=old_build)
+        cache.put("Approve invoice", "accounts_payable", 0, outputs())
+        cache.close()
+
+        same = JourneyCache(path, target_fingerprint=old_build)
+        new = JourneyCache(path, target_fingerprint=fingerprint_target("4.3.0"))
+
+        assert same.get("Approve invoice", "accounts_payable") == outputs()
+        assert new.get("Approve invoice", "accounts_payable") is None
+
+    def test_entries_expire_after_the_ttl(self):
+        """Expired entries miss and are deleted"""
+        clock = FakeClock()
+        cache = JourneyCache(ttl=60, clock=clock)
+        cache.put("Find part", "parts", 0, outputs())
+
+        clock.now += 59
+        assert cache.get("Find part", "parts") is not None
+        clock.now += 1
+        assert cache.get("Find part", "parts") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used_over_the_size_limit(self):
+        """Recently read entries survive eviction"""
+        clock = FakeClock()
+        cache = JourneyCache(clock=clock, max_bytes=None)
+        cache.put("probe", "parts", 0, outputs(padding=0))
+        entry_size = cache.size()
+        cache.clear()
+        cache.max_bytes = 3 * entry_size + entry_size // 2
+
+        for i in range(3):
+            clock.now += 1
+            cache.put(f"journey {i}", "parts", 0, outputs(i))
+        clock.now += 1
+        cache.get("journey 0", "parts")
+        clock.now += 1
+        cache.put("journey 3", "parts", 0, outputs(3))
+
+        assert cache.size() <= cache.max_bytes
+        assert cache.get("journey 1", "parts") is None
+        assert cache.get("journey 0", "parts") is not None
+        assert cache.get("journey 3", "parts") is not None
+
+    def test_evict_expired_sweeps_old_entries(self):
+        """Expired entries can be swept without a lookup"""
+        clock = FakeClock()
+        cache = JourneyCache(ttl=10, clock=clock)
+        cache.put("a", "parts", 0, outputs())
+        clock.now += 5
+        cache.put("b", "parts", 0, outputs())
+        clock.now += 6
+
+        assert cache.evict_expired() == 1
+        assert len(cache) == 1
+
+
+class CountingClient(PlaywrightMCPClient):
+    """Client counting the browser actions it performs"""
+
+    def __init__(self):
+        super().__init__()
+        self.actions = 0
+
+    async def aexecute_action(self, instruction):
+        self.actions += 1
+        return await self.navigate_to_url("https://ap.example.com/api/invoices")
+
+
+class TestWorkflowJourneyCache:
+    """Test serving journey iterations from the cache"""
+
+    @pytest.mark.asyncio
+    async def test_rerun_is_served_without_the_browser(self):
+        """A second run of the same journey doesn't touch the client"""
+        cache = JourneyCache()
+        first = ReverseEngineeringWorkflow(
+            client_factory=CountingClient, journey_cache=cache
+        )
+        live = await first.execute(create_initial_state("Open invoices", "ap"))
+
+        second = ReverseEngineeringWorkflow(
+            client_factory=CountingClient, journey_cache=cache
+        )
+        replayed = await second.execute(create_initial_state("Open invoices", "ap"))
+
+        assert first.playwright_client.actions == 1
+        assert second.playwright_client.actions == 0
+        assert replayed["user_interactions"][0]["cached"] is True
+        assert list(replayed["network_requests"]) == list(live["network_requests"])
+        assert replayed["playwright_logs"] == live["playwright_logs"]
+        assert replayed["inferred_api_endpoints"] == live["inferred_api_endpoints"]
+
+    @pytest.mark.asyncio
+    async def test_failed_journeys_are_not_cached(self):
+        """Only successful iterations are stored"""
+
+        class FailingClient(CountingClient):
+            async def aexecute_action(self, instruction):
+                self.actions += 1
+                return {"success": False, "error": "Element not found"}
+
+        cache = JourneyCache()
+        workflow = ReverseEngineeringWorkflow(
+            client_factory=FailingClient, journey_cache=cache
+        )
+        await workflow.execute(create_initial_state("Open invoices", "ap"))
+
+        assert len(cache) == 0
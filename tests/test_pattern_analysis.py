@@ -6,6 +6,8 @@ Following TDD principles - tests written first, then implementation.
 """
 
 from src.agents.pattern_analyzer import PatternAnalysisAgent
+from src.agents.route_inference import RouteInferenceEngine
+from src.workflows.capture_store import NetworkRequestStore
 from src.workflows.state_management import create_initial_state
 
 
@@ -581,3 +583,207 @@ class TestPatternAnalysisAgent:
         )
         assert put_orders_endpoint is not None
         assert put_orders_endpoint["call_count"] == 1
+
+
+class TestEndpointAggregator:
+    """Test the online endpoint aggregator."""
+
+    def sample_requests(self):
+        """Requests spread over two endpoints plus one invalid entry."""
+        return [
+            {
+                "url": "https://api.example.com/users/123",
+                "method": "GET",
+                "status": 200,
+                "response_time": 150,
+                "timestamp": "2024-01-15T10:30:00",
+            },
+            {
+                "url": "https://api.example.com/users/456",
+                "method": "GET",
+                "status": 404,
+                "response_time": 50,
+                "timestamp": "2024-01-15T10:30:05",
+            },
+            {"url": "", "method": "GET", "status": 400},
+            {
+                "url": "https://api.example.com/users",
+                "method": "POST",
+                "status": 201,
+                "response_time": 200.5,
+                "timestamp": "2024-01-15T10:30:10",
+            },
+            {
+                "url": "https://api.example.com/users/789",
+                "method": "GET",
+                "status": 200,
+                "response_time": 100,
+                "timestamp": "2024-01-15T10:30:15",
+            },
+        ]
+
+    def test_snapshot_matches_batch_analysis(self):
+        """Observing requests one by one gives the batch endpoints."""
+        agent = PatternAnalysisAgent()
+        requests = self.sample_requests()
+        state = create_initial_state("User management workflow", "user_management")
+        state["network_requests"] = requests
+
+        aggregator = agent.create_aggregator()
+        for request in requests:
+            aggregator.observe(request)
+
+        assert (
+            aggregator.snapshot()
+            == agent.analyze_api_patterns(state)["inferred_api_endpoints"]
+        )
+        assert aggregator.observed == 5
+        assert len(aggregator) == 2
+
+    def test_tracks_endpoint_statistics(self):
+        """Call statistics are kept per endpoint pattern."""
+        aggregator = PatternAnalysisAgent().create_aggregator()
+        aggregator.observe_many(self.sample_requests())
+
+        users = next(
+            ep
+            for ep in aggregator.snapshot(include_stats=True)
+            if ep["path_pattern"] == "/users/{id}"
+        )
+
+        assert users["call_count"] == 3
+        assert users["stats"] == {
+            "status_counts": {200: 2, 404: 1},
+            "response_time_min": 50,
+            "response_time_max": 150,
+            "response_time_avg": 100.0,
+            "first_seen": "2024-01-15T10:30:00",
+            "last_seen": "2024-01-15T10:30:15",
+        }
+
+    def test_snapshots_are_independent(self):
+        """Later observations don't change an earlier snapshot."""
+        aggregator = PatternAnalysisAgent().create_aggregator()
+        requests = self.sample_requests()
+
+        aggregator.observe(requests[0])
+        first = aggregator.snapshot()
+        aggregator.observe(requests[1])
+
+        assert first[0]["call_count"] == 1
+        assert aggregator.snapshot()[0]["call_count"] == 2
+
+    def test_counts_body_fields_and_resets(self):
+        """Body schema fields are counted across endpoints until reset."""
+        aggregator = PatternAnalysisAgent().create_aggregator()
+        aggregator.observe_many(self.sample_requests())
+        assert aggregator.field_count() == 0
+
+        aggregator.observe(
+            {
+                "url": "https://api.example.com/users",
+                "method": "POST",
+                "status": 201,
+                "request_body": '{"name": "Ada", "roles": ["admin"]}',
+                "response_body": '{"id": 7}',
+            }
+        )
+        # name, roles and the roles items; id
+        assert aggregator.field_count() == 4
+
+        aggregator.reset()
+        assert aggregator.observed == 0
+        assert len(aggregator) == 0
+        assert aggregator.field_count() == 0
+
+
+class TestBatchPatternAnalysis:
+    """Test the bulk endpoint extraction path."""
+
+    def tricky_requests(self):
+        """Requests where digits sit in ports, literals and query keys."""
+        requests = []
+        for i in range(60):
+            requests.extend(
+                [
+                    {"url": f"https://api.example.com/users/{i}", "method": "GET"},
+                    {
+                        "url": f"http://localhost:808{i % 2}/v{i % 3}/items/{i}"
+                        f"?q{i % 2}=1&page={i}",
+                        "method": "GET",
+                    },
+                    {
+                        "url": f"https://shop.example.com/p/item-{i}/reviews",
+                        "method": "POST" if i % 4 else "GET",
+                    },
+                ]
+            )
+        requests.extend(
+            [
+                {"url": "", "method": "GET"},
+                {"url": None, "method": "GET"},
+                {"url": "https://api.example.com/users/1", "method": ""},
+                {"url": "api.example.com/products/789", "method": "GET"},
+                {"url": " https://api.example.com/users/7", "method": "GET"},
+                {"url": "https://api.example.com/a;p=1?b=2#f3", "method": "GET"},
+                {
+                    "url": "HTTPS://API.example.com/doc/9e107d9d372bb682",
+                    "method": "GET",
+                },
+            ]
+        )
+        return requests
+
+    def test_matches_per_request_analysis(self):
+        """Bulk extraction infers the same endpoints in the same order."""
+        state = create_initial_state("Mixed traffic", "batch")
+        state["network_requests"] = self.tricky_requests()
+
+        expected_agent = PatternAnalysisAgent(RouteInferenceEngine(max_literals=10))
+        batch_agent = PatternAnalysisAgent(RouteInferenceEngine(max_literals=10))
+
+        expected = expected_agent.analyze_api_patterns(state)
+        result = batch_agent.analyze_api_patterns_batch(state)
+
+        assert result["inferred_api_endpoints"] == expected["inferred_api_endpoints"]
+        # Both paths taught route inference the same routes
+        assert batch_agent.route_engine.resolve(
+            "https://shop.example.com", "/p/item-0/reviews"
+        ) == expected_agent.route_engine.resolve(
+            "https://shop.example.com", "/p/item-0/reviews"
+        )
+
+    def test_repeat_requests_count_toward_literal_ratios(self):
+        """Repeated requests keep a busy literal position from collapsing."""
+        requests = [
+            {"url": f"https://api.example.com/static/page-{slug}", "method": "GET"}
+            for slug in (f"{chr(97 + i % 26)}{chr(97 + i // 26)}" for i in range(120))
+            for _ in range(5)
+        ]
+        state = create_initial_state("Static pages", "batch")
+        state["network_requests"] = requests
+
+        expected = PatternAnalysisAgent().analyze_api_patterns(state)
+        result = PatternAnalysisAgent().analyze_api_patterns_batch(state)
+
+        assert result["inferred_api_endpoints"] == expected["inferred_api_endpoints"]
+        assert len(result["inferred_api_endpoints"]) == 120
+
+    def test_reads_columnar_store(self):
+        """Bulk extraction reads the request store's columns directly."""
+        requests = self.tricky_requests()
+        state = create_initial_state("Mixed traffic", "batch")
+        state["network_requests"] = NetworkRequestStore(requests)
+
+        result = PatternAnalysisAgent().analyze_api_patterns_batch(state)
+        expected = PatternAnalysisAgent().analyze_api_patterns(state)
+
+        assert result["inferred_api_endpoints"] == expected["inferred_api_endpoints"]
+
+    def test_empty_capture(self):
+        """No requests yields no endpoints."""
+        state = create_initial_state("Empty", "batch")
+
+        result = PatternAnalysisAgent().analyze_api_patterns_batch(state)
+
+        assert result["inferred_api_endpoints"] == []
@@ -120,3 +120,67 @@ class TestPlaywrightMCPIntegration:
         # Verify network requests were captured
         network_requests = mcp_client.get_network_requests()
         assert len(network_requests) >= 2  # At least 2 navigation requests
+
+    @pytest.mark.asyncio
+    async def test_async_execute_action_records_like_sync_path(self, mcp_client):
+        """Test that the async action path captures the same data as the sync one."""
+        mcp_client.clear_session_data()
+
+        result = await mcp_client.aexecute_action("Navigate to login page")
+
+        assert result["success"] is True
+        assert result["instruction"] == "Navigate to login page"
+        assert (
+            mcp_client.get_audit_logs()[-1]["instruction"] == "Navigate to login page"
+        )
+        assert len(mcp_client.get_network_requests()) == 1
+
+    def test_navigate_action_requests_the_instructed_page(self, mcp_client):
+        """Test that navigate actions request the URL or page they name."""
+        mcp_client.execute_action("Navigate to https://ap.example.com/vendors")
+        mcp_client.execute_action("Navigate to the vendor invoices page")
+
+        assert [r["url"] for r in mcp_client.get_network_requests()] == [
+            "https://ap.example.com/vendors",
+            "https://example.com/vendor-invoices",
+        ]
+        assert mcp_client.current_url == "https://example.com/vendor-invoices"
+
+    @pytest.mark.asyncio
+    async def test_drain_returns_only_new_entries(self, mcp_client):
+        """Test that draining with a cursor skips entries already drained."""
+        await mcp_client.navigate_to_url("https://example.com/login")
+        first, cursor = mcp_client.drain_network_requests()
+
+        await mcp_client.navigate_to_url("https://example.com/dashboard")
+        second, cursor = mcp_client.drain_network_requests(cursor)
+        empty, _ = mcp_client.drain_network_requests(cursor)
+
+        assert [r["url"] for r in first] == ["https://example.com/login"]
+        assert [r["url"] for r in second] == ["https://example.com/dashboard"]
+        assert empty == []
+
+    @pytest.mark.asyncio
+    async def test_drain_cursor_survives_clear(self, mcp_client):
+        """Test that cursors stay valid after session data is cleared."""
+        await mcp_client.navigate_to_url("https://example.com/login")
+        _, cursor = mcp_client.drain_audit_logs()
+
+        mcp_client.clear_session_data()
+        await mcp_client.navigate_to_url("https://example.com/dashboard")
+        logs, _ = mcp_client.drain_audit_logs(cursor)
+
+        assert [log["url"] for log in logs] == ["https://example.com/dashboard"]
+
+    @pytest.mark.asyncio
+    async def test_foreign_cursor_drains_from_start(self, mcp_client):
+        """Test that a cursor from another client is not applied."""
+        other = PlaywrightMCPClient()
+        await other.navigate_to_url("https://example.com/a")
+        await other.navigate_to_url("https://example.com/b")
+        _, foreign_cursor = other.drain_network_requests()
+
+        await mcp_client.navigate_to_url("https://example.com/login")
+        requests, _ = mcp_client.drain_network_requests(foreign_cursor)
+
+        assert len(requests) == 1
@@ -0,0 +1,142 @@
+"""
+Test per-node workflow profiling and Chrome trace export
+"""
+
+import json
+
+import pytest
+
+from src.workflows.profiling import NodeProfiler, state_sizes
+from src.workflows.reverse_engineering import ReverseEngineeringWorkflow
+from src.workflows.state_management import create_initial_state
+
+# Spans of a single-iteration workflow run, sorted by name
+RUN_SPANS = ["data_capturer", "journey_executor", "pattern_analyzer", "workflow"]
+
+
+@pytest.fixture
+def profiler():
+    """Profiler that stops tracemalloc afterwards if it started it"""
+    profiler = NodeProfiler()
+    yield profiler
+    profiler.close()
+
+
+def journey_state(i=0):
+    """Initial state of a navigation journey."""
+    return create_initial_state(f"Navigate to https://example.com/{i}", "parts")
+
+
+class TestNodeProfiler:
+    """Test span recording outside the workflow"""
+
+    @pytest.mark.asyncio
+    async def test_wrapped_node_records_timing_memory_and_sizes(self, profiler):
+        """A node span carries wall, CPU, memory peak and state sizes"""
+
+        async def node(state, config=None):
+            state["network_requests"] = [bytearray(100_000)] * 3
+            return state
+
+        wrapped = profiler.wrap("capture", node)
+        await wrapped({"network_requests": [], "workflow_description": "x"})
+
+        (event,) = profiler.events
+        assert event["name"] == "capture"
+        assert event["ph"] == "X"
+        assert event["args"]["input_sizes"] == {"network_requests": 0}
+        assert event["args"]["output_sizes"] == {"network_requests": 3}
+        assert event["args"]["memory_peak_bytes"] >= 100_000
+        assert event["args"]["wall_ms"] >= 0
+        assert event["args"]["cpu_ms"] >= 0
+
+    def test_outer_span_peak_covers_nested_spans(self, profiler):
+        """Nested spans resetting the peak don't hide it from the outer span"""
+        with profiler.span("outer", "graph"):
+            with profiler.span("inner"):
+                buffer = bytearray(500_000)
+                del buffer
+            with profiler.span("second"):
+                pass
+
+        peaks = {e["name"]: e["args"]["memory_peak_bytes"] for e in profiler.events}
+        assert peaks["inner"] >= 500_000
+        assert peaks["second"] < 500_000
+        assert peaks["outer"] >= 500_000
+
+    def test_failing_span_is_recorded_with_its_error(self, profiler):
+        """Exceptions propagate and are noted on the span"""
+        with pytest.raises(ValueError):
+            with profiler.span("broken"):
+                raise ValueError("boom")
+
+        assert "boom" in profiler.events[0]["args"]["error"]
+
+    def test_state_sizes_skip_scalars_and_strings(self):
+        """Only collections are sized"""
+        sizes = state_sizes(
+            {"iteration_count": 2, "workflow_description": "abc", "dom_changes": [1]}
+        )
+
+        assert sizes == {"dom_changes": 1}
+
+
+class TestWorkflowProfiling:
+    """Test profiling of LangGraph workflow runs"""
+
+    @pytest.mark.asyncio
+    async def test_execute_records_every_node_and_the_run(self, profiler):
+        """Each node invocation and the run as a whole become spans"""
+        workflow = ReverseEngineeringWorkflow(profiler=profiler)
+
+        result = await workflow.execute(journey_state())
+
+        assert "workflow_error" not in result
+        names = [event["name"] for event in profiler.events]
+        assert sorted(names) == RUN_SPANS
+        summary = profiler.summary()
+        assert summary["workflow"]["wall_ms"] >= (
+            summary["journey_executor"]["wall_ms"]
+            + summary["data_capturer"]["wall_ms"]
+            + summary["pattern_analyzer"]["wall_ms"]
+        )
+        executor = next(e for e in profiler.events if e["name"] == "journey_executor")
+        assert executor["args"]["output_sizes"]["user_interactions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_journeys_get_separate_lanes(self, profiler):
+        """Spans of each journey share a trace thread of their own"""
+        workflow = ReverseEngineeringWorkflow(profiler=profiler)
+
+        async for _ in workflow.execute_many([journey_state(i) for i in range(3)]):
+            pass
+
+        lanes = {}
+        for event in profiler.events:
+            lanes.setdefault(event["tid"], []).append(event["name"])
+        assert len(lanes) == 3
+        for names in lanes.values():
+            assert sorted(names) == RUN_SPANS
+
+    @pytest.mark.asyncio
+    async def test_export_writes_a_chrome_trace(self, profiler, tmp_path):
+        """The exported file is a trace event JSON object"""
+        workflow = ReverseEngineeringWorkflow(profiler=profiler)
+        await workflow.execute(journey_state())
+
+        path = profiler.export(tmp_path / "trace.json")
+
+        trace = json.loads(path.read_text())
+        assert trace["displayTimeUnit"] == "ms"
+        spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        names = [e for e in trace["traceEvents"] if e["ph"] == "M"]
+        assert len(spans) == len(RUN_SPANS)
+        assert names[0]["name"] == "thread_name"
+        assert all(span["dur"] >= 0 and span["ts"] >= 0 for span in spans)
+
+    def test_workflow_without_profiler_registers_plain_nodes(self):
+        """Profiling is opt-in"""
+        workflow = ReverseEngineeringWorkflow()
+
+        assert workflow.profiler is None
+        assert workflow._node("data_capturer") == workflow.capture_data
@@ -0,0 +1,177 @@
+"""
+Test recording and replaying Playwright MCP browser sessions
+"""
+
+import gzip
+
+import pytest
+
+from src.integrations.recording import (
+    RecordingPlaywrightClient,
+    ReplayPlaywrightClient,
+    load_tape,
+    recording_factory,
+)
+from src.workflows.reverse_engineering import ReverseEngineeringWorkflow
+from src.workflows.state_management import create_initial_state
+
+JOURNEY = [
+    {"action": "navigate", "url": "https://ap.example.com/invoices"},
+    {"action": "click", "element": "Approve button", "selector": "#approve"},
+]
+
+
+@pytest.fixture
+def tape(tmp_path):
+    """Path of a session tape"""
+    return tmp_path / "session.tape.gz"
+
+
+class TestRecordReplay:
+    """Test that replayed calls reproduce the recorded session"""
+
+    @pytest.mark.asyncio
+    async def test_replay_reproduces_results_and_captures(self, tape):
+        """Each call returns its recorded result and captures"""
+        recorder = RecordingPlaywrightClient(tape)
+        navigated = await recorder.navigate_to_url("https://ap.example.com/vendors")
+        journey = await recorder.execute_user_journey(JOURNEY)
+        action = recorder.execute_action("Navigate to payments")
+        recorder.close()
+
+        player = ReplayPlaywrightClient(tape)
+
+        assert await player.navigate_to_url("https://ap.example.com/vendors") == (
+            navigated
+        )
+        assert await player.execute_user_journey(JOURNEY) == journey
+        assert await player.aexecute_action("Navigate to payments") == action
+        assert player.get_audit_logs() == recorder.get_audit_logs()
+        assert player.get_network_requests() == recorder.get_network_requests()
+
+    @pytest.mark.asyncio
+    async def test_journey_steps_are_recorded_as_one_call(self, tape):
+        """Steps performed inside a journey aren't recorded separately"""
+        recorder = RecordingPlaywrightClient(tape)
+        await recorder.execute_user_journey(JOURNEY)
+        recorder.close()
+
+        calls = load_tape(tape)
+
+        assert recorder.recorded == 1
+        ((record,),) = calls.values()
+        assert record["method"] == "execute_user_journey"
+        assert len(record["captures"]["audit_logs"]) == 3
+        assert len(record["captures"]["network_requests"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_repeated_calls_replay_in_recorded_order(self, tape):
+        """The n-th identical call gets the n-th recording, then the last"""
+        recorder = RecordingPlaywrightClient(tape)
+        results = [await recorder.navigate_to_url("https://x.test/") for _ in range(2)]
+        recorder.close()
+
+        player = ReplayPlaywrightClient(tape)
+        replayed = [await player.navigate_to_url("https://x.test/") for _ in range(3)]
+
+        assert replayed == results + results[-1:]
+
+    @pytest.mark.asyncio
+    async def test_unrecorded_calls_raise(self, tape):
+        """Replaying a call the tape never saw fails loudly"""
+        RecordingPlaywrightClient(tape).close()
+
+        with pytest.raises(KeyError):
+            await ReplayPlaywrightClient(tape).click_element("Save", "#save")
+
+    @pytest.mark.asyncio
+    async def test_truncated_tape_keeps_complete_calls(self, tape):
+        """A recording cut short by a crash still replays what it finished"""
+        recorder = RecordingPlaywrightClient(tape)
+        await recorder.navigate_to_url("https://x.test/a")
+        await recorder.navigate_to_url("https://x.test/b")
+        recorder.close()
+        data = gzip.decompress(tape.read_bytes())
+        tape.write_bytes(gzip.compress(data[:-20]))
+
+        player = ReplayPlaywrightClient(tape)
+
+        assert (await player.navigate_to_url("https://x.test/a"))["success"]
+        with pytest.raises(KeyError):
+            await player.navigate_to_url("https://x.test/b")
+
+    def test_rejects_other_files(self, tmp_path):
+        """Only session tapes are loaded"""
+        path = tmp_path / "other.gz"
+        path.write_bytes(gzip.compress(b'{"log": {}}\n'))
+
+        with pytest.raises(ValueError):
+            load_tape(path)
+
+    @pytest.mark.asyncio
+    async def test_workflow_runs_identically_from_a_replay(self, tape):
+        """A replayed workflow run infers what the recorded run inferred"""
+        recorder = RecordingPlaywrightClient(tape)
+        recorded = await ReverseEngineeringWorkflow(
+            client_factory=lambda: recorder
+        ).execute(create_initial_state("Navigate to invoices", "accounts_payable"))
+        recorder.close()
+
+        player = ReplayPlaywrightClient(tape)
+        replayed = await ReverseEngineeringWorkflow(
+            client_factory=lambda: player
+        ).execute(create_initial_state("Navigate to invoices", "accounts_payable"))
+
+        assert player.replayed == 1
+        assert replayed["playwright_logs"] == recorded["playwright_logs"]
+        assert replayed["inferred_api_endpoints"] == recorded["inferred_api_endpoints"]
+        assert (
+            replayed["user_interactions"][0]["result"]
+            == recorded["user_interactions"][0]["result"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_journeys_replay_from_their_own_tapes(self, tmp_path):
+        """Every journey run by execute_many is recorded and replays"""
+        instructions = ["Navigate to invoices", "Navigate to vendors"]
+
+        def states():
+            return [create_initial_state(i, "accounts_payable") for i in instructions]
+
+        recorders = []
+        factory = recording_factory(tmp_path / "tapes")
+
+        def record():
+            recorders.append(factory())
+            return recorders[-1]
+
+        recorded = dict(
+            [
+                r
+                async for r in ReverseEngineeringWorkflow(
+                    client_factory=record
+                ).execute_many(states())
+            ]
+        )
+        for recorder in recorders:
+            recorder.close()
+
+        replayed = dict(
+            [
+                r
+                async for r in ReverseEngineeringWorkflow(
+                    client_factory=lambda: ReplayPlaywrightClient(tmp_path / "tapes")
+                ).execute_many(states())
+            ]
+        )
+
+        assert len(list((tmp_path / "tapes").iterdir())) == len(recorders)
+        assert recorded[0]["playwright_logs"] != recorded[1]["playwright_logs"]
+        for index in range(len(instructions)):
+            assert replayed[index]["playwright_logs"] == (
+                recorded[index]["playwright_logs"]
+            )
+            assert (
+                replayed[index]["inferred_api_endpoints"]
+                == recorded[index]["inferred_api_endpoints"]
+            )
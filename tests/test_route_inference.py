@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for segment-trie route inference
+"""
+
+from src.agents.pattern_analyzer import PatternAnalysisAgent
+from src.agents.route_inference import RouteInferenceEngine, classify_segment
+
+BASE_URL = "https://legacy.example.com"
+
+
+class TestClassifySegment:
+    """Test type-based parameter detection."""
+
+    def test_identifier_segments(self):
+        """Numeric IDs and UUIDs are identifiers."""
+        assert classify_segment("123") == "{id}"
+        assert classify_segment("3f2b8c1e-9a4d-4c2e-8f1a-0b9c7d6e5a4f") == "{id}"
+
+    def test_hash_and_date_segments(self):
+        """Hex digests, long tokens and dates get their own placeholders."""
+        assert classify_segment("9e107d9d372bb6826bd81d3542a419d6") == "{hash}"
+        assert classify_segment("eyJhbGciOiJIUzI1NiJ9abc123xyz") == "{hash}"
+        assert classify_segment("2024-01-15") == "{date}"
+
+    def test_plain_literals(self):
+        """Words, short slugs and placeholders are not reclassified."""
+        assert classify_segment("users") is None
+        assert classify_segment("deadbeef") is None
+        assert classify_segment("v2") is None
+        assert classify_segment("{param}") == "{param}"
+
+    def test_long_static_slugs(self):
+        """Long slugs with a version or year stay literals."""
+        for slug in (
+            "v2-customer-invoice-summary-report",
+            "customer_invoice_summary_v2",
+            "CustomerInvoiceSummaryV2Report",
+            "invoice-summary-2024-q1-v2-final",
+        ):
+            assert classify_segment(slug) is None
+        assert classify_segment("cjld2cjxh0000qzrmn831i7rn") == "{hash}"
+        assert classify_segment("dGhpcyBpcyBhIHRlc3QgdG9rZW4xMjM=") == "{hash}"
+
+
+class TestRouteInferenceEngine:
+    """Test cardinality-based collapsing and stability."""
+
+    def test_typed_segments_become_parameters(self):
+        """Typed segments are parameterized on first sight."""
+        engine = RouteInferenceEngine()
+
+        assert engine.infer(BASE_URL, "/users/123/orders") == "/users/{id}/orders"
+        assert engine.infer(BASE_URL, "/reports/2024-01-15") == "/reports/{date}"
+        assert engine.infer(BASE_URL, "/users") == "/users"
+
+    def test_high_cardinality_position_collapses(self):
+        """A position with too many distinct literals becomes {param}."""
+        engine = RouteInferenceEngine(max_literals=3)
+
+        patterns = [
+            engine.infer(BASE_URL, f"/products/{slug}/reviews")
+            for slug in ("red-shirt", "blue-hat", "green-scarf", "black-boots")
+        ]
+
+        assert patterns[0] == "/products/red-shirt/reviews"
+        assert patterns[-1] == "/products/{param}/reviews"
+        assert engine.resolve(BASE_URL, "/products/red-shirt/reviews") == (
+            "/products/{param}/reviews"
+        )
+        # Sibling positions keep their literals
+        assert engine.infer(BASE_URL, "/users/me") == "/users/me"
+
+    def test_collapsed_patterns_are_stable(self):
+        """Once collapsed, new values and earlier patterns resolve the same."""
+        engine = RouteInferenceEngine(max_literals=2)
+        for i in range(10):
+            engine.infer(BASE_URL, f"/wiki/page-{chr(97 + i)}/history")
+
+        assert engine.infer(BASE_URL, "/wiki/another-page/history") == (
+            "/wiki/{param}/history"
+        )
+        assert engine.resolve(BASE_URL, "/wiki/{param}/history") == (
+            "/wiki/{param}/history"
+        )
+
+    def test_busy_static_positions_keep_their_literals(self):
+        """Many resources requested over and over are not a parameter."""
+        engine = RouteInferenceEngine()
+        for _ in range(10):
+            for i in range(80):
+                engine.observe(BASE_URL, f"/api/resource-{chr(97 + i % 26)}{i // 26}")
+
+        assert engine.resolve(BASE_URL, "/api/resource-a0") == "/api/resource-a0"
+
+    def test_unique_values_collapse_after_min_observations(self):
+        """A position producing a new value on most visits collapses."""
+        engine = RouteInferenceEngine(min_observations=20)
+        patterns = [
+            engine.infer(BASE_URL, f"/wiki/{chr(97 + i % 26)}{chr(97 + i // 26)}")
+            for i in range(30)
+        ]
+
+        assert patterns[18] == "/wiki/sa"
+        assert patterns[-1] == "/wiki/{param}"
+
+    def test_merged_visits_decide_collapse(self):
+        """Merged engines judge a position by its combined visits."""
+        left = RouteInferenceEngine(min_observations=20)
+        right = RouteInferenceEngine(min_observations=20)
+        for i in range(30):
+            slug = f"{chr(97 + i % 26)}{chr(97 + i // 26)}"
+            (left if i % 2 else right).observe(BASE_URL, f"/wiki/{slug}")
+
+        left.merge(right)
+
+        assert left.resolve(BASE_URL, "/wiki/aa") == "/wiki/{param}"
+
+    def test_memory_bounded_on_unique_urls(self):
+        """Distinct URLs don't grow the trie past its limits."""
+        engine = RouteInferenceEngine(max_literals=8, max_nodes=200)
+
+        for i in range(20000):
+            engine.infer(BASE_URL, f"/files/doc-{i}/rev-{i % 97}/view")
+
+        assert engine.node_count <= 210
+        assert engine.resolve(BASE_URL, "/files/doc-5/rev-5/view") == (
+            "/files/{param}/{param}/view"
+        )
+
+
+class TestRouteInferenceInAnalysis:
+    """Test endpoint aggregation with learned routes."""
+
+    def test_slug_endpoints_merge_after_collapse(self):
+        """Endpoints seen before a collapse merge into the parameterized one."""
+        agent = PatternAnalysisAgent()
+        agent.route_engine.max_literals = 2
+        aggregator = agent.create_aggregator()
+
+        for slug in ("alpha", "beta", "gamma", "delta"):
+            aggregator.observe(
+                {
+                    "url": f"{BASE_URL}/catalog/{slug}",
+                    "method": "GET",
+                    "status": 200,
+                    "response_time": 100,
+                }
+            )
+
+        endpoints = aggregator.snapshot(include_stats=True)
+
+        assert len(endpoints) == 1
+        assert endpoints[0]["path_pattern"] == "/catalog/{param}"
+        assert endpoints[0]["call_count"] == 4
+        assert endpoints[0]["original_url"] == f"{BASE_URL}/catalog/alpha"
+        assert endpoints[0]["stats"]["status_counts"] == {200: 4}
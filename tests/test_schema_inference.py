@@ -0,0 +1,186 @@
+"""
+Test incremental JSON body schema inference
+"""
+
+import json
+
+from src.agents.pattern_analyzer import PatternAnalysisAgent
+from src.agents.schema_inference import SchemaInferrer, parse_json_body
+from src.workflows.capture_store import NetworkRequestStore
+from src.workflows.state_management import create_initial_state
+
+
+def order(i):
+    """Order document i with an optional note on every third order."""
+    document = {
+        "id": i,
+        "status": ["open", "paid", "shipped"][i % 3],
+        "total": 10 + i * 0.5 if i % 2 else 10 + i,
+        "created_at": f"2024-01-{1 + i % 28:02d}T10:30:00Z",
+        "customer": {"email": f"user{i}@example.com", "vip": i % 5 == 0},
+        "lines": [{"sku": f"SKU-{i}-{n}", "qty": n + 1} for n in range(i % 3)],
+    }
+    if i % 3 == 0:
+        document["note"] = None if i % 2 else "leave at door"
+    return document
+
+
+class TestSchemaInferrer:
+    """Test merging documents into a schema"""
+
+    def test_infers_types_optionality_and_nesting(self):
+        """Fields, nested objects and array items are described"""
+        inferrer = SchemaInferrer()
+        for i in range(30):
+            inferrer.add(order(i))
+
+        pattern = inferrer.body_pattern()
+
+        assert pattern["id"] == {"type": "integer", "required": True}
+        assert pattern["total"]["type"] == "number"
+        assert pattern["status"]["enum"] == ["open", "paid", "shipped"]
+        assert pattern["created_at"]["format"] == "date-time"
+        assert pattern["note"]["required"] is False
+        assert pattern["note"]["type"] == ["null", "string"]
+        customer = pattern["customer"]["properties"]
+        assert customer["email"]["format"] == "email"
+        assert "enum" not in customer["email"]
+        assert customer["vip"]["type"] == "boolean"
+        items = pattern["lines"]["items"]["properties"]
+        assert items["qty"] == {"type": "integer", "required": True}
+
+    def test_merge_matches_sequential_adds(self):
+        """Merging partial schemas gives the schema of all documents"""
+        sequential = SchemaInferrer()
+        evens, odds = SchemaInferrer(), SchemaInferrer()
+        for i in range(40):
+            sequential.add(order(i))
+            (evens if i % 2 == 0 else odds).add(order(i))
+
+        evens.merge(odds)
+
+        assert evens.describe() == sequential.describe()
+        assert evens.samples == sequential.samples
+
+    def test_memory_stays_flat_as_calls_grow(self):
+        """Caps keep node and value counts constant over many documents"""
+        inferrer = SchemaInferrer(max_enum_values=5, max_properties=4, max_depth=2)
+        sizes = []
+        for i in range(2000):
+            inferrer.add(
+                {
+                    "name": f"user {i}",
+                    "role": ["admin", "clerk"][i % 2],
+                    "deep": {"a": {"b": {"c": i}}},
+                    f"extra_{i}": i,
+                }
+            )
+            sizes.append(inferrer.node_count)
+
+        pattern = inferrer.body_pattern()
+        root = inferrer.root
+
+        assert sizes[10] == sizes[-1]
+        assert root.properties["name"].values is None
+        assert len(root.properties) == 4
+        assert pattern["role"]["enum"] == ["admin", "clerk"]
+        assert inferrer.describe()["truncated"] is True
+        assert "properties" not in pattern["deep"]["properties"]["a"]
+
+    def test_id_keyed_maps_stay_within_the_node_budget(self):
+        """Maps keyed by new ids on every call are truncated, not grown"""
+        inferrer = SchemaInferrer(max_nodes=500)
+        for call in range(20):
+            ids = [f"{call}-{i}" for i in range(10)]
+            inferrer.add(
+                {"by_id": {a: {b: {c: 1 for c in ids} for b in ids} for a in ids}}
+            )
+
+        by_id = inferrer.body_pattern()["by_id"]
+
+        assert inferrer.node_count == 500
+        assert by_id["type"] == "object" and by_id["truncated"] is True
+        assert inferrer.samples == 20
+
+    def test_merging_respects_the_node_budget(self):
+        """Merged schemas are truncated at the same budget"""
+        left, right = SchemaInferrer(max_nodes=50), SchemaInferrer(max_nodes=50)
+        left.add({f"a{i}": i for i in range(40)})
+        right.add({f"b{i}": [i] for i in range(40)})
+
+        left.merge(right)
+
+        assert left.node_count == 50
+        assert left.describe()["truncated"] is True
+
+    def test_samples_are_capped(self):
+        """Documents past the sample cap are skipped"""
+        inferrer = SchemaInferrer(max_samples=10)
+        for i in range(30):
+            inferrer.add({"id": i, f"late_{i}": i} if i >= 10 else {"id": i})
+
+        assert inferrer.samples == 10
+        assert list(inferrer.body_pattern()) == ["id"]
+
+    def test_only_json_documents_are_parsed(self):
+        """Text that isn't a JSON object or array is skipped"""
+        assert parse_json_body('  {"a": 1}') == {"a": 1}
+        assert parse_json_body([1, 2]) == [1, 2]
+        for body in ("<html></html>", "a=1&b=2", "{broken", "", None, "42"):
+            assert parse_json_body(body) is None
+
+
+class TestEndpointBodyPatterns:
+    """Test body patterns on inferred endpoints"""
+
+    def requests(self):
+        """PUT /orders/{id} calls with request and response bodies."""
+        requests = []
+        for i in range(12):
+            document = order(i)
+            requests.append(
+                {
+                    "url": f"https://api.example.com/orders/{i}",
+                    "method": "PUT",
+                    "status": 200,
+                    "request_body": f'{{"status": "{document["status"]}"}}',
+                    "response_body": json.dumps(document),
+                }
+            )
+        requests.append(
+            {
+                "url": "https://api.example.com/orders/99",
+                "method": "PUT",
+                "status": 404,
+                "response_body": '{"error": "not found"}',
+            }
+        )
+        return requests
+
+    def test_error_responses_not_merged(self):
+        """Response schemas come from successful responses only"""
+        state = create_initial_state("Orders", "consignment")
+        state["network_requests"] = self.requests()
+
+        result = PatternAnalysisAgent().analyze_api_patterns(state)
+        (endpoint,) = result["inferred_api_endpoints"]
+
+        assert endpoint["request_body_pattern"]["status"]["enum"] == [
+            "open",
+            "paid",
+            "shipped",
+        ]
+        assert "error" not in endpoint["response_body_pattern"]
+        assert endpoint["response_body_pattern"]["id"]["required"] is True
+
+    def test_batch_matches_online_patterns(self):
+        """The bulk path infers the same body patterns from lists and stores"""
+        requests = self.requests()
+        state = create_initial_state("Orders", "consignment")
+        state["network_requests"] = requests
+        expected = PatternAnalysisAgent().analyze_api_patterns(state)
+
+        for source in (requests, NetworkRequestStore(requests)):
+            state["network_requests"] = source
+            batch = PatternAnalysisAgent().analyze_api_patterns_batch(state)
+            assert batch["inferred_api_endpoints"] == expected["inferred_api_endpoints"]
@@ -0,0 +1,197 @@
+"""
+Test the browser session pool for Playwright MCP
+"""
+
+import asyncio
+
+import pytest
+
+from src.integrations.playwright_mcp import PlaywrightMCPClient
+from src.integrations.session_pool import BrowserSessionPool
+from src.workflows.reverse_engineering import ReverseEngineeringWorkflow
+from src.workflows.state_management import create_initial_state
+
+
+class CountingClient(PlaywrightMCPClient):
+    """Client that records browser context lifecycle calls."""
+
+    def __init__(self):
+        super().__init__()
+        self.created = []
+        self.resets = []
+        self.closed = []
+
+    async def create_session(self):
+        session_id = await super().create_session()
+        self.created.append(session_id)
+        return session_id
+
+    async def reset_session(self, session_id):
+        self.resets.append(session_id)
+
+    async def close_session(self, session_id):
+        self.closed.append(session_id)
+
+
+class FlakyLaunchClient(CountingClient):
+    """Client whose browser launches fail after the first few."""
+
+    def __init__(self, launches):
+        super().__init__()
+        self.launches = launches
+
+    async def create_session(self):
+        if len(self.created) >= self.launches:
+            raise RuntimeError("browser launch failed")
+        return await super().create_session()
+
+
+class TestBrowserSessionPool:
+    """Test leasing, resetting and recycling browser contexts"""
+
+    @pytest.mark.asyncio
+    async def test_prewarmed_contexts_are_hits(self):
+        """Leases from a warmed pool reuse existing contexts"""
+        client = CountingClient()
+        pool = BrowserSessionPool(client, size=2)
+        await pool.start()
+
+        for _ in range(3):
+            async with pool.lease():
+                pass
+
+        stats = pool.stats()
+        assert len(client.created) == 2
+        assert stats["hits"] == 3
+        assert stats["misses"] == 0
+        assert len(client.resets) == 3
+
+    @pytest.mark.asyncio
+    async def test_cold_pool_counts_misses(self):
+        """Leases that have to create a context count as misses"""
+        client = CountingClient()
+        pool = BrowserSessionPool(client, size=2)
+
+        async with pool.lease() as first:
+            async with pool.lease() as second:
+                assert first.session_id != second.session_id
+
+        stats = pool.stats()
+        assert stats["misses"] == 2
+        assert stats["idle"] == 2
+
+    @pytest.mark.asyncio
+    async def test_contexts_recycled_after_max_uses(self):
+        """Contexts past the use-count limit are closed and replaced"""
+        client = CountingClient()
+        pool = BrowserSessionPool(client, size=1, max_uses=2)
+        await pool.start()
+
+        session_ids = []
+        for _ in range(3):
+            async with pool.lease() as session:
+                session_ids.append(session.session_id)
+
+        assert session_ids[0] == session_ids[1]
+        assert session_ids[2] != session_ids[0]
+        assert client.closed == [session_ids[0]]
+        assert pool.stats()["recycled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_contexts_recycled_after_max_age(self):
+        """Contexts older than the age limit are replaced on lease"""
+        client = CountingClient()
+        pool = BrowserSessionPool(client, size=1, max_age=0.0)
+        await pool.start()
+
+        async with pool.lease() as session:
+            assert session.session_id != client.created[0]
+
+        assert client.created[0] in client.closed
+
+    @pytest.mark.asyncio
+    async def test_waits_when_all_contexts_leased(self):
+        """Leases wait for a returned context and record the wait time"""
+        pool = BrowserSessionPool(CountingClient(), size=1)
+        await pool.start()
+
+        async def hold():
+            async with pool.lease():
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(hold(), hold())
+
+        stats = pool.stats()
+        assert stats["waits"] == 1
+        assert stats["wait_time_max"] >= 0.04
+        assert stats["total_sessions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_recycles_free_their_slot(self):
+        """A context that can't be replaced hands its slot to a waiter"""
+        client = FlakyLaunchClient(launches=1)
+        pool = BrowserSessionPool(client, size=1, max_uses=1)
+        await pool.start()
+
+        session = await pool.acquire()
+        waiter = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+        await pool.release(session)
+
+        client.launches = 2
+        replacement = await asyncio.wait_for(waiter, 1)
+        assert replacement.session_id == client.created[1]
+        assert pool.stats()["total_sessions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_launches_do_not_shrink_the_pool(self):
+        """Every failed launch gives its slot back"""
+        client = FlakyLaunchClient(launches=0)
+        pool = BrowserSessionPool(client, size=2)
+
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                await pool.acquire()
+
+        client.launches = 2
+        async with pool.lease(), pool.lease():
+            pass
+        stats = pool.stats()
+        assert (stats["total_sessions"], stats["idle"]) == (2, 2)
+
+    @pytest.mark.asyncio
+    async def test_close_wakes_waiters(self):
+        """Callers waiting on a closed pool fail instead of hanging"""
+        pool = BrowserSessionPool(CountingClient(), size=1)
+        await pool.start()
+        session = await pool.acquire()
+        waiter = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+
+        await pool.close()
+
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(waiter, 1)
+        await pool.release(session)
+        assert pool.stats()["total_sessions"] == 0
+
+    @pytest.mark.asyncio
+    async def test_workflow_runs_journeys_in_leased_contexts(self):
+        """Journeys executed by the workflow lease contexts from the pool"""
+        client = CountingClient()
+        pool = BrowserSessionPool(client, size=2)
+        await pool.start()
+
+        workflow = ReverseEngineeringWorkflow(session_pool=pool)
+        states = [
+            create_initial_state(f"Open consignment {i}", "consignment")
+            for i in range(4)
+        ]
+
+        results = [
+            result async for result in workflow.execute_many(states, max_concurrency=2)
+        ]
+
+        assert len(results) == 4
+        assert len(client.created) == 2
+        assert pool.stats()["hits"] == 4
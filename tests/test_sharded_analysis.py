@@ -0,0 +1,191 @@
+"""
+Test sharded multi-core endpoint analysis and mergeable aggregates
+"""
+
+import json
+
+import pytest
+
+from src.agents import sharded_analysis
+from src.agents.batch_extraction import learn_routes
+from src.agents.pattern_analyzer import PatternAnalysisAgent
+from src.agents.route_inference import RouteInferenceEngine
+from src.agents.sharded_analysis import (
+    aggregate_shard,
+    merge_aggregators,
+    shard_requests,
+    sharded_endpoint_patterns,
+)
+from src.workflows.capture_store import NetworkRequestStore
+
+HOSTS = ("https://ap.example.com", "https://parts.example.com")
+
+
+def capture(count=600):
+    """Requests over two hosts with bodies, statuses and whole response times."""
+    requests = []
+    for i in range(count):
+        host = HOSTS[i % 2]
+        request = {
+            "url": f"{host}/api/{['orders', 'vendors', 'items'][i % 3]}/{i}",
+            "method": "GET" if i % 4 else "POST",
+            "status": 200 if i % 7 else 500,
+            "response_time": 50 + i % 13,
+            "timestamp": f"2024-01-15T10:{i // 60 % 60:02d}:{i % 60:02d}",
+        }
+        if i % 5 == 0:
+            request["response_body"] = json.dumps({"id": i, "state": "open"})
+        requests.append(request)
+    # A high-cardinality literal position split across shards
+    requests.extend(
+        {"url": f"https://ap.example.com/reports/{name}", "method": "GET"}
+        for name in (
+            f"report-{chr(97 + i % 26)}{chr(97 + i // 26)}" for i in range(150)
+        )
+    )
+    return requests
+
+
+def single_process(requests, include_stats=True):
+    """Endpoints from one aggregator observing every request."""
+    aggregator = PatternAnalysisAgent().create_aggregator()
+    aggregator.observe_many(requests)
+    return aggregator.snapshot(include_stats=include_stats)
+
+
+class TestMergeableAggregates:
+    """Test merging route tries and endpoint aggregators"""
+
+    def test_merged_route_engines_collapse_like_one_engine(self):
+        """Literals split across engines still collapse past the limit"""
+        paths = [
+            f"/reports/name{chr(97 + i % 26)}{chr(97 + i // 26)}" for i in range(8)
+        ]
+        single = RouteInferenceEngine(max_literals=5)
+        left = RouteInferenceEngine(max_literals=5)
+        right = RouteInferenceEngine(max_literals=5)
+        for i, path in enumerate(paths):
+            single.observe(HOSTS[0], path)
+            (left if i % 2 else right).observe(HOSTS[0], path)
+
+        left.merge(right)
+
+        assert left.resolve(HOSTS[0], paths[0]) == "/reports/{param}"
+        assert left.resolve(HOSTS[0], paths[0]) == single.resolve(HOSTS[0], paths[0])
+
+    @pytest.mark.parametrize("grouping", ["left", "right"])
+    def test_aggregator_merge_is_associative(self, grouping):
+        """Any grouping of the parts gives the single-process catalog"""
+        requests = capture()
+        parts = [[], [], []]
+        for seq, request in enumerate(requests, start=1):
+            parts[seq % 3].append((seq, request))
+
+        def aggregate(part):
+            engine = RouteInferenceEngine()
+            aggregator = PatternAnalysisAgent(engine).create_aggregator()
+            for seq, request in part:
+                aggregator.observe(request, seq)
+            return aggregator
+
+        a, b, c = (aggregate(part) for part in parts)
+        if grouping == "left":
+            merged = merge_aggregators(
+                PatternAnalysisAgent(),
+                [merge_aggregators(PatternAnalysisAgent(), [a, b]), c],
+            )
+        else:
+            merged = merge_aggregators(
+                PatternAnalysisAgent(),
+                [a, merge_aggregators(PatternAnalysisAgent(), [b, c])],
+            )
+
+        assert merged.snapshot(include_stats=True) == single_process(requests)
+        assert merged.observed == len(requests)
+
+
+class TestShardedAnalysis:
+    """Test sharding and parallel aggregation"""
+
+    @pytest.mark.parametrize("shard_by", ["endpoint", "base_url"])
+    def test_shards_partition_the_capture(self, shard_by):
+        """Every request lands in exactly one shard with its position"""
+        requests = capture()
+
+        shards = shard_requests(requests, 4, shard_by)
+
+        seqs = sorted(seq for shard_seqs in shards for seq in shard_seqs.tolist())
+        assert seqs == list(range(1, len(requests) + 1))
+        if shard_by == "base_url":
+            shards_by_host = {}
+            for number, shard_seqs in enumerate(shards):
+                for seq in shard_seqs.tolist():
+                    host = requests[seq - 1]["url"].split("/")[2]
+                    shards_by_host.setdefault(host, set()).add(number)
+            assert all(len(numbers) == 1 for numbers in shards_by_host.values())
+
+    @pytest.mark.parametrize("shard_by", ["endpoint", "base_url"])
+    def test_stores_shard_like_lists(self, shard_by):
+        """A columnar capture is sharded from its codes, the same way"""
+        requests = capture()
+        requests.append({"method": "GET"})
+
+        shards = shard_requests(NetworkRequestStore(requests), 4, shard_by)
+
+        expected = shard_requests(requests, 4, shard_by)
+        assert [s.tolist() for s in shards] == [s.tolist() for s in expected]
+
+    def test_shard_aggregates_use_capture_wide_positions(self):
+        """Merged shard aggregates match the single-process catalog"""
+        requests = capture()
+        agent = PatternAnalysisAgent()
+        learn_routes(agent, requests)
+
+        aggregators = [
+            aggregate_shard(requests, seqs, agent.route_engine)
+            for seqs in shard_requests(requests, 3)
+        ]
+        merged = merge_aggregators(agent, aggregators)
+
+        assert merged.snapshot(include_stats=True) == single_process(requests)
+
+    @pytest.mark.parametrize("shard_by", ["endpoint", "base_url"])
+    def test_process_pool_matches_single_process(self, shard_by, monkeypatch):
+        """Workers produce the same endpoints, stats and schemas"""
+        monkeypatch.setattr(sharded_analysis, "MIN_PARALLEL_REQUESTS", 0)
+        requests = NetworkRequestStore(capture())
+        agent = PatternAnalysisAgent()
+
+        endpoints = sharded_endpoint_patterns(
+            agent, requests, workers=2, shard_by=shard_by, include_stats=True
+        )
+
+        assert endpoints == single_process(requests)
+        assert any("response_body_pattern" in endpoint for endpoint in endpoints)
+        # The agent learned the capture's routes
+        assert agent.route_engine.resolve(
+            "https://ap.example.com", "/reports/weekly"
+        ) == ("/reports/{param}")
+
+    def test_collapses_decided_early_in_the_capture_survive(self, monkeypatch):
+        """A position collapsed before its literals repeat stays collapsed"""
+        monkeypatch.setattr(sharded_analysis, "MIN_PARALLEL_REQUESTS", 0)
+        slugs = [f"item-{chr(97 + i % 26)}{chr(97 + i // 26)}" for i in range(200)]
+        requests = [
+            {"url": f"https://shop.example.com/api/products/{slug}", "method": "GET"}
+            for slug in slugs + slugs * 20
+        ]
+
+        endpoints = sharded_endpoint_patterns(
+            PatternAnalysisAgent(), requests, workers=2, include_stats=True
+        )
+
+        assert endpoints == single_process(requests)
+        assert [endpoint["path_pattern"] for endpoint in endpoints] == [
+            "/api/products/{param}"
+        ]
+
+    def test_rejects_unknown_shard_keys(self):
+        """Only the documented shard keys are accepted"""
+        with pytest.raises(ValueError):
+            shard_requests(capture(10), 2, shard_by="path")
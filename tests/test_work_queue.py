@@ -0,0 +1,275 @@
+"""
+Test the journey work queue and distributed journey workers
+"""
+
+import pytest
+
+from src.integrations.playwright_mcp import PlaywrightMCPClient
+from src.workflows.reverse_engineering import ReverseEngineeringWorkflow
+from src.workflows.state_management import create_initial_state
+from src.workflows.work_queue import JourneyQueue, job_id_for
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def spec(description="Open invoices", domain="ap"):
+    """Journey spec as enqueued by the coordinator."""
+    return {"workflow_description": description, "domain": domain}
+
+
+class TestJourneyQueue:
+    """Test leases, retries and result storage"""
+
+    def test_enqueue_is_idempotent(self):
+        """The same spec is queued once"""
+        queue = JourneyQueue()
+
+        first = queue.enqueue(spec())
+        second = queue.enqueue(spec())
+
+        assert first == second == job_id_for(spec())
+        assert queue.counts()["pending"] == 1
+
+    def test_leases_jobs_oldest_first_and_once(self):
+        """A leased job is not handed to another worker"""
+        clock = FakeClock()
+        queue = JourneyQueue(clock=clock)
+        older = queue.enqueue(spec("Open invoices"))
+        clock.now += 1
+        newer = queue.enqueue(spec("Find part"))
+
+        a = queue.lease("worker-a")
+        b = queue.lease("worker-b")
+
+        assert (a["job_id"], b["job_id"]) == (older, newer)
+        assert a["spec"] == spec("Open invoices")
+        assert a["attempt"] == 1
+        assert queue.lease("worker-c") is None
+
+    def test_expired_leases_are_taken_over(self):
+        """A dead worker's job is leased again once its lease expires"""
+        clock = FakeClock()
+        queue = JourneyQueue(lease_seconds=60, clock=clock)
+        job_id = queue.enqueue(spec())
+        lost = queue.lease("worker-a")
+
+        clock.now += 59
+        assert queue.lease("worker-b") is None
+        clock.now += 1
+        taken = queue.lease("worker-b")
+
+        assert taken["job_id"] == job_id
+        assert taken["attempt"] == 2
+        assert not queue.renew(job_id, lost["lease_token"])
+        assert queue.job(job_id)["lease_owner"] == "worker-b"
+
+    def test_renewed_leases_do_not_expire(self):
+        """Renewing pushes the lease expiry out"""
+        clock = FakeClock()
+        queue = JourneyQueue(lease_seconds=60, clock=clock)
+        job_id = queue.enqueue(spec())
+        lease = queue.lease("worker-a")
+
+        clock.now += 50
+        assert queue.renew(job_id, lease["lease_token"])
+        clock.now += 50
+
+        assert queue.lease("worker-b") is None
+
+    def test_failed_attempts_are_retried_until_max_attempts(self):
+        """Failures wait out the retry delay, then the job fails for good"""
+        clock = FakeClock()
+        queue = JourneyQueue(max_attempts=2, retry_delay=30, clock=clock)
+        job_id = queue.enqueue(spec())
+
+        lease = queue.lease("worker-a")
+        assert queue.fail(job_id, lease["lease_token"], "timeout") == "pending"
+        assert queue.lease("worker-a") is None
+
+        clock.now += 30
+        lease = queue.lease("worker-a")
+        assert lease["attempt"] == 2
+        assert queue.fail(job_id, lease["lease_token"], "timeout") == "failed"
+
+        clock.now += 30
+        assert queue.lease("worker-a") is None
+        assert queue.job(job_id)["last_error"] == "timeout"
+
+    def test_stale_failures_are_ignored(self):
+        """A worker that lost its lease can't fail the new attempt"""
+        clock = FakeClock()
+        queue = JourneyQueue(lease_seconds=60, clock=clock)
+        job_id = queue.enqueue(spec())
+        lost = queue.lease("worker-a")
+        clock.now += 60
+        queue.lease("worker-b")
+
+        assert queue.fail(job_id, lost["lease_token"], "crashed") == "leased"
+
+    def test_expired_leases_out_of_attempts_fail(self):
+        """A job whose every worker died is not leased forever"""
+        clock = FakeClock()
+        queue = JourneyQueue(lease_seconds=60, max_attempts=1, clock=clock)
+        job_id = queue.enqueue(spec())
+        queue.lease("worker-a")
+        clock.now += 60
+
+        assert queue.lease("worker-b") is None
+        assert queue.job(job_id)["status"] == "failed"
+
+    def test_first_result_wins(self):
+        """A job finished by two workers keeps one result"""
+        clock = FakeClock()
+        queue = JourneyQueue(lease_seconds=60, clock=clock)
+        job_id = queue.enqueue(spec())
+        queue.lease("worker-a")
+        clock.now += 60
+        queue.lease("worker-b")
+
+        assert queue.complete(job_id, {"by": "worker-b"}, "worker-b")
+        assert not queue.complete(job_id, {"by": "worker-a"}, "worker-a")
+
+        assert [result for _, _, result in queue.results()] == [{"by": "worker-b"}]
+        assert queue.counts()["done"] == 1
+
+    def test_workers_share_a_database_file(self, tmp_path):
+        """Separate connections see each other's leases and results"""
+        path = tmp_path / "journeys.db"
+        coordinator = JourneyQueue(path)
+        worker = JourneyQueue(path)
+        job_id = coordinator.enqueue(spec())
+
+        assert worker.lease("worker-a")["job_id"] == job_id
+        assert coordinator.lease("worker-b") is None
+        worker.complete(job_id, {"ok": True}, "worker-a")
+
+        ((seq, result_job, result),) = coordinator.results()
+        assert (result_job, result) == (job_id, {"ok": True})
+        assert list(coordinator.results(after=seq)) == []
+
+
+class JourneyClient(PlaywrightMCPClient):
+    """Client requesting an API endpoint named after the journey"""
+
+    async def aexecute_action(self, instruction):
+        resource = instruction.split()[-1]
+        return await self.navigate_to_url(f"https://ap.example.com/api/{resource}")
+
+
+class BrokenClient(PlaywrightMCPClient):
+    """Client whose browser session can't be restored"""
+
+    async def restore_authentication(self):
+        raise RuntimeError("browser crashed")
+
+
+class CrashingClient(PlaywrightMCPClient):
+    """Client whose browser crashes while executing actions"""
+
+    def execute_action(self, instruction):
+        raise RuntimeError("browser crashed mid-action")
+
+
+class TestJourneyWorkers:
+    """Test executing queued journeys and merging their results"""
+
+    @pytest.mark.asyncio
+    async def test_workers_drain_the_queue_for_central_analysis(self):
+        """Every queued journey is executed once and analyzed centrally"""
+        queue = JourneyQueue()
+        for resource in ("invoices", "vendors", "payments"):
+            queue.enqueue(spec(f"Open {resource}"))
+
+        worker = ReverseEngineeringWorkflow(client_factory=JourneyClient)
+        assert await worker.run_worker(queue, worker_id="worker-a") == 3
+        assert queue.counts()["done"] == 3
+
+        coordinator = ReverseEngineeringWorkflow(client_factory=JourneyClient)
+        state = await coordinator.merge_results(
+            queue, create_initial_state("Accounts payable", "ap")
+        )
+
+        assert len(state["merged_jobs"]) == 3
+        assert state["iteration_count"] == 3
+        assert {i["job_id"] for i in state["user_interactions"]} == set(
+            state["merged_jobs"]
+        )
+        assert len(state["inferred_api_endpoints"]) == 3
+        assert len(state["processed_interactions"]) == len(state["playwright_logs"])
+
+    @pytest.mark.asyncio
+    async def test_merging_again_only_adds_new_results(self):
+        """Merging is idempotent and incremental"""
+        queue = JourneyQueue()
+        queue.enqueue(spec("Open invoices"))
+        worker = ReverseEngineeringWorkflow(client_factory=JourneyClient)
+        coordinator = ReverseEngineeringWorkflow(client_factory=JourneyClient)
+
+        await worker.run_worker(queue)
+        state = await coordinator.merge_results(
+            queue, create_initial_state("Accounts payable", "ap")
+        )
+        requests = len(state["network_requests"])
+        read = []
+        results = queue.results
+        queue.results = lambda after=0: (read.append(r) or r for r in results(after))
+        state = await coordinator.merge_results(queue, state)
+        assert len(state["network_requests"]) == requests
+        assert read == []
+
+        queue.enqueue(spec("Open vendors"))
+        await worker.run_worker(queue)
+        state = await coordinator.merge_results(queue, state)
+
+        assert len(state["merged_jobs"]) == 2
+        assert len(state["inferred_api_endpoints"]) == 2
+        assert [entry["new_endpoints"] for entry in state["discovery_history"]] == [
+            1,
+            0,
+            1,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_journeys_are_retried(self):
+        """Workflow errors are reported and the job retried"""
+        queue = JourneyQueue(max_attempts=2, retry_delay=0)
+        job_id = queue.enqueue(spec())
+        worker = ReverseEngineeringWorkflow(client_factory=BrokenClient)
+
+        assert await worker.run_worker(queue) == 0
+
+        job = queue.job(job_id)
+        assert (job["status"], job["attempts"]) == ("failed", 2)
+        assert job["last_error"] == "browser crashed"
+
+    @pytest.mark.asyncio
+    async def test_failed_interactions_are_retried(self):
+        """Action errors recorded as interactions fail the attempt"""
+        queue = JourneyQueue(max_attempts=2, retry_delay=0)
+        job_id = queue.enqueue(spec())
+        worker = ReverseEngineeringWorkflow(client_factory=CrashingClient)
+
+        assert await worker.run_worker(queue) == 0
+
+        job = queue.job(job_id)
+        assert (job["status"], job["attempts"]) == ("failed", 2)
+        assert job["last_error"] == "browser crashed mid-action"
+
+    @pytest.mark.asyncio
+    async def test_max_jobs_limits_the_worker(self):
+        """A worker can be told to stop after a number of jobs"""
+        queue = JourneyQueue()
+        for resource in ("invoices", "vendors"):
+            queue.enqueue(spec(f"Open {resource}"))
+        worker = ReverseEngineeringWorkflow(client_factory=JourneyClient)
+
+        assert await worker.run_worker(queue, max_jobs=1) == 1
+        assert queue.counts()["pending"] == 1